@@ -0,0 +1,90 @@
+"""Benchmark of the detection of the feature types and missing values of a dataset from the values of ``X`` against
+the metadata of its columns computed by ``load_task``.
+
+For each number of features, the ``synthetic.<spec>`` task (with missing values added to some numeric columns) is
+loaded as an object array and as returned by ``load_task``. The time to find the numeric columns of
+``get_mandatory_preprocessing`` from the type of each value is compared with the time to read the metadata of the
+columns, and the time of the check for missing values done by the pre-processing of a workflow at each anchor
+(``np.any(pd.isnull(X))``) with the time of ``has_missing_values`` restricted to the columns with missing values.
+
+Usage:
+
+    python benchmark/column_metadata.py --rows 10000 --features 100 1000 5000 --anchor 5000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from lcdb.data._tabular import TabularArray, get_columns_metadata
+from lcdb.data._synthetic import get_synthetic_data
+from lcdb.workflow._preprocessing_workflow import get_missing_columns, has_missing_values
+
+
+def get_duration(function, repeat: int) -> float:
+    """Returns the median duration of ``repeat`` calls of ``function`` in seconds."""
+    durations = []
+    for _ in range(repeat):
+        timestamp_start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - timestamp_start)
+    return float(np.median(durations))
+
+
+def get_numeric_features(X) -> list:
+    """Returns the numeric columns of an object array as found by the previous ``get_mandatory_preprocessing``."""
+    types = [set([type(v) for v in r]) for r in X.T]
+    return [c for c, t in enumerate(types) if len(t) == 1 and list(t)[0] != str]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--features", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--categorical", type=float, default=0.2)
+    parser.add_argument("--anchor", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'features':>8} {'types (ms)':>18} {'missing (ms)':>16} {'identical':>10}"
+    )
+    for num_features in args.features:
+        X_frame, y, _ = get_synthetic_data(
+            f"rows={args.rows},features={num_features},categorical={args.categorical}"
+        )
+        # missing values in the first tenth of the columns
+        rng = np.random.RandomState(42)
+        for i in range(num_features // 10):
+            X_frame.iloc[rng.choice(args.rows, args.rows // 100, replace=False), i] = np.nan
+        X = TabularArray.from_frame(X_frame)
+        X_object = np.asarray(X)
+        metadata = {"columns": get_columns_metadata(X)}
+
+        indices = np.sort(rng.choice(args.rows, min(args.anchor, args.rows), replace=False))
+        X_anchor, X_object_anchor = X[indices], X_object[indices]
+
+        types_durations = [
+            get_duration(lambda: get_numeric_features(X_object), args.repeat),
+            get_duration(
+                lambda: [c for c, column in enumerate(metadata["columns"]) if column["kind"] == "numeric"],
+                args.repeat,
+            ),
+        ]
+        missing_durations = [
+            get_duration(lambda: np.any(pd.isnull(X_object_anchor)), args.repeat),
+            get_duration(lambda: has_missing_values(X_anchor, get_missing_columns(metadata)), args.repeat),
+        ]
+        identical = get_numeric_features(X_object) == [
+            c for c, column in enumerate(metadata["columns"]) if column["kind"] == "numeric"
+        ] and bool(np.any(pd.isnull(X_object_anchor))) == has_missing_values(X_anchor, get_missing_columns(metadata))
+
+        print(
+            f"{num_features:>8} {types_durations[0] * 1e3:>9.1f} -> {types_durations[1] * 1e3:>5.2f} "
+            f"{missing_durations[0] * 1e3:>7.1f} -> {missing_durations[1] * 1e3:>5.2f} {str(identical):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark of the time to load OpenML tasks with ``load_task`` with and without the dataset cache.
+
+For each task, the dataset is loaded from ``openml`` (whose own cache must already hold the dataset, e.g., after
+``lcdb fetch``), then written in an empty dataset cache and finally memory-mapped from the cache. The sizes of the
+arrays returned and of the files of the cache are reported.
+
+Usage:
+
+    python benchmark/dataset_cache.py --openml-ids 3 6 1590 --repeat 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from lcdb.data import load_task
+from lcdb.data._cache import get_dataset_path
+
+
+def get_size(path: str) -> int:
+    """Returns the size of the files of a directory in bytes."""
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def get_nbytes(X: np.ndarray) -> int:
+    """Returns the size of an array in bytes, including the objects of an object array."""
+    if X.dtype != object:
+        return X.nbytes
+    return X.nbytes + sum(sys.getsizeof(v) for v in X.flat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--openml-ids", type=int, nargs="+", default=[3, 6, 1590])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'task':<14} {'openml (ms)':>12} {'write (ms)':>11} {'cached (ms)':>12} {'X (MB)':>8} {'cache (MB)':>11}"
+    )
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for openml_id in args.openml_ids:
+            task_name = f"openml.{openml_id}"
+            # the first load downloads the dataset if it is not in the cache of openml
+            load_task(task_name, use_cache=False)
+
+            durations = []
+            for _ in range(args.repeat):
+                timestamp_start = time.perf_counter()
+                (X, y), _ = load_task(task_name, use_cache=False)
+                durations.append(time.perf_counter() - timestamp_start)
+            openml_duration = np.median(durations)
+            X_size = get_nbytes(X)
+
+            timestamp_start = time.perf_counter()
+            load_task(task_name, cache_dir=cache_dir)
+            write_duration = time.perf_counter() - timestamp_start
+
+            durations = []
+            for _ in range(args.repeat):
+                timestamp_start = time.perf_counter()
+                load_task(task_name, cache_dir=cache_dir)
+                durations.append(time.perf_counter() - timestamp_start)
+            cached_duration = np.median(durations)
+
+            cache_size = get_size(get_dataset_path(task_name, cache_dir))
+            print(
+                f"{task_name:<14} {openml_duration * 1e3:>12.1f} {write_duration * 1e3:>11.1f} "
+                f"{cached_duration * 1e3:>12.1f} {X_size / 1024**2:>8.1f} {cache_size / 1024**2:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
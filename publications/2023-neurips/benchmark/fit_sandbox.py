@@ -0,0 +1,105 @@
+"""Microbenchmark of the overhead of ``lcdb.builder.sandbox.FitSandbox`` compared to the thread of ``terminate_on_timeout``.
+
+The overheads measured are the start of the fork server (once per process), the start of a worker (after a
+timeout), a call in a running worker and the fit of a workflow whose arguments and result are pickled. The CPU time
+used by the process after a timeout shows if the timed out call keeps running.
+
+Usage:
+
+    python benchmark/fit_sandbox.py --instances 5000 --features 20 --repeat 5
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import psutil
+
+from lcdb.builder.sandbox import FitSandbox, fit_workflow
+from lcdb.builder.timer import Timer
+from lcdb.builder.utils import FunctionCallTimeoutError, terminate_on_timeout
+from lcdb.workflow.sklearn import LibLinearWorkflow
+
+
+def busy(seconds: float):
+    """Keeps the CPU busy for some seconds."""
+    timestamp_start = time.time()
+    while time.time() - timestamp_start < seconds:
+        pass
+
+
+def get_workflow():
+    return LibLinearWorkflow(timer=Timer(precision=4), **{"pp@cat_encoder": "onehot"})
+
+
+def get_cpu_time_after_timeout(timeout_func) -> float:
+    """Returns the CPU time used by the process in the second following a timeout."""
+    try:
+        timeout_func()
+    except FunctionCallTimeoutError:
+        pass
+    process = psutil.Process()
+    cpu_start = process.cpu_times()
+    time.sleep(1)
+    cpu_stop = process.cpu_times()
+    return (cpu_stop.user + cpu_stop.system) - (cpu_start.user + cpu_start.system)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--instances", type=int, default=5000)
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(args.instances, args.features))
+    y = (X[:, 0] + rng.normal(size=args.instances) > 0).astype(int)
+    fit_kwargs = dict(X_valid=X, y_valid=y, X_test=X, y_test=y, metadata={"categories": {"columns": np.zeros(args.features, dtype=bool)}})
+
+    sandbox = FitSandbox(preload=[LibLinearWorkflow.__module__])
+
+    timestamp_start = time.perf_counter()
+    sandbox.start()
+    sandbox.call(-1, os.getpid)
+    server_start = time.perf_counter() - timestamp_start
+
+    worker_starts = []
+    calls = []
+    for _ in range(args.repeat):
+        sandbox.kill()
+        timestamp_start = time.perf_counter()
+        sandbox.call(-1, os.getpid)
+        worker_starts.append(time.perf_counter() - timestamp_start)
+
+        timestamp_start = time.perf_counter()
+        sandbox.call(-1, os.getpid)
+        calls.append(time.perf_counter() - timestamp_start)
+
+    fits_thread = []
+    fits_sandbox = []
+    for _ in range(args.repeat):
+        timestamp_start = time.perf_counter()
+        terminate_on_timeout(60, fit_workflow, get_workflow(), "fit", X, y, **fit_kwargs)
+        fits_thread.append(time.perf_counter() - timestamp_start)
+
+        workflow = get_workflow()
+        timestamp_start = time.perf_counter()
+        sandbox.call(60, fit_workflow, workflow, "fit", X, y, **fit_kwargs)
+        fits_sandbox.append(time.perf_counter() - timestamp_start)
+
+    cpu_thread = get_cpu_time_after_timeout(lambda: terminate_on_timeout(0.5, busy, 2))
+    cpu_sandbox = get_cpu_time_after_timeout(lambda: sandbox.call(0.5, busy, 2))
+    sandbox.close()
+
+    print(f"{'fork server start (ms)':<32} {server_start * 1e3:>10.1f}")
+    print(f"{'worker start (ms)':<32} {min(worker_starts) * 1e3:>10.1f}")
+    print(f"{'call in worker (ms)':<32} {min(calls) * 1e3:>10.3f}")
+    print(f"{'fit in thread (ms)':<32} {min(fits_thread) * 1e3:>10.1f}")
+    print(f"{'fit in sandbox (ms)':<32} {min(fits_sandbox) * 1e3:>10.1f}")
+    print(f"{'CPU after timeout, thread (s)':<32} {cpu_thread:>10.2f}")
+    print(f"{'CPU after timeout, sandbox (s)':<32} {cpu_sandbox:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
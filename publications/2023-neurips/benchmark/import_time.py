@@ -0,0 +1,94 @@
+"""Benchmark of the time spent importing modules by each subcommand of ``lcdb`` with ``python -X importtime``.
+
+Each subcommand is run in a new interpreter: with ``--help`` only the parser is created, while ``space`` also reads
+the config space of a workflow. The import time is the sum of the cumulative times of the top-level imports, the
+heavy packages imported (e.g., ``sklearn``, ``deephyper``) are listed. With ``--check``, the script fails if the help
+of a subcommand imports a heavy package, so that it can be used as a regression test.
+
+Usage:
+
+    python benchmark/import_time.py --repeat 3 --check
+"""
+import argparse
+import subprocess
+import sys
+
+# Packages which must not be imported to create the parser of the command line
+HEAVY_PACKAGES = [
+    "ConfigSpace",
+    "deephyper",
+    "keras",
+    "matplotlib",
+    "openml",
+    "pandas",
+    "sklearn",
+    "tensorflow",
+    "xgboost",
+]
+
+COMMANDS = {
+    "lcdb --help": ["--help"],
+    **{
+        f"lcdb {name} --help": [name, "--help"]
+        for name in ["init", "space", "create", "fetch", "test", "run", "add", "rescore", "trace", "results", "plot"]
+    },
+    "lcdb space": ["space", "-w", "lcdb.workflow.sklearn.LibLinearWorkflow"],
+    "lcdb space (xgboost)": ["space", "-w", "lcdb.workflow.xgboost.XGBoostWorkflow"],
+}
+
+
+def measure(argv: list) -> tuple:
+    """Runs ``lcdb`` with the arguments in a new interpreter and returns the import time in seconds and the top-level
+    packages imported."""
+    code = (
+        "import sys\n"
+        f"sys.argv = ['lcdb'] + {argv!r}\n"
+        "from lcdb.cli._cli import main\n"
+        "try:\n"
+        "    main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    total = 0
+    packages = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            # header line
+            continue
+        packages.add(name.strip().split(".")[0])
+        # the top-level imports are not indented
+        if name[1:2] != " ":
+            total += int(cumulative)
+    return total / 1e6, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", default=False)
+    args = parser.parse_args()
+
+    print(f"{'command':<28} {'imports (ms)':>13}  heavy packages")
+    failed = []
+    for command, argv in COMMANDS.items():
+        measures = [measure(argv) for _ in range(args.repeat)]
+        duration = min(m[0] for m in measures)
+        heavy = sorted(set(HEAVY_PACKAGES) & measures[0][1])
+        print(f"{command:<28} {duration * 1e3:>13.0f}  {', '.join(heavy)}")
+        if args.check and "--help" in argv and len(heavy) > 0:
+            failed.append(command)
+
+    if failed:
+        sys.exit(f"Heavy packages are imported by: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
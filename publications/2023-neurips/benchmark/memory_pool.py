@@ -0,0 +1,74 @@
+"""Microbenchmark of ``lcdb.builder.pool.MemoryLimitedPool`` compared to ``terminate_on_memory_exceeded``.
+
+The overhead per job is measured with a job returning immediately, the first job of the pool (which starts the fork
+server) is reported separately. The peak memory reported for a job allocating an array for a short time (shorter than
+the interval of the measures) shows if the spike is missed by the measures of the resident set size.
+
+Usage:
+
+    python benchmark/memory_pool.py --jobs 20 --spike 500
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from lcdb.builder.pool import MemoryLimitedPool
+from lcdb.builder.utils import terminate_on_memory_exceeded
+
+MEMORY_TRACING_INTERVAL = 0.1
+
+
+def spike(size: int, duration: float = 0.3) -> float:
+    """Allocates ``size`` bytes for a few milliseconds then waits ``duration`` seconds."""
+    array = np.ones(size // 8)
+    del array
+    time.sleep(duration)
+    return 0.0
+
+
+def run_executor(func, *args):
+    return terminate_on_memory_exceeded(-1, MEMORY_TRACING_INTERVAL, False, func, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--spike", type=int, default=500, help="Size of the spike (MBs).")
+    args = parser.parse_args()
+
+    pool = MemoryLimitedPool(-1, memory_tracing_interval=MEMORY_TRACING_INTERVAL)
+
+    timestamp_start = time.perf_counter()
+    pool.run(os.getpid)
+    first_job = time.perf_counter() - timestamp_start
+
+    durations = {"executor": [], "pool": []}
+    for _ in range(args.jobs):
+        for name, run in [("executor", run_executor), ("pool", pool.run)]:
+            timestamp_start = time.perf_counter()
+            run(os.getpid)
+            durations[name].append(time.perf_counter() - timestamp_start)
+
+    size = args.spike * 1024**2
+    baseline = {
+        "executor": run_executor(spike, 0)["metadata"]["memory"],
+        "pool": pool.run(spike, 0)["metadata"]["memory"],
+    }
+    peaks = {
+        "executor": run_executor(spike, size)["metadata"]["memory"],
+        "pool": pool.run(spike, size)["metadata"]["memory"],
+    }
+    pool.close()
+
+    print(f"{'first job of the pool (ms)':<36} {first_job * 1e3:>10.1f}")
+    for name in durations:
+        print(f"{f'job, {name} (ms)':<36} {np.median(durations[name]) * 1e3:>10.1f}")
+    for name in peaks:
+        spike_measured = (peaks[name] - baseline[name]) / 1024**2
+        print(f"{f'spike of {args.spike} MB, {name} (MB)':<36} {spike_measured:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
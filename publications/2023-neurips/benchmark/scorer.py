@@ -0,0 +1,253 @@
+"""Benchmark of ``lcdb.builder.scorer.ClassificationScorer`` against the previous implementation calling
+``sklearn.metrics`` for each metric (``SklearnClassificationScorer`` below).
+
+The predictions are random with ties (the probabilities are rounded as for trees and ensembles). Before timing, the
+scores of both implementations are checked to be the same. The time is per call of ``score``, i.e., per split of an
+anchor or per scored epoch of an iterative learner. The last column is the time per epoch when the predictions of
+``--epochs`` epochs are scored at once with ``score_many``.
+
+Usage:
+
+    python benchmark/scorer.py --instances 1000 10000 --classes 2 5 20 --epochs 20
+"""
+import argparse
+import time
+from itertools import product
+
+import numpy as np
+from sklearn.metrics import (
+    brier_score_loss,
+    confusion_matrix,
+    log_loss,
+    roc_auc_score,
+)
+
+from lcdb.builder.scorer import ClassificationScorer
+from lcdb.builder.timer import Timer
+
+
+class SklearnClassificationScorer(ClassificationScorer):
+    """Previous implementation of ``ClassificationScorer.score``."""
+
+    def score(self, y_true, y_pred, y_pred_proba):
+
+        # make sure that y_predict_proba is a matrix over all known labels (not only the ones known to the learner)
+        if len(self.padded_classes) > 0:
+            expansion_matrix = np.zeros(
+                (len(y_true), len(self.padded_classes))
+            )
+            y_pred_proba = np.concatenate([y_pred_proba, expansion_matrix], axis=1)
+            y_pred_proba = y_pred_proba[:, self.reordering_index]
+
+        labels_in_ground_truth = sorted(np.unique(y_true))
+        num_labels_in_ground_truth = len(labels_in_ground_truth)
+        is_unary = num_labels_in_ground_truth == 1
+        is_binary = num_labels_in_ground_truth == 2
+
+        metric_names = [
+            "confusion_matrix",
+            "auc",
+            "log_loss",
+            "brier_score",
+        ]
+
+        scores = {}
+
+        for metric_name in metric_names:
+            with self.timer.time(metric_name) as metric_timer:
+                score = None
+
+                if metric_name == "confusion_matrix":
+                    score = np.round(
+                        confusion_matrix(y_true, y_pred, labels=self.classes_overall), 5
+                    ).tolist()
+
+                elif metric_name == "auc":
+                    if is_unary:
+                        score = np.nan  # AUC not defined for single class problems
+                    elif is_binary:
+                        score = np.round(
+                            roc_auc_score(
+                                y_true, y_pred_proba[:, 1], labels=self.classes_overall
+                            ),
+                            5,
+                        )
+                    else:
+
+                        # if the learner has a superset of the ground truth labels, only use the ground truth labels
+                        if set(y_true).issubset(set(self.classes_learner)):
+                            accepted_labels = labels_in_ground_truth
+
+                        # otherwise use all the labels that are either present in ground truth or in the predictions
+                        else:
+                            accepted_labels = [
+                                l for i, l in enumerate(self.classes_overall)
+                                if (
+                                    l in y_true or
+                                    y_pred_proba[:, i].sum() > 0
+                                )
+                            ]
+
+                        # generate a proper distribution over the remaining labels
+                        mask_labels_auc = np.isin(self.classes_overall, accepted_labels)
+                        y_pred_proba_auc = y_pred_proba[:, mask_labels_auc]
+                        if num_labels_in_ground_truth != len(self.classes_learner):
+                            y_pred_proba_auc /= y_pred_proba_auc.sum(axis=1, keepdims=1)
+
+                        # compute the different AUC scores
+                        score = {}
+                        for multi_class, average in product(
+                            ["ovr", "ovo"], ["micro", "macro", "weighted", None]
+                        ):
+                            if average in [None, "micro"] and multi_class != "ovr":
+                                continue
+                            try:
+                                auc = np.round(
+                                    roc_auc_score(
+                                        y_true=y_true,
+                                        y_score=y_pred_proba_auc,
+                                        labels=accepted_labels,
+                                        multi_class=multi_class,
+                                        average=average,
+                                    ),
+                                    5,
+                                )
+                            except ValueError as e:
+                                if "Only one class present in y_true." in str(e):
+                                    auc = np.nan
+                                else:
+                                    raise e
+
+                            score[f"auc_{multi_class}_{average}"] = auc
+                elif metric_name == "log_loss":
+                    y_base = y_pred_proba[:, 1] if is_binary else y_pred_proba
+                    score = np.round(
+                        log_loss(y_true, y_base, labels=self.classes_overall), 5
+                    )
+                elif metric_name == "brier_score":
+                    if is_binary:
+                        score = np.round(
+                            brier_score_loss(
+                                y_true, y_pred_proba[:, 1], pos_label=self.classes_overall[1]
+                            ),
+                            5,
+                        )
+                    else:
+                        y_true_binarized = np.zeros((len(y_true), len(self.classes_overall)))
+                        for j, label in enumerate(self.classes_overall):
+                            mask = y_true == label
+                            y_true_binarized[mask, j] = 1
+                        score = np.round(
+                            ((y_true_binarized - y_pred_proba) ** 2).sum(axis=1).mean(),
+                            5,
+                        )
+
+                metric_timer["value"] = score
+
+                scores[metric_name] = score
+        return scores
+
+
+def get_predictions(
+    num_instances: int, num_classes: int, num_missing: int, decimals: int, seed: int, num_epochs: int = 1
+):
+    """Returns random predictions of ``num_epochs`` epochs (stacked) of a learner which does not know the last
+    ``num_missing`` classes."""
+    rng = np.random.default_rng(seed)
+    classes_overall = list(range(num_classes))
+    classes_learner = classes_overall[: num_classes - num_missing]
+
+    y_true = rng.integers(num_classes, size=num_instances)
+    y_pred_proba = rng.dirichlet(np.ones(len(classes_learner)), size=(num_epochs, num_instances))
+    y_pred_proba = np.round(y_pred_proba, decimals)
+    y_pred_proba /= y_pred_proba.sum(axis=2, keepdims=True)
+    y_pred = np.asarray(classes_learner)[np.argmax(y_pred_proba, axis=2)]
+    return classes_learner, classes_overall, y_true, y_pred, y_pred_proba
+
+
+def assert_same_scores(scores, expected_scores):
+    if isinstance(expected_scores, dict):
+        assert scores.keys() == expected_scores.keys(), (scores.keys(), expected_scores.keys())
+        for key in expected_scores:
+            assert_same_scores(scores[key], expected_scores[key])
+    else:
+        np.testing.assert_array_equal(scores, expected_scores)
+
+
+def get_scorer(scorer_class, classes_learner: list, classes_overall: list) -> ClassificationScorer:
+    timer = Timer()
+    timer.start("metrics")
+    return scorer_class(classes_learner, classes_overall, timer=timer)
+
+
+def benchmark(scorer_class, predictions, repeat: int) -> float:
+    classes_learner, classes_overall, y_true, y_pred, y_pred_proba = predictions
+    durations = []
+    for _ in range(repeat):
+        scorer = get_scorer(scorer_class, classes_learner, classes_overall)
+        t_start = time.perf_counter()
+        scorer.score(y_true, y_pred[0], y_pred_proba[0])
+        durations.append(time.perf_counter() - t_start)
+    return min(durations)
+
+
+def benchmark_many(predictions, repeat: int) -> float:
+    """Returns the time per epoch of ``score_many``."""
+    classes_learner, classes_overall, y_true, y_pred, y_pred_proba = predictions
+    durations = []
+    for _ in range(repeat):
+        scorer = get_scorer(ClassificationScorer, classes_learner, classes_overall)
+        parents = [scorer.timer.active_node] * len(y_pred)
+        t_start = time.perf_counter()
+        scorer.score_many(y_true, y_pred, y_pred_proba, parents)
+        durations.append(time.perf_counter() - t_start)
+    return min(durations) / len(y_pred)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--instances", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--classes", type=int, nargs="+", default=[2, 5, 20])
+    parser.add_argument("--missing", type=int, default=0, help="number of classes unknown to the learner")
+    parser.add_argument("--decimals", type=int, default=2, help="decimals of the probabilities (for ties)")
+    parser.add_argument("--epochs", type=int, default=20, help="number of epochs scored with score_many")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'instances':>10} {'classes':>8} {'sklearn (ms)':>13} {'scorer (ms)':>12} {'speedup':>8} "
+        f"{'score_many (ms/epoch)':>22}"
+    )
+    for num_instances, num_classes in product(args.instances, args.classes):
+        predictions = get_predictions(
+            num_instances, num_classes, args.missing, args.decimals, seed=0, num_epochs=args.epochs
+        )
+        classes_learner, classes_overall, y_true, y_pred, y_pred_proba = predictions
+        expected_scores = [
+            get_scorer(SklearnClassificationScorer, classes_learner, classes_overall).score(
+                y_true, y_pred[i], y_pred_proba[i]
+            )
+            for i in range(len(y_pred))
+        ]
+        assert_same_scores(
+            get_scorer(ClassificationScorer, classes_learner, classes_overall).score(y_true, y_pred[0], y_pred_proba[0]),
+            expected_scores[0],
+        )
+        scorer = get_scorer(ClassificationScorer, classes_learner, classes_overall)
+        for scores, expected in zip(
+            scorer.score_many(y_true, y_pred, y_pred_proba, [scorer.timer.active_node] * len(y_pred)),
+            expected_scores,
+        ):
+            assert_same_scores(scores, expected)
+
+        t_sklearn = benchmark(SklearnClassificationScorer, predictions, args.repeat)
+        t_scorer = benchmark(ClassificationScorer, predictions, args.repeat)
+        t_many = benchmark_many(predictions, args.repeat)
+        print(
+            f"{num_instances:>10} {num_classes:>8} {t_sklearn * 1000:>13.2f} "
+            f"{t_scorer * 1000:>12.2f} {t_sklearn / t_scorer:>8.1f} {t_many * 1000:>22.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark of fitting a workflow on a high-cardinality categorical dataset with a dense or a sparse (CSR) output of
+its pre-processing.
+
+For each number of categories, a dataset with a few numeric columns and a categorical column is one-hot encoded by
+the pre-processing of the workflow. Each path is forced through ``SPARSE_MIN_DENSE_BYTES``, the time to fit and predict
+and the peak memory are reported for each path with the path chosen by default and the largest absolute difference
+between the predicted probabilities.
+
+Usage:
+
+    python benchmark/sparse_path.py --rows 20000 --categories 100 1000 10000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from lcdb.builder.resources import get_peak_rss, reset_peak_rss
+from lcdb.builder.timer import Timer
+from lcdb.workflow import _preprocessing_workflow
+from lcdb.workflow.sklearn import LibLinearWorkflow
+
+
+def get_data(num_rows: int, num_categories: int, num_numeric: int, seed: int = 42):
+    """Returns the ``(X, y)`` arrays and metadata of a dataset with ``num_numeric`` numeric columns and a categorical
+    column of ``num_categories`` categories."""
+    rng = np.random.RandomState(seed)
+    X_num = rng.randn(num_rows, num_numeric)
+    codes = rng.randint(0, num_categories, num_rows)
+    X = np.empty((num_rows, num_numeric + 1), dtype=object)
+    X[:, :num_numeric] = X_num
+    X[:, num_numeric] = np.array([f"c{i}" for i in range(num_categories)])[codes]
+    y = np.where(X_num[:, 0] + (codes % 2) > 0.5, "a", "b")
+    metadata = {
+        "type": "classification",
+        "num_classes": 2,
+        "categories": {"columns": [False] * num_numeric + [True]},
+    }
+    return X, y, metadata
+
+
+def run(X, y, metadata, config):
+    """Fits the workflow and predicts the instances, returns the probabilities, the duration and the peak memory."""
+    reset_peak_rss()
+    timestamp_start = time.perf_counter()
+    timer = Timer()
+    timer.start("run")
+    workflow = LibLinearWorkflow(timer=timer, **config)
+    workflow.fit(X, y, X[:1], y[:1], X[:1], y[:1], metadata)
+    y_pred_proba = workflow.predict_proba(X)
+    duration = time.perf_counter() - timestamp_start
+    return y_pred_proba, workflow.sparse_transform, duration, get_peak_rss(os.getpid())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--categories", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--numeric", type=int, default=5)
+    args = parser.parse_args()
+
+    config = {"pp@cat_encoder": "onehot", "pp@scaler": "none"}
+    min_dense_bytes = _preprocessing_workflow.SPARSE_MIN_DENSE_BYTES
+
+    print(
+        f"{'categories':>10} {'default':>8} {'dense (s)':>10} {'dense (MB)':>11} {'sparse (s)':>11} "
+        f"{'sparse (MB)':>12} {'max diff':>9}"
+    )
+    for num_categories in args.categories:
+        X, y, metadata = get_data(args.rows, num_categories, args.numeric)
+
+        workflow = LibLinearWorkflow(**config)
+        default_path = "sparse" if workflow.use_sparse_transform(X, metadata, **workflow.pp_kws) else "dense"
+
+        _preprocessing_workflow.SPARSE_MIN_DENSE_BYTES = float("inf")
+        y_dense, _, dense_duration, dense_peak = run(X, y, metadata, config)
+
+        _preprocessing_workflow.SPARSE_MIN_DENSE_BYTES = 0
+        y_sparse, _, sparse_duration, sparse_peak = run(X, y, metadata, config)
+
+        _preprocessing_workflow.SPARSE_MIN_DENSE_BYTES = min_dense_bytes
+        print(
+            f"{num_categories:>10} {default_path:>8} {dense_duration:>10.2f} {dense_peak / 1024**2:>11.0f} "
+            f"{sparse_duration:>11.2f} {sparse_peak / 1024**2:>12.0f} {np.abs(y_dense - y_sparse).max():>9.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
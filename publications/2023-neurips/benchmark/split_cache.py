@@ -0,0 +1,85 @@
+"""Benchmark of the split of a task with ``train_valid_test_split`` against the split indices of the dataset cache.
+
+For each number of rows, the ``synthetic.<spec>`` task is generated in a temporary dataset cache. The time to split
+the dataset with ``train_valid_test_split`` (which copies the training, validation and test sets) is compared with the
+time to compute and store the indices of the split with ``load_split_indices``, to read them from the cache and to
+build the ``DatasetSplits`` of a job from them (which only copies the validation and test sets).
+
+Usage:
+
+    python benchmark/split_cache.py --rows 1e4 1e5 1e6 --features 20 --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from lcdb.builder.cache import DatasetSplits
+from lcdb.data import load_task
+from lcdb.data.split import load_split_indices, train_valid_test_split
+
+
+def get_duration(function, repeat: int) -> float:
+    """Returns the median duration of ``repeat`` calls of ``function`` in seconds."""
+    durations = []
+    for _ in range(repeat):
+        timestamp_start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - timestamp_start)
+    return float(np.median(durations))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=float, nargs="+", default=[1e4, 1e5, 1e6])
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--classes", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>10} {'split (ms)':>11} {'write (ms)':>11} {'read (ms)':>10} {'splits (ms)':>12} {'identical':>10}"
+    )
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["LCDB_DATASET_CACHE"] = cache_dir
+        for rows in args.rows:
+            task_id = f"synthetic.rows={int(rows)},features={args.features},classes={args.classes}"
+            (X, y), metadata = load_task(task_id)
+            split_kwargs = dict(test_seed=42, valid_seed=42, test_prop=0.1, valid_prop=0.1, stratify=True)
+
+            split_duration = get_duration(lambda: train_valid_test_split(X, y, **split_kwargs), args.repeat)
+
+            timestamp_start = time.perf_counter()
+            load_split_indices(task_id, y, **split_kwargs)
+            write_duration = time.perf_counter() - timestamp_start
+
+            read_duration = get_duration(lambda: load_split_indices(task_id, y, **split_kwargs), args.repeat)
+            splits_duration = get_duration(
+                lambda: DatasetSplits(
+                    X,
+                    y,
+                    metadata["categories"],
+                    split_kwargs["test_seed"],
+                    split_kwargs["valid_seed"],
+                    indices=load_split_indices(task_id, y, **split_kwargs),
+                ),
+                args.repeat,
+            )
+
+            X_train, X_valid, X_test, y_train, y_valid, y_test = train_valid_test_split(X, y, **split_kwargs)
+            train, valid, test = load_split_indices(task_id, y, **split_kwargs)
+            identical = all(
+                np.array_equal(a, b)
+                for a, b in [(X_train, X[train]), (X_valid, X[valid]), (X_test, X[test]), (y_train, y[train])]
+            )
+
+            print(
+                f"{int(rows):>10} {split_duration * 1e3:>11.1f} {write_duration * 1e3:>11.1f} "
+                f"{read_duration * 1e3:>10.2f} {splits_duration * 1e3:>12.1f} {str(identical):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
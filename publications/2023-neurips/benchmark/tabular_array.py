@@ -0,0 +1,104 @@
+"""Benchmark of the memory and latency of the ``TabularArray`` returned by ``load_task`` against the object array of
+the values of the data frame of the task.
+
+For each task, the size of both representations is reported with the median time to gather the rows of an anchor,
+to check for missing values (``pd.isnull`` on the object array) and to fit and apply the default pre-processing of
+``LibLinearWorkflow`` (one-hot encoding) on the anchor. The tasks from OpenML must be in the cache of ``openml``
+(e.g., after ``lcdb fetch``) or are downloaded, synthetic tasks can be used without network access.
+
+Usage:
+
+    python benchmark/tabular_array.py --task-ids openml.1111 openml.41162 openml.42734 --anchor 10000
+    python benchmark/tabular_array.py --task-ids "synthetic.rows=100000,features=200,categorical=0.3"
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from lcdb.data import TabularArray, load_task
+from lcdb.workflow.sklearn import LibLinearWorkflow
+
+
+def get_nbytes(X) -> int:
+    """Returns the size of an array in bytes, including the objects of an object array."""
+    if isinstance(X, TabularArray):
+        return X.nbytes
+    if X.dtype != object:
+        return X.nbytes
+    return X.nbytes + sum(sys.getsizeof(v) for v in X.flat)
+
+
+def get_duration(function, repeat: int) -> float:
+    """Returns the median duration of ``repeat`` calls of ``function`` in seconds."""
+    durations = []
+    for _ in range(repeat):
+        timestamp_start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - timestamp_start)
+    return float(np.median(durations))
+
+
+def preprocess(X, y, metadata):
+    """Fits the default pre-processing of ``LibLinearWorkflow`` on ``X`` and transforms ``X`` (in ``float32`` as in the
+    workflow)."""
+    workflow = LibLinearWorkflow(**{"pp@cat_encoder": "onehot", "pp@scaler": "none"})
+    pipeline = workflow.get_pp_pipeline(X, y, metadata, **workflow.pp_kws)
+    return pipeline.fit(X, y).transform(X).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--task-ids", type=str, nargs="+", default=["openml.1111", "openml.41162", "openml.42734"])
+    parser.add_argument("--anchor", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'task':<24} {'shape':>14} {'object (MB)':>12} {'typed (MB)':>11} "
+        f"{'rows (ms)':>16} {'missing (ms)':>16} {'pre-processing (ms)':>20}"
+    )
+    for task_id in args.task_ids:
+        (X, y), metadata = load_task(task_id, use_cache=False)
+        if not isinstance(X, TabularArray):
+            print(f"{task_id:<24} has no categorical columns, skipped.")
+            continue
+        X_object = np.asarray(X)
+        metadata = dict(metadata, categories={"columns": [c["kind"] == "categorical" for c in X.columns]})
+
+        rng = np.random.RandomState(42)
+        indices = np.sort(rng.choice(X.shape[0], min(args.anchor, X.shape[0]), replace=False))
+        X_anchor, X_object_anchor, y_anchor = X[indices], X_object[indices], y[indices]
+        assert np.array_equal(
+            preprocess(X_anchor, y_anchor, metadata), preprocess(X_object_anchor, y_anchor, metadata), equal_nan=True
+        )
+
+        durations = []
+        for arrays in [(X, X_anchor), (X_object, X_object_anchor)]:
+            durations.append(
+                [
+                    get_duration(lambda: arrays[0][indices], args.repeat),
+                    get_duration(
+                        lambda: arrays[1].has_missing_values()
+                        if isinstance(arrays[1], TabularArray)
+                        else np.any(pd.isnull(arrays[1])),
+                        args.repeat,
+                    ),
+                    get_duration(lambda: preprocess(arrays[1], y_anchor, metadata), args.repeat),
+                ]
+            )
+
+        print(
+            f"{task_id[:24]:<24} {str(X.shape):>14} {get_nbytes(X_object) / 1024**2:>12.1f} "
+            f"{get_nbytes(X) / 1024**2:>11.1f} "
+            + " ".join(
+                f"{durations[1][i] * 1e3:>7.1f} -> {durations[0][i] * 1e3:>5.1f}".rjust(width)
+                for i, width in enumerate([16, 16, 20])
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Microbenchmark of the overhead per node of ``lcdb.builder.timer.Timer``.
+
+The tree recorded mimics an iteration curve (e.g., the callbacks of the Keras and XGBoost workflows): for each epoch,
+a node with a few metric children is created. The overhead per node is the total time divided by the number of
+nodes created. The export is measured both as a JSON tree (``as_json``, stored in ``m:json``) and as a serialized
+table of nodes (``as_table().serialize()``, stored in ``m:table``), with the size of each in the results.
+
+With ``--log-level INFO``, the logging is configured as in ``lcdb run`` (where the log file is at the ``INFO`` level).
+
+Usage:
+
+    python benchmark/timer_overhead.py --epochs 10000 --log-level INFO
+"""
+import argparse
+import logging
+import os
+import time
+
+from lcdb.builder.timer import Timer
+
+METRICS = ["confusion_matrix", "auc", "log_loss", "brier_score"]
+
+
+def record_start_stop(timer: Timer, epochs: int):
+    for i in range(epochs):
+        timer.start("epoch", metadata={"value": i})
+        for metric in METRICS:
+            timer.start(metric)
+            timer.stop()
+        timer.stop()
+
+
+def record_context_manager(timer: Timer, epochs: int):
+    for i in range(epochs):
+        with timer.time("epoch", metadata={"value": i}):
+            for metric in METRICS:
+                with timer.time(metric) as node:
+                    node["value"] = 0.0
+
+
+def record_cancel(timer: Timer, epochs: int):
+    for i in range(epochs):
+        with timer.time("epoch", metadata={"value": i}):
+            # a deep stack makes the lookup of the canceled node more expensive
+            node_ids = [timer.start(f"level_{j}") for j in range(10)]
+            timer.cancel(node_ids[0])
+
+
+SCENARIOS = {
+    "start_stop": (record_start_stop, 1 + len(METRICS)),
+    "context_manager": (record_context_manager, 1 + len(METRICS)),
+    "cancel": (record_cancel, 11),
+}
+
+
+def benchmark(scenario: str, epochs: int, repeat: int) -> dict:
+    record, nodes_per_epoch = SCENARIOS[scenario]
+    num_nodes = epochs * nodes_per_epoch + 1
+
+    record_durations = []
+    export_durations = []
+    table_durations = []
+    for _ in range(repeat):
+        timer = Timer(precision=4)
+        t_start = time.perf_counter()
+        timer.start("run")
+        record(timer, epochs)
+        timer.stop()
+        t_end = time.perf_counter()
+        tree = timer.as_json()
+        t_export = time.perf_counter()
+        table = timer.as_table().serialize()
+        t_table = time.perf_counter()
+
+        record_durations.append(t_end - t_start)
+        export_durations.append(t_export - t_end)
+        table_durations.append(t_table - t_export)
+
+    return {
+        "scenario": scenario,
+        "nodes": num_nodes,
+        "record_ns_per_node": min(record_durations) / num_nodes * 1e9,
+        "export_ns_per_node": min(export_durations) / num_nodes * 1e9,
+        "table_ns_per_node": min(table_durations) / num_nodes * 1e9,
+        # the tree is written in the results as the string of the dictionary
+        "json_bytes": len(str(tree)),
+        "table_bytes": len(table),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--epochs", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS)
+    )
+    parser.add_argument("--log-level", type=str, default="WARNING")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=args.log_level,
+        format="%(asctime)s - %(levelname)s - %(filename)s:%(funcName)s - %(message)s",
+        handlers=[logging.FileHandler(os.devnull)],
+    )
+
+    print(
+        f"{'scenario':<16} {'nodes':>8} {'record (ns/node)':>18} {'as_json (ns/node)':>18} "
+        f"{'table (ns/node)':>16} {'json (bytes)':>13} {'table (bytes)':>14}"
+    )
+    for scenario in args.scenarios:
+        result = benchmark(scenario, args.epochs, args.repeat)
+        print(
+            f"{result['scenario']:<16} {result['nodes']:>8} "
+            f"{result['record_ns_per_node']:>18.0f} {result['export_ns_per_node']:>18.0f} "
+            f"{result['table_ns_per_node']:>16.0f} {result['json_bytes']:>13} {result['table_bytes']:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
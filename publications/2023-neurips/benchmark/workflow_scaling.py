@@ -0,0 +1,71 @@
+"""Benchmark of ``run_learning_workflow`` on synthetic tasks of increasing size, without network access.
+
+For each number of rows, the ``synthetic.<spec>`` task is generated and written in a temporary dataset cache, then a
+job with the default configuration of the workflow is run in the current process. The time to generate the dataset,
+to load it from the cache and to run the job are reported with the peak resident memory of the job.
+
+Usage:
+
+    python benchmark/workflow_scaling.py --rows 1e3 1e4 1e5 1e6 1e7 --features 20 --categorical 0.2
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from deephyper.evaluator import RunningJob
+
+from lcdb.builder import run_learning_workflow
+from lcdb.builder.resources import get_peak_rss, reset_peak_rss
+from lcdb.data import load_task
+from lcdb.workflow import get_config_space
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=float, nargs="+", default=[1e3, 1e4, 1e5])
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--classes", type=int, default=2)
+    parser.add_argument("--categorical", type=float, default=0.0)
+    parser.add_argument("-w", "--workflow-class", type=str, default="lcdb.workflow.sklearn.LibLinearWorkflow")
+    args = parser.parse_args()
+
+    config = dict(get_config_space(args.workflow_class).get_default_configuration())
+
+    print(f"{'rows':>10} {'generate (s)':>13} {'load (s)':>9} {'job (s)':>9} {'peak (MB)':>10}  objective")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["LCDB_DATASET_CACHE"] = cache_dir
+        for rows in args.rows:
+            task_id = (
+                f"synthetic.rows={int(rows)},features={args.features},classes={args.classes},"
+                f"categorical={args.categorical}"
+            )
+
+            timestamp_start = time.perf_counter()
+            load_task(task_id)
+            generate_duration = time.perf_counter() - timestamp_start
+
+            timestamp_start = time.perf_counter()
+            load_task(task_id)
+            load_duration = time.perf_counter() - timestamp_start
+
+            reset_peak_rss()
+            timestamp_start = time.perf_counter()
+            output = run_learning_workflow(
+                RunningJob(id=0, parameters=config),
+                task_id=task_id,
+                workflow_class=args.workflow_class,
+                logger=logging.getLogger("LCDB"),
+            )
+            job_duration = time.perf_counter() - timestamp_start
+            peak = get_peak_rss(os.getpid())
+
+            print(
+                f"{int(rows):>10} {generate_duration:>13.2f} {load_duration:>9.3f} {job_duration:>9.2f} "
+                f"{peak / 1024**2:>10.0f}  {output['objective']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Export of the trees of the ``Timer`` in the Chrome trace event format.
+
+The traces can be opened in ``chrome://tracing`` or in `Perfetto <https://ui.perfetto.dev>`_. Each node of a tree is a
+span (complete event) nested in the span of its parent and the metadata of the node are the arguments of its span.
+Each job is displayed as a process so that several jobs can be overlaid.
+
+Example use:
+
+>>> trace = get_chrome_trace([tree_1, tree_2], names=["job 1", "job 2"])
+>>> write_chrome_trace("trace.json", trace)
+"""
+import math
+
+import lcdb.json
+
+from ..builder.node_table import NodeTable
+from ..builder.timer import Timer
+
+# Timestamps of the trace events are in microseconds
+MICROSECONDS = 1_000_000
+
+
+def as_tree(source) -> dict:
+    """Returns the tree (as given by ``Timer.as_json``) of a ``Timer``, a ``NodeTable``, a serialized ``NodeTable`` or a tree."""
+    if isinstance(source, Timer):
+        return source.as_json()
+    if isinstance(source, NodeTable):
+        return source.as_dict()
+    if isinstance(source, str):
+        return NodeTable.deserialize(source).as_dict()
+    if isinstance(source, dict):
+        return source
+    raise ValueError(f"Cannot export a source of type {type(source)} as a trace.")
+
+
+def get_trace_args(value):
+    """Returns a copy of metadata where the values which are not valid in JSON (NaN, infinity) are strings."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return str(value)
+    if isinstance(value, dict):
+        return {k: get_trace_args(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [get_trace_args(v) for v in value]
+    return value
+
+
+def get_trace_events(tree: dict, pid: int = 0, timestamp_offset: float = 0) -> list:
+    """Returns the trace events of the spans of a tree.
+
+    The spans of the children of a node are on the thread of the node. Children which overlap each other (e.g., anchors
+    built in parallel) are moved to new threads, they would not be displayed properly otherwise.
+
+    Args:
+        tree (dict): the tree (as given by ``Timer.as_json``).
+        pid (int, optional): the process of the events. Defaults to ``0``.
+        timestamp_offset (float, optional): offset in seconds added to the timestamps of the tree. Defaults to ``0``.
+
+    Returns:
+        list: the trace events.
+    """
+    events = []
+    num_threads = 1
+    nodes = [(tree, 0)]
+    while nodes:
+        node, tid = nodes.pop()
+
+        start = node["timestamp_start"] + timestamp_offset
+        stop = node["timestamp_stop"] + timestamp_offset
+        event = {
+            "name": str(node["tag"]),
+            "ph": "X",
+            "ts": round(start * MICROSECONDS, 3),
+            "dur": round((stop - start) * MICROSECONDS, 3),
+            "pid": pid,
+            "tid": tid,
+            "args": get_trace_args(node.get("metadata", {})),
+        }
+        if "cancellation_source_id" in node:
+            event["cat"] = "canceled"
+            event["args"]["cancellation_source_id"] = node["cancellation_source_id"]
+        events.append(event)
+
+        # end of the last span of each thread used by the children
+        threads_end = {tid: None}
+        children = []
+        for child in node.get("children", []):
+            child_tid = None
+            for candidate, end in threads_end.items():
+                if end is None or end <= child["timestamp_start"]:
+                    child_tid = candidate
+                    break
+            if child_tid is None:
+                child_tid = num_threads
+                num_threads += 1
+            threads_end[child_tid] = child["timestamp_stop"]
+            children.append((child, child_tid))
+        nodes.extend(reversed(children))
+
+    return events
+
+
+def get_chrome_trace(sources: list, names: list = None, timestamp_offsets: list = None) -> dict:
+    """Returns the Chrome trace of several jobs, each job being displayed as a process.
+
+    Args:
+        sources (list): the trees of the jobs (or any source accepted by ``as_tree``).
+        names (list, optional): the names of the processes of the jobs. Defaults to ``None`` for ``job 0``, ``job 1``, etc.
+        timestamp_offsets (list, optional): the offset in seconds of each job. Defaults to ``None``, i.e., all jobs start at 0 and are overlaid.
+
+    Returns:
+        dict: the trace, which can be written with ``write_chrome_trace``.
+    """
+    if names is None:
+        names = [f"job {i}" for i in range(len(sources))]
+    if timestamp_offsets is None:
+        timestamp_offsets = [0] * len(sources)
+    if not (len(sources) == len(names) == len(timestamp_offsets)):
+        raise ValueError("The number of sources, names and timestamp offsets must be the same.")
+
+    events = []
+    for pid, (source, name, timestamp_offset) in enumerate(zip(sources, names, timestamp_offsets)):
+        events.append(
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": str(name)}}
+        )
+        events.append(
+            {"name": "process_sort_index", "ph": "M", "pid": pid, "args": {"sort_index": pid}}
+        )
+        events.extend(get_trace_events(as_tree(source), pid=pid, timestamp_offset=timestamp_offset))
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(path: str, trace: dict):
+    """Writes a trace returned by ``get_chrome_trace`` in a JSON file."""
+    with open(path, "w") as f:
+        f.write(lcdb.json.dumps(trace))
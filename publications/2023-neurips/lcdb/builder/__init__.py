@@ -1,5 +1,19 @@
-"""Sub-package reponsible of building learning curves for workflows."""
+"""Sub-package reponsible of building learning curves for workflows.
 
-from lcdb.builder._base import run_learning_workflow
+The builder is imported when it is first accessed as it imports ``deephyper``, so that the light modules of this
+sub-package (e.g., ``lcdb.builder.timer``) can be imported alone.
+"""
+import importlib
 
-__all__ = ["run_learning_workflow"]
+__all__ = [
+    "run_learning_workflow",
+    "run_learning_workflows",
+    "run_cached_learning_workflow",
+    "recover_learning_workflow",
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(importlib.import_module("lcdb.builder._base"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
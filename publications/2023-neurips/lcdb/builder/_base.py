@@ -1,31 +1,38 @@
 import functools
+import inspect
+import multiprocessing
+import os
 import numpy as np
 import copy
 import logging
 
 from deephyper.evaluator import RunningJob
-from ..data import load_task
-from .utils import import_attr_from_module
 
 import traceback
 import warnings
 
-from tqdm import tqdm
 
-from ..data.split import train_valid_test_split
-from .timer import Timer
+from .cache import DatasetCache, DatasetSplits
+from .checkpoint import AnchorCheckpoint
+from .predictions import PredictionsRecorder
+from .sandbox import FitSandbox, fit_workflow
+from .sampler import AnchorSampler, EvaluationSampler
+from .timer import Timer, TimerNode, wall_clock_time
 from .utils import (
     FunctionCallTimeoutError,
+    PowerLawCostModel,
     get_schedule,
+    prune_anchors_to_budget,
     terminate_on_timeout,
 )
-from .scorer import ClassificationScorer, RegressionScorer
-from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+from .scorer import ClassificationScorer, MetricSelection, RegressionScorer
+from ..workflow import get_workflow_class
 
 
 def run_learning_workflow(
     job: RunningJob,
     openml_id: int = 3,
+    task_id: str = None,
     task_type: str = "classification",
     workflow_class: str = "lcdb.workflow.sklearn.LibLinearWorkflow",
     monotonic: bool = True,
@@ -35,17 +42,35 @@ def run_learning_workflow(
     valid_prop: float = 0.1,
     test_prop: float = 0.1,
     timeout_on_fit=-1,
+    timeout_isolation: str = "thread",
     known_categories: bool = True,
     raise_errors: bool = False,
     anchor_schedule: str = "power",
+    anchor_budget: float = -1,
+    anchor_cost_prior: list = None,
     epoch_schedule: str = "full",
+    warm_start: bool = False,
+    num_anchor_workers: int = 1,
+    stratify_anchors: bool = False,
+    max_eval_instances: int = -1,
+    predict_chunk_size: int = 10000,
+    predict_num_threads: int = 1,
+    predictions_dir: str = None,
+    checkpoint_dir: str = None,
+    timer_format: str = "json",
+    resource_tags: list = None,
+    tracemalloc_tags: list = None,
+    metrics: list = None,
+    expensive_metrics_scope: list = None,
     logger=None,
+    dataset_cache: DatasetCache = None,
 ):
     """This function trains the workflow on a dataset and returns performance metrics.
 
     Args:
         job (RunningJob): A running job passed by DeepHyper (represent an instance of the function).
         openml_id (int, optional): The identifier of the OpenML dataset. Defaults to 3.
+        task_id (str, optional): The name of the task loaded by `load_task` instead of the OpenML dataset (e.g., `file.data/iris.csv` or `synthetic.rows=1e6,features=20`). Defaults to None, i.e., `openml.<openml_id>`.
         workflow_class (str, optional): The "path" of the workflow to train. Defaults to "lcdb.workflow.sklearn.LibLinearWorkflow".
         monotonic (bool, optional): A boolean indicating if the sample-wise learning curve should be monotonic (i.e., sample set at smaller anchors are always included in sample sets at larger anchors) or not. Defaults to True.
         valid_seed (int, optional): Random state seed of train/validation split. Defaults to 42.
@@ -54,35 +79,69 @@ def run_learning_workflow(
         valid_prop (float, optional): Ratio of validation/(train+validation). Defaults to 0.1.
         test_prop (float, optional): Ratio of test/data . Defaults to 0.1.
         timeout_on_fit (int, optional): Timeout in seconds for the fit method. Defaults to -1 for infinite time.
+        timeout_isolation (str, optional): How the fit is interrupted on timeout. With "thread", the workflow is fitted in a thread which keeps running after the timeout. With "process", the workflow is fitted in a worker process (see `FitSandbox`) which is killed on timeout so that the CPU is reclaimed. The workflow must then be picklable (verified for the scikit-learn and XGBoost workflows, not for DenseNN) and a script calling this function must guard its entry point with `if __name__ == "__main__":`. Processes cannot be used in daemonic processes (e.g., when anchors are built in parallel), threads are then used. Defaults to "thread".
         known_categories (bool, optional): If all the possible categories are assumed to be known in advance. Defaults to True.
         raise_errors (bool, optional): If `True`, then errors are risen to the outside. Otherwise, just a log message is generated. Defaults to False.
-        anchor_schedule (str, optional): A type of schedule for anchors (over samples of the dataset). Defaults to "power".
+        anchor_schedule (str, optional): A type of schedule for anchors (over samples of the dataset). With "budget", the anchors of the "power" schedule are pruned so that the predicted time to build the curves fits in `anchor_budget`. Defaults to "power".
+        anchor_budget (float, optional): Time in seconds to build the curves with the "budget" schedule. The time of each anchor is predicted by a power law (see `PowerLawCostModel`) fitted on `anchor_cost_prior` before the first anchors are built, then on the anchors built by the job. When the anchors are built in parallel, they are only planned with the prior. Defaults to -1.
+        anchor_cost_prior (list, optional): The `(anchor, seconds)` pairs of past results of the workflow used to plan the "budget" schedule (see `get_anchor_costs`). Defaults to None, i.e., all the anchors are planned and pruned while the curves are built.
         epoch_schedule (str, optional): A type of schedule for epochs (over epochs of the dataset). Defaults to "power".
+        warm_start (bool, optional): If `True`, workflows that support it continue their training from the previous anchor instead of being refitted from scratch, which gives other models than the cold fits. The pre-processing fitted at the first anchor is kept (its one-hot encoding covers all the known categories), then PassiveAggressive and Perceptron run a single epoch (`partial_fit`) over the new instances of the anchor (a cold fit runs up to `max_iter` epochs), DenseNN runs `num_epochs` further epochs over the new instances, and XGBoost continues boosting on all the instances of the anchor with its `n_estimators` rounds spread over the anchors in proportion to their size (the last anchor has `n_estimators` rounds in total). If the pre-processing cannot be kept, i.e., the categories or the columns with missing values are not known in advance (e.g., `known_categories=False`), the workflow is refitted from scratch at each anchor. Requires `monotonic=True`. Defaults to False.
+        num_anchor_workers (int, optional): Number of processes used to build the anchors in parallel. Anchors are independent of each other unless `warm_start=True`. Defaults to 1, i.e., anchors are built sequentially.
+        stratify_anchors (bool, optional): If `True`, the class proportions of the training set are preserved in each anchor. Defaults to False.
+        max_eval_instances (int, optional): Maximum number of instances of each split (train, validation, test) on which the predictions are scored. The instances are selected with a stratified sampling seeded by `valid_seed`. Defaults to -1 for no limit.
+        predict_chunk_size (int, optional): Maximum number of instances predicted at once by the workflow, which bounds the memory used for predictions. Defaults to 10000, use -1 to predict all instances at once.
+        predict_num_threads (int, optional): Number of threads predicting chunks concurrently. Only useful for learners releasing the GIL while predicting. Defaults to 1.
+        predictions_dir (str, optional): If given, the labels and probabilities (in `float32`) on which metrics are computed at each anchor and scheduled epoch are saved in a `.npz` file of this directory. The path of the file is returned in the `predictions` entry of the metadata and missing metrics can be computed from it with `lcdb rescore`. Defaults to None, i.e., predictions are not saved.
+        checkpoint_dir (str, optional): If given, each completed anchor is appended to a checkpoint file of this directory identified by the parameters of the job. Anchors found in the checkpoint are not built again when the same job is run again, they are marked with `resumed` in their metadata. Defaults to None, i.e., no checkpoint.
+        timer_format (str, optional): Format of the detailed results of the timer in the metadata. With "json", the tree is returned in the `json` entry. With "table", the table of its nodes (see `NodeTable`) is returned serialized in the `table` entry, which is much smaller. Defaults to "json".
+        resource_tags (list, optional): Tags of the nodes of the timer (e.g., "anchor", "fit", "epoch") for which the CPU time and memory of the process are recorded in their metadata (`cpu_user`, `cpu_system`, `rss_start`, `rss_stop`, `max_rss_delta`, `major_faults`). Defaults to None.
+        tracemalloc_tags (list, optional): Tags of the nodes of the timer for which the peak of the memory allocated by Python (`alloc_peak`) is also recorded with `tracemalloc`. This slows down the workflow. Defaults to None.
+        metrics (list, optional): Names of the classification metrics computed (see `CLASSIFICATION_METRICS` in `lcdb.builder.scorer`), "log_loss" is required as it is the objective. The selection is returned in the `metrics` entry of the metadata. Defaults to None for all the metrics.
+        expensive_metrics_scope (list, optional): Scopes to which the expensive metrics (e.g., "auc_ovo" whose cost is quadratic in the number of classes) are restricted: "final_anchor", "final_epoch" and/or "val". Defaults to None, i.e., all the metrics are computed for all anchors, epochs and splits.
+        dataset_cache (DatasetCache, optional): Cache of the datasets and splits shared by several jobs (see `run_learning_workflows`). Defaults to None, i.e., the dataset is loaded and split for this job only.
 
     Returns:
         dict: a dictionary with 2 keys (objective, metadata) where objective is the objective maximized by deephyper (if used) and metadata is a JSON serializable sub-dictionnary which are complementary information about the workflow.
     """
+    checkpoint_path = get_checkpoint_path(**locals())
+
+    if timer_format not in TIMER_FORMATS:
+        raise ValueError(
+            f"Timer format must be one of {TIMER_FORMATS} but is {timer_format}."
+        )
+    if timeout_isolation not in TIMEOUT_ISOLATIONS:
+        raise ValueError(
+            f"Timeout isolation must be one of {TIMEOUT_ISOLATIONS} but is {timeout_isolation}."
+        )
+
     logger.info(f"Running job {job.id} with parameters: {job.parameters}")
 
-    timer = Timer(precision=4)
+    timer = Timer(
+        precision=4, resource_tags=resource_tags, tracemalloc_tags=tracemalloc_tags
+    )
     run_timer_id = timer.start("run")
 
     # Load the raw dataset
-    with timer.time("load_task"):
+    task_id, openml_id = get_task(openml_id, task_id)
+    if dataset_cache is None:
+        dataset_cache = DatasetCache()
+    with timer.time("load_task", metadata={"cached": dataset_cache.is_loaded(task_id)}):
         logger.info("Loading the dataset...")
-        (X, y), dataset_metadata = load_task(f"openml.{openml_id}")
+        (X, y), dataset_metadata = dataset_cache.load_task(task_id)
 
     # Create and fit the workflow
     logger.info("Importing the workflow...")
-    WorkflowClass = import_attr_from_module(workflow_class)
+    WorkflowClass = get_workflow_class(workflow_class)
     workflow_kwargs = copy.deepcopy(job.parameters)
     workflow_kwargs["epoch_schedule"] = epoch_schedule
     workflow_kwargs["random_state"] = workflow_seed
-    workflow_factory = lambda: WorkflowClass(timer=timer, **workflow_kwargs)
+    workflow_factory = functools.partial(WorkflowClass, **workflow_kwargs)
 
     # Initialize information to be returned
     infos = {
         "openmlid": openml_id,
+        "task_id": task_id,
         "workflow_seed": workflow_seed,
         "workflow": workflow_class,
     }
@@ -95,12 +154,37 @@ def run_learning_workflow(
     is_classification = task_type == "classification"
     stratify = is_classification
 
+    predictions_recorder = None
+    if predictions_dir is not None:
+        if not is_classification:
+            raise ValueError("Predictions can only be saved for classification tasks.")
+        predictions_recorder = PredictionsRecorder()
+
+    metric_selection = None
+    if is_classification:
+        metric_selection = MetricSelection(metrics=metrics, expensive_scope=expensive_metrics_scope)
+        if "log_loss" not in metric_selection.metrics:
+            raise ValueError("The metric 'log_loss' is the objective and cannot be deselected.")
+    elif metrics is not None or expensive_metrics_scope is not None:
+        raise ValueError("Metrics can only be selected for classification tasks.")
+
+    splits = dataset_cache.get_splits(
+        task_id,
+        test_seed=test_seed,
+        valid_seed=valid_seed,
+        valid_prop=valid_prop,
+        test_prop=test_prop,
+        stratify=stratify,
+        known_categories=known_categories,
+    )
+
     controller = LearningCurveBuilder(
         timer=timer,
         workflow_factory=workflow_factory,
         is_classification=is_classification,
         X=X,
         y=y,
+        splits=splits,
         dataset_metadata=dataset_metadata,
         test_seed=test_seed,
         valid_seed=valid_seed,
@@ -108,12 +192,27 @@ def run_learning_workflow(
         test_prop=test_prop,
         valid_prop=valid_prop,
         timeout_on_fit=timeout_on_fit,
+        timeout_isolation=timeout_isolation,
         known_categories=known_categories,
         stratify=stratify,
         raise_errors=raise_errors,
         anchor_schedule=anchor_schedule,
+        anchor_budget=anchor_budget,
+        anchor_cost_prior=anchor_cost_prior,
+        warm_start=warm_start,
+        num_anchor_workers=num_anchor_workers,
+        stratify_anchors=stratify_anchors,
+        max_eval_instances=max_eval_instances,
+        predict_chunk_size=predict_chunk_size,
+        predict_num_threads=predict_num_threads,
+        predictions_recorder=predictions_recorder,
+        metric_selection=metric_selection,
+        checkpoint=None if checkpoint_path is None else AnchorCheckpoint(checkpoint_path),
     )
 
+    # the builder only keeps the splits of the dataset
+    del X, y, splits
+
     # build the curves
     controller.build_curves()
 
@@ -125,13 +224,186 @@ def run_learning_workflow(
     # update infos based on report
     infos.update(controller.report)
 
-    infos["json"] = timer.as_json()
+    # save the predictions next to the results
+    if predictions_recorder is not None:
+        os.makedirs(predictions_dir, exist_ok=True)
+        infos["predictions"] = os.path.join(predictions_dir, f"predictions_{job.id}.npz")
+        predictions_recorder.save(infos["predictions"])
+
+    infos.update(export_timer(timer, timer_format))
 
     results = {"objective": controller.objective, "metadata": infos}
 
     return results
 
 
+def run_learning_workflows(job_batch: list, dataset_cache: DatasetCache = None, **kwargs) -> list:
+    """Runs a batch of jobs one after the other in the current process (see ``run_learning_workflow``).
+
+    The dataset is loaded and split once for all the jobs of the batch which use the same dataset and seeds, which
+    avoids the overhead of a job for each configuration on small datasets.
+
+    Example use:
+
+    >>> results = run_learning_workflows(
+    ...     [job_1, (job_2, {"workflow_seed": 1})], openml_id=3, logger=logger
+    ... )
+
+    Args:
+        job_batch (list): The jobs to run. Each job is either a ``RunningJob`` or a tuple ``(RunningJob, dict)`` where the dictionary overrides some arguments of ``run_learning_workflow`` for this job (e.g., the seeds).
+        dataset_cache (DatasetCache, optional): The cache of the datasets and splits. Defaults to None, i.e., a new cache is created for the batch.
+        **kwargs: The arguments of ``run_learning_workflow`` shared by all the jobs.
+
+    Returns:
+        list: the result of each job (as returned by ``run_learning_workflow``) in the order of ``job_batch``.
+    """
+    if dataset_cache is None:
+        dataset_cache = DatasetCache()
+
+    results = []
+    for job in job_batch:
+        job_kwargs = dict(kwargs)
+        if isinstance(job, tuple):
+            job, overrides = job
+            job_kwargs.update(overrides)
+
+        try:
+            result = run_learning_workflow(
+                job, dataset_cache=dataset_cache, **job_kwargs
+            )
+        except Exception:
+            # one failing job does not prevent the other jobs of the batch from running
+            if job_kwargs.get("raise_errors", False):
+                raise
+            traceback_str = traceback.format_exc()
+            logger = job_kwargs.get("logger") or logging.getLogger("LCDB")
+            logger.error(f"Error while running job {job.id}: \n{traceback_str}")
+            result = {"objective": "F", "metadata": {"traceback": traceback_str}}
+        results.append(result)
+
+    return results
+
+
+# Datasets and splits kept by the current process for its following jobs (see ``run_cached_learning_workflow``)
+_process_dataset_cache = None
+
+
+def run_cached_learning_workflow(job: RunningJob, **kwargs) -> dict:
+    """Same as ``run_learning_workflow`` but the dataset and its splits are kept by the current process for the
+    following jobs, e.g., the jobs run by a worker of the ``MemoryLimitedPool`` of ``lcdb run``, which use the same
+    dataset and seeds."""
+    global _process_dataset_cache
+    if _process_dataset_cache is None:
+        _process_dataset_cache = DatasetCache()
+    return run_learning_workflow(job, dataset_cache=_process_dataset_cache, **kwargs)
+
+
+# Formats of the timer in the results of run_learning_workflow
+TIMER_FORMATS = ["json", "table"]
+
+# Ways of interrupting the fit of a workflow on timeout (see run_learning_workflow)
+TIMEOUT_ISOLATIONS = ["process", "thread"]
+
+
+def export_timer(timer: Timer, timer_format: str = "json") -> dict:
+    """Returns the entry of the metadata of the results with the tree of ``timer`` in the given format."""
+    if timer_format == "table":
+        return {"table": timer.as_table().serialize()}
+    return {"json": timer.as_json()}
+
+
+# Arguments of run_learning_workflow which do not change the learning curve and are therefore ignored to identify the checkpoint of a job
+CHECKPOINT_IGNORED_ARGUMENTS = [
+    "anchor_budget",
+    "anchor_cost_prior",
+    "timeout_on_fit",
+    "timeout_isolation",
+    "raise_errors",
+    "num_anchor_workers",
+    "predict_chunk_size",
+    "predict_num_threads",
+    "predictions_dir",
+    "checkpoint_dir",
+    "timer_format",
+    "resource_tags",
+    "tracemalloc_tags",
+    "logger",
+    "dataset_cache",
+]
+
+
+def get_task(openml_id: int, task_id: str = None) -> tuple:
+    """Returns the name of the task of a job and its OpenML identifier (``None`` if the task is not from OpenML)
+    given the ``openml_id`` and ``task_id`` arguments of ``run_learning_workflow``."""
+    if task_id is None:
+        return f"openml.{openml_id}", openml_id
+    if task_id.startswith("openml."):
+        return task_id, int(task_id[len("openml.") :])
+    return task_id, None
+
+
+def get_checkpoint_path(job: RunningJob, **kwargs):
+    """Returns the path of the checkpoint of a job given the arguments of ``run_learning_workflow`` or ``None`` if the job is not checkpointed."""
+    arguments = inspect.signature(run_learning_workflow).bind(job, **kwargs)
+    arguments.apply_defaults()
+    arguments = arguments.arguments
+    if arguments["checkpoint_dir"] is None:
+        return None
+
+    parameters = {
+        k: v for k, v in arguments.items() if k not in CHECKPOINT_IGNORED_ARGUMENTS
+    }
+    parameters["job"] = job.parameters
+    parameters["save_predictions"] = arguments["predictions_dir"] is not None
+    return AnchorCheckpoint.get_path(arguments["checkpoint_dir"], parameters)
+
+
+def recover_learning_workflow(output, job: RunningJob, **kwargs):
+    """Returns the partial learning curve of a job that was terminated (e.g., when its memory limit was exceeded) from its checkpoint.
+
+    It takes the same arguments as ``run_learning_workflow`` after the output of the terminated job. If the job has no
+    checkpoint or no anchor was completed, ``output`` is returned. Otherwise, the objective is kept as ``output`` (the
+    job failed) and the metadata contain the anchors of the checkpoint.
+    """
+    checkpoint_path = get_checkpoint_path(job, **kwargs)
+    if checkpoint_path is None:
+        return output
+
+    completed_anchors = AnchorCheckpoint(checkpoint_path).load()
+    if len(completed_anchors) == 0:
+        return output
+
+    timer = Timer(precision=4)
+    timer.start("run")
+    timer.start("build_curves")
+    for anchor in sorted(completed_anchors):
+        entry = completed_anchors[anchor]
+        for key, value in entry["root_metadata"].items():
+            timer.root.metadata.setdefault(key, value)
+        timer.attach(TimerNode.from_dict(entry["node"], precision=timer.precision))
+    timer.stop()
+    timer.stop()
+
+    # the timer only covers the recovered anchors
+    build_curves_node = timer.root.children[0]
+    timer.root.timestamp_start = build_curves_node.timestamp_start = build_curves_node.children[0].timestamp_start
+    timer.root.timestamp_end = build_curves_node.timestamp_end = build_curves_node.children[-1].timestamp_end
+
+    task_id, openml_id = get_task(kwargs.get("openml_id", 3), kwargs.get("task_id"))
+    infos = {
+        "openmlid": openml_id,
+        "task_id": task_id,
+        "workflow_seed": kwargs.get("workflow_seed"),
+        "workflow": kwargs.get("workflow_class"),
+    }
+    infos.update(completed_anchors[max(completed_anchors)]["report"])
+    infos["traceback"] = f"The job was terminated, the completed anchors are recovered from {checkpoint_path}"
+    infos.update(export_timer(timer, kwargs.get("timer_format", "json")))
+
+    objective = output if isinstance(output, str) else "F"
+    return {"objective": objective, "metadata": infos}
+
+
 class LearningCurveBuilder:
 
     def __init__(
@@ -149,12 +421,34 @@ class LearningCurveBuilder:
         stratify=True,
         monotonic=False,
         timeout_on_fit=-1,
+        timeout_isolation: str = "thread",
         known_categories: bool = True,
         raise_errors: bool = False,
         anchor_schedule: str = "power",
+        anchor_budget: float = -1,
+        anchor_cost_prior: list = None,
+        warm_start: bool = False,
+        num_anchor_workers: int = 1,
+        stratify_anchors: bool = False,
+        max_eval_instances: int = -1,
+        predict_chunk_size: int = 10000,
+        predict_num_threads: int = 1,
+        predictions_recorder: PredictionsRecorder = None,
+        metric_selection: MetricSelection = None,
+        checkpoint: AnchorCheckpoint = None,
+        splits: DatasetSplits = None,
         logger=None,
     ):
 
+        if warm_start and not monotonic:
+            raise ValueError("Warm starting workflows requires a monotonic learning curve.")
+        if warm_start and num_anchor_workers > 1:
+            raise ValueError("Anchors depend on each other when warm starting and cannot be built in parallel.")
+        if stratify_anchors and not is_classification:
+            raise ValueError("Anchors can only be stratified for classification tasks.")
+        if anchor_schedule == "budget" and anchor_budget <= 0:
+            raise ValueError("The budget schedule requires a positive anchor budget.")
+
         self.logger = logger if logger is not None else logging.getLogger("LCDB")
 
         self.timer = timer
@@ -162,173 +456,455 @@ class LearningCurveBuilder:
         self.workflow = None
         self.is_classification = is_classification
 
-        self.num_instances = X.shape[0]
-        self.dataset_metadata = dataset_metadata
+        # Splits of the dataset, possibly shared with other builders
+        if splits is None:
+            splits = DatasetSplits(
+                X,
+                y,
+                dataset_metadata["categories"],
+                test_seed,
+                valid_seed,
+                valid_prop=valid_prop,
+                test_prop=test_prop,
+                stratify=stratify,
+                known_categories=known_categories,
+            )
+        self.num_instances = splits.num_instances
+        # the number of instances lets the workflows size their pre-processing on the whole dataset (e.g., sparse or not)
+        self.dataset_metadata = dict(
+            dataset_metadata, categories=splits.categories, num_instances=splits.num_instances
+        )
 
-        self.X = X
-        self.y = y
-        self.labels = list(np.unique(y))
+        self.labels = splits.labels
         self.is_binary = len(self.labels) == 2
-        (
-            self.X_train,
-            self.X_valid,
-            self.X_test,
-            self.y_train,
-            self.y_valid,
-            self.y_test,
-        ) = train_valid_test_split(
-            X, y, test_seed, valid_seed, test_prop, valid_prop, stratify=stratify
-        )
+        # the training instances are gathered from the dataset at each anchor (see ``AnchorSampler``)
+        self.num_train_instances = len(splits.train_indices)
+        self.X_valid, self.X_test = splits.X_valid, splits.X_test
+        self.y_train, self.y_valid, self.y_test = splits.y_train, splits.y_valid, splits.y_test
         self.valid_seed = valid_seed
         self.test_seed = test_seed
         self.monotonic = monotonic
+        self.warm_start = warm_start
+        self.num_anchor_workers = num_anchor_workers
+        self.predict_chunk_size = predict_chunk_size
+        self.predict_num_threads = predict_num_threads
+        self.predictions_recorder = predictions_recorder
+        self.metric_selection = metric_selection
+        self.checkpoint = checkpoint
         self.timeout_on_fit = timeout_on_fit
+        self.timeout_isolation = timeout_isolation
+
+        # worker process in which the workflow is fitted when the fit has a timeout, started by the first fit
+        self.fit_sandbox = None
         self.raise_errors = raise_errors
+        self.anchor_schedule = anchor_schedule
+        self.anchor_budget = anchor_budget
+        # model predicting the time of the anchors, only used by the budget schedule
+        self.anchor_cost_model = None
+        if anchor_schedule == "budget":
+            self.anchor_cost_model = PowerLawCostModel(prior=anchor_cost_prior)
         self.anchors = get_schedule(
-            name=anchor_schedule, n=len(self.X_train), base=2, power=0.5, delay=7
+            name=anchor_schedule,
+            n=self.num_train_instances,
+            base=2,
+            power=0.5,
+            delay=7,
+            budget=anchor_budget,
+            cost_model=self.anchor_cost_model,
+        )
+        self.planned_anchors = list(self.anchors)
+        # anchors built (or resumed) by build_curves
+        self.built_anchors = []
+        self.anchor_sampler = AnchorSampler(
+            splits.X,
+            splits.y,
+            # the samples of the anchors do not depend on the budget
+            anchors=get_schedule(name="power", n=self.num_train_instances, base=2, power=0.5, delay=7)
+            if anchor_schedule == "budget"
+            else self.anchors,
+            monotonic=monotonic,
+            stratify=stratify_anchors,
+            random_state=valid_seed,
+            train_indices=splits.train_indices,
+        )
+
+        # Instances on which the predictions are scored
+        self.evaluation_sampler = EvaluationSampler(
+            max_instances=max_eval_instances,
+            stratify=is_classification,
+            random_state=valid_seed,
+        )
+        self.X_valid_eval, self.y_valid_eval = self.evaluation_sampler.sample(
+            self.X_valid, self.y_valid
+        )
+        self.X_test_eval, self.y_test_eval = self.evaluation_sampler.sample(
+            self.X_test, self.y_test
         )
 
         # state variables
+        self.prev_anchor = None
         self.cur_anchor = None
         self.X_train_at_anchor = None
         self.y_train_at_anchor = None
+        self.X_train_eval_at_anchor = None
+        self.y_train_eval_at_anchor = None
         self.labels_as_used_by_workflow = (
             None  # list of labels, this order is defined by the workflow
         )
         self.curves = None
         self.additional_data_per_anchor = None
 
-        # Transform categorical features
-        columns_categories = np.asarray(dataset_metadata["categories"], dtype=bool)
-        values_categories = None
-
-        dataset_metadata["categories"] = {"columns": columns_categories}
-        if not (np.any(columns_categories)):
-            one_hot_encoder = FunctionTransformer(func=lambda x: x, validate=False)
-        else:
-            dataset_metadata["categories"]["values"] = None
-            one_hot_encoder = OneHotEncoder(
-                drop="first", sparse_output=False
-            )  # TODO: drop "first" could be an hyperparameter
-            one_hot_encoder.fit(X[:, columns_categories])
-            if known_categories:
-                values_categories = one_hot_encoder.categories_
-                values_categories = [v.tolist() for v in values_categories]
-                dataset_metadata["categories"]["values"] = values_categories
-
         # create report
         self.report = {
             "valid_prop": valid_prop,
             "test_prop": valid_prop,
             "monotonic": monotonic,
+            "warm_start": warm_start,
+            "stratify_anchors": stratify_anchors,
+            "max_eval_instances": max_eval_instances,
             "valid_seed": valid_seed,
             "test_seed": test_seed,
             "traceback": None,
         }
+        if metric_selection is not None:
+            self.report["metrics"] = metric_selection.as_dict()
+
+        # predictions of the current anchor whose expensive metrics are restricted to the last anchor, scored if the
+        # budget schedule prunes all the anchors after it (see ``score_deferred_metrics``)
+        self.deferred_scoring = None
 
         self.objective = None
 
     def set_anchor(self, anchor):
-        train_idx = np.arange(self.X_train.shape[0])
-        # If not monotonic, the training set should be shuffled differently for each anchor
-        # so that the training sets of different anchors do not contain eachother
-        i = self.anchors.index(anchor)
-        if not self.monotonic:
-            random_seed_train_shuffle = np.random.RandomState(self.valid_seed).randint(
-                0, 2**32 - 1, size=len(self.anchors)
-            )[i]
-            rs = np.random.RandomState(random_seed_train_shuffle)
-            rs.shuffle(train_idx)
-
-            X_train = self.X_train[train_idx]
-            y_train = self.y_train[train_idx]
-        else:
-            X_train, y_train = self.X_train, self.y_train
-
+        self.prev_anchor = self.cur_anchor
         self.cur_anchor = anchor
-        self.X_train_at_anchor = X_train[:anchor]
-        self.y_train_at_anchor = y_train[:anchor]
+        if self.metric_selection is not None:
+            # the anchors after this one can still be pruned (see ``score_deferred_metrics``)
+            self.metric_selection.final_anchor = anchor == self.anchors[-1]
+        self.deferred_scoring = None
+        self.X_train_at_anchor, self.y_train_at_anchor = self.anchor_sampler.sample(
+            anchor
+        )
+        (
+            self.X_train_eval_at_anchor,
+            self.y_train_eval_at_anchor,
+        ) = self.evaluation_sampler.sample(self.X_train_at_anchor, self.y_train_at_anchor)
 
     def build_curves(self):
         # Build sample-wise learning curve
 
+        # Anchors completed by a previous run of the same job
+        completed_anchors = {} if self.checkpoint is None else self.checkpoint.load()
+
         with self.timer.time("build_curves"):
-            for anchor in tqdm(self.anchors, disable=True):
-                self.set_anchor(anchor)
+            try:
+                if self.num_anchor_workers > 1:
+                    self.build_anchors_in_parallel(completed_anchors)
+                else:
+                    # with the budget schedule, the anchors after the current one are replaced while iterating (see
+                    # prune_anchors)
+                    i = 0
+                    while i < len(self.anchors):
+                        anchor = self.anchors[i]
+                        i += 1
+                        self.built_anchors.append(anchor)
+                        if anchor in completed_anchors:
+                            self.resume_anchor(completed_anchors[anchor])
+                            self.prune_anchors(anchor)
+                            continue
+
+                        self.set_anchor(anchor)
+                        error_code = self.build_anchor(anchor)
+
+                        # If an error was detected then the remaining anchors are skipped
+                        if error_code != 0:
+                            break
+
+                        anchor_node = self.timer.active_node.children[-1]
+                        self.checkpoint_anchor(anchor, anchor_node)
+                        self.prune_anchors(anchor)
+                        if anchor == self.anchors[-1] and self.score_deferred_metrics():
+                            self.checkpoint_anchor(anchor, anchor_node)
+            finally:
+                self.report["anchor_schedule"] = self.get_schedule_report()
+                if self.fit_sandbox is not None:
+                    self.fit_sandbox.close()
+                    self.fit_sandbox = None
+
+    def build_anchor(self, anchor) -> int:
+        """Fit and score the workflow on the current anchor (see ``set_anchor``).
+
+        Returns 0 if the anchor was built successfully, 1 otherwise.
+        """
+        with self.timer.time("anchor", {"value": anchor}) as anchor_timer:
+            self.logger.info(
+                f"Fitting workflow {self.workflow.__class__.__name__} on sample anchor {anchor} which is {anchor / self.num_train_instances * 100:.2f}% of the dataset."
+            )
 
-                with self.timer.time("anchor", {"value": anchor}) as anchor_timer:
-                    self.logger.info(
-                        f"Fitting workflow {self.workflow.__class__.__name__} on sample anchor {anchor} which is {anchor / self.X_train.shape[0] * 100:.2f}% of the dataset."
-                    )
+            warm_start = self.warm_start and self.can_warm_start_on_current_anchor()
 
-                    error_code = self.fit_workflow_on_current_anchor()
+            error_code = self.fit_workflow_on_current_anchor(warm_start=warm_start)
+            if self.warm_start:
+                # the workflow can still be refitted from scratch (see ``BaseWorkflow.partial_fit``)
+                anchor_timer["warm_started"] = warm_start and self.workflow.warm_started
 
-                    if error_code != 0:
-                        # Cancel timers that were started in fit_workflow_on_current_anchor
-                        self.timer.cancel(anchor_timer.id, only_children=True)
+            if error_code != 0:
+                # Cancel timers that were started in fit_workflow_on_current_anchor
+                self.timer.cancel(anchor_timer.id, only_children=True)
 
-                    assert (
-                        self.timer.active_node.id == anchor_timer.id
-                    ), f"The active timer is not correct, it is {self.timer.active_node} when it should be {anchor_timer} "
+            assert (
+                self.timer.active_node.id == anchor_timer.id
+            ), f"The active timer is not correct, it is {self.timer.active_node} when it should be {anchor_timer} "
 
-                    # If an error was detected then skip scoring...
-                    if error_code != 0:
-                        break
+            # If an error was detected then skip scoring...
+            if error_code != 0:
+                return error_code
 
-                    # Predict and Score
-                    self.logger.info("Predicting and scoring...")
-                    try:
-                        self.compute_metrics_for_workflow()
-                    except Exception as exception:
-                        # Cancel timers that were started in 'try' block
-                        self.timer.cancel(anchor_timer.id, only_children=True)
+            # Predict and Score
+            self.logger.info("Predicting and scoring...")
+            try:
+                self.compute_metrics_for_workflow()
+            except Exception as exception:
+                # Cancel timers that were started in 'try' block
+                self.timer.cancel(anchor_timer.id, only_children=True)
 
-                        # Collect traceback
-                        self.report["traceback"] = traceback.format_exc()
+                # Collect traceback
+                self.report["traceback"] = traceback.format_exc()
 
-                        self.logger.error(
-                            f"Error while fitting the workflow: \n{self.report['traceback']}"
-                        )
+                self.logger.error(
+                    f"Error while fitting the workflow: \n{self.report['traceback']}"
+                )
 
-                        self.report["traceback"] = r'"{}"'.format(
-                            self.report["traceback"]
-                        )
+                self.report["traceback"] = r'"{}"'.format(
+                    self.report["traceback"]
+                )
+
+                # The evaluation is considered a total failure only if
+                # None of the anchors returned scored.
+                if self.objective is None:
+                    self.objective = "F"
+
+                    if isinstance(exception, ValueError):
+                        self.objective += "_value_error"
+
+                error_code = 1
 
-                        # The evaluation is considered a total failure only if
-                        # None of the anchors returned scored.
-                        if self.objective is None:
-                            self.objective = "F"
+        return error_code
 
-                            if isinstance(exception, ValueError):
-                                self.objective += "_value_error"
+    def build_anchors_in_parallel(self, completed_anchors: dict = None):
+        """Build all anchors in a pool of ``num_anchor_workers`` processes.
 
-                        error_code = 1
-                        break
+        Each anchor is recorded by its own timer in the sub-process, the branches are attached to the
+        active node of ``self.timer`` in the order of the anchors. As in the sequential case, the first
+        anchor that fails cancels all the anchors that come after it.
 
-    def fit_workflow_on_current_anchor(self) -> int:
+        Args:
+            completed_anchors (dict, optional): anchors loaded from the checkpoint which are not built again. Defaults to ``None``.
+        """
+        completed_anchors = {} if completed_anchors is None else completed_anchors
+        anchors_to_build = [a for a in self.anchors if a not in completed_anchors]
+        num_processes = max(1, min(self.num_anchor_workers, len(anchors_to_build)))
+        pool = multiprocessing.Pool(
+            processes=num_processes,
+            initializer=_init_anchor_worker,
+            initargs=(self,),
+        )
+        try:
+            results = {
+                anchor: pool.apply_async(_build_anchor_in_worker, (anchor,))
+                for anchor in anchors_to_build
+            }
+            for anchor in self.anchors:
+                self.built_anchors.append(anchor)
+                if anchor in completed_anchors:
+                    self.resume_anchor(completed_anchors[anchor])
+                    continue
+
+                error_code, root, objective, traceback_str, records = results[anchor].get()
+
+                # information recorded by the workflows at the root of the timer (e.g., the classes)
+                self.update_root_metadata(root.metadata)
+                anchor_node = root.children[0]
+                self.timer.attach(anchor_node)
+
+                # the predictions recorded in the worker are re-keyed in the recorder of this builder
+                self.add_predictions_of_branch(anchor_node, records)
+
+                if error_code != 0:
+                    self.report["traceback"] = traceback_str
+                    if self.objective is None:
+                        self.objective = objective
+                    break
+
+                self.objective = objective
+                self.checkpoint_anchor(anchor, anchor_node)
+        finally:
+            # kill the workers that are still busy with anchors after a failure
+            pool.terminate()
+            pool.join()
+
+    def prune_anchors(self, anchor):
+        """Adds the time of the last anchor of the timer to the cost model of the budget schedule and removes the next
+        anchors whose predicted time does not fit in the rest of the budget. Only used by the budget schedule."""
+        if self.anchor_cost_model is None:
+            return
+        anchor_node = self.timer.active_node.children[-1]
+        self.anchor_cost_model.add(anchor, anchor_node.timestamp_end - anchor_node.timestamp_start)
+
+        # the time of the resumed anchors was spent by a previous run
+        remaining_budget = self.anchor_budget - (wall_clock_time() - self.timer.active_node.timestamp_start)
+        next_index = self.anchors.index(anchor) + 1
+        # anchors pruned with a previous prediction of the costs can be planned again
+        next_anchors = prune_anchors_to_budget(
+            [a for a in self.planned_anchors if a > anchor], remaining_budget, self.anchor_cost_model
+        )
+        if next_anchors != self.anchors[next_index:]:
+            self.logger.info(
+                f"Anchors {next_anchors} planned after anchor {anchor} to fit in the remaining budget of {remaining_budget:.1f}s."
+            )
+            self.anchors[next_index:] = next_anchors
+
+    def score_deferred_metrics(self) -> bool:
+        """Computes the expensive metrics restricted to the last anchor (see ``MetricSelection``) on the current
+        anchor when the budget schedule pruned all the anchors planned after it. They are timed in a
+        ``deferred_metrics`` node after the anchor and written in the nodes of its splits (see
+        ``ClassificationScorer.score_missing``).
+
+        Only the metrics of the anchor are computed, not those of the epochs of iterative workflows.
+
+        Returns:
+            bool: ``True`` if metrics were added to the anchor.
+        """
+        if self.deferred_scoring is None:
+            return False
+        scorer, splits = self.deferred_scoring
+        self.deferred_scoring = None
+
+        self.metric_selection.final_anchor = True
+        scores = {}
+        with self.timer.time("deferred_metrics", {"anchor": self.cur_anchor}):
+            for split_node, y_true, y_pred, y_pred_proba, label_split in splits:
+                scores[label_split] = scorer.score_missing(
+                    y_true, y_pred, y_pred_proba, split_node, split=label_split
+                )
+        return any(scores.values())
+
+    def get_schedule_report(self) -> dict:
+        """Returns the schedule of anchors actually used to build the curves."""
+        report = {"name": self.anchor_schedule, "anchors": list(self.built_anchors)}
+        if self.anchor_cost_model is not None:
+            report["budget"] = self.anchor_budget
+            report["planned_anchors"] = self.planned_anchors
+            report["cost_model"] = self.anchor_cost_model.as_dict()
+        return report
+
+    def update_root_metadata(self, metadata: dict):
+        """Adds the missing entries of ``metadata`` (recorded by another timer) to the root of the timer."""
+        for key, value in metadata.items():
+            if key not in self.timer.root.metadata:
+                self.timer.root[key] = value
+
+    def add_predictions_of_branch(self, node, records: dict):
+        """Adds the predictions ``records`` linked to the nodes of a branch to the predictions recorder and updates
+        the keys in the branch accordingly."""
+        if self.predictions_recorder is None:
+            return
+        nodes = [node]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.children)
+            if "predictions" in node.metadata:
+                node["predictions"] = self.predictions_recorder.add(
+                    records[node["predictions"]]
+                )
+
+    def checkpoint_anchor(self, anchor, anchor_node):
+        """Appends a completed anchor to the checkpoint (if any)."""
+        if self.checkpoint is None:
+            return
+
+        records = None
+        if self.predictions_recorder is not None:
+            records = {}
+            nodes = [anchor_node]
+            while nodes:
+                node = nodes.pop()
+                nodes.extend(node.children)
+                if "predictions" in node.metadata:
+                    key = node["predictions"]
+                    records[key] = self.predictions_recorder.records[key]
+
+        self.checkpoint.append(
+            anchor,
+            anchor_node,
+            objective=self.objective,
+            report=self.report,
+            root_metadata=self.timer.root.metadata,
+            records=records,
+        )
+
+    def resume_anchor(self, entry: dict):
+        """Attaches an anchor completed by a previous run of the job (see ``checkpoint_anchor``) to the timer."""
+        anchor_node = TimerNode.from_dict(entry["node"], precision=self.timer.precision)
+        anchor_node["resumed"] = True
+        self.update_root_metadata(entry["root_metadata"])
+        self.timer.attach(anchor_node)
+        if self.predictions_recorder is not None:
+            self.add_predictions_of_branch(
+                anchor_node, self.checkpoint.load_predictions(entry["anchor"])
+            )
+        self.objective = entry["objective"]
+
+    def can_warm_start_on_current_anchor(self) -> bool:
+        """Checks if the workflow of the previous anchor can continue its training on the new instances of the current anchor."""
+        return (
+            self.workflow is not None
+            and self.prev_anchor is not None
+            and self.workflow.can_partial_fit(self.y_train_at_anchor)
+        )
+
+    def fit_workflow_on_current_anchor(self, warm_start: bool = False) -> int:
         """Fit the workflow on the current anchor.
 
+        If ``warm_start`` is ``True``, the workflow of the previous anchor is kept and continues its training on the instances of the current anchor (see ``BaseWorkflow.partial_fit``).
+
         Returns 0 if the workflow was fitted successfully, 1 otherwise.
         """
 
         # Represent success (0) or failure (1) while fitting the workflow
         error_code = 0
 
-        with self.timer.time("create_workflow"):
-            self.workflow = self.workflow_factory()
-
+        if warm_start:
+            fit_method = "partial_fit"
+        else:
+            with self.timer.time("create_workflow"):
+                self.workflow = self.workflow_factory(timer=self.timer)
+                self.workflow.evaluation_sampler = self.evaluation_sampler
+                self.workflow.predict_chunk_size = self.predict_chunk_size
+                self.workflow.predict_num_threads = self.predict_num_threads
+                self.workflow.predictions_recorder = self.predictions_recorder
+                self.workflow.metric_selection = self.metric_selection
+            fit_method = "fit"
+        if self.warm_start:
+            # the last anchor changes when the budget schedule prunes the anchors (see ``prune_anchors``)
+            self.workflow.warm_start_final_anchor = self.anchors[-1]
+        X_fit, y_fit = self.X_train_at_anchor, self.y_train_at_anchor
+
+        fit = getattr(self.workflow, fit_method)
         if self.timeout_on_fit > 0:
-            self.workflow.fit = functools.partial(
-                terminate_on_timeout, self.timeout_on_fit, self.workflow.fit
-            )
+            # daemonic processes (e.g., the workers building anchors in parallel) cannot start a sandbox
+            if self.timeout_isolation == "process" and not multiprocessing.current_process().daemon:
+                fit = functools.partial(self.fit_workflow_in_sandbox, fit_method)
+            else:
+                fit = functools.partial(terminate_on_timeout, self.timeout_on_fit, fit)
 
         try:
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
 
-                self.workflow.fit(
-                    self.X_train_at_anchor,
-                    self.y_train_at_anchor,
+                fit(
+                    X_fit,
+                    y_fit,
                     X_valid=self.X_valid,
                     y_valid=self.y_valid,
                     X_test=self.X_test,
@@ -359,6 +935,52 @@ class LearningCurveBuilder:
 
         return error_code
 
+    def fit_workflow_in_sandbox(self, method: str, X, y, **kwargs):
+        """Calls the fit ``method`` of the workflow in a ``FitSandbox`` whose worker is killed if the fit exceeds
+        ``timeout_on_fit``, the workflow is then replaced by the fitted one.
+
+        The other arguments of the fit (the validation and test data and the metadata) are the same for all the anchors,
+        they are sent once to the worker (see ``FitSandbox.store``) and only the workflow and the training instances of
+        the anchor are sent with each fit. The workflow records its nodes with a new timer in the worker, they are
+        attached to the active node of ``self.timer`` as in ``build_anchors_in_parallel``.
+        """
+        if self.fit_sandbox is None:
+            self.fit_sandbox = FitSandbox(preload=[type(self.workflow).__module__])
+            self.fit_sandbox.store("fit_kwargs", kwargs)
+
+        workflow = self.workflow
+        workflow.timer = Timer(
+            precision=self.timer.precision,
+            resource_tags=self.timer.resource_tags,
+            tracemalloc_tags=self.timer.tracemalloc_tags,
+        )
+        if self.predictions_recorder is not None:
+            workflow.predictions_recorder = PredictionsRecorder()
+        try:
+            fitted_workflow = self.fit_sandbox.call(
+                self.timeout_on_fit, fit_workflow, workflow, method, X, y, stored_kwargs="fit_kwargs"
+            )
+        finally:
+            workflow.timer = self.timer
+            workflow.predictions_recorder = self.predictions_recorder
+
+        root = fitted_workflow.timer.root
+        records = None
+        if fitted_workflow.predictions_recorder is not None:
+            records = fitted_workflow.predictions_recorder.records
+
+        # the objects shared with the builder are those of this process
+        fitted_workflow.timer = self.timer
+        fitted_workflow.evaluation_sampler = self.evaluation_sampler
+        fitted_workflow.predictions_recorder = self.predictions_recorder
+        fitted_workflow.metric_selection = self.metric_selection
+        self.workflow = fitted_workflow
+
+        self.update_root_metadata(root.metadata)
+        for node in root.children:
+            self.timer.attach(node)
+            self.add_predictions_of_branch(node, records)
+
     def compute_metrics_for_workflow(self):
         predictions, labels = self.get_predictions()
         self.labels_as_used_by_workflow = labels
@@ -372,12 +994,13 @@ class LearningCurveBuilder:
 
         with self.timer.time("get_predictions"):
             for X_split, label_split in [
-                (self.X_train_at_anchor, "train"),
-                (self.X_valid, "val"),
-                (self.X_test, "test"),
+                (self.X_train_eval_at_anchor, "train"),
+                (self.X_valid_eval, "val"),
+                (self.X_test_eval, "test"),
             ]:
-                with warnings.catch_warnings(), self.timer.time(label_split):
+                with warnings.catch_warnings(), self.timer.time(label_split) as split_timer:
                     warnings.simplefilter("ignore")
+                    split_timer["num_samples"] = X_split.shape[0]
 
                     keys[f"y_pred_proba_{label_split}"] = (
                         self.workflow.predict_proba(X_split)
@@ -406,19 +1029,33 @@ class LearningCurveBuilder:
                 classes_learner=self.workflow.infos["classes_train_orig"],
                 classes_overall=self.workflow.infos["classes_overall_orig"],
                 timer=self.timer,
+                predictions_recorder=self.predictions_recorder,
+                metric_selection=self.metric_selection,
             )
         else:
             scorer = RegressionScorer(timer=self.timer)
 
+        # the expensive metrics restricted to the last anchor are computed later if the anchors after this one are
+        # pruned (see ``score_deferred_metrics``)
+        defer = (
+            self.is_classification
+            and self.metric_selection is not None
+            and not self.metric_selection.final_anchor
+            and "final_anchor" in self.metric_selection.expensive_scope
+        )
+        deferred_splits = []
+
         with self.timer.time("metrics"):
             for y_true, y_pred, y_pred_proba, label_split in [
-                (self.y_train_at_anchor, y_pred_train, y_pred_proba_train, "train"),
-                (self.y_valid, y_pred_val, y_pred_proba_val, "val"),
-                (self.y_test, y_pred_test, y_pred_proba_test, "test"),
+                (self.y_train_eval_at_anchor, y_pred_train, y_pred_proba_train, "train"),
+                (self.y_valid_eval, y_pred_val, y_pred_proba_val, "val"),
+                (self.y_test_eval, y_pred_test, y_pred_proba_test, "test"),
             ]:
                 with self.timer.time(label_split) as split_timer:
                     if self.is_classification:
-                        scores = scorer.score(y_true, y_pred, y_pred_proba)
+                        scores = scorer.score(y_true, y_pred, y_pred_proba, split=label_split)
+                        if defer:
+                            deferred_splits.append((split_timer, y_true, y_pred, y_pred_proba, label_split))
                         if label_split == "val":
                             self.objective = -scores["log_loss"]
                     else:
@@ -426,4 +1063,41 @@ class LearningCurveBuilder:
                         if label_split == "val":
                             self.objective = -scores["mean_squared_error"]
 
+        if defer:
+            self.deferred_scoring = (scorer, deferred_splits)
+
         return 0  # no error occurred
+
+
+# Builder of the current worker process when anchors are built in parallel
+_anchor_worker_builder = None
+
+
+def _init_anchor_worker(builder: LearningCurveBuilder):
+    global _anchor_worker_builder
+    _anchor_worker_builder = builder
+
+
+def _build_anchor_in_worker(anchor):
+    """Builds a single anchor in a worker process and returns its timer tree along with the outcome."""
+    builder = _anchor_worker_builder
+    builder.timer = Timer(
+        precision=builder.timer.precision,
+        resource_tags=builder.timer.resource_tags,
+        tracemalloc_tags=builder.timer.tracemalloc_tags,
+    )
+    builder.workflow = None
+    builder.fit_sandbox = None
+    builder.objective = None
+    builder.report["traceback"] = None
+    if builder.predictions_recorder is not None:
+        builder.predictions_recorder = PredictionsRecorder()
+
+    builder.timer.start("build_curves")
+    builder.set_anchor(anchor)
+    error_code = builder.build_anchor(anchor)
+    builder.timer.stop()
+
+    records = None if builder.predictions_recorder is None else builder.predictions_recorder.records
+
+    return error_code, builder.timer.root, builder.objective, builder.report["traceback"], records
@@ -0,0 +1,138 @@
+import numpy as np
+import scipy.sparse
+from sklearn.preprocessing import OneHotEncoder
+
+from ..data import load_task
+from ..data.split import load_split_indices, train_valid_test_split_indices
+
+
+class DatasetSplits:
+    """Class representing the train/validation/test splits of a dataset and the categories of its features.
+
+    The splits only depend on the dataset and on the arguments of the split, they can therefore be shared by the
+    learning curves of several jobs (see ``DatasetCache``). The training set is kept as the ``train_indices`` of ``X``
+    from which the instances of the anchors are gathered (see ``AnchorSampler``), only the validation and test sets
+    are copied.
+
+    Args:
+        X (np.ndarray): the instances of the dataset (possibly a sparse matrix).
+        y (np.ndarray): the labels of the dataset.
+        categories (list): for each column of ``X``, if it is categorical.
+        test_seed (int): random state of the train+validation/test split.
+        valid_seed (int): random state of the train/validation split.
+        valid_prop (float, optional): ratio of validation/(train+validation). Defaults to ``0.1``.
+        test_prop (float, optional): ratio of test/data. Defaults to ``0.1``.
+        stratify (bool, optional): if the splits are stratified. Defaults to ``True``.
+        known_categories (bool, optional): if all the possible categories are assumed to be known in advance. Defaults to ``True``.
+        indices (tuple, optional): the indices of the train, validation and test instances (e.g., from ``load_split_indices``). Defaults to ``None`` to compute them with ``train_valid_test_split_indices``.
+    """
+
+    def __init__(
+        self,
+        X,
+        y,
+        categories: list,
+        test_seed: int,
+        valid_seed: int,
+        valid_prop: float = 0.1,
+        test_prop: float = 0.1,
+        stratify: bool = True,
+        known_categories: bool = True,
+        indices: tuple = None,
+    ):
+        self.num_instances = X.shape[0]
+        self.labels = list(np.unique(y))
+        if indices is None:
+            indices = train_valid_test_split_indices(
+                y, test_seed, valid_seed, test_prop, valid_prop, stratify=stratify
+            )
+        self.train_indices, self.valid_indices, self.test_indices = indices
+
+        self.X = X
+        self.y = np.asarray(y)
+        self.y_train = self.y[self.train_indices]
+        self.X_valid, self.y_valid = X[self.valid_indices], self.y[self.valid_indices]
+        self.X_test, self.y_test = X[self.test_indices], self.y[self.test_indices]
+
+        # Categories of the features as given to the workflows in their metadata
+        columns_categories = np.asarray(categories, dtype=bool)
+        self.categories = {"columns": columns_categories}
+        if np.any(columns_categories):
+            self.categories["values"] = None
+            if known_categories:
+                one_hot_encoder = OneHotEncoder(
+                    drop="first", sparse_output=False
+                )  # TODO: drop "first" could be an hyperparameter
+                X_categories = X[:, np.where(columns_categories)[0]]
+                if scipy.sparse.issparse(X_categories):
+                    X_categories = X_categories.toarray()
+                one_hot_encoder.fit(X_categories)
+                self.categories["values"] = [
+                    v.tolist() for v in one_hot_encoder.categories_
+                ]
+
+
+class DatasetCache:
+    """Class keeping the datasets loaded and the splits computed in the current process so that they are shared by
+    the jobs of a batch (see ``run_learning_workflows``).
+
+    Example use:
+
+    >>> cache = DatasetCache()
+    >>> (X, y), metadata = cache.load_task("openml.3")
+    >>> splits = cache.get_splits("openml.3", test_seed=42, valid_seed=42)
+    """
+
+    def __init__(self):
+        self.tasks = {}
+        self.splits = {}
+
+    def is_loaded(self, task_id: str) -> bool:
+        return task_id in self.tasks
+
+    def load_task(self, task_id: str):
+        """Same as ``lcdb.data.load_task`` but the task is only loaded the first time."""
+        if task_id not in self.tasks:
+            self.tasks[task_id] = load_task(task_id)
+        return self.tasks[task_id]
+
+    def get_splits(
+        self,
+        task_id: str,
+        test_seed: int,
+        valid_seed: int,
+        valid_prop: float = 0.1,
+        test_prop: float = 0.1,
+        stratify: bool = True,
+        known_categories: bool = True,
+    ) -> DatasetSplits:
+        """Returns the splits of a task (see ``DatasetSplits``), they are only computed the first time.
+
+        The indices of the splits are read from the dataset cache or stored in it (see ``load_split_indices``).
+        """
+        key = (
+            task_id,
+            test_seed,
+            valid_seed,
+            valid_prop,
+            test_prop,
+            stratify,
+            known_categories,
+        )
+        if key not in self.splits:
+            (X, y), dataset_metadata = self.load_task(task_id)
+            self.splits[key] = DatasetSplits(
+                X,
+                y,
+                dataset_metadata["categories"],
+                test_seed,
+                valid_seed,
+                valid_prop=valid_prop,
+                test_prop=test_prop,
+                stratify=stratify,
+                known_categories=known_categories,
+                indices=load_split_indices(
+                    task_id, y, test_seed, valid_seed, test_prop, valid_prop, stratify=stratify
+                ),
+            )
+        return self.splits[key]
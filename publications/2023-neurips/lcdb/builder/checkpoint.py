@@ -0,0 +1,104 @@
+import hashlib
+import os
+
+import lcdb.json
+
+from .predictions import PredictionsRecorder
+from .timer import TimerNode
+
+
+class AnchorCheckpoint:
+    """Class representing the checkpoint of a job, i.e., the anchors of its learning curve which are already completed.
+
+    The checkpoint is a file with one JSON line per completed anchor. A line is appended (and flushed to the disk) as
+    soon as an anchor is completed so that the anchors survive the termination of the job. If the predictions of an
+    anchor are recorded, they are saved in a ``.npz`` file next to the checkpoint before the line is appended.
+
+    Example use:
+
+    >>> checkpoint = AnchorCheckpoint(AnchorCheckpoint.get_path("checkpoints", {"openml_id": 3, ...}))
+    >>> completed_anchors = checkpoint.load()
+
+    Args:
+        path (str): path of the checkpoint file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @staticmethod
+    def get_path(checkpoint_dir: str, parameters: dict) -> str:
+        """Returns the path of the checkpoint of the job identified by ``parameters`` in ``checkpoint_dir``."""
+        key = hashlib.sha1(lcdb.json.dumps(parameters, sort_keys=True).encode()).hexdigest()
+        return os.path.join(checkpoint_dir, f"checkpoint_{key}.jsonl")
+
+    def get_predictions_path(self, anchor: int) -> str:
+        return f"{os.path.splitext(self.path)[0]}.anchor_{anchor}.npz"
+
+    def load(self) -> dict:
+        """Returns the completed anchors.
+
+        Returns:
+            dict: for each completed anchor, a dictionary with the ``node`` of the anchor in the timer (as given by ``TimerNode.as_dict``), the ``objective`` and ``report`` of the builder after the anchor and the ``root_metadata`` of the timer.
+        """
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = lcdb.json.loads(line)
+                except ValueError:
+                    # the line was not completely written before the job was killed
+                    continue
+                completed[entry["anchor"]] = entry
+        return completed
+
+    def load_predictions(self, anchor: int) -> dict:
+        """Returns the records of the predictions of a completed anchor (empty if they were not recorded)."""
+        path = self.get_predictions_path(anchor)
+        if not os.path.exists(path):
+            return {}
+        return PredictionsRecorder.load(path).records
+
+    def append(self, anchor: int, node: TimerNode, objective, report: dict, root_metadata: dict, records: dict = None):
+        """Appends a completed anchor to the checkpoint.
+
+        Args:
+            anchor (int): the anchor.
+            node (TimerNode): the node of the anchor in the timer.
+            objective: the objective of the builder after the anchor.
+            report (dict): the report of the builder.
+            root_metadata (dict): the metadata of the root of the timer (e.g., the classes).
+            records (dict, optional): the records of the predictions of the anchor. Defaults to ``None``.
+        """
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+
+        if records is not None:
+            recorder = PredictionsRecorder()
+            recorder.records = records
+            recorder.save(self.get_predictions_path(anchor))
+
+        entry = dict(
+            anchor=anchor,
+            node=node.as_dict(timestamp_offset=0),
+            objective=objective,
+            report=report,
+            root_metadata=root_metadata,
+        )
+        line = lcdb.json.dumps(entry) + "\n"
+
+        # the last line may be incomplete if the job was killed while writing it
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = "\n" + line
+
+        with open(self.path, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,253 @@
+import base64
+import io
+
+import lcdb.json
+import numpy as np
+
+# Kinds of metadata values stored in their own array, other values are stored in JSON
+METADATA_DTYPES = {"bool": np.bool_, "int": np.int64, "float": np.float64}
+
+
+def get_metadata_kind(value) -> str:
+    """Returns the kind of column in which a metadata value is stored (see ``METADATA_DTYPES``)."""
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int" if -(2**63) <= value < 2**63 else "json"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    return "json"
+
+
+class NodeTable:
+    """Class representing the tree of a ``Timer`` as a table with one row per node, stored column by column.
+
+    The nodes are numbered in pre-order (the root is the node 0) and each column is an array with one entry per node:
+    the index of the parent (``-1`` for the root), the index of the tag in ``tags``, the timestamps (in seconds from
+    the start of the root) and the id of the node from which the node was canceled (``-1`` if it was not canceled).
+    The metadata are stored by key: for each key and kind of value, the nodes which have the key and their values.
+    Booleans, integers and floats are stored in arrays, other values (e.g., confusion matrices) are stored in a single
+    JSON string which is only decoded when the tree is rebuilt (see ``as_dict``).
+
+    Example use:
+
+    >>> table = timer.as_table()
+    >>> anchors = table.select("anchor")
+    >>> nodes, values = table.get_metadata("value", kind="float")
+    >>> tree = NodeTable.deserialize(table.serialize()).as_dict()
+
+    Args:
+        parent (np.ndarray): the index of the parent of each node.
+        tag (np.ndarray): the index of the tag of each node in ``tags``.
+        tags (list): the distinct tags of the nodes.
+        timestamp_start (np.ndarray): the start of each node.
+        timestamp_stop (np.ndarray): the stop of each node.
+        cancellation_source_id (np.ndarray): the id of the node from which each node was canceled or ``-1``.
+        metadata (dict): for each key, a dictionary mapping each kind of value to a tuple ``(nodes, values)``.
+        precision (int, optional): number of digits of the timestamps. Defaults to ``6``.
+    """
+
+    def __init__(
+        self,
+        parent,
+        tag,
+        tags: list,
+        timestamp_start,
+        timestamp_stop,
+        cancellation_source_id,
+        metadata: dict,
+        precision: int = 6,
+    ):
+        self.parent = parent
+        self.tag = tag
+        self.tags = tags
+        self.timestamp_start = timestamp_start
+        self.timestamp_stop = timestamp_stop
+        self.cancellation_source_id = cancellation_source_id
+        self.metadata = metadata
+        self.precision = precision
+
+    def __len__(self):
+        return len(self.parent)
+
+    @property
+    def canceled(self):
+        """For each node, if it is the root of a canceled branch."""
+        return self.cancellation_source_id >= 0
+
+    @staticmethod
+    def from_node(root, timestamp_offset: float = 0) -> "NodeTable":
+        """Creates the table of the branch starting at ``root`` (a ``TimerNode``).
+
+        Args:
+            root (TimerNode): the root of the branch.
+            timestamp_offset (float, optional): the offset subtracted from the timestamps. Defaults to ``0``.
+        """
+        nodes = []
+        parent = []
+        branch = [(root, -1)]
+        while branch:
+            node, parent_index = branch.pop()
+            index = len(nodes)
+            nodes.append(node)
+            parent.append(parent_index)
+            branch.extend((child, index) for child in reversed(node.children))
+
+        tags = {}
+        tag = [tags.setdefault(node.tag, len(tags)) for node in nodes]
+
+        timestamps = np.array(
+            [(node.timestamp_start, node.timestamp_end) for node in nodes],
+            dtype=np.float64,
+        )
+        timestamps = np.round(timestamps - timestamp_offset, root.precision)
+
+        cancellation_source_id = [
+            -1 if node.cancellation_source_id is None else node.cancellation_source_id
+            for node in nodes
+        ]
+
+        metadata = {}
+        for index, node in enumerate(nodes):
+            for key, value in node.metadata.items():
+                columns = metadata.setdefault(key, {})
+                column = columns.setdefault(get_metadata_kind(value), ([], []))
+                column[0].append(index)
+                column[1].append(value)
+
+        for columns in metadata.values():
+            for kind, (column_nodes, values) in columns.items():
+                if kind == "json":
+                    values = lcdb.json.dumps(values)
+                else:
+                    values = np.asarray(values, dtype=METADATA_DTYPES[kind])
+                columns[kind] = (np.asarray(column_nodes, dtype=np.int32), values)
+
+        return NodeTable(
+            parent=np.asarray(parent, dtype=np.int32),
+            tag=np.asarray(tag, dtype=np.int32),
+            tags=list(tags),
+            timestamp_start=timestamps[:, 0].copy(),
+            timestamp_stop=timestamps[:, 1].copy(),
+            cancellation_source_id=np.asarray(cancellation_source_id, dtype=np.int64),
+            metadata=metadata,
+            precision=root.precision,
+        )
+
+    def select(self, tag) -> np.ndarray:
+        """Returns the indices of the nodes with a given tag."""
+        if tag not in self.tags:
+            return np.empty(0, dtype=np.int32)
+        return np.flatnonzero(self.tag == self.tags.index(tag))
+
+    def get_children(self, index: int) -> np.ndarray:
+        """Returns the indices of the children of a node."""
+        return np.flatnonzero(self.parent == index)
+
+    def get_metadata(self, key, kind: str = None):
+        """Returns the nodes which have a metadata ``key`` and the corresponding values.
+
+        Args:
+            key: the key of the metadata.
+            kind (str, optional): if given, only the values of this kind (``"bool"``, ``"int"``, ``"float"`` or ``"json"``) are returned, as an array if possible. Otherwise, all the values are returned in a list. Defaults to ``None``.
+
+        Returns:
+            tuple: (nodes, values) the sorted indices of the nodes and their values.
+        """
+        columns = self.metadata.get(key, {})
+        if kind is not None:
+            if kind not in columns:
+                return np.empty(0, dtype=np.int32), []
+            nodes, values = columns[kind]
+            return nodes, lcdb.json.loads(values) if kind == "json" else values
+
+        nodes = []
+        values = []
+        for kind in columns:
+            column_nodes, column_values = self.get_metadata(key, kind)
+            nodes.extend(column_nodes.tolist())
+            values.extend(column_values if kind == "json" else column_values.tolist())
+        order = np.argsort(nodes, kind="stable")
+        return np.asarray(nodes, dtype=np.int32)[order], [values[i] for i in order]
+
+    def as_dict(self) -> dict:
+        """Rebuilds the tree as given by ``Timer.as_json``."""
+        tags = self.tags
+        outs = [
+            dict(
+                tag=tags[tag],
+                timestamp_start=timestamp_start,
+                timestamp_stop=timestamp_stop,
+            )
+            for tag, timestamp_start, timestamp_stop in zip(
+                self.tag.tolist(),
+                self.timestamp_start.tolist(),
+                self.timestamp_stop.tolist(),
+            )
+        ]
+
+        for key, columns in self.metadata.items():
+            for kind, (nodes, values) in columns.items():
+                values = lcdb.json.loads(values) if kind == "json" else values.tolist()
+                for index, value in zip(nodes.tolist(), values):
+                    outs[index].setdefault("metadata", {})[key] = value
+
+        # children are after their parent (and in order) in the pre-order
+        for index, parent in enumerate(self.parent.tolist()):
+            if parent >= 0:
+                outs[parent].setdefault("children", []).append(outs[index])
+
+        for index in np.flatnonzero(self.cancellation_source_id > 0).tolist():
+            outs[index]["cancellation_source_id"] = int(self.cancellation_source_id[index])
+
+        return outs[0]
+
+    def serialize(self) -> str:
+        """Returns the table as a compressed ``.npz`` file encoded in base64 (e.g., to be stored in a CSV file)."""
+        arrays = dict(
+            parent=self.parent,
+            tag=self.tag,
+            tags=np.array(lcdb.json.dumps(self.tags)),
+            timestamp_start=self.timestamp_start,
+            timestamp_stop=self.timestamp_stop,
+            cancellation_source_id=self.cancellation_source_id,
+            precision=np.array(self.precision),
+        )
+
+        metadata_columns = []
+        for key, columns in self.metadata.items():
+            for kind, (nodes, values) in columns.items():
+                i = len(metadata_columns)
+                metadata_columns.append([key, kind])
+                arrays[f"metadata_{i}_nodes"] = nodes
+                arrays[f"metadata_{i}_values"] = (
+                    np.array(values) if kind == "json" else values
+                )
+        arrays["metadata"] = np.array(lcdb.json.dumps(metadata_columns))
+
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    @staticmethod
+    def deserialize(data: str) -> "NodeTable":
+        """Inverse of ``serialize``."""
+        with np.load(io.BytesIO(base64.b64decode(data)), allow_pickle=False) as arrays:
+            metadata = {}
+            for i, (key, kind) in enumerate(lcdb.json.loads(str(arrays["metadata"]))):
+                values = arrays[f"metadata_{i}_values"]
+                metadata.setdefault(key, {})[kind] = (
+                    arrays[f"metadata_{i}_nodes"],
+                    str(values) if kind == "json" else values,
+                )
+
+            return NodeTable(
+                parent=arrays["parent"],
+                tag=arrays["tag"],
+                tags=lcdb.json.loads(str(arrays["tags"])),
+                timestamp_start=arrays["timestamp_start"],
+                timestamp_stop=arrays["timestamp_stop"],
+                cancellation_source_id=arrays["cancellation_source_id"],
+                metadata=metadata,
+                precision=int(arrays["precision"]),
+            )
@@ -0,0 +1,210 @@
+"""Long-lived pool of worker processes running the jobs of ``lcdb run`` under a memory limit.
+
+Contrary to ``terminate_on_memory_exceeded``, which starts a ``ProcessPoolExecutor`` (and imports ``lcdb`` again) for
+each job, the workers of a ``MemoryLimitedPool`` are started from a fork server and reused by the following jobs.
+"""
+import atexit
+import resource
+import threading
+import time
+
+import psutil
+
+from deephyper.evaluator._run_function_utils import standardize_run_function_output
+
+from .resources import get_tree_peak_rss, reset_peak_rss
+from .sandbox import FitSandbox, WorkerTerminatedError
+
+# Pools of the current process by configuration (see ``get_memory_limited_pool``)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _limit_address_space(address_space_limit: int):
+    """Initializer of the workers setting the limit of their virtual memory (inherited by their descendants)."""
+    resource.setrlimit(resource.RLIMIT_AS, (address_space_limit, address_space_limit))
+
+
+def _run_job(func, *args, **kwargs):
+    """Runs a job in a worker after resetting its peak memory."""
+    reset_peak_rss()
+    return func(*args, **kwargs)
+
+
+class MemoryLimitedPool:
+    """Pool of worker processes running functions (e.g., ``run_learning_workflow``) under a memory limit.
+
+    The memory used by a job is the peak resident set size (``VmHWM``) of its worker summed over the descendants of the
+    worker (e.g., the sandbox of ``--timeout-on-fit``), which is measured every ``memory_tracing_interval`` seconds. As
+    the peak is kept by the kernel, short spikes between two measures are not missed. When the memory limit is
+    exceeded, the worker is killed and the output of the job is ``"F_memory_limit_exceeded"``.
+
+    The virtual memory of the workers can also be limited with ``RLIMIT_AS``, the allocations above the limit then
+    fail with a ``MemoryError`` in the job (reported as ``"F_memory_error"``) instead of waiting for the next measure.
+    The virtual memory is larger than the resident memory (e.g., the stacks of the BLAS threads and the arenas of the
+    allocator are reserved but mostly not used), this limit must therefore be larger than the memory limit.
+
+    A worker runs one job at a time, the pool starts as many workers as there are concurrent jobs (e.g., with the
+    ``thread`` evaluator). Workers are recycled after ``max_jobs_per_worker`` jobs, after a memory breach and after a
+    crash (e.g., killed by the out-of-memory killer).
+
+    A pool is pickled as its configuration and unpickled as the pool of the receiving process with the same
+    configuration (see ``get_memory_limited_pool``), the ``run`` method can therefore be the ``run_function`` of any
+    evaluator:
+
+    >>> pool = MemoryLimitedPool(memory_limit=2 * 1024**3)
+    >>> run_function = functools.partial(pool.run, run_learning_workflow, recover_func=recover_learning_workflow)
+
+    Args:
+        memory_limit (int): in bytes, the memory limit of a job. If set to ``-1``, only the peak memory is measured.
+        memory_tracing_interval (float, optional): in seconds, the interval at which the memory is measured. Defaults to ``0.1``.
+        address_space_limit (int, optional): in bytes, the limit of the virtual memory of the workers. Defaults to ``-1`` for no limit.
+        max_jobs_per_worker (int, optional): number of jobs after which a worker is replaced, ``-1`` for no limit. Defaults to ``100``.
+        preload (list, optional): modules imported once by the fork server of the workers (e.g., the module of the workflow). Defaults to ``None``.
+    """
+
+    def __init__(
+        self,
+        memory_limit: int,
+        memory_tracing_interval: float = 0.1,
+        address_space_limit: int = -1,
+        max_jobs_per_worker: int = 100,
+        preload: list = None,
+    ):
+        if memory_tracing_interval <= 0:
+            raise ValueError(
+                f"The memory tracing interval must be positive, got {memory_tracing_interval}."
+            )
+        if max_jobs_per_worker == 0 or max_jobs_per_worker < -1:
+            raise ValueError(
+                f"The maximum number of jobs per worker must be positive or -1, got {max_jobs_per_worker}."
+            )
+        self.memory_limit = int(memory_limit)
+        self.memory_tracing_interval = memory_tracing_interval
+        self.address_space_limit = int(address_space_limit)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.preload = list(preload or [])
+
+        self.idle_workers = []
+        self.lock = threading.Lock()
+        # the workers are not daemonic (they can start the sandbox of the fit) and must be stopped before
+        # ``multiprocessing`` joins them at exit
+        atexit.register(self.close)
+
+    @property
+    def config(self) -> tuple:
+        return (
+            self.memory_limit,
+            self.memory_tracing_interval,
+            self.address_space_limit,
+            self.max_jobs_per_worker,
+            tuple(self.preload),
+        )
+
+    def __reduce__(self):
+        return get_memory_limited_pool, self.config
+
+    def acquire(self) -> FitSandbox:
+        """Returns an idle worker, a new one is created if there is none."""
+        with self.lock:
+            if self.idle_workers:
+                return self.idle_workers.pop()
+
+        if self.address_space_limit > 0:
+            initializer, initargs = _limit_address_space, (self.address_space_limit,)
+        else:
+            initializer, initargs = None, ()
+        worker = FitSandbox(
+            preload=self.preload,
+            daemon=False,
+            initializer=initializer,
+            initargs=initargs,
+        )
+        worker.num_jobs = 0
+        return worker
+
+    def release(self, worker: FitSandbox):
+        """Returns a worker to the pool unless it is recycled."""
+        if worker.pid is None or (
+            self.max_jobs_per_worker > 0 and worker.num_jobs >= self.max_jobs_per_worker
+        ):
+            worker.close()
+            return
+        with self.lock:
+            self.idle_workers.append(worker)
+
+    def run(self, func, *args, recover_func=None, **kwargs) -> dict:
+        """Runs ``func(*args, **kwargs)`` in a worker and returns its output with the timestamps and the peak memory
+        of the job in the metadata (as ``terminate_on_memory_exceeded``).
+
+        Args:
+            func (function): the function to run, it must be importable by the worker.
+            *args: positional arguments to pass to the function.
+            recover_func (function, optional): If given, it is called as ``recover_func(output, *args, **kwargs)`` when the function is terminated to build the output from what the function saved before its termination (e.g., a checkpoint). Defaults to ``None``.
+            **kwargs: keyword arguments to pass to the function.
+
+        Returns:
+            dict: the standardized output of the function.
+        """
+        timestamp_start = time.time()
+
+        output = None
+        memory_peak = 0
+
+        worker = self.acquire()
+        try:
+            worker.submit(_run_job, func, *args, **kwargs)
+            worker.num_jobs += 1
+            while True:
+                done = worker.wait(self.memory_tracing_interval)
+                try:
+                    memory_peak = max(memory_peak, get_tree_peak_rss(worker.pid))
+                except psutil.NoSuchProcess:
+                    # the worker died, ``result`` raises
+                    done = True
+
+                if self.memory_limit > 0 and memory_peak > self.memory_limit:
+                    output = "F_memory_limit_exceeded"
+                    worker.kill()
+                    break
+
+                if done:
+                    output = worker.result()
+                    break
+        except WorkerTerminatedError:
+            pass
+        finally:
+            self.release(worker)
+
+        # the function was terminated before returning
+        if recover_func is not None and (output is None or isinstance(output, str)):
+            output = recover_func(output, *args, **kwargs)
+
+        timestamp_end = time.time()
+
+        output = standardize_run_function_output(output)
+        metadata = {
+            "timestamp_start": timestamp_start,
+            "timestamp_end": timestamp_end,
+            "memory": memory_peak,
+        }
+        metadata.update(output["metadata"])
+        output["metadata"] = metadata
+
+        return output
+
+    def close(self):
+        """Stops the idle workers."""
+        with self.lock:
+            workers, self.idle_workers = self.idle_workers, []
+        for worker in workers:
+            worker.close()
+
+
+def get_memory_limited_pool(*config) -> MemoryLimitedPool:
+    """Returns the pool of the current process with the given configuration (the arguments of ``MemoryLimitedPool``),
+    it is created by the first call so that the workers are reused by all the jobs run by the process."""
+    with _pools_lock:
+        if config not in _pools:
+            _pools[config] = MemoryLimitedPool(*config)
+        return _pools[config]
@@ -0,0 +1,186 @@
+import lcdb.json
+import numpy as np
+
+from .scorer import ClassificationScorer
+from .timer import Timer
+
+# Probabilities are stored in ``float32``, whose relative precision keeps the metrics recomputed from them (e.g., the
+# log loss of probabilities close to 0) close to the metrics computed from the exact probabilities
+PROBA_DTYPE = np.float32
+
+# Probabilities of the files saved by previous versions, as unsigned integers of 16 bits
+PROBA_QUANTIZATION_LEVELS = np.iinfo(np.uint16).max
+
+
+def encode_probabilities(y_pred_proba):
+    """Returns the probabilities as stored in the records (``PROBA_DTYPE``)."""
+    return np.asarray(y_pred_proba, dtype=PROBA_DTYPE)
+
+
+def decode_probabilities(y_pred_proba_encoded):
+    """Inverse of ``encode_probabilities``, the quantized probabilities of previous versions are dequantized."""
+    if y_pred_proba_encoded.dtype == np.uint16:
+        return dequantize_probabilities(y_pred_proba_encoded)
+    return y_pred_proba_encoded.astype(np.float64)
+
+
+def dequantize_probabilities(y_pred_proba_quantized):
+    """Returns the probabilities quantized to ``uint16`` by previous versions, the rows are normalized to sum to 1."""
+    y_pred_proba = y_pred_proba_quantized.astype(np.float64) / PROBA_QUANTIZATION_LEVELS
+    row_sums = y_pred_proba.sum(axis=1, keepdims=True)
+    np.divide(y_pred_proba, row_sums, out=y_pred_proba, where=row_sums > 0)
+    return y_pred_proba
+
+
+def encode_labels(y, classes: list):
+    """Returns the index of each label of ``y`` in ``classes`` (-1 for unknown labels)."""
+    dtype = np.int16 if len(classes) < np.iinfo(np.int16).max else np.int32
+    uniques, inverse = np.unique(np.asarray(y), return_inverse=True)
+    class_index = {label: i for i, label in enumerate(classes)}
+    codes = np.array([class_index.get(label, -1) for label in uniques.tolist()], dtype=dtype)
+    return codes[inverse.reshape(-1)]
+
+
+def decode_labels(codes, classes: list):
+    """Inverse of ``encode_labels``."""
+    return np.asarray(classes)[codes]
+
+
+class PredictionsRecorder:
+    """Class recording the predictions scored during the construction of a learning curve.
+
+    Each call to ``record`` stores the labels and the probabilities (in ``float32``) scored in the active node of the
+    timer and writes the key of the record in the ``predictions`` entry of the metadata of this node. The records are
+    saved in a single compressed ``.npz`` file (see ``save``) from which missing metrics can be computed (see ``rescore``).
+
+    Example use:
+
+    >>> recorder = PredictionsRecorder()
+    >>> scorer = ClassificationScorer(classes_learner, classes_overall, timer=timer, predictions_recorder=recorder)
+    >>> scorer.score(y_true, y_pred, y_pred_proba)
+    >>> recorder.save("predictions.npz")
+    """
+
+    def __init__(self):
+        self.records = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def record(self, timer: Timer, classes_learner: list, classes_overall: list, y_true, y_pred, y_pred_proba, node=None) -> str:
+        """Records predictions and links them to the active node of ``timer`` (or to ``node``).
+
+        Args:
+            timer (Timer): the timer whose active node is scored.
+            classes_learner (list): the classes corresponding to the columns of ``y_pred_proba``.
+            classes_overall (list): all the classes of the dataset.
+            y_true (np.ndarray): the true labels.
+            y_pred (np.ndarray): the predicted labels.
+            y_pred_proba (np.ndarray): the predicted probabilities.
+            node (TimerNode, optional): the node scored (e.g., by ``ClassificationScorer.score_many``). Defaults to ``None`` for the active node of ``timer``.
+
+        Returns:
+            str: the key of the record.
+        """
+        key = self.add(
+            dict(
+                classes_learner=list(classes_learner),
+                classes_overall=list(classes_overall),
+                y_true=encode_labels(y_true, classes_overall),
+                y_pred=encode_labels(y_pred, classes_overall),
+                y_pred_proba=encode_probabilities(y_pred_proba),
+            )
+        )
+        if node is None:
+            node = timer.active_node
+        node["predictions"] = key
+        return key
+
+    def add(self, record: dict) -> str:
+        """Adds an already encoded record (e.g., from another recorder) and returns its key."""
+        key = str(len(self.records))
+        self.records[key] = record
+        return key
+
+    def save(self, path: str):
+        """Saves the records in a compressed ``.npz`` file."""
+        arrays = {}
+        classes = {}
+        for key, record in self.records.items():
+            classes[key] = dict(
+                classes_learner=record["classes_learner"],
+                classes_overall=record["classes_overall"],
+            )
+            for name in ["y_true", "y_pred", "y_pred_proba"]:
+                arrays[f"{key}/{name}"] = record[name]
+
+        # the classes are stored as JSON to load the file without pickle
+        arrays["classes"] = np.array(lcdb.json.dumps(classes))
+        np.savez_compressed(path, **arrays)
+
+    @staticmethod
+    def load(path: str) -> "PredictionsRecorder":
+        """Loads the records saved with ``save``."""
+        recorder = PredictionsRecorder()
+        with np.load(path, allow_pickle=False) as data:
+            classes = lcdb.json.loads(str(data["classes"]))
+            for key, record_classes in classes.items():
+                recorder.records[key] = dict(
+                    **record_classes,
+                    y_true=data[f"{key}/y_true"],
+                    y_pred=data[f"{key}/y_pred"],
+                    y_pred_proba=data[f"{key}/y_pred_proba"],
+                )
+        return recorder
+
+    def get_predictions(self, key: str):
+        """Returns the true labels, predicted labels and probabilities of a record.
+
+        Returns:
+            tuple: (y_true, y_pred, y_pred_proba, classes_learner, classes_overall)
+        """
+        record = self.records[key]
+        classes_overall = record["classes_overall"]
+        return (
+            decode_labels(record["y_true"], classes_overall),
+            decode_labels(record["y_pred"], classes_overall),
+            decode_probabilities(record["y_pred_proba"]),
+            record["classes_learner"],
+            classes_overall,
+        )
+
+    def rescore(self, tree: dict) -> dict:
+        """Computes the metrics missing from the nodes of a tree (as given by ``Timer.as_json()``) linked to a record,
+        e.g., metrics added to the scorer after the job was run.
+
+        The missing metrics are added as nodes without duration at the end of the scored node. The metrics already in
+        the tree, computed from the exact probabilities, are left unchanged.
+
+        Args:
+            tree (dict): the tree of the timer.
+
+        Returns:
+            dict: the updated tree.
+        """
+        nodes = [tree]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get("children", []))
+
+            key = node.get("metadata", {}).get("predictions")
+            if key is None:
+                continue
+
+            y_true, y_pred, y_pred_proba, classes_learner, classes_overall = self.get_predictions(key)
+            timer = Timer()
+            timer.start(node["tag"])
+            scorer = ClassificationScorer(classes_learner=classes_learner, classes_overall=classes_overall, timer=timer)
+            scorer.score(y_true=y_true, y_pred=y_pred, y_pred_proba=y_pred_proba)
+            timer.stop()
+
+            tags = {child["tag"] for child in node.get("children", [])}
+            for metric_node in timer.as_json().get("children", []):
+                if metric_node["tag"] not in tags:
+                    metric_node["timestamp_start"] = metric_node["timestamp_stop"] = node["timestamp_stop"]
+                    node.setdefault("children", []).append(metric_node)
+        return tree
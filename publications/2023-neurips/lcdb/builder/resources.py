@@ -0,0 +1,150 @@
+import os
+import resource
+import sys
+import tracemalloc
+
+import psutil
+
+# ``ru_maxrss`` is in kilobytes on Linux and in bytes on macOS
+MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+_process = None
+
+
+def get_rss() -> int:
+    """Returns the resident set size of the current process in bytes."""
+    global _process
+    # the process is created again after a fork
+    if _process is None or _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process.memory_info().rss
+
+
+def get_peak_rss(pid: int) -> int:
+    """Returns the peak resident set size (``VmHWM``) of a process in bytes.
+
+    Where ``/proc`` is not available, the current resident set size is returned instead.
+    """
+    try:
+        with open(f"/proc/{pid}/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except FileNotFoundError:
+        pass
+    return psutil.Process(pid).memory_info().rss
+
+
+def get_tree_peak_rss(pid: int) -> int:
+    """Returns the sum of the peak resident set sizes (see ``get_peak_rss``) of a process and its descendants in bytes.
+
+    The memory shared by several processes (e.g., after a fork) is counted once per process, the sum is an upper bound.
+    Descendants which exited before the call are not counted.
+    """
+    process = psutil.Process(pid)
+    pids = [pid] + [child.pid for child in process.children(recursive=True)]
+    total = 0
+    for pid in pids:
+        try:
+            total += get_peak_rss(pid)
+        except (psutil.NoSuchProcess, ProcessLookupError):
+            pass
+    return total
+
+
+def reset_peak_rss() -> bool:
+    """Resets the peak resident set size (``VmHWM``) of the current process to its current resident set size and
+    returns if it is supported (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class ResourceProbe:
+    """Class measuring the resources used by the current process between its creation and ``stop``.
+
+    The measures are returned as flat metadata so that they are stored in numerical columns of a ``NodeTable``:
+
+    - ``cpu_user``, ``cpu_system``: CPU time (in seconds) spent in user and system mode by all the threads of the process (e.g., BLAS threads). A CPU time much lower than the duration of the node indicates waiting (I/O, swapping, etc.).
+    - ``rss_start``, ``rss_stop``: resident set size (in bytes) at the start and stop.
+    - ``max_rss_delta``: increase of the peak resident set size of the process (in bytes), positive only if the node reached a new peak.
+    - ``major_faults``: number of page faults which required an I/O (e.g., from the swap).
+    - ``alloc_peak``: only if allocations are traced (see ``AllocationTracer``), peak of the memory allocated by Python (in bytes) above the memory allocated at the start.
+
+    Args:
+        traced (bool, optional): if the allocations are traced with ``tracemalloc``. Defaults to ``False``.
+    """
+
+    __slots__ = (
+        "usage",
+        "rss",
+        "traced",
+        "alloc_start",
+        "alloc_peak",
+    )
+
+    def __init__(self, traced: bool = False):
+        self.traced = traced
+        self.alloc_start = None
+        self.alloc_peak = None
+        if traced:
+            self.alloc_start = self.alloc_peak = tracemalloc.get_traced_memory()[0]
+        self.rss = get_rss()
+        self.usage = resource.getrusage(resource.RUSAGE_SELF)
+
+    def stop(self, precision: int = 6) -> dict:
+        """Returns the resources used since the creation of the probe."""
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        metadata = {
+            "cpu_user": round(usage.ru_utime - self.usage.ru_utime, precision),
+            "cpu_system": round(usage.ru_stime - self.usage.ru_stime, precision),
+            "rss_start": self.rss,
+            "rss_stop": get_rss(),
+            "max_rss_delta": (usage.ru_maxrss - self.usage.ru_maxrss) * MAXRSS_UNIT,
+            "major_faults": usage.ru_majflt - self.usage.ru_majflt,
+        }
+        if self.traced:
+            metadata["alloc_peak"] = self.alloc_peak - self.alloc_start
+        return metadata
+
+
+class AllocationTracer:
+    """Class tracing the peak of the memory allocated by Python in nested probes with ``tracemalloc``.
+
+    ``tracemalloc`` only has a global peak, which is reset each time a probe starts or stops after being reported to
+    all the active probes. ``tracemalloc`` is started with the first probe (if it was not already tracing) and
+    stopped with the last one as it slows down all allocations.
+    """
+
+    def __init__(self):
+        self.probes = []
+        self.started = False
+
+    def start(self) -> ResourceProbe:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+        self.update_peaks()
+        probe = ResourceProbe(traced=True)
+        self.probes.append(probe)
+        return probe
+
+    def stop(self, probe: ResourceProbe):
+        self.update_peaks()
+        self.probes.remove(probe)
+        if len(self.probes) == 0 and self.started:
+            tracemalloc.stop()
+            self.started = False
+
+    def update_peaks(self):
+        """Reports the peak since the last update to the active probes."""
+        if len(self.probes) == 0:
+            tracemalloc.reset_peak()
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for probe in self.probes:
+            probe.alloc_peak = max(probe.alloc_peak, peak)
+        tracemalloc.reset_peak()
@@ -0,0 +1,193 @@
+import numpy as np
+
+
+def stratified_order(order, y):
+    """Reorder the indices ``order`` such that each of its prefixes has (approximately) the class proportions of
+    ``y``. The relative order of the instances of a same class is preserved.
+
+    Args:
+        order (np.ndarray): indices of the instances.
+        y (np.ndarray): labels of all instances.
+
+    Returns:
+        np.ndarray: the reordered indices.
+    """
+    _, y_codes = np.unique(np.asarray(y)[order], return_inverse=True)
+    y_codes = y_codes.reshape(-1)
+    class_counts = np.bincount(y_codes)
+
+    # rank of each instance among the instances of its class
+    sorted_by_class = np.argsort(y_codes, kind="stable")
+    class_offsets = np.concatenate(([0], np.cumsum(class_counts)[:-1]))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[sorted_by_class] = np.arange(len(order)) - np.repeat(
+        class_offsets, class_counts
+    )
+
+    # the i-th instance of a class of size n is placed at the relative position (i + 0.5) / n
+    position = (rank + 0.5) / class_counts[y_codes]
+    return order[np.argsort(position, kind="stable")]
+
+
+class AnchorSampler:
+    """Class responsible of sampling the training instances of each anchor of a learning curve.
+
+    The training instances of an anchor are described by an array of ``int32`` indices of ``X``. These indices are
+    computed once for all anchors when the sampler is created. The rows of an anchor are then gathered into a
+    read-only buffer which is reused from one anchor to the next so that a single copy of the largest anchor is
+    allocated for the whole learning curve. With monotonic anchors, only the rows which are not in the buffer yet
+    are gathered.
+
+    Example use:
+
+    >>> sampler = AnchorSampler(X_train, y_train, anchors=[16, 32, 64], monotonic=False, random_state=42)
+    >>> X_anchor, y_anchor = sampler.sample(32)
+
+    Args:
+        X (np.ndarray): the training set, or the whole dataset if ``train_indices`` is given (possibly a sparse matrix or a ``TabularArray``, whose anchors are then copied instead of using a buffer).
+        y (np.ndarray): the labels of ``X``.
+        anchors (list): the anchors of the learning curve.
+        monotonic (bool, optional): if ``True`` the sample set of an anchor always contains the sample sets of the smaller anchors. Otherwise, the training set is shuffled differently for each anchor. Defaults to ``True``.
+        stratify (bool, optional): if ``True`` the class proportions of each anchor follow the class proportions of the training set. Defaults to ``False``.
+        random_state (int, optional): random state used to shuffle the training set when ``monotonic=False``. Defaults to ``None``.
+        train_indices (np.ndarray, optional): the indices of the training instances in ``X`` (see ``DatasetSplits``). Defaults to ``None``, i.e., all the instances of ``X``.
+    """
+
+    def __init__(
+        self,
+        X,
+        y,
+        anchors: list,
+        monotonic: bool = True,
+        stratify: bool = False,
+        random_state: int = None,
+        train_indices: np.ndarray = None,
+    ):
+        self.X = X
+        self.y = y
+        self.anchors = list(anchors)
+        self.monotonic = monotonic
+        self.stratify = stratify
+        self.random_state = random_state
+        self.train_indices = train_indices
+
+        num_instances = X.shape[0] if train_indices is None else len(train_indices)
+        y_train = self.y if train_indices is None else np.asarray(self.y)[train_indices]
+        if len(self.anchors) > 0 and max(self.anchors) > num_instances:
+            raise ValueError(
+                f"The largest anchor {max(self.anchors)} is larger than the training set of size {num_instances}."
+            )
+
+        # indices of the instances of each anchor
+        self.indices = {}
+        if self.monotonic:
+            # all anchors are prefixes of the same ordering of the training set
+            order = np.arange(num_instances, dtype=np.int32)
+            if self.stratify:
+                order = stratified_order(order, y_train)
+            if train_indices is not None:
+                order = np.asarray(train_indices)[order]
+            for anchor in self.anchors:
+                self.indices[anchor] = order[:anchor]
+        else:
+            # the training set should be shuffled differently for each anchor
+            # so that the training sets of different anchors do not contain eachother
+            seeds = np.random.RandomState(self.random_state).randint(
+                0, 2**32 - 1, size=len(self.anchors)
+            )
+            for seed, anchor in zip(seeds, self.anchors):
+                order = np.arange(num_instances, dtype=np.int32)
+                np.random.RandomState(seed).shuffle(order)
+                if self.stratify:
+                    order = stratified_order(order, y_train)
+                if train_indices is not None:
+                    order = np.asarray(train_indices)[order]
+                # only the first ``anchor`` indices are needed
+                self.indices[anchor] = order[:anchor].copy()
+
+        # monotonic and not stratified anchors of the training set are views of it and do not need a buffer
+        self.requires_buffer = not self.monotonic or self.stratify or train_indices is not None
+        self._X_buffer = None
+        self._y_buffer = None
+        # number of rows of the buffer which hold the first indices of the monotonic anchors
+        self._num_buffered = 0
+
+    def sample(self, anchor: int):
+        """Returns the training instances and labels of an anchor.
+
+        The returned arrays may be views of an internal buffer which is overwritten by the next call to ``sample``.
+
+        Args:
+            anchor (int): the anchor to sample.
+
+        Returns:
+            tuple: (X, y) the training instances and labels of the anchor.
+        """
+        indices = self.indices[anchor]
+
+        if not self.requires_buffer:
+            return self.X[:anchor], self.y[:anchor]
+
+        if not isinstance(self.X, np.ndarray):
+            # the rows of a sparse matrix (or of a ``TabularArray``) are gathered in a new matrix
+            return self.X[indices], np.asarray(self.y)[indices]
+
+        if self._X_buffer is None:
+            size = max(self.anchors)
+            self._X_buffer = np.empty((size,) + self.X.shape[1:], dtype=self.X.dtype)
+            self._y_buffer = np.empty((size,) + self.y.shape[1:], dtype=self.y.dtype)
+
+        # the anchors of a monotonic curve are prefixes of the same indices, the rows already gathered are kept
+        start = min(self._num_buffered, anchor) if self.monotonic else 0
+        np.take(self.X, indices[start:], axis=0, out=self._X_buffer[start:anchor])
+        np.take(self.y, indices[start:], axis=0, out=self._y_buffer[start:anchor])
+        self._num_buffered = anchor if self.monotonic else 0
+
+        # the returned views are read-only so that the rows kept in the buffer cannot be modified
+        X_anchor = self._X_buffer[:anchor].view()
+        y_anchor = self._y_buffer[:anchor].view()
+        X_anchor.flags.writeable = False
+        y_anchor.flags.writeable = False
+        return X_anchor, y_anchor
+
+
+class EvaluationSampler:
+    """Class responsible of selecting the instances on which predictions are scored.
+
+    At most ``max_instances`` instances are kept. The selection only depends on the labels and on the random state
+    so that the same instances are selected each time a same split is evaluated (e.g., at each epoch).
+
+    Example use:
+
+    >>> sampler = EvaluationSampler(max_instances=1000, random_state=42)
+    >>> X_eval, y_eval = sampler.sample(X_valid, y_valid)
+
+    Args:
+        max_instances (int, optional): the maximum number of instances to keep. Defaults to ``-1`` for no limit.
+        stratify (bool, optional): if ``True`` the class proportions of the selected instances follow the class proportions of the split. Defaults to ``True``.
+        random_state (int, optional): random state of the selection. Defaults to ``None``.
+    """
+
+    def __init__(self, max_instances: int = -1, stratify: bool = True, random_state: int = None):
+        self.max_instances = max_instances
+        self.stratify = stratify
+        self.random_state = random_state
+
+    def indices(self, y):
+        """Returns the sorted indices of the selected instances or ``None`` if all instances are kept."""
+        num_instances = len(y)
+        if self.max_instances <= 0 or num_instances <= self.max_instances:
+            return None
+
+        order = np.arange(num_instances, dtype=np.int32)
+        np.random.RandomState(self.random_state).shuffle(order)
+        if self.stratify:
+            order = stratified_order(order, y)
+        return np.sort(order[: self.max_instances])
+
+    def sample(self, X, y):
+        """Returns the selected instances and labels of a split."""
+        indices = self.indices(y)
+        if indices is None:
+            return X, y
+        return X[indices], np.asarray(y)[indices]
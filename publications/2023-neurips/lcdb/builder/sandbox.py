@@ -0,0 +1,271 @@
+import multiprocessing
+import os
+import signal
+import traceback
+
+from .utils import FunctionCallTimeoutError
+
+# Modules imported once by the fork server so that the workers are forked with them already imported
+PRELOADED_MODULES = [
+    "numpy",
+    "scipy.special",
+    "pandas",
+    "sklearn.base",
+    "sklearn.pipeline",
+    "sklearn.preprocessing",
+    "lcdb.builder.timer",
+    "lcdb.builder.scorer",
+]
+
+
+class WorkerTerminatedError(Exception):
+    """Exception raised when the worker of a ``FitSandbox`` dies while running a call (e.g., killed by the
+    out-of-memory killer or by a signal)."""
+
+    def __init__(self, exitcode: int):
+        super().__init__(f"The worker of the sandbox died while running the function (exit code {exitcode}).")
+        self.exitcode = exitcode
+
+
+class RemoteTraceback(Exception):
+    """Exception carrying the traceback of an exception raised in the worker of a ``FitSandbox``, it is the cause
+    of the exception raised again in the parent process so that both tracebacks are formatted."""
+
+    def __init__(self, tb: str):
+        super().__init__(tb)
+        self.tb = tb
+
+    def __str__(self):
+        return self.tb
+
+
+# Values stored in the worker of a ``FitSandbox`` (see ``FitSandbox.store``)
+_STORED_VALUES = {}
+
+
+def _store(key, value):
+    """Stores a value in the worker of a ``FitSandbox``."""
+    _STORED_VALUES[key] = value
+
+
+def get_stored(key):
+    """Returns a value stored in the worker of a ``FitSandbox`` by ``FitSandbox.store``."""
+    return _STORED_VALUES[key]
+
+
+def _serve(connection, initializer=None, initargs=()):
+    """Main loop of the worker of a ``FitSandbox``: runs the calls received until the connection is closed."""
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        func, args, kwargs = task
+        try:
+            result = (True, func(*args, **kwargs))
+        except BaseException as exception:
+            result = (False, (exception, traceback.format_exc()))
+
+        try:
+            connection.send(result)
+        except Exception:
+            # the result or the exception cannot be pickled
+            connection.send((False, (RuntimeError(f"The result of {func} cannot be sent back."), traceback.format_exc())))
+
+
+class FitSandbox:
+    """Class running function calls (e.g., the fit of a workflow) in a worker process which is killed on timeout.
+
+    Contrary to ``terminate_on_timeout``, whose thread keeps running after the timeout, the worker is killed with
+    ``SIGKILL`` so that the CPU and memory of a timed out call are reclaimed. The worker is reused by the following
+    calls and is only started again after a timeout (or a crash). With the ``forkserver`` start method (the default on
+    POSIX), the workers are forked from a server which imports ``PRELOADED_MODULES`` once, starting a worker then
+    takes a few milliseconds instead of the time to import ``numpy``, ``sklearn``, etc.
+
+    The arguments and the result of each call are pickled, the function must therefore return the objects it modifies
+    (e.g., the fitted workflow). The arguments which are the same for all the calls (e.g., the validation and test
+    data) can be sent once with ``store``. As with all the start methods other than ``fork``, the main module is
+    imported by the worker, a script using a sandbox must therefore guard its entry point with
+    ``if __name__ == "__main__":``.
+
+    Example use:
+
+    >>> with FitSandbox(preload=["lcdb.workflow.sklearn"]) as sandbox:
+    ...     sandbox.store("fit_kwargs", dict(X_valid=X_valid, y_valid=y_valid))
+    ...     workflow = sandbox.call(60, fit_workflow, workflow, "fit", X, y, stored_kwargs="fit_kwargs")
+
+    Args:
+        preload (list, optional): modules imported by the fork server in addition to ``PRELOADED_MODULES`` (e.g., the module of the workflow). Defaults to ``None``.
+        start_method (str, optional): start method of the worker (see ``multiprocessing``). Defaults to ``None`` for ``forkserver`` if available and ``spawn`` otherwise.
+        daemon (bool, optional): if the worker is daemonic, i.e., terminated when this process exits but unable to start processes. Defaults to ``True``.
+        initializer (function, optional): function called by each worker when it starts. Defaults to ``None``.
+        initargs (tuple, optional): arguments of ``initializer``. Defaults to ``()``.
+    """
+
+    def __init__(
+        self,
+        preload: list = None,
+        start_method: str = None,
+        daemon: bool = True,
+        initializer=None,
+        initargs: tuple = (),
+    ):
+        if start_method is None:
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+        self.context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            # only used if the fork server of the process is not started yet
+            self.context.set_forkserver_preload(PRELOADED_MODULES + list(preload or []))
+        self.daemon = daemon
+        self.initializer = initializer
+        self.initargs = initargs
+        self.process = None
+        self.connection = None
+
+        # values to store in the worker and keys of those already sent to the current worker
+        self.stored = {}
+        self.stored_in_worker = set()
+
+    @property
+    def pid(self) -> int:
+        """The process id of the worker, ``None`` if it is not started."""
+        return None if self.process is None else self.process.pid
+
+    def start(self):
+        """Starts the worker if it is not running."""
+        if self.process is not None and self.process.is_alive():
+            return
+        self.kill()
+        self.stored_in_worker = set()
+        self.connection, worker_connection = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_serve,
+            args=(worker_connection, self.initializer, self.initargs),
+            daemon=self.daemon,
+        )
+        try:
+            self.process.start()
+        except BaseException:
+            self.process = None
+            raise
+        finally:
+            worker_connection.close()
+
+    def call(self, timeout, func, *args, **kwargs):
+        """Calls ``func(*args, **kwargs)`` in the worker and returns its result.
+
+        Args:
+            timeout (int): timeout in seconds, ``-1`` (or ``None``) for no timeout.
+            func (function): the function to call, it must be importable by the worker.
+            *args: positional arguments to pass to the function.
+            **kwargs: keyword arguments to pass to the function.
+
+        Raises:
+            FunctionCallTimeoutError: if the call exceeds the timeout, the worker is then killed.
+            MemoryError: if the worker was killed (e.g., by the out-of-memory killer) while running the function.
+        """
+        self.submit(func, *args, **kwargs)
+        if not self.wait(timeout):
+            self.kill()
+            raise FunctionCallTimeoutError(f"Function timeout expired after: {timeout}")
+
+        try:
+            return self.result()
+        except WorkerTerminatedError as exception:
+            if exception.exitcode == -signal.SIGKILL:
+                raise MemoryError("The worker of the sandbox was killed while running the function.") from exception
+            raise
+
+    def store(self, key, value):
+        """Stores ``value`` in the worker, where the functions called get it with ``get_stored(key)``.
+
+        The value is sent to the worker with the next call, and again only if the worker is started again (e.g., after
+        a timeout), instead of being pickled with the arguments of each call.
+        """
+        self.stored[key] = value
+        self.stored_in_worker.discard(key)
+
+    def submit(self, func, *args, **kwargs):
+        """Starts the call of ``func(*args, **kwargs)`` in the worker, its result is given by ``result``."""
+        self.start()
+        for key, value in self.stored.items():
+            if key not in self.stored_in_worker:
+                self.connection.send((_store, (key, value), {}))
+                self.result()
+                self.stored_in_worker.add(key)
+        self.connection.send((func, args, kwargs))
+
+    def wait(self, timeout=None) -> bool:
+        """Waits for the result of the current call at most ``timeout`` seconds (``-1`` or ``None`` for no timeout)
+        and returns if it is available."""
+        return self.connection.poll(None if timeout is None or timeout <= 0 else timeout)
+
+    def result(self):
+        """Returns the result of the current call (see ``submit``) or raises its exception.
+
+        Raises:
+            WorkerTerminatedError: if the worker died while running the call, it is then started again by the next call.
+        """
+        try:
+            success, result = self.connection.recv()
+        except (EOFError, OSError):
+            self.process.join(timeout=1)
+            exitcode = self.process.exitcode
+            self.kill()
+            raise WorkerTerminatedError(exitcode)
+
+        if not success:
+            exception, tb = result
+            raise exception from RemoteTraceback(tb)
+        return result
+
+    def kill(self):
+        """Kills the worker (if any)."""
+        if self.process is not None:
+            if self.process.is_alive():
+                os.kill(self.process.pid, signal.SIGKILL)
+            self.process.join()
+            self.process.close()
+            self.process = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def close(self):
+        """Stops the worker once its current call is done."""
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.connection.send(None)
+                self.process.join(timeout=1)
+            except (BrokenPipeError, OSError):
+                pass
+        self.kill()
+
+    def __enter__(self) -> "FitSandbox":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def fit_workflow(workflow, method: str, *args, stored_kwargs: str = None, **kwargs):
+    """Calls the fit ``method`` of a workflow (e.g., ``"fit"`` or ``"partial_fit"``) in the worker of a
+    ``FitSandbox`` and returns the fitted workflow. The nodes recorded by the timer of the workflow are the children
+    of a ``sandbox`` root node. If ``stored_kwargs`` is given, the keyword arguments stored under this key (see
+    ``FitSandbox.store``) are also passed to the method."""
+    if stored_kwargs is not None:
+        kwargs = dict(get_stored(stored_kwargs), **kwargs)
+    workflow.timer.start("sandbox")
+    getattr(workflow, method)(*args, **kwargs)
+    workflow.timer.stop()
+    return workflow
@@ -1,20 +1,194 @@
-from itertools import combinations, product
+from itertools import combinations
 
 import numpy as np
-from .timer import Timer
+from .timer import Timer, wall_clock_time
 
 from sklearn.metrics import (
-    brier_score_loss,
-    confusion_matrix,
-    log_loss,
-    roc_auc_score,
     mean_squared_error,
     r2_score,
 )
 
+# Dtypes of the probabilities kept by ``sklearn.metrics``, other dtypes are converted to float64
+FLOAT_DTYPES = (np.float64, np.float32, np.float16)
+
+# Cost classes of the metrics, from the cheapest to the most expensive for ``n`` instances and ``k`` classes:
+# "linear" in O(nk), "sort" in O(kn log n) and "pairwise" in O(k^2 n log n)
+METRIC_COSTS = ["linear", "sort", "pairwise"]
+
+# Classification metrics in the order in which they are computed, with their cost class. The one-vs-one variants
+# of the AUC ("auc_ovo") are written in the node of the AUC with the one-vs-rest variants ("auc")
+CLASSIFICATION_METRICS = {
+    "confusion_matrix": "linear",
+    "auc": "sort",
+    "auc_ovo": "pairwise",
+    "log_loss": "linear",
+    "brier_score": "linear",
+}
+
+# Scopes to which the expensive metrics can be restricted (see ``MetricSelection``)
+METRIC_SCOPES = ["final_anchor", "final_epoch", "val"]
+
+# Size (in bytes) of the predictions buffered by ``EpochScoringBuffer`` above which they are scored
+EPOCH_BUFFER_MAX_BYTES = 64 * 1024**2
+
+
+def check_probabilities(y_pred_proba):
+    """Raises a ``ValueError`` if the predicted probabilities are not finite or not in [0, 1]."""
+    if not np.all(np.isfinite(y_pred_proba)):
+        raise ValueError("y_pred_proba contains NaN or infinity.")
+    if y_pred_proba.size > 0 and (y_pred_proba.max() > 1 or y_pred_proba.min() < 0):
+        raise ValueError("y_pred_proba contains values outside of [0, 1].")
+
+
+def get_means(losses) -> np.ndarray:
+    """Returns the mean of each row of ``losses`` in float64.
+
+    The means are computed row by row as a reduction along an axis does not sum the values in the same order as the
+    reduction of a single row, the scores of an epoch are then the same whether it is scored alone or not.
+    """
+    return np.array([np.mean(row) for row in losses], dtype=np.float64)
+
+
+def get_roc_auc(y_true_sorted, y_score_sorted) -> float:
+    """Returns the area under the ROC curve of labels (booleans) sorted by decreasing score.
+
+    The curve is built as in ``sklearn.metrics.roc_curve`` (with ``drop_intermediate=True``) so that the area is the
+    same as ``sklearn.metrics.roc_auc_score``, ``NaN`` if only one class is present.
+    """
+    if y_true_sorted.all() or not y_true_sorted.any():
+        return np.nan
+
+    # last index of each distinct score
+    threshold_idxs = np.append(
+        np.flatnonzero(np.diff(y_score_sorted)), len(y_score_sorted) - 1
+    )
+    tps = np.cumsum(y_true_sorted, dtype=np.float64)[threshold_idxs]
+    fps = 1 + threshold_idxs.astype(np.float64) - tps
+
+    # drop the points collinear with their neighbours
+    if len(fps) > 2:
+        optimal_idxs = np.flatnonzero(
+            np.concatenate(
+                [[True], np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), [True]]
+            )
+        )
+        fps = fps[optimal_idxs]
+        tps = tps[optimal_idxs]
+    fpr = np.append(0.0, fps) / fps[-1]
+    tpr = np.append(0.0, tps) / tps[-1]
+
+    return float((np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2.0).sum())
+
+
+class MetricSelection:
+    """Class selecting the classification metrics computed in a job among ``CLASSIFICATION_METRICS``.
+
+    The expensive metrics, i.e., those with a cost class of at least ``expensive_cost``, are only computed in the
+    scopes of ``expensive_scope``: on the last anchor (``"final_anchor"``), on the last scheduled epoch of an iterative
+    workflow (``"final_epoch"``) and/or on the validation split (``"val"``). When several scopes are given, the
+    expensive metrics are only computed where all of them apply.
+
+    Example use:
+
+    >>> selection = MetricSelection(expensive_scope=["final_anchor", "val"])
+    >>> selection.final_anchor = False
+    >>> selection.get_metric_names(split="val")
+    ['confusion_matrix', 'auc', 'log_loss', 'brier_score']
+
+    Args:
+        metrics (list, optional): the names of the metrics. Defaults to ``None`` for all the metrics.
+        expensive_scope (list, optional): the scopes to which the expensive metrics are restricted (see ``METRIC_SCOPES``). Defaults to ``None`` for no restriction.
+        expensive_cost (str, optional): the cheapest cost class of the expensive metrics (see ``METRIC_COSTS``). Defaults to ``"pairwise"``.
+    """
+
+    def __init__(self, metrics: list = None, expensive_scope: list = None, expensive_cost: str = "pairwise"):
+        metrics = list(CLASSIFICATION_METRICS) if metrics is None else list(metrics)
+        unknown_metrics = [m for m in metrics if m not in CLASSIFICATION_METRICS]
+        if len(unknown_metrics) > 0:
+            raise ValueError(
+                f"Unknown metrics {unknown_metrics}, the metrics must be in {list(CLASSIFICATION_METRICS)}."
+            )
+        expensive_scope = [] if expensive_scope is None else list(expensive_scope)
+        unknown_scopes = [s for s in expensive_scope if s not in METRIC_SCOPES]
+        if len(unknown_scopes) > 0:
+            raise ValueError(f"Unknown scopes {unknown_scopes}, the scopes must be in {METRIC_SCOPES}.")
+        if expensive_cost not in METRIC_COSTS:
+            raise ValueError(f"Cost class must be one of {METRIC_COSTS} but is {expensive_cost}.")
+
+        # the metrics are always computed in the order of the registry
+        self.metrics = [m for m in CLASSIFICATION_METRICS if m in metrics]
+        self.expensive_scope = [s for s in METRIC_SCOPES if s in expensive_scope]
+        self.expensive_cost = expensive_cost
+
+        # if the current anchor is the last one, updated by the builder for each anchor
+        self.final_anchor = True
+
+    def is_expensive(self, metric_name: str) -> bool:
+        return METRIC_COSTS.index(CLASSIFICATION_METRICS[metric_name]) >= METRIC_COSTS.index(self.expensive_cost)
+
+    def get_metric_names(self, split: str = None, final_epoch: bool = True) -> list:
+        """Returns the names of the metrics computed on a split of the current anchor.
+
+        Args:
+            split (str, optional): the split scored (e.g., ``"train"``, ``"val"``, ``"test"``, ``"oob"``). Defaults to ``None``.
+            final_epoch (bool, optional): if the predictions are those of the last scheduled epoch (or of a workflow without epochs). Defaults to ``True``.
+        """
+        in_scope = (
+            ("final_anchor" not in self.expensive_scope or self.final_anchor)
+            and ("final_epoch" not in self.expensive_scope or final_epoch)
+            and ("val" not in self.expensive_scope or split == "val")
+        )
+        return [m for m in self.metrics if in_scope or not self.is_expensive(m)]
+
+    def as_dict(self) -> dict:
+        """Returns the selection as recorded in the metadata of the results."""
+        return {
+            "names": self.metrics,
+            "expensive": [m for m in self.metrics if self.is_expensive(m)],
+            "expensive_scope": self.expensive_scope,
+        }
+
+
+def get_metric_nodes(metric_names: list) -> list:
+    """Returns the tags of the nodes in which the metrics are written, in order."""
+    nodes = []
+    for metric_name in metric_names:
+        node = "auc" if metric_name == "auc_ovo" else metric_name
+        if node not in nodes:
+            nodes.append(node)
+    return nodes
+
 
 class ClassificationScorer:
-    def __init__(self, classes_learner: list, classes_overall: list, timer: Timer = None) -> None:
+    """Class computing the classification metrics of the predictions of a learner.
+
+    The labels are encoded once per call of ``score`` as their index in ``classes_overall`` and all the metrics are
+    computed from the encoded labels with the same floating point operations as ``sklearn.metrics``, i.e., the scores
+    are the same as ``confusion_matrix``, ``roc_auc_score``, ``log_loss`` and ``brier_score_loss`` without the
+    validation and label encoding of each call. The ROC curves of all the AUC variants are built from a single sort
+    of the predicted probabilities of each class.
+
+    The predictions of several epochs of an iterative learner can be scored at once with ``score_many``. The metrics
+    computed (all of ``CLASSIFICATION_METRICS`` by default) can be restricted with a ``MetricSelection``.
+
+    Args:
+        classes_learner (list): the labels known by the learner, in the order of the columns of ``y_pred_proba``.
+        classes_overall (list): all the labels of the dataset.
+        timer (Timer, optional): the timer in which the metrics are recorded. Defaults to ``None`` for a new timer.
+        predictions_recorder (PredictionsRecorder, optional): records the scored predictions. Defaults to ``None``.
+        metric_selection (MetricSelection, optional): selects the metrics computed for each split and epoch. Defaults to ``None`` for all the metrics.
+    """
+
+    metric_names = list(CLASSIFICATION_METRICS)
+
+    def __init__(
+        self,
+        classes_learner: list,
+        classes_overall: list,
+        timer: Timer = None,
+        predictions_recorder=None,
+        metric_selection: MetricSelection = None,
+    ) -> None:
         if not isinstance(classes_learner, list):
             raise ValueError(f"'classes_learner' must be a list but is {type(classes_learner)}")
         if not isinstance(classes_overall, list):
@@ -29,124 +203,462 @@ class ClassificationScorer:
             self.reordering_index = None
         self.timer = Timer() if timer is None else timer
 
-    def score(self, y_true, y_pred, y_pred_proba):
+        # optional PredictionsRecorder to persist the scored predictions
+        self.predictions_recorder = predictions_recorder
+        self.metric_selection = metric_selection
+
+        self.label_indices = {label: i for i, label in enumerate(classes_overall)}
+
+        # position of each label among the sorted labels, ``log_loss`` assumes that the columns are in this order
+        self.sorted_positions = np.empty(len(classes_overall), dtype=np.int64)
+        self.sorted_positions[
+            sorted(range(len(classes_overall)), key=classes_overall.__getitem__)
+        ] = np.arange(len(classes_overall))
+
+    def encode(self, y):
+        """Returns the sorted distinct labels of ``y`` and the index in ``classes_overall`` of each label of ``y``
+        (``-1`` for the labels which are not in ``classes_overall``)."""
+        labels, inverse = np.unique(np.asarray(y), return_inverse=True)
+        indices = np.array(
+            [self.label_indices.get(label, -1) for label in labels.tolist()],
+            dtype=np.int64,
+        )
+        return list(labels), indices[inverse.ravel()]
+
+    def get_metric_names(self, split: str = None, final_epoch: bool = True) -> list:
+        """Returns the names of the metrics computed on a split (see ``MetricSelection.get_metric_names``)."""
+        if self.metric_selection is None:
+            return self.metric_names
+        return self.metric_selection.get_metric_names(split=split, final_epoch=final_epoch)
+
+    def score(self, y_true, y_pred, y_pred_proba, split: str = None, final_epoch: bool = True):
+
+        if self.predictions_recorder is not None:
+            self.predictions_recorder.record(
+                self.timer, self.classes_learner, self.classes_overall, y_true, y_pred, y_pred_proba
+            )
+
+        predictions = self.encode_predictions(
+            y_true, np.asarray(y_pred)[None], np.asarray(y_pred_proba)[None]
+        )
+
+        scores = {}
+
+        metric_names = self.get_metric_names(split=split, final_epoch=final_epoch)
+        for metric_name in get_metric_nodes(metric_names):
+            with self.timer.time(metric_name) as metric_timer:
+                score = self.get_scores(metric_name, *predictions, metric_names=metric_names)[0]
+
+                metric_timer["value"] = score
+
+                scores[metric_name] = score
+        return scores
+
+    def score_many(
+        self, y_true, y_pred, y_pred_proba, parents: list, split: str = None, final_epoch: bool = True
+    ) -> list:
+        """Scores the predictions of several epochs at once.
+
+        Each metric is computed for all the epochs in a single pass and written in a node of each epoch as the last
+        child of its node in ``parents`` (e.g., the node of the split in the epoch, which can already be stopped).
+        These nodes are not timed, they start and stop when their parent stops, the scoring of all the epochs is timed
+        in a single ``bulk_metrics`` node of the active node (with the ``split`` and ``num_epochs`` in its metadata).
+
+        Args:
+            y_true (np.ndarray): the true labels of shape ``(n_samples,)``.
+            y_pred (np.ndarray): the predicted labels of shape ``(n_epochs, n_samples)``.
+            y_pred_proba (np.ndarray): the predicted probabilities of shape ``(n_epochs, n_samples, n_classes_learner)``.
+            parents (list): for each epoch, the node of the timer in which the metrics are written.
+            split (str, optional): the split scored (see ``MetricSelection``). Defaults to ``None``.
+            final_epoch (bool, optional): if the last epoch is the last scheduled epoch, the others never are. Defaults to ``True``.
+
+        Returns:
+            list: for each epoch, the scores as returned by ``score``.
+        """
+        y_pred = np.asarray(y_pred)
+        y_pred_proba = np.asarray(y_pred_proba)
+        if not (len(parents) == len(y_pred) == len(y_pred_proba)):
+            raise ValueError(
+                f"The number of parents ({len(parents)}), of predictions ({len(y_pred)}) and of probabilities "
+                f"({len(y_pred_proba)}) must be the same."
+            )
+
+        if self.predictions_recorder is not None:
+            for parent, y_pred_epoch, y_pred_proba_epoch in zip(parents, y_pred, y_pred_proba):
+                self.predictions_recorder.record(
+                    self.timer, self.classes_learner, self.classes_overall, y_true, y_pred_epoch, y_pred_proba_epoch,
+                    node=parent,
+                )
+
+        predictions = self.encode_predictions(y_true, y_pred, y_pred_proba)
+
+        scores = [{} for _ in parents]
+
+        # the epochs are scored by groups of epochs with the same metrics
+        labels_in_ground_truth, y_true_encoded, y_pred_encoded, y_pred_proba = predictions
+        metric_names = self.get_metric_names(split=split, final_epoch=False)
+        final_metric_names = self.get_metric_names(split=split, final_epoch=final_epoch)
+        if metric_names == final_metric_names:
+            groups = [(0, metric_names)]
+        else:
+            groups = [(0, metric_names), (len(parents) - 1, final_metric_names)]
+
+        with self.timer.time("bulk_metrics", metadata={"split": split, "num_epochs": len(parents)}):
+            for k, (first, group_metric_names) in enumerate(groups):
+                last = groups[k + 1][0] if k + 1 < len(groups) else len(parents)
+                if first == last:
+                    continue
+                group_predictions = (
+                    labels_in_ground_truth,
+                    y_true_encoded,
+                    y_pred_encoded[first:last],
+                    y_pred_proba[first:last],
+                )
+
+                for metric_name in get_metric_nodes(group_metric_names):
+                    metric_scores = self.get_scores(metric_name, *group_predictions, metric_names=group_metric_names)
+
+                    for i, score in enumerate(metric_scores):
+                        parent = parents[first + i]
+                        timestamp = parent.timestamp_end if parent.timestamp_end is not None else wall_clock_time()
+                        self.timer.add_node(parent, metric_name, timestamp, timestamp, metadata={"value": score})
+                        scores[first + i][metric_name] = score
+        return scores
+
+    def score_missing(self, y_true, y_pred, y_pred_proba, node, split: str = None, final_epoch: bool = True) -> dict:
+        """Scores predictions already scored in ``node`` with the metrics that are missing from it, e.g., the
+        expensive metrics of an anchor which turns out to be the last one (see ``MetricSelection``).
+
+        The missing metrics are written as untimed nodes at the end of ``node`` (as in ``score_many``) and the missing
+        variants of the AUC are added to the value of its node.
+
+        Returns:
+            dict: the scores of the updated nodes.
+        """
+        predictions = self.encode_predictions(y_true, np.asarray(y_pred)[None], np.asarray(y_pred_proba)[None])
+
+        metric_nodes = {child.tag: child for child in node.children}
+        metric_names = self.get_metric_names(split=split, final_epoch=final_epoch)
+        timestamp = node.timestamp_end if node.timestamp_end is not None else wall_clock_time()
+
+        scores = {}
+        for metric_name in get_metric_nodes(metric_names):
+            metric_node = metric_nodes.get(metric_name)
+            if metric_node is None:
+                score = self.get_scores(metric_name, *predictions, metric_names=metric_names)[0]
+                self.timer.add_node(node, metric_name, timestamp, timestamp, metadata={"value": score})
+                scores[metric_name] = score
+            elif metric_name == "auc" and isinstance(metric_node.metadata.get("value"), dict):
+                # the one-vs-rest and one-vs-one variants of the multiclass AUC share the same node
+                value = metric_node["value"]
+                prefixes = {"auc": "auc_ovr_", "auc_ovo": "auc_ovo_"}
+                missing = [
+                    m for m in prefixes
+                    if m in metric_names and not any(k.startswith(prefixes[m]) for k in value)
+                ]
+                if missing:
+                    value.update(self.get_scores(metric_name, *predictions, metric_names=missing)[0])
+                    scores[metric_name] = value
+        return scores
+
+    def encode_predictions(self, y_true, y_pred, y_pred_proba):
+        """Returns the sorted distinct labels of the ground truth, the encoded true and predicted labels and the
+        probabilities over ``classes_overall`` of stacked predictions (see ``score_many``)."""
 
         # make sure that y_predict_proba is a matrix over all known labels (not only the ones known to the learner)
         if len(self.padded_classes) > 0:
             expansion_matrix = np.zeros(
-                (len(y_true), len(self.padded_classes))
+                y_pred_proba.shape[:2] + (len(self.padded_classes),)
             )
-            y_pred_proba = np.concatenate([y_pred_proba, expansion_matrix], axis=1)
-            y_pred_proba = y_pred_proba[:, self.reordering_index]
+            y_pred_proba = np.concatenate([y_pred_proba, expansion_matrix], axis=2)
+            y_pred_proba = y_pred_proba[:, :, self.reordering_index]
+        if y_pred_proba.dtype not in FLOAT_DTYPES:
+            y_pred_proba = y_pred_proba.astype(np.float64)
+
+        labels_in_ground_truth, y_true_encoded = self.encode(y_true)
+        _, y_pred_encoded = self.encode(y_pred)
+        y_pred_encoded = y_pred_encoded.reshape(y_pred.shape)
+
+        is_binary = len(labels_in_ground_truth) == 2
+        check_probabilities(y_pred_proba[:, :, 1] if is_binary else y_pred_proba)
+
+        return labels_in_ground_truth, y_true_encoded, y_pred_encoded, y_pred_proba
 
-        labels_in_ground_truth = sorted(np.unique(y_true))
+    def get_scores(
+        self, metric_name: str, labels_in_ground_truth, y_true_encoded, y_pred_encoded, y_pred_proba, metric_names=None
+    ) -> list:
+        """Returns the rounded scores of each epoch for a metric (see ``encode_predictions`` for the arguments).
+
+        The variants of the AUC in its node are those of ``metric_names`` (``"auc"`` for the one-vs-rest variants and
+        ``"auc_ovo"`` for the one-vs-one variants), all of them by default."""
+        metric_names = self.metric_names if metric_names is None else metric_names
         num_labels_in_ground_truth = len(labels_in_ground_truth)
         is_unary = num_labels_in_ground_truth == 1
         is_binary = num_labels_in_ground_truth == 2
 
-        metric_names = [
-            "confusion_matrix",
-            "auc",
-            "log_loss",
-            "brier_score",
+        if metric_name == "confusion_matrix":
+            return np.round(
+                self.get_confusion_matrices(y_true_encoded, y_pred_encoded), 5
+            ).tolist()
+
+        if metric_name == "auc":
+            if is_unary:
+                return [np.nan] * len(y_pred_proba)  # AUC not defined for single class problems
+            if is_binary:
+                return [
+                    np.round(auc, 5)
+                    for auc in self.get_binary_auc(y_true_encoded, labels_in_ground_truth, y_pred_proba)
+                ]
+            return [
+                {
+                    name: np.round(auc, 5)
+                    for name, auc in self.get_multiclass_auc(
+                        y_true_encoded,
+                        labels_in_ground_truth,
+                        y_pred_proba_epoch,
+                        ovr="auc" in metric_names,
+                        ovo="auc_ovo" in metric_names,
+                    ).items()
+                }
+                for y_pred_proba_epoch in y_pred_proba
+            ]
+
+        if metric_name == "log_loss":
+            return list(np.round(self.get_log_loss(y_true_encoded, y_pred_proba, is_binary), 5))
+
+        if metric_name == "brier_score":
+            return list(np.round(self.get_brier_score(y_true_encoded, y_pred_proba, is_binary), 5))
+
+        raise ValueError(f"Unknown metric '{metric_name}'.")
+
+    def get_confusion_matrices(self, y_true_encoded, y_pred_encoded) -> np.ndarray:
+        """Same as ``sklearn.metrics.confusion_matrix`` with ``labels=classes_overall`` for each epoch, the instances
+        of unknown labels are ignored."""
+        num_epochs = len(y_pred_encoded)
+        num_classes = len(self.classes_overall)
+        if not np.any(y_true_encoded >= 0):
+            raise ValueError("At least one label specified must be in y_true")
+        y_true_encoded = np.broadcast_to(y_true_encoded, y_pred_encoded.shape)
+        epochs = np.broadcast_to(np.arange(num_epochs)[:, None], y_pred_encoded.shape)
+        known = (y_true_encoded >= 0) & (y_pred_encoded >= 0)
+        return np.bincount(
+            (epochs[known] * num_classes + y_true_encoded[known]) * num_classes + y_pred_encoded[known],
+            minlength=num_epochs * num_classes**2,
+        ).reshape(num_epochs, num_classes, num_classes)
+
+    def get_binary_auc(self, y_true_encoded, labels_in_ground_truth, y_pred_proba) -> list:
+        """Same as ``sklearn.metrics.roc_auc_score`` with the probabilities of the second class for each epoch, the
+        positive label is the greatest label of the ground truth."""
+        is_positive = y_true_encoded == self.label_indices.get(labels_in_ground_truth[-1], -1)
+        y_score = y_pred_proba[:, :, 1]
+        orders = np.argsort(y_score, axis=1, kind="stable")[:, ::-1]
+        return [
+            get_roc_auc(is_positive[order], y_score_epoch[order])
+            for y_score_epoch, order in zip(y_score, orders)
+        ]
+
+    def get_multiclass_auc(
+        self, y_true_encoded, labels_in_ground_truth, y_pred_proba, ovr: bool = True, ovo: bool = True
+    ) -> dict:
+        """Same as ``sklearn.metrics.roc_auc_score`` with all the combinations of ``multi_class`` and ``average``,
+        restricted to the labels of the ground truth (and those predicted if the learner does not know all of them).
+        The one-vs-rest and one-vs-one variants are only computed if ``ovr`` and ``ovo`` respectively."""
+
+        # if the learner has a superset of the ground truth labels, only use the ground truth labels
+        if set(labels_in_ground_truth).issubset(set(self.classes_learner)):
+            accepted_labels = labels_in_ground_truth
+
+        # otherwise use all the labels that are either present in ground truth or in the predictions
+        else:
+            in_ground_truth = np.zeros(len(self.classes_overall), dtype=bool)
+            in_ground_truth[y_true_encoded[y_true_encoded >= 0]] = True
+            in_predictions = y_pred_proba.sum(axis=0) > 0
+            accepted_labels = [
+                l for i, l in enumerate(self.classes_overall)
+                if in_ground_truth[i] or in_predictions[i]
+            ]
+
+        # generate a proper distribution over the remaining labels
+        mask_labels_auc = np.isin(self.classes_overall, accepted_labels)
+        y_pred_proba_auc = y_pred_proba[:, mask_labels_auc]
+        if len(labels_in_ground_truth) != len(self.classes_learner):
+            y_pred_proba_auc /= y_pred_proba_auc.sum(axis=1, keepdims=1)
+
+        if not np.allclose(1, y_pred_proba_auc.sum(axis=1)):
+            raise ValueError(
+                "Target scores need to be probabilities for multiclass "
+                "roc_auc, i.e. they should sum up to 1.0 over classes"
+            )
+        if accepted_labels != sorted(accepted_labels):
+            raise ValueError("Parameter 'labels' must be ordered")
+        num_classes = len(accepted_labels)
+        if num_classes != y_pred_proba_auc.shape[1]:
+            raise ValueError(
+                f"Number of given labels, {num_classes}, not equal to the number "
+                f"of columns in 'y_score', {y_pred_proba_auc.shape[1]}"
+            )
+
+        # index of the labels among the accepted labels, the last entry maps the unknown labels (-1) to -1
+        accepted_indices = {label: j for j, label in enumerate(accepted_labels)}
+        y_true_auc = np.array(
+            [accepted_indices.get(label, -1) for label in self.classes_overall] + [-1],
+            dtype=np.int64,
+        )[y_true_encoded]
+        if np.any(y_true_auc < 0):
+            raise ValueError("'y_true' contains labels not in parameter 'labels'")
+        class_counts = np.bincount(y_true_auc, minlength=num_classes)
+
+        # the instances sorted by decreasing probability of each class
+        orders = [
+            np.argsort(y_pred_proba_auc[:, j], kind="stable")[::-1]
+            for j in range(num_classes)
         ]
 
         scores = {}
 
-        for metric_name in metric_names:
-            with self.timer.time(metric_name) as metric_timer:
-                score = None
+        # one-vs-rest
+        if ovr:
+            ovr_scores = np.zeros(num_classes)
+            for j, order in enumerate(orders):
+                ovr_scores[j] = get_roc_auc(y_true_auc[order] == j, y_pred_proba_auc[order, j])
+            y_true_flat = (y_true_auc[:, None] == np.arange(num_classes)).ravel()
+            y_score_flat = y_pred_proba_auc.ravel()
+            order = np.argsort(y_score_flat, kind="stable")[::-1]
+            class_weights = class_counts.astype(np.float64)
+            weighted_ovr_scores = np.where(class_counts == 0, 0, ovr_scores)
 
-                if metric_name == "confusion_matrix":
-                    score = np.round(
-                        confusion_matrix(y_true, y_pred, labels=self.classes_overall), 5
-                    ).tolist()
-
-                elif metric_name == "auc":
-                    if is_unary:
-                        score = np.nan  # AUC not defined for single class problems
-                    elif is_binary:
-                        score = np.round(
-                            roc_auc_score(
-                                y_true, y_pred_proba[:, 1], labels=self.classes_overall
-                            ),
-                            5,
-                        )
-                    else:
-
-                        # if the learner has a superset of the ground truth labels, only use the ground truth labels
-                        if set(y_true).issubset(set(self.classes_learner)):
-                            accepted_labels = labels_in_ground_truth
-
-                        # otherwise use all the labels that are either present in ground truth or in the predictions
-                        else:
-                            accepted_labels = [
-                                l for i, l in enumerate(self.classes_overall)
-                                if (
-                                    l in y_true or
-                                    y_pred_proba[:, i].sum() > 0
-                                )
-                            ]
-
-                        # generate a proper distribution over the remaining labels
-                        mask_labels_auc = np.isin(self.classes_overall, accepted_labels)
-                        y_pred_proba_auc = y_pred_proba[:, mask_labels_auc]
-                        if num_labels_in_ground_truth != len(self.classes_learner):
-                            y_pred_proba_auc /= y_pred_proba_auc.sum(axis=1, keepdims=1)
-
-                        # compute the different AUC scores
-                        score = {}
-                        for multi_class, average in product(
-                            ["ovr", "ovo"], ["micro", "macro", "weighted", None]
-                        ):
-                            if average in [None, "micro"] and multi_class != "ovr":
-                                continue
-                            try:
-                                auc = np.round(
-                                    roc_auc_score(
-                                        y_true=y_true,
-                                        y_score=y_pred_proba_auc,
-                                        labels=accepted_labels,
-                                        multi_class=multi_class,
-                                        average=average,
-                                    ),
-                                    5,
-                                )
-                            except ValueError as e:
-                                if "Only one class present in y_true." in str(e):
-                                    auc = np.nan
-                                else:
-                                    raise e
-
-                            score[f"auc_{multi_class}_{average}"] = auc
-                elif metric_name == "log_loss":
-                    y_base = y_pred_proba[:, 1] if is_binary else y_pred_proba
-                    score = np.round(
-                        log_loss(y_true, y_base, labels=self.classes_overall), 5
-                    )
-                elif metric_name == "brier_score":
-                    if is_binary:
-                        score = np.round(
-                            brier_score_loss(
-                                y_true, y_pred_proba[:, 1], pos_label=self.classes_overall[1]
-                            ),
-                            5,
-                        )
-                    else:
-                        y_true_binarized = np.zeros((len(y_true), len(self.classes_overall)))
-                        for j, label in enumerate(self.classes_overall):
-                            mask = y_true == label
-                            y_true_binarized[mask, j] = 1
-                        score = np.round(
-                            ((y_true_binarized - y_pred_proba) ** 2).sum(axis=1).mean(),
-                            5,
-                        )
+            scores["auc_ovr_micro"] = get_roc_auc(y_true_flat[order], y_score_flat[order])
+            scores["auc_ovr_macro"] = float(np.mean(ovr_scores))
+            scores["auc_ovr_weighted"] = float(
+                (weighted_ovr_scores * class_weights).sum() / class_weights.sum()
+            )
+            scores["auc_ovr_None"] = ovr_scores
 
-                metric_timer["value"] = score
+        # one-vs-one over the pairs of labels of the ground truth
+        if ovo:
+            pairs = list(combinations(np.flatnonzero(class_counts).tolist(), 2))
+            ovo_scores = np.empty(len(pairs))
+            prevalence = np.empty(len(pairs))
+            for ix, (a, b) in enumerate(pairs):
+                ab_mask = (y_true_auc == a) | (y_true_auc == b)
+                prevalence[ix] = np.average(ab_mask)
+                order_a = orders[a][ab_mask[orders[a]]]
+                order_b = orders[b][ab_mask[orders[b]]]
+                a_true_score = get_roc_auc(y_true_auc[order_a] == a, y_pred_proba_auc[order_a, a])
+                b_true_score = get_roc_auc(y_true_auc[order_b] == b, y_pred_proba_auc[order_b, b])
+                ovo_scores[ix] = (a_true_score + b_true_score) / 2
+
+            scores["auc_ovo_macro"] = np.average(ovo_scores)
+            scores["auc_ovo_weighted"] = np.average(ovo_scores, weights=prevalence)
 
-                scores[metric_name] = score
         return scores
 
+    def get_log_loss(self, y_true_encoded, y_pred_proba, is_binary) -> np.ndarray:
+        """Same as ``sklearn.metrics.log_loss`` with ``labels=classes_overall`` for each epoch, which assumes that the
+        columns of ``y_pred_proba`` are in the order of the sorted labels. In the binary case, only the probabilities
+        of the second class are used."""
+        if np.any(y_true_encoded < 0):
+            raise ValueError("y_true contains values not belonging to 'classes_overall'.")
+        columns = self.sorted_positions[y_true_encoded]
+        if is_binary:
+            if len(self.classes_overall) != 2:
+                raise ValueError(
+                    "The number of classes in labels is different from that in y_prob. "
+                    f"Classes found in labels: {sorted(self.classes_overall)}"
+                )
+            proba = y_pred_proba[:, :, 1]
+            proba = np.where(columns == 1, proba, 1 - proba)
+        else:
+            proba = y_pred_proba[:, np.arange(len(columns)), columns]
+        eps = np.finfo(proba.dtype).eps
+        proba = np.clip(proba, eps, 1 - eps)
+        return get_means(-np.log(proba))
+
+    def get_brier_score(self, y_true_encoded, y_pred_proba, is_binary) -> np.ndarray:
+        """In the binary case, same as ``sklearn.metrics.brier_score_loss`` with the probabilities of the second class
+        (i.e., half of the multiclass Brier score) for each epoch. Otherwise, the mean over the instances of the
+        squared distance between the probabilities and the one-hot encoded label."""
+        if is_binary:
+            proba = y_pred_proba[:, :, 1]
+            is_positive = (y_true_encoded == 1).astype(proba.dtype)
+            return get_means(((1 - is_positive) - (1 - proba)) ** 2 + (is_positive - proba) ** 2) * 0.5
+
+        known = np.flatnonzero(y_true_encoded >= 0)
+        y_true_binarized = np.zeros((len(y_true_encoded), len(self.classes_overall)))
+        y_true_binarized[known, y_true_encoded[known]] = 1
+        return get_means(
+            [((y_true_binarized - y_pred_proba_epoch) ** 2).sum(axis=1) for y_pred_proba_epoch in y_pred_proba]
+        )
+
+
+class EpochScoringBuffer:
+    """Class buffering the predictions of the epochs of an iterative workflow to score them together with
+    ``ClassificationScorer.score_many``.
+
+    The memory of the buffer is bounded: the predictions are scored by batches of epochs once they take more than
+    ``max_bytes`` (see ``flush_if_full``, called before an epoch starts so that the last epoch is scored with
+    ``flush`` at the end of the training, or when the training is interrupted).
+
+    Example use:
+
+    >>> buffer = EpochScoringBuffer(scorer, {"train": y_train, "val": y_valid, "test": y_test})
+    >>> for epoch in epochs:
+    ...     buffer.flush_if_full()
+    ...     with timer.time("val") as split_timer:
+    ...         buffer.add("val", split_timer, y_pred, y_pred_proba)
+    >>> buffer.flush()
+
+    Args:
+        scorer (ClassificationScorer): the scorer of the predictions.
+        y_true (dict): for each split, the true labels.
+        max_bytes (int, optional): the size of the predictions above which they are scored. Defaults to ``EPOCH_BUFFER_MAX_BYTES``.
+    """
+
+    def __init__(self, scorer: ClassificationScorer, y_true: dict, max_bytes: int = EPOCH_BUFFER_MAX_BYTES):
+        self.scorer = scorer
+        self.y_true = y_true
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+        self.predictions = {label_split: ([], [], []) for label_split in y_true}
+
+    def add(self, split: str, node, y_pred, y_pred_proba):
+        """Buffers the predictions of an epoch on a split, whose metrics are written in ``node`` when scored."""
+        y_pred = np.asarray(y_pred)
+        y_pred_proba = np.asarray(y_pred_proba)
+        nodes, y_preds, y_pred_probas = self.predictions[split]
+        nodes.append(node)
+        y_preds.append(y_pred)
+        y_pred_probas.append(y_pred_proba)
+        self.num_bytes += y_pred.nbytes + y_pred_proba.nbytes
+
+    def flush_if_full(self):
+        """Scores the buffered predictions if they take more than ``max_bytes``. To be called when another epoch
+        follows, the buffered epochs are then not the last scheduled one."""
+        if self.num_bytes > self.max_bytes:
+            self.flush(final_epoch=False)
+
+    def flush(self, final_epoch: bool = True):
+        """Scores the buffered predictions of each split (see ``ClassificationScorer.score_many``) and empties the
+        buffer.
+
+        Args:
+            final_epoch (bool, optional): if the last buffered epoch is the last scheduled epoch. Defaults to ``True``.
+        """
+        predictions = self.predictions
+        self.predictions = {label_split: ([], [], []) for label_split in self.y_true}
+        self.num_bytes = 0
+        for label_split, (nodes, y_preds, y_pred_probas) in predictions.items():
+            if len(nodes) == 0:
+                continue
+            self.scorer.score_many(
+                y_true=self.y_true[label_split],
+                y_pred=np.stack(y_preds),
+                y_pred_proba=np.stack(y_pred_probas),
+                parents=nodes,
+                split=label_split,
+                final_epoch=final_epoch,
+            )
+
 
 class RegressionScorer:
     def __init__(self, timer: Timer = None) -> None:
@@ -1,12 +1,26 @@
 import logging
 import pprint
 import time
-from contextlib import contextmanager
 from typing import Any, Hashable
 
 import lcdb.json
 import numpy as np
 
+from .node_table import NodeTable
+from .resources import AllocationTracer, ResourceProbe
+
+
+logger = logging.getLogger(__name__)
+
+# Offset between the wall clock and the performance counter (in nanoseconds), measured once so that timestamps are
+# both precise and monotonic while remaining comparable to ``time.time()`` (e.g., across processes)
+WALL_CLOCK_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+def wall_clock_time() -> float:
+    """Returns the current time in seconds since the epoch, measured with ``time.perf_counter_ns``."""
+    return (time.perf_counter_ns() + WALL_CLOCK_OFFSET_NS) / 1_000_000_000
+
 
 # !Private class to be used within the Timer class
 class TimerNode:
@@ -14,6 +28,20 @@ class TimerNode:
     STOPPED: str = "STOPPED"
     CANCELED: str = "CANCELED"
 
+    # millions of nodes can be created for a single job (e.g., one per epoch and metric)
+    __slots__ = (
+        "id",
+        "precision",
+        "tag",
+        "status",
+        "cancellation_source_id",
+        "timestamp_start",
+        "timestamp_end",
+        "metadata",
+        "children",
+        "probe",
+    )
+
     def __init__(
         self, id_: int, tag: str, metadata: dict = None, precision: int = 6
     ) -> None:
@@ -25,7 +53,7 @@ class TimerNode:
         self.status = TimerNode.STARTED
         self.cancellation_source_id = None
 
-        self.timestamp_start = self.time()
+        self.timestamp_start = wall_clock_time()
         self.timestamp_end = None
 
         assert metadata is None or isinstance(metadata, dict)
@@ -33,18 +61,17 @@ class TimerNode:
 
         self.children = []
 
-    def time(self) -> float:
-        # return np.round(time.time(), decimals=self.precision)
-        return time.time()
+        # resources measured until the node is stopped (see ``Timer``)
+        self.probe = None
 
     def stop(self, metadata=None):
-        self.timestamp_end = self.time()
+        self.timestamp_end = wall_clock_time()
         if metadata is not None:
             self.metadata.update(metadata)
         self.status = TimerNode.STOPPED
 
     def cancel(self):
-        self.timestamp_end = self.time()
+        self.timestamp_end = wall_clock_time()
         self.status = TimerNode.CANCELED
 
     def __getitem__(self, key):
@@ -54,37 +81,101 @@ class TimerNode:
         self.metadata[key] = value
 
     def as_dict(self, timestamp_offset: float = 0) -> dict:
-        out = dict(
-            # id=self.id,
-            tag=self.tag,
-            timestamp_start=np.round(
-                self.timestamp_start - timestamp_offset, self.precision
-            ),
-            timestamp_stop=np.round(
-                self.timestamp_end - timestamp_offset, self.precision
-            ),
-            # TODO: remove because redundant with timestamp_start/end
-            # duration=np.round(
-            #     self.timestamp_end - self.timestamp_start, self.precision
-            # ),
-            # status=self.status,
+        # nodes of the branch in pre-order
+        nodes = []
+        branch = [self]
+        while branch:
+            node = branch.pop()
+            nodes.append(node)
+            branch.extend(reversed(node.children))
+
+        # the timestamps of all nodes are rounded at once
+        timestamps = np.array(
+            [(n.timestamp_start, n.timestamp_end) for n in nodes], dtype=np.float64
         )
+        timestamps = np.round(timestamps - timestamp_offset, self.precision).tolist()
+
+        outs = {}
+        for node, (timestamp_start, timestamp_stop) in zip(nodes, timestamps):
+            out = dict(
+                # id=node.id,
+                tag=node.tag,
+                timestamp_start=timestamp_start,
+                timestamp_stop=timestamp_stop,
+                # TODO: remove because redundant with timestamp_start/end
+                # duration=np.round(
+                #     node.timestamp_end - node.timestamp_start, node.precision
+                # ),
+                # status=node.status,
+            )
+
+            if len(node.metadata) > 0:
+                out["metadata"] = node.metadata
+
+            if len(node.children) > 0:
+                # children come after their parent in the pre-order
+                out["children"] = node.children
+
+            if node.cancellation_source_id:
+                out["cancellation_source_id"] = node.cancellation_source_id
 
-        if len(self.metadata) > 0:
-            out["metadata"] = self.metadata
+            outs[id(node)] = out
 
-        if len(self.children) > 0:
-            out["children"] = [c.as_dict(timestamp_offset) for c in self.children]
+        for out in outs.values():
+            if "children" in out:
+                out["children"] = [outs[id(c)] for c in out["children"]]
 
-        if self.cancellation_source_id:
-            out["cancellation_source_id"] = self.cancellation_source_id
+        return outs[id(self)]
 
-        return out
+    @staticmethod
+    def from_dict(d: dict, precision: int = 6) -> "TimerNode":
+        """Creates a stopped node (and its children) from the output of ``as_dict`` with ``timestamp_offset=0``.
+
+        The ids of the created nodes are all 0, they are assigned when the node is attached to a timer (see ``Timer.attach``).
+        """
+        node = TimerNode(0, d["tag"], dict(d.get("metadata", {})), precision)
+        node.timestamp_start = d["timestamp_start"]
+        node.timestamp_end = d["timestamp_stop"]
+        node.status = TimerNode.STOPPED
+        if "cancellation_source_id" in d:
+            node.status = TimerNode.CANCELED
+            node.cancellation_source_id = d["cancellation_source_id"]
+        node.children = [TimerNode.from_dict(c, precision) for c in d.get("children", [])]
+        return node
 
     def __repr__(self) -> str:
         return f"TimerNode(id={self.id}, tag={self.tag}, status={self.status})"
 
 
+class TimerContext:
+    """Context manager returned by ``Timer.time``."""
+
+    __slots__ = ("timer", "tag", "metadata", "cancel_on_error", "node_id")
+
+    def __init__(self, timer: "Timer", tag: Hashable, metadata: dict, cancel_on_error: bool):
+        self.timer = timer
+        self.tag = tag
+        self.metadata = metadata
+        self.cancel_on_error = cancel_on_error
+        self.node_id = None
+
+    def __enter__(self) -> TimerNode:
+        self.node_id = self.timer.start(self.tag, self.metadata)
+        return self.timer.stack[-1]
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        if exc_type is None:
+            self.timer.stop()
+            return False
+
+        if self.cancel_on_error:
+            self.timer.cancel(self.node_id)
+            # the exception is not propagated
+            return True
+
+        return False
+
+
 class Timer:
     """Class representing a timing profiler.
 
@@ -98,16 +189,35 @@ class Timer:
     >>> timer.stop()
     >>> time.as_dict()
 
+    The resources used by the nodes with some tags can also be recorded in their metadata (see ``ResourceProbe``):
+
+    >>> timer = Timer(resource_tags=["anchor", "fit"], tracemalloc_tags=["fit"])
+
     Args:
         precision (int): Number of digits recorded in measurement.
+        resource_tags (list, optional): Tags of the nodes for which the CPU time and memory of the process are recorded. Defaults to ``None``.
+        tracemalloc_tags (list, optional): Tags of the nodes for which the peak of the memory allocated by Python is also recorded with ``tracemalloc``, which slows down allocations while these nodes are active. Defaults to ``None``.
     """
 
-    def __init__(self, precision: int = 6):
+    def __init__(
+        self,
+        precision: int = 6,
+        resource_tags: list = None,
+        tracemalloc_tags: list = None,
+    ):
         self.root = None
         self.stack = []
         self.precision = precision
         self.id_counter = 0
 
+        # ids of the nodes of the stack for constant time lookups
+        self.stack_ids = set()
+
+        self.resource_tags = frozenset(resource_tags or [])
+        self.tracemalloc_tags = frozenset(tracemalloc_tags or [])
+        self.probed_tags = self.resource_tags | self.tracemalloc_tags
+        self.allocation_tracer = AllocationTracer()
+
     def start(self, tag: Hashable, metadata: dict = None) -> int:
         """Start the timer for a new tag (i.e., creates a child node in the time tree).
 
@@ -118,7 +228,7 @@ class Timer:
         Returns:
             int: id of the created node in the timer tree.
         """
-        logging.info(f"Starting timer for '{tag}'")
+        logger.debug("Starting timer for '%s'", tag)
 
         node = TimerNode(self.id_counter, tag, metadata, self.precision)
         self.id_counter += 1
@@ -130,6 +240,13 @@ class Timer:
             parent.children.append(node)
 
         self.stack.append(node)
+        self.stack_ids.add(node.id)
+
+        if tag in self.probed_tags:
+            if tag in self.tracemalloc_tags:
+                node.probe = self.allocation_tracer.start()
+            else:
+                node.probe = ResourceProbe()
 
         return node.id
 
@@ -140,9 +257,12 @@ class Timer:
             raise ValueError("No timer currently active!")
 
         node = self.stack.pop()
+        self.stack_ids.discard(node.id)
         node.stop(metadata)
-        
-        logging.info(f"Stopping timer for '{node.tag}'")
+        if node.probe is not None:
+            self.stop_probe(node)
+
+        logger.debug("Stopping timer for '%s'", node.tag)
 
     def cancel(self, node_id: int, only_children: bool = False):
         """Cancels all child nodes up to the node corresponding to node_id (i.e., cancel all branches starting from `node_id`).
@@ -153,7 +273,7 @@ class Timer:
         """
 
         # Node must be in current set of active nodes
-        if node_id not in [n.id for n in self.stack]:
+        if node_id not in self.stack_ids:
             raise ValueError(
                 f"The node timer with id '{node_id}' cannot be canceled because it is not currently active."
             )
@@ -165,16 +285,84 @@ class Timer:
         node = None
         while node is None or node.id != node_id:
             node = self.stack.pop()
+            self.stack_ids.discard(node.id)
 
             if node.id == node_id and only_children:
                 self.stack.append(node)
+                self.stack_ids.add(node.id)
                 break
 
             node.cancel()
+            if node.probe is not None:
+                self.stop_probe(node)
 
         # Record source of cancellation at root of cancelled branch
         node.cancellation_source_id = source.id
 
+    def stop_probe(self, node: TimerNode):
+        """Records the resources used by a node in its metadata."""
+        probe = node.probe
+        node.probe = None
+        if probe.traced:
+            self.allocation_tracer.stop(probe)
+        node.metadata.update(probe.stop(self.precision))
+
+    def attach(self, node: TimerNode):
+        """Attach a branch recorded by another timer (e.g., in a sub-process) as the last child of the active node.
+
+        The ids of the nodes of the branch are re-assigned so that they remain unique in this timer.
+
+        Args:
+            node (TimerNode): root node of the branch to attach.
+        """
+        # nodes of the branch in breadth-first order
+        nodes = [node]
+        i = 0
+        while i < len(nodes):
+            nodes.extend(nodes[i].children)
+            i += 1
+
+        ids = {}
+        for n in nodes:
+            ids[n.id] = self.id_counter
+            n.id = self.id_counter
+            self.id_counter += 1
+
+        for n in nodes:
+            if n.cancellation_source_id is not None:
+                n.cancellation_source_id = ids.get(n.cancellation_source_id, n.cancellation_source_id)
+
+        self.active_node.children.append(node)
+
+    def add_node(
+        self,
+        parent: TimerNode,
+        tag: Hashable,
+        timestamp_start: float,
+        timestamp_stop: float,
+        metadata: dict = None,
+    ) -> int:
+        """Adds a stopped node timed elsewhere as the last child of ``parent`` (e.g., the metrics of several epochs
+        scored at once, see ``ClassificationScorer.score_many``).
+
+        Args:
+            parent (TimerNode): the parent of the node, which can already be stopped.
+            tag (Hashable): tag of the node.
+            timestamp_start (float): start of the node (see ``wall_clock_time``).
+            timestamp_stop (float): stop of the node.
+            metadata (dict, optional): optional metadata of the node. Defaults to ``None``.
+
+        Returns:
+            int: id of the created node in the timer tree.
+        """
+        node = TimerNode(self.id_counter, tag, metadata, self.precision)
+        self.id_counter += 1
+        node.timestamp_start = timestamp_start
+        node.timestamp_end = timestamp_stop
+        node.status = TimerNode.STOPPED
+        parent.children.append(node)
+        return node.id
+
     @property
     def active_node(self):
         """The current active timer node."""
@@ -185,31 +373,27 @@ class Timer:
     def as_dict(self):
         return self.root.as_dict(timestamp_offset=self.root.timestamp_start)
 
+    def as_table(self) -> NodeTable:
+        """Returns the tree as a table of nodes (see ``NodeTable``)."""
+        return NodeTable.from_node(self.root, timestamp_offset=self.root.timestamp_start)
+
     def as_json(self):
-        # try:
-        json_dumped = lcdb.json.dumps(self.as_dict())
-        # except Exception as e:
-        #     print(f'JSON dump failed')
-        #     print(self.as_dict())
-        # try:
-        json_data = lcdb.json.loads(json_dumped)
-        # except Exception as e:
-        #     print(f"Json serialization failed!")
-        #     print(json_dumped)
-        return json_data
-
-    @contextmanager
-    def time(self, tag: Hashable, metadata: dict = None, cancel_on_error=False):
-        node_id = self.start(tag, metadata)
-        try:
-            yield self.active_node
-        except:
-            if cancel_on_error:
-                self.cancel(node_id)
-            else:
-                raise
-        else:
-            self.stop()
+        """Returns the tree as a JSON compatible dictionary.
+
+        The tree is rebuilt from its table so that only the metadata values which are not booleans or numbers are
+        encoded to (and decoded from) JSON.
+        """
+        return self.as_table().as_dict()
+
+    def time(self, tag: Hashable, metadata: dict = None, cancel_on_error=False) -> TimerContext:
+        """Context manager timing its block in a new node (see ``start`` and ``stop``).
+
+        Args:
+            tag (Hashable): tag of the node.
+            metadata (dict, optional): optional metadata of the node. Defaults to ``None``.
+            cancel_on_error (bool, optional): if ``True``, the branch of the node is canceled (see ``cancel``) and the exception is not propagated when an exception is raised in the block. Defaults to ``False``.
+        """
+        return TimerContext(self, tag, metadata, cancel_on_error)
 
 
 def test_timer():
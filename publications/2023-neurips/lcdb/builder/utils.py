@@ -11,8 +11,6 @@ import numpy as np
 from scipy.special import softmax
 import psutil
 
-from deephyper.evaluator._run_function_utils import standardize_run_function_output
-
 
 def import_attr_from_module(path: str):
     """Import an attribute from a module given its path.
@@ -86,6 +84,7 @@ def terminate_on_memory_exceeded(
     raise_exception,
     func,
     *args,
+    recover_func=None,
     **kwargs,
 ):
     """Decorator to use on a ``run_function`` to profile its execution-time and peak memory usage.
@@ -93,11 +92,14 @@ def terminate_on_memory_exceeded(
     Args:
         memory_limit (int): In bytes, if set to a positive integer, the memory usage is measured at regular intervals and the function is interrupted if the memory usage exceeds the limit. If set to ``-1``, only the peak memory is measured. If the executed function is busy outside of the Python interpretor, this mechanism will not work properly. Defaults to ``-1``.
         memory_tracing_interval (float): In seconds, the interval at which the memory usage is measured. Defaults to ``0.1``.
+        recover_func (function, optional): If given, it is called as ``recover_func(output, *args, **kwargs)`` when the function is terminated to build the output from what the function saved before its termination (e.g., a checkpoint). Defaults to ``None``.
 
     Returns:
         function: a decorated function.
     """
 
+    from deephyper.evaluator._run_function_utils import standardize_run_function_output
+
     timestamp_start = time.time()
 
     p = psutil.Process()  # get the current process
@@ -138,6 +140,10 @@ def terminate_on_memory_exceeded(
     except BrokenExecutor:
         pass
 
+    # the function was terminated before returning
+    if recover_func is not None and (output is None or isinstance(output, str)):
+        output = recover_func(output, *args, **kwargs)
+
     timestamp_end = time.time()
 
     output = standardize_run_function_output(output)
@@ -169,6 +175,8 @@ def get_schedule(name, **kwargs):
         return [kwargs["n"]]
     elif name == "power":
         return get_power_schedule(**kwargs)
+    elif name == "budget":
+        return get_budget_schedule(**kwargs)
     else:
         raise ValueError(f"Unknown schedule: {name}")
 
@@ -193,6 +201,144 @@ def get_power_schedule(n: int, base=2, power=0.5, delay: int = 7, **kwargs):
     return anchors
 
 
+def get_budget_schedule(
+    n: int, budget: float, cost_model=None, base=2, power=0.5, delay: int = 7, **kwargs
+):
+    """Get the anchors of the power schedule for a given size `n` whose total predicted cost (see
+    ``PowerLawCostModel``) fits in ``budget``. All the anchors are kept if the cost cannot be predicted yet, the
+    smallest anchor is always kept."""
+    anchors = get_power_schedule(n, base=base, power=power, delay=delay)
+    return anchors[:1] + prune_anchors_to_budget(anchors[1:], budget - get_predicted_cost(anchors[:1], cost_model), cost_model)
+
+
+def get_predicted_cost(anchors: list, cost_model=None) -> float:
+    """Returns the total predicted cost of the anchors, ``0`` if the cost cannot be predicted."""
+    if cost_model is None or not cost_model.is_fitted or len(anchors) == 0:
+        return 0.0
+    return float(np.sum(cost_model.predict(anchors)))
+
+
+def prune_anchors_to_budget(anchors: list, budget: float, cost_model=None) -> list:
+    """Returns the longest prefix of the (increasing) anchors whose total predicted cost fits in ``budget``.
+
+    The largest anchors are the most expensive ones, they are dropped first. All the anchors are kept if the cost
+    cannot be predicted.
+    """
+    if cost_model is None or not cost_model.is_fitted or len(anchors) == 0:
+        return list(anchors)
+    cumulative_costs = np.cumsum(cost_model.predict(anchors))
+    return list(anchors[: int(np.searchsorted(cumulative_costs, budget, side="right"))])
+
+
+class PowerLawCostModel:
+    """Model of the cost (e.g., the time in seconds) of building a workflow at an anchor as a power law
+    ``cost = coefficient * anchor ** exponent``, fitted by least squares in log-log space on the ``num_anchors``
+    largest anchors. The cost of the small anchors is dominated by a constant overhead which would flatten the power
+    law and underestimate the cost of the large anchors.
+
+    The costs observed in the current job (see ``add``) are preferred over the ``prior`` costs (e.g., from past
+    results of the workflow on other datasets) as the cost depends on the dataset: with two observed anchors or more,
+    the model is fitted on the observed costs only. With a single observed anchor, the exponent of the prior (or ``1``
+    without prior) is kept and the coefficient is fitted on the observed cost.
+
+    Args:
+        prior (list, optional): the ``(anchor, cost)`` pairs known before the job. Defaults to ``None``.
+        num_anchors (int, optional): the number of largest anchors on which the power law is fitted. Defaults to ``4``.
+        max_exponent (float, optional): the maximum exponent of the power law, which bounds the extrapolation from a few small anchors. Defaults to ``3``.
+    """
+
+    def __init__(self, prior: list = None, num_anchors: int = 4, max_exponent: float = 3.0):
+        if num_anchors < 2:
+            raise ValueError(f"The power law must be fitted on at least 2 anchors, got {num_anchors}.")
+        self.prior = [(int(a), float(c)) for a, c in (prior or [])]
+        self.observed = []
+        self.num_anchors = num_anchors
+        self.max_exponent = max_exponent
+        self.coefficient = None
+        self.exponent = None
+        self.fit()
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.coefficient is not None
+
+    def add(self, anchor: int, cost: float):
+        """Adds the cost observed for an anchor and fits the model again."""
+        self.observed.append((int(anchor), float(cost)))
+        self.fit()
+
+    def fit(self):
+        if len({a for a, _ in self.observed}) > 1:
+            exponent, log_coefficient = self._fit_log_log(self.observed)
+        else:
+            exponent, log_coefficient = self._fit_log_log(self.prior)
+            if len(self.observed) > 0:
+                # a single observed anchor only gives the scale of the costs of the job
+                exponent = 1.0 if exponent is None else exponent
+                log_anchors, log_costs = self._log(self.observed)
+                log_coefficient = np.mean(log_costs - exponent * log_anchors)
+
+        if exponent is None:
+            self.coefficient = self.exponent = None
+        else:
+            self.exponent = float(exponent)
+            self.coefficient = float(np.exp(log_coefficient))
+
+    def _log(self, points: list):
+        anchors, costs = np.array(points, dtype=np.float64).reshape(-1, 2).T
+        # costs of 0 (e.g., rounded durations) would have an infinite logarithm
+        return np.log(anchors), np.log(np.maximum(costs, 1e-6))
+
+    def _fit_log_log(self, points: list):
+        """Returns the exponent and the logarithm of the coefficient fitted on the points, ``None`` if there are not
+        two distinct anchors."""
+        log_anchors, log_costs = self._log(points)
+        distinct_log_anchors = np.unique(log_anchors)
+        if len(distinct_log_anchors) < 2:
+            return None, None
+        largest = log_anchors >= distinct_log_anchors[-min(self.num_anchors, len(distinct_log_anchors))]
+        log_anchors, log_costs = log_anchors[largest], log_costs[largest]
+        exponent, log_coefficient = np.polyfit(log_anchors, log_costs, deg=1)
+        # the cost cannot decrease with the anchor
+        exponent = np.clip(exponent, 0, self.max_exponent)
+        return exponent, np.mean(log_costs - exponent * log_anchors)
+
+    def predict(self, anchors) -> np.ndarray:
+        """Returns the predicted cost of each anchor."""
+        if not self.is_fitted:
+            raise ValueError("The cost model cannot predict before costs are observed.")
+        return self.coefficient * np.asarray(anchors, dtype=np.float64) ** self.exponent
+
+    def as_dict(self) -> dict:
+        return {
+            "coefficient": self.coefficient,
+            "exponent": self.exponent,
+            "num_prior": len(self.prior),
+            "num_observed": len(self.observed),
+        }
+
+
+def get_anchor_costs(tree: dict) -> list:
+    """Returns the ``(anchor, duration)`` pairs of the anchors of a tree recorded by the timer of a job (see
+    ``Timer.as_json``), e.g., as the prior of a ``PowerLawCostModel``. The anchors whose fit failed are skipped."""
+    costs = []
+    for node in tree.get("children", []):
+        if node["tag"] != "build_curves":
+            continue
+        for anchor_node in node.get("children", []):
+            if anchor_node["tag"] != "anchor" or "cancellation_source_id" in anchor_node:
+                continue
+            if any("cancellation_source_id" in child for child in anchor_node.get("children", [])):
+                continue
+            costs.append(
+                (
+                    anchor_node["metadata"]["value"],
+                    anchor_node["timestamp_stop"] - anchor_node["timestamp_start"],
+                )
+            )
+    return costs
+
+
 def decision_fun_to_proba(decision_fun_vals):
     """
     take a vector or matrix of decision function values and turn them into probabilities through a softmax
@@ -5,7 +5,7 @@ $ lcdb run ...
 """
 import argparse
 
-from . import _init, _space, _create, _fetch, _results, _run, _test, _add, _plot
+from . import _init, _space, _create, _fetch, _results, _run, _test, _add, _plot, _rescore, _trace
 
 
 def create_parser():
@@ -37,6 +37,12 @@ def create_parser():
     # execution of experiments
     _add.add_subparser(subparsers)
 
+    # add missing metrics from saved predictions
+    _rescore.add_subparser(subparsers)
+
+    # export the timers of results as traces
+    _trace.add_subparser(subparsers)
+
     # plot results
     _results.add_subparser(subparsers)
 
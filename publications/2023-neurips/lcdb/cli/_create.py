@@ -2,9 +2,6 @@
 import os
 import pathlib
 
-import pandas as pd
-from ..builder.utils import import_attr_from_module
-
 
 def add_subparser(subparsers):
     """
@@ -46,14 +43,16 @@ def main(
     """
     :meta private:
     """
+    import pandas as pd
     from deephyper.problem._hyperparameter import convert_to_skopt_space
 
+    from ..workflow import get_config_space
+
     log_dir = os.path.dirname(output_file)
     pathlib.Path(log_dir).mkdir(parents=True, exist_ok=True)
 
-    # Load the workflow to get its config space
-    WorkflowClass = import_attr_from_module(workflow_class)
-    config_space = WorkflowClass.config_space()
+    # Load the config space of the workflow
+    config_space = get_config_space(workflow_class)
 
     if verbose:
         print(config_space)
@@ -1,7 +1,4 @@
 """Command line to create a list of hyperparameter configurations to be evaluated later."""
-import numpy as np
-from ..data import load_task
-from ..data.split import train_valid_test_split
 
 
 def add_subparser(subparsers):
@@ -19,7 +16,7 @@ def add_subparser(subparsers):
         "--task-id",
         type=str,
         required=True,
-        help="The task ID. For example, the task 61 from OpenML will have task ID 'openml.61'",
+        help="The task ID. For example, the task 61 from OpenML will have task ID 'openml.61', a local file 'file.data/iris.csv' and a generated dataset 'synthetic.rows=1000,features=20,classes=2'.",
     )
     subparser.add_argument(
         "-vp",
@@ -47,20 +44,18 @@ def main(
     test_prop: float,
 ):
     """Entry point for the command line interface."""
+    import numpy as np
+
+    from ..data import load_task
+    from ..data.split import load_split_indices
 
     print(f"Loading task '{task_id}'...", end="")
     (X, y), dataset_metadata = load_task(task_id)
     print(" done!\n")
 
-    (
-        X_train,
-        X_valid,
-        X_test,
-        y_train,
-        y_valid,
-        y_test,
-    ) = train_valid_test_split(
-        X,
+    # the split used by default by ``lcdb run`` is stored in the dataset cache
+    train, valid, test = load_split_indices(
+        task_id,
         y,
         test_seed=42,
         valid_seed=42,
@@ -70,7 +65,7 @@ def main(
     )
 
     print(f" * Type   : {dataset_metadata['type']}")
-    print(f" * X shape: {np.shape(X)}")
+    print(f" * X shape: {X.shape}")
     print(f" * y shape: {np.shape(y)}")
     print(f" * Classes: {dataset_metadata['num_classes']}")
     print(f" * Categories: {dataset_metadata['categories']}")
@@ -78,12 +73,12 @@ def main(
     print()
     print(" --- Splitting ---")
 
-    print(f" * Train X shape: {np.shape(X_train)}")
-    print(f" * Train y shape: {np.shape(y_train)}")
-    print(f" * Valid X shape: {np.shape(X_valid)}")
-    print(f" * Valid y shape: {np.shape(y_valid)}")
-    print(f" * Test  X shape: {np.shape(X_test)}")
-    print(f" * Test  y shape: {np.shape(y_test)}")
+    print(f" * Train X shape: {(len(train),) + X.shape[1:]}")
+    print(f" * Train y shape: {(len(train),)}")
+    print(f" * Valid X shape: {(len(valid),) + X.shape[1:]}")
+    print(f" * Valid y shape: {(len(valid),)}")
+    print(f" * Test  X shape: {(len(test),) + X.shape[1:]}")
+    print(f" * Test  y shape: {(len(test),)}")
 
     print()
     print(" --- Description ---")
@@ -1,7 +1,5 @@
 """Command line to create a list of hyperparameter configurations to be evaluated later."""
 import os
-import matplotlib.pyplot as plt
-import pandas as pd
 import json
 
 from ._utils import parse_comma_separated_strs
@@ -78,6 +76,8 @@ def main(
     anchor,
     metric
 ):
+    import matplotlib.pyplot as plt
+    import pandas as pd
 
     from ..db import LCDB
     from ..analysis.plot import (
@@ -0,0 +1,89 @@
+"""Command line to add the missing metrics of results from their saved predictions."""
+import os
+
+
+def add_subparser(subparsers):
+    """
+    :meta private:
+    """
+    subparser_name = "rescore"
+    function_to_call = main
+
+    subparser = subparsers.add_parser(
+        subparser_name,
+        help="Add the metrics missing from results (e.g., new metrics) computed from the predictions saved with '--predictions-dir', the metrics already in the results are kept.",
+    )
+
+    subparser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        required=True,
+        help="The CSV file of results (e.g., 'results.csv' in the log directory of 'lcdb run').",
+    )
+    subparser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        required=False,
+        default=None,
+        help="The CSV file where the rescored results are written. Defaults to the input file.",
+    )
+    subparser.add_argument(
+        "--predictions-dir",
+        type=str,
+        required=False,
+        default=None,
+        help="The directory containing the predictions files if they were moved after the results were created.",
+    )
+
+    subparser.set_defaults(func=function_to_call)
+
+
+def main(input, output, predictions_dir):
+    import pandas as pd
+    from tqdm import tqdm
+
+    import lcdb.json
+    from lcdb.builder.node_table import NodeTable
+    from lcdb.builder.predictions import PredictionsRecorder
+    from lcdb.builder.timer import TimerNode
+    from lcdb.db._dataframe import deserialize_dataframe
+
+    df = pd.read_csv(input)
+    # results stored as tables of nodes (see '--timer-format') are written back as tables
+    has_json = "m:json" in df.columns
+    is_table = None
+    if "m:table" in df.columns:
+        is_table = df["m:table"].map(lambda x: isinstance(x, str))
+    df = deserialize_dataframe(df)
+
+    if "m:predictions" not in df.columns:
+        raise ValueError(f"The results in {input} do not have saved predictions.")
+
+    def rescore_row(row):
+        path = row["m:predictions"]
+        if not isinstance(row["m:json"], dict) or not isinstance(path, str):
+            return row["m:json"]
+        if predictions_dir is not None:
+            path = os.path.join(predictions_dir, os.path.basename(path))
+        return PredictionsRecorder.load(path).rescore(row["m:json"])
+
+    tqdm.pandas(desc="Rescoring")
+    df["m:json"] = df.progress_apply(rescore_row, axis=1)
+    if is_table is not None:
+        # the timestamps of the rescored trees are already rounded to the precision of the timer of the builder
+        to_table = lambda x: NodeTable.from_node(TimerNode.from_dict(x, precision=4)).serialize()
+        df["m:table"] = df["m:json"].where(is_table).map(
+            lambda x: to_table(x) if isinstance(x, dict) else x
+        )
+        df["m:json"] = df["m:json"].where(~is_table)
+        if not has_json:
+            df.drop(columns="m:json", inplace=True)
+
+    if "m:json" in df.columns:
+        df["m:json"] = df["m:json"].map(
+            lambda x: lcdb.json.dumps(x) if isinstance(x, dict) else x
+        )
+
+    df.to_csv(input if output is None else output, index=False)
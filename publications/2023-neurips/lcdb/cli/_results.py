@@ -1,5 +1,4 @@
 """Command line to fetch and aggregate results from LCDB 2.0 repositories"""
-import pandas as pd
 
 
 def add_subparser(subparsers):
@@ -46,6 +45,8 @@ def main(
     repositories
 ):
 
+    import pandas as pd
+
     from ..db import Repository, get_repository_paths  # lazy import
 
 
@@ -19,13 +19,18 @@ def add_subparser(subparsers):
         subparser_name, help="Run experiments with DeepHyper."
     )
 
-    subparser.add_argument(
+    task_group = subparser.add_mutually_exclusive_group(required=True)
+    task_group.add_argument(
         "-id",
         "--openml-id",
         type=int,
-        required=True,
         help="The identifier of the OpenML dataset.",
     )
+    task_group.add_argument(
+        "--task-id",
+        type=str,
+        help="The task ID loaded instead of an OpenML dataset, e.g., 'file.data/iris.csv' for a local Parquet, NPZ or CSV file or 'synthetic.rows=1e6,features=20,classes=2,categorical=0.2' for a generated dataset.",
+    )
     subparser.add_argument(
         "-w",
         "--workflow-class",
@@ -97,6 +102,14 @@ def add_subparser(subparsers):
         required=False,
         help="Timeout in seconds for the fit method. Defaults to -1 for unlimited time.",
     )
+    subparser.add_argument(
+        "--timeout-isolation",
+        type=str,
+        default="thread",
+        choices=["process", "thread"],
+        required=False,
+        help="How the fit is interrupted on timeout. With 'thread' (the default), the fit runs in a thread which keeps running after the timeout. With 'process', the fit runs in a worker process which is killed on timeout, the workflow must then be picklable (not verified for DenseNN).",
+    )
     subparser.add_argument(
         "-d",
         "--log-dir",
@@ -127,6 +140,20 @@ def add_subparser(subparsers):
         required=False,
         help="Memory limit per config (MBs).",
     )
+    subparser.add_argument(
+        "--workflow-address-space-limit",
+        type=float,
+        default=-1,
+        required=False,
+        help="Limit of the virtual memory of the workers running the configs (MBs), allocations above it fail with a memory error. It must be larger than the memory limit as the virtual memory includes memory reserved but not used. Defaults to -1 for no limit.",
+    )
+    subparser.add_argument(
+        "--max-jobs-per-worker",
+        type=int,
+        default=100,
+        required=False,
+        help="Number of configs run by a worker before it is replaced. Defaults to 100, -1 for no limit.",
+    )
     subparser.add_argument(
         "--initial-configs",
         type=str,
@@ -159,7 +186,20 @@ def add_subparser(subparsers):
         "--anchor-schedule",
         default="power",
         type=str,
-        help="The type of schedule for anchors (over samples of the dataset). Value in ['linear', 'last', 'power'].",
+        help="The type of schedule for anchors (over samples of the dataset). Value in ['linear', 'last', 'power', 'budget'].",
+    )
+    subparser.add_argument(
+        "--anchor-budget",
+        default=-1,
+        type=float,
+        help="Time in seconds to build the curves of a config with the 'budget' schedule of anchors, the anchors whose predicted time does not fit in it are not built.",
+    )
+    subparser.add_argument(
+        "--anchor-cost-prior",
+        default=None,
+        type=str,
+        nargs="*",
+        help="CSV files of results of the workflow from which the time of the anchors is predicted before they are built with the 'budget' schedule.",
     )
     subparser.add_argument(
         "--epoch-schedule",
@@ -167,11 +207,95 @@ def add_subparser(subparsers):
         type=str,
         help="The type of schedule for anchors (over learning iterations of the workflow). Value in ['linear', 'last', 'power'].",
     )
+    subparser.add_argument(
+        "--warm-start",
+        action="store_true",
+        default=False,
+        required=False,
+        help="A boolean indicating if workflows that support it should continue their training from the previous anchor instead of being refitted from scratch, which gives other models than cold fits (see the warm_start argument of run_learning_workflow). Requires --monotonic.",
+    )
+    subparser.add_argument(
+        "--num-anchor-workers",
+        default=1,
+        type=int,
+        required=False,
+        help="Number of processes used to build the anchors of a job in parallel. Cannot be combined with --warm-start.",
+    )
+    subparser.add_argument(
+        "--stratify-anchors",
+        action="store_true",
+        default=False,
+        required=False,
+        help="A boolean indicating if the class proportions of the training set should be preserved in each anchor.",
+    )
+    subparser.add_argument(
+        "--max-eval-instances",
+        default=-1,
+        type=int,
+        required=False,
+        help="The maximum number of instances of each split (train, validation, test) on which predictions are scored. Defaults to -1 for no limit.",
+    )
+    subparser.add_argument(
+        "--predictions-dir",
+        default=None,
+        type=str,
+        required=False,
+        help="If given, the labels and probabilities on which metrics are computed are saved in this directory so that missing metrics can be computed later with 'lcdb rescore'.",
+    )
+    subparser.add_argument(
+        "--checkpoint-dir",
+        default=None,
+        type=str,
+        required=False,
+        help="If given, completed anchors are checkpointed in this directory and skipped when the same job is run again.",
+    )
+    subparser.add_argument(
+        "--timer-format",
+        default="json",
+        type=str,
+        choices=["json", "table"],
+        required=False,
+        help="Format of the detailed results, 'table' stores a compact table of the nodes of the timer in 'm:table' instead of the tree in 'm:json'.",
+    )
+    subparser.add_argument(
+        "--resource-tags",
+        default=None,
+        type=str,
+        nargs="*",
+        required=False,
+        help="Tags of the nodes of the timer (e.g., 'anchor fit') for which the CPU time and memory of the process are recorded.",
+    )
+    subparser.add_argument(
+        "--tracemalloc-tags",
+        default=None,
+        type=str,
+        nargs="*",
+        required=False,
+        help="Tags of the nodes of the timer for which the peak of the memory allocated by Python is recorded with tracemalloc (slow).",
+    )
+    subparser.add_argument(
+        "--metrics",
+        default=None,
+        type=str,
+        nargs="*",
+        required=False,
+        help="Names of the classification metrics computed among 'confusion_matrix', 'auc', 'auc_ovo', 'log_loss' and 'brier_score' (the objective 'log_loss' is required). Defaults to all the metrics.",
+    )
+    subparser.add_argument(
+        "--expensive-metrics-scope",
+        default=None,
+        type=str,
+        nargs="*",
+        choices=["final_anchor", "final_epoch", "val"],
+        required=False,
+        help="Restricts the expensive metrics (e.g., 'auc_ovo') to the last anchor, the last scheduled epoch and/or the validation split.",
+    )
     subparser.set_defaults(func=function_to_call)
 
 
 def run_experiment(
     openml_id,
+    task_id,
     task_type,
     workflow_class,
     monotonic,
@@ -181,6 +305,7 @@ def run_experiment(
     valid_prop,
     test_prop,
     timeout_on_fit,
+    timeout_isolation,
     log_dir,
     max_evals,
     timeout,
@@ -190,8 +315,23 @@ def run_experiment(
     evaluator,
     num_workers,
     anchor_schedule,
+    anchor_budget,
+    anchor_cost_prior,
     epoch_schedule,
     workflow_memory_limit,
+    workflow_address_space_limit,
+    max_jobs_per_worker,
+    warm_start,
+    num_anchor_workers,
+    stratify_anchors,
+    max_eval_instances,
+    predictions_dir,
+    checkpoint_dir,
+    timer_format,
+    resource_tags,
+    tracemalloc_tags,
+    metrics,
+    expensive_metrics_scope,
 ):
 
     try:
@@ -218,8 +358,9 @@ def run_experiment(
     from deephyper.problem._hyperparameter import convert_to_skopt_space
     from deephyper.search.hps import CBO
 
-    from lcdb.builder import run_learning_workflow
-    from lcdb.builder.utils import import_attr_from_module, terminate_on_memory_exceeded
+    from lcdb.builder import run_cached_learning_workflow, recover_learning_workflow
+    from lcdb.builder.pool import MemoryLimitedPool
+    from lcdb.workflow import get_config_space, get_workflow_module
 
     if evaluator in ["serial", "thread", "process", "ray"]:
         # Master-Worker Parallelism: only 1 process will run this code
@@ -275,9 +416,15 @@ def run_experiment(
     else:
         raise ValueError(f"Unknown evaluator: {evaluator}")
 
-    # Load the workflow to get its config space
-    WorkflowClass = import_attr_from_module(workflow_class)
-    config_space = WorkflowClass.config_space()
+    # Load the config space of the workflow (without importing it)
+    config_space = get_config_space(workflow_class)
+
+    # The time of the anchors of past results, read once for all configs
+    if anchor_cost_prior is not None:
+        from lcdb.db._dataframe import read_anchor_costs
+
+        anchor_cost_prior = read_anchor_costs(anchor_cost_prior, workflow_class, openml_id)
+
     config_default = config_space.get_default_configuration().get_dictionary()
 
     # Set the search space
@@ -310,6 +457,7 @@ def run_experiment(
 
     run_function_kwargs = {
         "openml_id": openml_id,
+        "task_id": task_id,
         "task_type": task_type,
         "workflow_class": workflow_class,
         "monotonic": monotonic,
@@ -319,8 +467,22 @@ def run_experiment(
         "valid_prop": valid_prop,
         "test_prop": test_prop,
         "timeout_on_fit": timeout_on_fit,
+        "timeout_isolation": timeout_isolation,
         "anchor_schedule": anchor_schedule,
+        "anchor_budget": anchor_budget,
+        "anchor_cost_prior": anchor_cost_prior,
         "epoch_schedule": epoch_schedule,
+        "warm_start": warm_start,
+        "num_anchor_workers": num_anchor_workers,
+        "stratify_anchors": stratify_anchors,
+        "max_eval_instances": max_eval_instances,
+        "predictions_dir": predictions_dir,
+        "checkpoint_dir": checkpoint_dir,
+        "timer_format": timer_format,
+        "resource_tags": resource_tags,
+        "tracemalloc_tags": tracemalloc_tags,
+        "metrics": metrics,
+        "expensive_metrics_scope": expensive_metrics_scope,
         "logger": logger,
     }
 
@@ -329,14 +491,22 @@ def run_experiment(
 
     # Convert from MBs to Bytes
     memory_limit = workflow_memory_limit * (1024**2)
+    address_space_limit = workflow_address_space_limit * (1024**2)
     memory_tracing_interval = 0.1
-    raise_exception = False
-    run_function = functools.partial(
-        terminate_on_memory_exceeded,
+
+    # the workers are reused by the configs run by each worker of the evaluator, and keep the dataset and its splits
+    # loaded for the following configs
+    pool = MemoryLimitedPool(
         memory_limit,
-        memory_tracing_interval,
-        raise_exception,
-        run_learning_workflow,
+        memory_tracing_interval=memory_tracing_interval,
+        address_space_limit=address_space_limit,
+        max_jobs_per_worker=max_jobs_per_worker,
+        preload=[get_workflow_module(workflow_class)],
+    )
+    run_function = functools.partial(
+        pool.run,
+        run_cached_learning_workflow,
+        recover_func=recover_learning_workflow,
     )
 
     with Evaluator.create(
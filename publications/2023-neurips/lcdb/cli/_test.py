@@ -5,12 +5,6 @@ import json
 import os
 import logging
 
-import lcdb.json
-from deephyper.evaluator import RunningJob
-from ..builder.utils import import_attr_from_module, terminate_on_memory_exceeded
-
-#from ._experiments import run
-
 # Avoid Tensorflow Warnings
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = str(3)
 
@@ -26,13 +20,18 @@ def add_subparser(subparsers):
         subparser_name, help="Run experiments with DeepHyper."
     )
 
-    subparser.add_argument(
+    task_group = subparser.add_mutually_exclusive_group(required=True)
+    task_group.add_argument(
         "-id",
         "--openml-id",
         type=int,
-        required=True,
         help="The identifier of the OpenML dataset.",
     )
+    task_group.add_argument(
+        "--task-id",
+        type=str,
+        help="The task ID loaded instead of an OpenML dataset, e.g., 'file.data/iris.csv' for a local Parquet, NPZ or CSV file or 'synthetic.rows=1e6,features=20,classes=2,categorical=0.2' for a generated dataset.",
+    )
     subparser.add_argument(
         "-w",
         "--workflow-class",
@@ -104,6 +103,14 @@ def add_subparser(subparsers):
         required=False,
         help="Timeout in seconds for the fit method. Defaults to -1 for unlimited time.",
     )
+    subparser.add_argument(
+        "--timeout-isolation",
+        type=str,
+        default="thread",
+        choices=["process", "thread"],
+        required=False,
+        help="How the fit is interrupted on timeout. With 'thread' (the default), the fit runs in a thread which keeps running after the timeout. With 'process', the fit runs in a worker process which is killed on timeout, the workflow must then be picklable (not verified for DenseNN).",
+    )
     subparser.add_argument(
         "--parameters",
         type=str,
@@ -121,7 +128,20 @@ def add_subparser(subparsers):
         "--anchor-schedule",
         default="power",
         type=str,
-        help="The type of schedule for anchors (over samples of the dataset). Value in ['linear', 'last', 'power'].",
+        help="The type of schedule for anchors (over samples of the dataset). Value in ['linear', 'last', 'power', 'budget'].",
+    )
+    subparser.add_argument(
+        "--anchor-budget",
+        default=-1,
+        type=float,
+        help="Time in seconds to build the curves of a config with the 'budget' schedule of anchors, the anchors whose predicted time does not fit in it are not built.",
+    )
+    subparser.add_argument(
+        "--anchor-cost-prior",
+        default=None,
+        type=str,
+        nargs="*",
+        help="CSV files of results of the workflow from which the time of the anchors is predicted before they are built with the 'budget' schedule.",
     )
     subparser.add_argument(
         "--epoch-schedule",
@@ -129,11 +149,95 @@ def add_subparser(subparsers):
         type=str,
         help="The type of schedule for anchors (over learning iterations of the workflow). Value in ['linear', 'last', 'power'].",
     )
+    subparser.add_argument(
+        "--warm-start",
+        action="store_true",
+        default=False,
+        required=False,
+        help="A boolean indicating if workflows that support it should continue their training from the previous anchor instead of being refitted from scratch, which gives other models than cold fits (see the warm_start argument of run_learning_workflow). Requires --monotonic.",
+    )
+    subparser.add_argument(
+        "--num-anchor-workers",
+        default=1,
+        type=int,
+        required=False,
+        help="Number of processes used to build the anchors of a job in parallel. Cannot be combined with --warm-start.",
+    )
+    subparser.add_argument(
+        "--stratify-anchors",
+        action="store_true",
+        default=False,
+        required=False,
+        help="A boolean indicating if the class proportions of the training set should be preserved in each anchor.",
+    )
+    subparser.add_argument(
+        "--max-eval-instances",
+        default=-1,
+        type=int,
+        required=False,
+        help="The maximum number of instances of each split (train, validation, test) on which predictions are scored. Defaults to -1 for no limit.",
+    )
+    subparser.add_argument(
+        "--predictions-dir",
+        default=None,
+        type=str,
+        required=False,
+        help="If given, the labels and probabilities on which metrics are computed are saved in this directory so that missing metrics can be computed later with 'lcdb rescore'.",
+    )
+    subparser.add_argument(
+        "--checkpoint-dir",
+        default=None,
+        type=str,
+        required=False,
+        help="If given, completed anchors are checkpointed in this directory and skipped when the same job is run again.",
+    )
+    subparser.add_argument(
+        "--timer-format",
+        default="json",
+        type=str,
+        choices=["json", "table"],
+        required=False,
+        help="Format of the detailed results, 'table' stores a compact table of the nodes of the timer in 'm:table' instead of the tree in 'm:json'.",
+    )
+    subparser.add_argument(
+        "--resource-tags",
+        default=None,
+        type=str,
+        nargs="*",
+        required=False,
+        help="Tags of the nodes of the timer (e.g., 'anchor fit') for which the CPU time and memory of the process are recorded.",
+    )
+    subparser.add_argument(
+        "--tracemalloc-tags",
+        default=None,
+        type=str,
+        nargs="*",
+        required=False,
+        help="Tags of the nodes of the timer for which the peak of the memory allocated by Python is recorded with tracemalloc (slow).",
+    )
+    subparser.add_argument(
+        "--metrics",
+        default=None,
+        type=str,
+        nargs="*",
+        required=False,
+        help="Names of the classification metrics computed among 'confusion_matrix', 'auc', 'auc_ovo', 'log_loss' and 'brier_score' (the objective 'log_loss' is required). Defaults to all the metrics.",
+    )
+    subparser.add_argument(
+        "--expensive-metrics-scope",
+        default=None,
+        type=str,
+        nargs="*",
+        choices=["final_anchor", "final_epoch", "val"],
+        required=False,
+        help="Restricts the expensive metrics (e.g., 'auc_ovo') to the last anchor, the last scheduled epoch and/or the validation split.",
+    )
     subparser.set_defaults(func=function_to_call)
 
 
 def main(
     openml_id,
+    task_id,
     workflow_class,
     task_type,
     monotonic,
@@ -143,11 +247,31 @@ def main(
     valid_prop,
     test_prop,
     timeout_on_fit,
+    timeout_isolation,
     parameters,
     verbose,
     anchor_schedule,
+    anchor_budget,
+    anchor_cost_prior,
     epoch_schedule,
+    warm_start,
+    num_anchor_workers,
+    stratify_anchors,
+    max_eval_instances,
+    predictions_dir,
+    checkpoint_dir,
+    timer_format,
+    resource_tags,
+    tracemalloc_tags,
+    metrics,
+    expensive_metrics_scope,
 ):
+    import lcdb.json
+    from deephyper.evaluator import RunningJob
+
+    from ..builder import run_learning_workflow, recover_learning_workflow
+    from ..builder.utils import terminate_on_memory_exceeded
+    from ..workflow import get_config_space
 
     # define stream handler
     ch = logging.StreamHandler()
@@ -160,8 +284,7 @@ def main(
 
     # No parameters are given the default configuration is used
     if parameters is None:
-        WorkflowClass = import_attr_from_module(workflow_class)
-        config_space = WorkflowClass.config_space()
+        config_space = get_config_space(workflow_class)
         config = dict(config_space.get_default_configuration())
     else:
         config = json.loads(parameters)
@@ -172,6 +295,11 @@ def main(
             f"Task type must be 'classification' or 'regression' but is {task_type}."
         )
 
+    if anchor_cost_prior is not None:
+        from lcdb.db._dataframe import read_anchor_costs
+
+        anchor_cost_prior = read_anchor_costs(anchor_cost_prior, workflow_class, openml_id)
+
     memory_limit_giga_bytes = float(
         os.environ.get("LCDB_EVALUATION_MEMORY_LIMIT", 10)
     )  # in GB
@@ -183,12 +311,14 @@ def main(
         memory_limit,
         memory_tracing_interval,
         raise_exception,
-        run,
+        run_learning_workflow,
+        recover_func=recover_learning_workflow,
     )
 
     output = run_function(
         RunningJob(id=0, parameters=config),
         openml_id=openml_id,
+        task_id=task_id,
         workflow_class=workflow_class,
         task_type=task_type,
         monotonic=monotonic,
@@ -198,8 +328,22 @@ def main(
         valid_prop=valid_prop,
         test_prop=test_prop,
         timeout_on_fit=timeout_on_fit,
+        timeout_isolation=timeout_isolation,
         anchor_schedule=anchor_schedule,
+        anchor_budget=anchor_budget,
+        anchor_cost_prior=anchor_cost_prior,
         epoch_schedule=epoch_schedule,
+        warm_start=warm_start,
+        num_anchor_workers=num_anchor_workers,
+        stratify_anchors=stratify_anchors,
+        max_eval_instances=max_eval_instances,
+        predictions_dir=predictions_dir,
+        checkpoint_dir=checkpoint_dir,
+        timer_format=timer_format,
+        resource_tags=resource_tags,
+        tracemalloc_tags=tracemalloc_tags,
+        metrics=metrics,
+        expensive_metrics_scope=expensive_metrics_scope,
         logger=logger
     )
 
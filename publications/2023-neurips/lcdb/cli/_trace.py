@@ -0,0 +1,71 @@
+"""Command line to export the timers of results as Chrome traces (e.g., to open them in Perfetto)."""
+import os
+
+
+def add_subparser(subparsers):
+    """
+    :meta private:
+    """
+    subparser_name = "trace"
+    function_to_call = main
+
+    subparser = subparsers.add_parser(
+        subparser_name,
+        help="Export the detailed results of jobs in the Chrome trace event format, to be opened in 'chrome://tracing' or 'https://ui.perfetto.dev'.",
+    )
+
+    subparser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        required=True,
+        help="The CSV file of results (e.g., 'results.csv' in the log directory of 'lcdb run') or a JSON file with the output of a single job.",
+    )
+    subparser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        required=False,
+        default="trace.json",
+        help="The JSON file where the trace is written.",
+    )
+    subparser.add_argument(
+        "--job-ids",
+        type=int,
+        nargs="*",
+        required=False,
+        default=None,
+        help="The jobs of the CSV file to export, overlaid in the trace. Defaults to all jobs.",
+    )
+
+    subparser.set_defaults(func=function_to_call)
+
+
+def main(input, output, job_ids):
+    import lcdb.json
+    from lcdb.analysis.trace import get_chrome_trace, write_chrome_trace
+
+    if os.path.splitext(input)[1] == ".json":
+        with open(input, "r") as f:
+            data = lcdb.json.loads(f.read())
+        metadata = data.get("metadata", data)
+        source = metadata["json"] if "json" in metadata else metadata["table"]
+        trace = get_chrome_trace([source], names=[os.path.basename(input)])
+    else:
+        import pandas as pd
+        from lcdb.db._dataframe import deserialize_dataframe
+
+        df = deserialize_dataframe(pd.read_csv(input))
+        if job_ids is not None:
+            df = df[df["job_id"].isin(job_ids)]
+        df = df[df["m:json"].map(lambda x: isinstance(x, dict))]
+        if len(df) == 0:
+            raise ValueError(f"No detailed results to export in {input}.")
+
+        trace = get_chrome_trace(
+            df["m:json"].tolist(),
+            names=[f"job {job_id}" for job_id in df["job_id"]],
+        )
+
+    write_chrome_trace(output, trace)
+    print(f"Trace of {len(set(e['pid'] for e in trace['traceEvents']))} job(s) written to {output}")
@@ -2,5 +2,6 @@
 """
 from ._base import load_task
 from ._sklearn import load_from_sklearn
+from ._tabular import TabularArray
 
-__all__ = ["load_task", "load_from_sklearn"]
+__all__ = ["load_task", "load_from_sklearn", "TabularArray"]
@@ -1,28 +1,117 @@
+import logging
+
 from sklearn.preprocessing import LabelEncoder
 
+logger = logging.getLogger(__name__)
 
-def load_task(task_name: str):
-    """Loads a task by name.
+
+# Sources of the tasks kept in the dataset cache (the files of the `file` source are already on disk)
+CACHED_SOURCES = ["openml", "synthetic"]
+
+
+def is_sparse_frame(X) -> bool:
+    """Returns if all the columns of a data frame are sparse (e.g., a sparse ARFF dataset from OpenML)."""
+    import pandas as pd
+
+    return X.shape[1] > 0 and all(isinstance(dtype, pd.SparseDtype) for dtype in X.dtypes)
+
+
+def frame_to_arrays(X, y):
+    """Converts the data frame of the features and the series of the target of a task to the `(X, y)` arrays returned
+    by `load_task`. The features of a sparse data frame are returned as a CSR matrix, the features with categorical
+    (or boolean) columns as a `TabularArray` and the other features as the array of their values."""
+    import numpy as np
+    import pandas as pd
+
+    from lcdb.data._tabular import TabularArray
+
+    if is_sparse_frame(X):
+        X = X.sparse.to_coo().tocsr()
+    else:
+        X = TabularArray.from_frame(X)
+        if X.is_numeric:
+            X = X.numeric
+    if isinstance(y.dtype, pd.SparseDtype):
+        y = y.sparse.to_dense()
+    y = y.values
+    if isinstance(y, pd.Categorical):
+        y = np.array(y.categories.tolist())[y.codes]
+    return X, y
+
+
+def get_task_data(task_name: str):
+    """Loads the data frames of a task from the `openml`, `file` or `synthetic` source (see `load_task`).
 
     Args:
-        task_name (str): Name of the task to load. A task name is composed of the `source` and the `name` of the task, separated by a dot. For example, `sklearn.breast_cancer` loads the `breast_cancer` task from `sklearn`. Similarly, `openml.3` loads the `3` task from `openml`.
+        task_name (str): Name of the task to load, e.g., `openml.3`, `file.data/iris.csv` or `synthetic.rows=1000,features=20`.
 
     Returns:
-        data (tuple): Tuple of `(X, y)` arrays.
+        X (pd.DataFrame): the features, with a categorical dtype for the categorical columns.
+        y (pd.Series): the target.
         metadata (dict): Dictionary of metadata for the task.
     """
+    source, _, name = task_name.partition(".")
+    if source == "openml":
+        from lcdb.data._openml import get_openml_data
+
+        X, y, metadata = get_openml_data(name)
+    elif source == "file":
+        from lcdb.data._file import get_file_data
+
+        X, y, metadata = get_file_data(name)
+    elif source == "synthetic":
+        from lcdb.data._synthetic import get_synthetic_data
+
+        X, y, metadata = get_synthetic_data(name)
+    else:
+        raise ValueError(f"Unknown task '{task_name}'")
+    metadata["name"] = task_name
+    return X, y, metadata
+
+
+def load_task(task_name: str, use_cache: bool = True, cache_dir: str = None):
+    """Loads a task by name.
+
+    The tasks from `openml` and `synthetic` are stored in the dataset cache (see `lcdb.data._cache`) the first time
+    they are loaded and are then memory-mapped from the cache.
+
+    Args:
+        task_name (str): Name of the task to load. A task name is composed of the `source` and the `name` of the task, separated by a dot. For example, `sklearn.breast_cancer` loads the `breast_cancer` task from `sklearn`. Similarly, `openml.3` loads the `3` task from `openml`, `file.data/iris.csv` loads a local file (see `load_from_file`) and `synthetic.rows=1000,features=20,classes=2` generates a dataset (see `load_from_synthetic`).
+        use_cache (bool, optional): If the dataset cache is used. Defaults to `True`.
+        cache_dir (str, optional): Directory of the dataset cache. Defaults to `None` for the `LCDB_DATASET_CACHE` environment variable or `~/.lcdb/datasets`.
+
+    Returns:
+        data (tuple): Tuple of `(X, y)` arrays, `X` is a `TabularArray` if the task has categorical features (see `frame_to_arrays`).
+        metadata (dict): Dictionary of metadata for the task, its `columns` entry gives the `kind`, number of missing values and cardinality of each column (see `get_columns_metadata`).
+    """
     if task_name.startswith("sklearn"):
         from lcdb.data._sklearn import load_from_sklearn
 
         data, metadata = load_from_sklearn(task_name[len("sklearn.") :])
         metadata["name"] = task_name
-    elif task_name.startswith("openml"):
-        from lcdb.data._openml import load_from_openml
+    elif use_cache and task_name.partition(".")[0] in CACHED_SOURCES:
+        from lcdb.data._cache import get_dataset_path, is_dataset_cached, read_dataset, write_dataset
 
-        data, metadata = load_from_openml(task_name[len("openml.") :])
-        metadata["name"] = task_name
+        path = get_dataset_path(task_name, cache_dir)
+        if is_dataset_cached(path):
+            data, metadata = read_dataset(path)
+        else:
+            X, y, metadata = get_task_data(task_name)
+            try:
+                write_dataset(path, X, y, metadata)
+                data, metadata = read_dataset(path)
+            except OSError as exception:
+                logger.warning(f"The task '{task_name}' cannot be written in the dataset cache: {exception}")
+                data = frame_to_arrays(X, y)
     else:
-        raise ValueError(f"Unknown task '{task_name}'")
+        X, y, metadata = get_task_data(task_name)
+        data = frame_to_arrays(X, y)
+
+    # the kind, missing values and cardinality of the columns are read from the dataset cache or inspected once here
+    if "columns" not in metadata:
+        from lcdb.data._tabular import get_columns_metadata
+
+        metadata["columns"] = get_columns_metadata(data[0])
 
     # Verifications of metadata format
     assert "type" in metadata
@@ -0,0 +1,248 @@
+"""On-disk cache of the datasets loaded by ``load_task``.
+
+A dataset is stored in a directory named after its task (e.g., ``openml.3``) with:
+
+- ``numeric.npy``: the numeric columns, as a 2D array of their common dtype (``float32`` if it is exact and the dataset has categorical columns, see ``TabularArray``).
+- ``codes.npy``: the codes of the categorical columns, as a 2D array of the smallest signed integer dtype (``-1`` for a missing value).
+- ``missing.npy``: the mask of the missing values of ``X`` (only if there are missing values).
+- ``target.npy``: the codes of the classes of the target (its values if it is not categorical).
+- ``data.npy``, ``indices.npy`` and ``indptr.npy``: the arrays of the CSR matrix of a sparse dataset, stored instead of the arrays above.
+- ``metadata.json``: the metadata of the task and of the columns (dtype, categories, number of missing values) and the counts of the classes.
+- ``splits/``: the ``int32`` indices of the train, validation and test instances of each split of the dataset (see ``write_split``).
+
+The arrays are memory-mapped read-only by ``read_dataset``, the jobs loading the same dataset on a node therefore share
+the pages of the page cache instead of parsing the dataset again.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from ._base import is_sparse_frame
+from ._tabular import TabularArray, get_codes_dtype, summarize_columns
+
+# Version of the format of the cache, the datasets cached with another version are loaded again
+DATASET_CACHE_VERSION = 3
+
+
+def get_dataset_cache_dir() -> str:
+    """Returns the directory of the dataset cache, given by the ``LCDB_DATASET_CACHE`` environment variable and
+    ``datasets/`` in the LCDB folder otherwise, i.e., ``.lcdb`` if it exists in the current directory and ``~/.lcdb``
+    otherwise (same as ``lcdb.db._util.get_path_to_lcdb``, which is not imported as ``lcdb.db`` imports ``deephyper``)."""
+    if "LCDB_DATASET_CACHE" in os.environ:
+        return os.path.expanduser(os.environ["LCDB_DATASET_CACHE"])
+
+    lcdb_folder = os.path.abspath(".lcdb")
+    if not os.path.exists(lcdb_folder):
+        lcdb_folder = os.path.expanduser("~/.lcdb")
+    return os.path.join(lcdb_folder, "datasets")
+
+
+def get_dataset_path(task_name: str, cache_dir: str = None) -> str:
+    """Returns the directory of a task in the dataset cache."""
+    if cache_dir is None:
+        cache_dir = get_dataset_cache_dir()
+    return os.path.join(cache_dir, task_name)
+
+
+def is_dataset_cached(path: str) -> bool:
+    """Returns if the directory contains a dataset written by ``write_dataset`` with the current format."""
+    try:
+        with open(os.path.join(path, "metadata.json"), "r") as f:
+            return json.load(f)["version"] == DATASET_CACHE_VERSION
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def write_dataset(path: str, X: pd.DataFrame, y: pd.Series, metadata: dict):
+    """Writes a dataset in the cache.
+
+    The files are written in a temporary directory which is then renamed, a dataset written concurrently by several
+    processes is therefore kept from the first one.
+
+    Args:
+        path (str): the directory of the dataset (see ``get_dataset_path``).
+        X (pd.DataFrame): the features, the columns with a ``category`` (or non-numeric) dtype are categorical.
+        y (pd.Series): the target.
+        metadata (dict): the metadata of the task, it must be serializable in JSON.
+    """
+    arrays = {}
+    if is_sparse_frame(X):
+        # the numeric columns of a sparse frame are stored as a CSR matrix
+        matrix = X.sparse.to_coo().tocsr()
+        arrays["data"], arrays["indices"], arrays["indptr"] = matrix.data, matrix.indices, matrix.indptr
+        num_missing = np.zeros(X.shape[1], dtype=np.int64)
+        if np.issubdtype(matrix.dtype, np.floating):
+            num_missing = np.bincount(matrix.indices[np.isnan(matrix.data)], minlength=X.shape[1])
+        columns = [
+            {"name": str(c), "num_missing": int(n), "kind": "numeric", "dtype": matrix.dtype.str, "index": i}
+            for i, (c, n) in enumerate(zip(X.columns, num_missing))
+        ]
+        y = y.sparse.to_dense() if isinstance(y.dtype, pd.SparseDtype) else y
+    else:
+        tabular = TabularArray.from_frame(X)
+        columns = tabular.columns
+        for name in ["numeric", "codes", "missing"]:
+            if getattr(tabular, name) is not None:
+                arrays[name] = getattr(tabular, name)
+
+    target = {"name": str(y.name)}
+    if isinstance(y.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(y.dtype):
+        categorical = pd.Categorical(y)
+        target["classes"] = categorical.categories.tolist()
+        target["class_counts"] = np.bincount(
+            categorical.codes[categorical.codes >= 0], minlength=len(target["classes"])
+        ).tolist()
+        target_values = categorical.codes.astype(get_codes_dtype(len(target["classes"])))
+    else:
+        target["dtype"] = y.dtype.str
+        target_values = y.to_numpy()
+    arrays["target"] = target_values
+
+    cache_metadata = {
+        "version": DATASET_CACHE_VERSION,
+        "format": "csr" if "indptr" in arrays else "dense",
+        "shape": list(X.shape),
+        "columns": columns,
+        "target": target,
+        "metadata": metadata,
+    }
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), array)
+        # the metadata is written last as it marks the dataset as complete
+        with open(os.path.join(tmp_path, "metadata.json"), "w") as f:
+            json.dump(cache_metadata, f)
+
+        if os.path.isdir(path) and not is_dataset_cached(path):
+            # written with another version
+            shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # written concurrently by another process
+            if not is_dataset_cached(path):
+                raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _load_array(path: str, name: str, mmap_mode: str):
+    """Loads an array of the cache, ``None`` if it was not written."""
+    file = os.path.join(path, f"{name}.npy")
+    if not os.path.exists(file):
+        return None
+    array = np.load(file, mmap_mode=mmap_mode)
+    # a plain view of the memory map (the memmap subclass is kept by the slices of the array)
+    return np.asarray(array)
+
+
+def read_dataset(path: str, mmap_mode: str = "r"):
+    """Reads a dataset written by ``write_dataset`` as returned by ``load_task``.
+
+    The features of a sparse dataset are given as a CSR matrix of the memory maps of its arrays. Otherwise, if all the
+    columns are numeric, ``X`` is the memory map of the numeric columns (of their common dtype), otherwise it is the
+    ``TabularArray`` of the memory maps of the numeric columns, of the codes of the categorical columns and of the
+    missing values. The target is given as an array of its values.
+
+    Args:
+        path (str): the directory of the dataset (see ``get_dataset_path``).
+        mmap_mode (str, optional): the mode of the memory maps (see ``np.load``). Defaults to ``"r"`` for read-only memory maps.
+
+    Returns:
+        data (tuple): Tuple of `(X, y)` arrays.
+        metadata (dict): Dictionary of metadata for the task, with the metadata of its ``columns``.
+    """
+    with open(os.path.join(path, "metadata.json"), "r") as f:
+        cache_metadata = json.load(f)
+
+    columns = cache_metadata["columns"]
+    numeric = _load_array(path, "numeric", mmap_mode)
+    codes = _load_array(path, "codes", mmap_mode)
+    target_values = _load_array(path, "target", mmap_mode)
+
+    if cache_metadata["format"] == "csr":
+        import scipy.sparse
+
+        X = scipy.sparse.csr_matrix(
+            (
+                _load_array(path, "data", mmap_mode),
+                _load_array(path, "indices", mmap_mode),
+                _load_array(path, "indptr", mmap_mode),
+            ),
+            shape=tuple(cache_metadata["shape"]),
+            copy=False,
+        )
+    else:
+        X = TabularArray(numeric, codes, columns, _load_array(path, "missing", mmap_mode))
+        if X.is_numeric:
+            # same as the values of the data frame, whose dtype is the common dtype of the columns
+            X = numeric
+
+    target = cache_metadata["target"]
+    if "classes" in target:
+        y = np.array(target["classes"])[target_values]
+    else:
+        y = target_values
+
+    # the metadata of the columns computed when the dataset was written (see ``get_columns_metadata``)
+    metadata = dict(cache_metadata["metadata"], columns=summarize_columns(columns))
+    return (X, y), metadata
+
+
+def get_split_path(path: str, test_seed: int, valid_seed: int, test_prop: float, valid_prop: float, stratify: bool) -> str:
+    """Returns the directory of the indices of a split of a dataset of the cache."""
+    name = f"test_seed={test_seed}-valid_seed={valid_seed}-test_prop={test_prop}-valid_prop={valid_prop}-stratify={stratify}"
+    return os.path.join(path, "splits", name)
+
+
+def write_split(path: str, train: np.ndarray, valid: np.ndarray, test: np.ndarray):
+    """Writes the indices of the train, validation and test instances of a split as ``train.npy``, ``valid.npy`` and
+    ``test.npy``.
+
+    As for ``write_dataset``, the files are written in a temporary directory which is then renamed.
+
+    Args:
+        path (str): the directory of the split (see ``get_split_path``).
+        train (np.ndarray): the indices of the train instances.
+        valid (np.ndarray): the indices of the validation instances.
+        test (np.ndarray): the indices of the test instances.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        for name, indices in [("train", train), ("valid", valid), ("test", test)]:
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(indices, dtype=np.int32))
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # written concurrently by another process
+            if not os.path.isdir(path):
+                raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def read_split(path: str, mmap_mode: str = "r"):
+    """Reads the indices of a split written by ``write_split``, ``None`` if the split is not in the cache.
+
+    Args:
+        path (str): the directory of the split (see ``get_split_path``).
+        mmap_mode (str, optional): the mode of the memory maps (see ``np.load``). Defaults to ``"r"`` for read-only memory maps.
+
+    Returns:
+        tuple: the indices of the train, validation and test instances.
+    """
+    try:
+        indices = tuple(_load_array(path, name, mmap_mode) for name in ["train", "valid", "test"])
+    except (OSError, ValueError):
+        return None
+    return None if any(i is None for i in indices) else indices
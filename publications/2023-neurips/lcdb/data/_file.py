@@ -0,0 +1,109 @@
+import json
+import os
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._base import frame_to_arrays
+
+FILE_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".csv": "csv",
+    ".npz": "npz",
+}
+
+
+def get_sidecar_path(path: str) -> str:
+    """Returns the path of the metadata file of a dataset file, e.g., ``data/iris.json`` for ``data/iris.csv``."""
+    return os.path.splitext(path)[0] + ".json"
+
+
+def get_file_data(path: str) -> Tuple[pd.DataFrame, pd.Series, dict]:
+    """Load the data frame of a dataset from a Parquet, NPZ or CSV file.
+
+    The metadata of the dataset are read from the JSON file next to it (see ``get_sidecar_path``), whose keys are all
+    optional:
+
+    - ``"type"``: the type of the task, ``"classification"`` (default) or ``"regression"``.
+    - ``"target"``: the name of the target column (the index of the column for a CSV file without header), defaults to the last column. A NPZ file holds the features and the target in the ``X`` and ``y`` arrays instead.
+    - ``"categories"``: the names (or indices) of the categorical columns, defaults to the columns with a non-numeric dtype.
+    - ``"header"``: if the first line of a CSV file is the header. Defaults to ``True``.
+    - ``"description"``: the description of the dataset.
+
+    Args:
+        path (str): the path of the file of the dataset.
+
+    Raises:
+        ValueError: if the file does not exist or its format is not supported.
+
+    Returns:
+        (pd.DataFrame, pd.Series, dict): X, y, metadata where X is the input data frame (with a categorical dtype for the categorical columns), y is the target series, and metadata is a dictionary containing additional information about the data.
+    """
+    if not os.path.exists(path):
+        raise ValueError(f"Dataset file {path} not found.")
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(
+            f"Format of the dataset file {path} must be one of {list(FILE_FORMATS)} but is '{extension}'."
+        )
+
+    sidecar = {}
+    if os.path.exists(get_sidecar_path(path)):
+        with open(get_sidecar_path(path), "r") as f:
+            sidecar = json.load(f)
+    task_type = sidecar.get("type", "classification")
+    if task_type not in ["classification", "regression"]:
+        raise ValueError(
+            f"Task type must be 'classification' or 'regression' but is {task_type}."
+        )
+
+    file_format = FILE_FORMATS[extension]
+    if file_format == "npz":
+        with np.load(path, allow_pickle=False) as arrays:
+            X, y = pd.DataFrame(arrays["X"]), pd.Series(arrays["y"])
+    else:
+        if file_format == "parquet":
+            data = pd.read_parquet(path)
+        else:
+            data = pd.read_csv(path, header=0 if sidecar.get("header", True) else None)
+        target = sidecar.get("target", data.columns[-1])
+        if target not in data.columns:
+            raise ValueError(f"Target column {target} not found in {path}.")
+        X, y = data.drop(columns=[target]), data[target]
+
+    categories = sidecar.get("categories")
+    if categories is None:
+        categories = [c for c in X.columns if not pd.api.types.is_numeric_dtype(X[c].dtype)]
+    unknown_columns = set(categories).difference(X.columns)
+    if unknown_columns:
+        raise ValueError(f"Categorical columns {unknown_columns} not found in {path}.")
+    X = X.astype({c: "category" for c in categories})
+
+    metadata = {
+        "type": task_type,
+        "categories": [c in categories for c in X.columns],
+        "description": sidecar.get("description"),
+    }
+    if task_type == "classification":
+        y = y.astype("category")
+        metadata["num_classes"] = int(y.nunique())
+
+    return X, y, metadata
+
+
+def load_from_file(path: str) -> Tuple[np.ndarray, np.ndarray, dict]:
+    """Load dataset from a Parquet, NPZ or CSV file (see ``get_file_data``).
+
+    Args:
+        path (str): the path of the file of the dataset.
+
+    Raises:
+        ValueError: if the file does not exist or its format is not supported.
+
+    Returns:
+        (np.ndarray, np.ndarray, dict): X, y, metadata where X is the input array, y is the target array, and metadata is a dictionary containing additional information about the data.
+    """
+    X, y, metadata = get_file_data(path)
+    return frame_to_arrays(X, y), metadata
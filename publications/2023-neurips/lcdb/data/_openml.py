@@ -4,9 +4,11 @@ import numpy as np
 import openml
 import pandas as pd
 
+from ._base import frame_to_arrays
 
-def load_from_openml(dataset_id: str) -> Tuple[np.ndarray, np.ndarray, dict]:
-    """Load dataset from openml library.
+
+def get_openml_data(dataset_id: str) -> Tuple[pd.DataFrame, pd.Series, dict]:
+    """Load the data frame of a dataset from openml library.
 
     Args:
         dataset_id (str): the identifier of the dataset to be loaded from the OpenML database.
@@ -15,7 +17,7 @@ def load_from_openml(dataset_id: str) -> Tuple[np.ndarray, np.ndarray, dict]:
         ValueError: if the dataset is not found.
 
     Returns:
-        (np.ndarray, np.ndarray, dict): X, y, metadata where X is the input array, y is the target array, and metadata is a dictionary containing additional information about the data.
+        (pd.DataFrame, pd.Series, dict): X, y, metadata where X is the input data frame (with a categorical dtype for the categorical columns), y is the target series, and metadata is a dictionary containing additional information about the data.
     """
     dataset = openml.datasets.get_dataset(
         dataset_id,
@@ -27,18 +29,31 @@ def load_from_openml(dataset_id: str) -> Tuple[np.ndarray, np.ndarray, dict]:
     X, y, categorical_indicator, _ = dataset.get_data(
         target=dataset.default_target_attribute
     )
-    X, y = X.values, y.values
-    if isinstance(y, pd.core.arrays.categorical.Categorical):
-        y = np.array([v for v in y])
 
     metadata = {
         "type": "classification",
-        "num_classes": len(np.unique(y)),
-        "categories": categorical_indicator,
+        "num_classes": int(y.nunique()),
+        "categories": [bool(c) for c in categorical_indicator],
         "description": dataset.description,
     }
 
-    return (X, y), metadata
+    return X, y, metadata
+
+
+def load_from_openml(dataset_id: str) -> Tuple[np.ndarray, np.ndarray, dict]:
+    """Load dataset from openml library.
+
+    Args:
+        dataset_id (str): the identifier of the dataset to be loaded from the OpenML database.
+
+    Raises:
+        ValueError: if the dataset is not found.
+
+    Returns:
+        (np.ndarray, np.ndarray, dict): X, y, metadata where X is the input array, y is the target array, and metadata is a dictionary containing additional information about the data.
+    """
+    X, y, metadata = get_openml_data(dataset_id)
+    return frame_to_arrays(X, y), metadata
 
 
 if __name__ == "__main__":
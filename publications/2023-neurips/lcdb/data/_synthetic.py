@@ -0,0 +1,143 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from ._base import frame_to_arrays
+
+# Parameters of a synthetic dataset with their defaults
+SYNTHETIC_PARAMETERS = {
+    "rows": 1000,
+    "features": 20,
+    "classes": 2,
+    "categorical": 0.0,
+    "cardinality": 5,
+    "seed": 42,
+}
+
+
+def parse_synthetic_spec(spec: str) -> dict:
+    """Parses the specification of a synthetic dataset, e.g., ``rows=1e6,features=50,classes=3,categorical=0.2``.
+
+    The parameters not given take their default value (see ``SYNTHETIC_PARAMETERS``):
+
+    - ``rows``: the number of instances.
+    - ``features``: the number of features.
+    - ``classes``: the number of classes.
+    - ``categorical``: the fraction of the features which are categorical.
+    - ``cardinality``: the number of categories of the categorical features.
+    - ``seed``: the random state of the generation.
+
+    Raises:
+        ValueError: if the specification is not valid.
+    """
+    parameters = dict(SYNTHETIC_PARAMETERS)
+    for item in spec.split(","):
+        if item == "":
+            continue
+        key, sep, value = item.partition("=")
+        if sep == "" or key not in SYNTHETIC_PARAMETERS:
+            raise ValueError(
+                f"Synthetic dataset parameters must be 'key=value' with a key in {list(SYNTHETIC_PARAMETERS)} but got '{item}'."
+            )
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(f"Value of the synthetic dataset parameter '{key}' must be a number but is '{value}'.")
+        parameters[key] = value if key == "categorical" else int(value)
+
+    if parameters["rows"] < 1 or parameters["features"] < 1 or parameters["classes"] < 2:
+        raise ValueError(
+            f"A synthetic dataset must have at least 1 row, 1 feature and 2 classes but got {spec}."
+        )
+    if not 0 <= parameters["categorical"] <= 1:
+        raise ValueError(
+            f"The fraction of categorical features must be in [0, 1] but is {parameters['categorical']}."
+        )
+    if parameters["cardinality"] < 2:
+        raise ValueError(
+            f"The cardinality of the categorical features must be at least 2 but is {parameters['cardinality']}."
+        )
+    return parameters
+
+
+def get_synthetic_data(spec: str) -> Tuple[pd.DataFrame, pd.Series, dict]:
+    """Generates the data frame of a synthetic classification dataset with ``sklearn.datasets.make_classification``.
+
+    The last ``categorical * features`` features are discretized in ``cardinality`` categories (``"v0"``, ``"v1"``,
+    etc.) at their quantiles, so that they stay informative. The classes are ``"0"``, ``"1"``, etc.
+
+    Args:
+        spec (str): the specification of the dataset (see ``parse_synthetic_spec``).
+
+    Raises:
+        ValueError: if the specification is not valid.
+
+    Returns:
+        (pd.DataFrame, pd.Series, dict): X, y, metadata where X is the input data frame (with a categorical dtype for the categorical columns), y is the target series, and metadata is a dictionary containing additional information about the data.
+    """
+    from sklearn.datasets import make_classification
+
+    parameters = parse_synthetic_spec(spec)
+    num_features = parameters["features"]
+    num_classes = parameters["classes"]
+    # enough informative features to separate the classes (``make_classification`` needs 2**n >= classes)
+    num_informative = min(num_features, max(2, int(np.ceil(np.log2(num_classes))) + 1))
+    if 2**num_informative < num_classes:
+        raise ValueError(
+            f"A synthetic dataset with {num_classes} classes needs at least {int(np.ceil(np.log2(num_classes)))} features."
+        )
+
+    X, y = make_classification(
+        n_samples=parameters["rows"],
+        n_features=num_features,
+        n_informative=num_informative,
+        n_redundant=0,
+        n_classes=num_classes,
+        n_clusters_per_class=1,
+        shuffle=True,
+        random_state=parameters["seed"],
+    )
+
+    num_categorical = int(round(parameters["categorical"] * num_features))
+    cardinality = parameters["cardinality"]
+    quantiles = np.linspace(0, 1, cardinality + 1)[1:-1]
+    categories = [f"v{i}" for i in range(cardinality)]
+    columns = {}
+    for i in range(num_features):
+        name = f"f{i}"
+        if i >= num_features - num_categorical:
+            codes = np.searchsorted(np.quantile(X[:, i], quantiles), X[:, i])
+            columns[name] = pd.Categorical.from_codes(codes, categories=categories)
+        else:
+            columns[name] = X[:, i]
+    X = pd.DataFrame(columns)
+    y = pd.Series(
+        pd.Categorical.from_codes(y, categories=[str(c) for c in range(num_classes)]),
+        name="class",
+    )
+
+    metadata = {
+        "type": "classification",
+        "num_classes": num_classes,
+        "categories": [i >= num_features - num_categorical for i in range(num_features)],
+        "description": f"Synthetic classification dataset generated by make_classification with {parameters}.",
+    }
+
+    return X, y, metadata
+
+
+def load_from_synthetic(spec: str) -> Tuple[np.ndarray, np.ndarray, dict]:
+    """Load a synthetic classification dataset (see ``get_synthetic_data``).
+
+    Args:
+        spec (str): the specification of the dataset (see ``parse_synthetic_spec``).
+
+    Raises:
+        ValueError: if the specification is not valid.
+
+    Returns:
+        (np.ndarray, np.ndarray, dict): X, y, metadata where X is the input array, y is the target array, and metadata is a dictionary containing additional information about the data.
+    """
+    X, y, metadata = get_synthetic_data(spec)
+    return frame_to_arrays(X, y), metadata
@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse
+
+
+def get_codes_dtype(num_categories: int) -> np.dtype:
+    """Returns the smallest signed integer dtype for codes in ``[-1, num_categories)``."""
+    for dtype in [np.int8, np.int16, np.int32]:
+        if num_categories <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def downcast_numeric(numeric: np.ndarray) -> np.ndarray:
+    """Returns the numeric block as ``float32`` if it represents all its values exactly, and unchanged otherwise."""
+    if numeric.dtype == np.float32:
+        return numeric
+    downcast = numeric.astype(np.float32)
+    with np.errstate(invalid="ignore"):
+        is_exact = np.array_equal(downcast.astype(numeric.dtype), numeric, equal_nan=numeric.dtype.kind == "f")
+    return downcast if is_exact else numeric
+
+
+class TabularArray:
+    """Features of a dataset with numeric and categorical columns stored in typed blocks, used instead of the object
+    array of its data frame (``pd.DataFrame.values``) whose boxed values take up to 8 times more memory.
+
+    The numeric columns are stored in the 2D ``numeric`` array (in ``float32`` if it represents all their values
+    exactly), the categorical columns in the 2D ``codes`` array of the smallest signed integer dtype (``-1`` for a
+    missing value) with the categories of each column, and the missing values in the boolean ``missing`` mask.
+
+    The array is indexed as a 2D NumPy array by the workflows and the builder:
+
+    - ``X[rows]`` returns the ``TabularArray`` of the rows, without building their values.
+    - ``X[rows, columns]`` returns the values of the columns, in ``float64`` if they are all numeric and as the object array of the data frame otherwise.
+    - ``np.asarray(X)`` returns the object array of all the columns.
+
+    Example use:
+
+    >>> X = TabularArray.from_frame(pd.DataFrame({"a": [0.5, 1.5], "b": pd.Categorical(["x", None])}))
+    >>> X[:, [0]]
+    array([[0.5],
+           [1.5]])
+    >>> X[[1], :]
+    array([[1.5, nan]], dtype=object)
+
+    Args:
+        numeric (np.ndarray): the numeric columns, ``None`` if there are none.
+        codes (np.ndarray): the codes of the categorical columns, ``None`` if there are none.
+        columns (list): for each column, a dictionary with its ``kind`` (``"numeric"`` or ``"categorical"``), its ``index`` in ``numeric`` or ``codes``, its ``dtype`` (numeric) or its ``categories`` (categorical) and its ``num_missing``.
+        missing (np.ndarray, optional): the mask of the missing values, ``None`` if there are none. Defaults to ``None``.
+    """
+
+    ndim = 2
+
+    def __init__(self, numeric: np.ndarray, codes: np.ndarray, columns: list, missing: np.ndarray = None):
+        self.numeric = numeric
+        self.codes = codes
+        self.columns = columns
+        self.missing = missing
+
+        block = numeric if numeric is not None else codes
+        self.shape = (0 if block is None else block.shape[0], len(columns))
+
+    @classmethod
+    def from_frame(cls, X: pd.DataFrame, downcast: bool = None) -> "TabularArray":
+        """Builds the typed blocks of a data frame.
+
+        Args:
+            X (pd.DataFrame): the features, the columns with a ``category`` (or non-numeric) dtype are categorical.
+            downcast (bool, optional): if the numeric block is stored in ``float32`` when it is exact. Defaults to ``None``, i.e., only if there are categorical or boolean columns (the numeric block of the other frames is their ``values``, see ``is_numeric``).
+
+        Returns:
+            TabularArray: the features.
+        """
+        # the kinds and missing values of the columns are inspected once for the whole frame
+        is_numeric_dtype = {
+            dtype: pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+            for dtype in set(X.dtypes)
+        }
+        is_missing = X.isna()
+        num_missing = is_missing.sum().to_numpy()
+
+        columns = []
+        numeric, codes = [], []
+        for i, column in enumerate(X.columns):
+            series = X.iloc[:, i]
+            column_metadata = {
+                "name": str(column),
+                "num_missing": int(num_missing[i]),
+            }
+            if is_numeric_dtype[series.dtype]:
+                column_metadata["kind"] = "numeric"
+                column_metadata["dtype"] = series.dtype.str
+                column_metadata["index"] = len(numeric)
+                numeric.append(series.to_numpy())
+            else:
+                categorical = pd.Categorical(series)
+                column_metadata["kind"] = "categorical"
+                column_metadata["categories"] = categorical.categories.tolist()
+                column_metadata["index"] = len(codes)
+                codes.append(categorical.codes)
+            columns.append(column_metadata)
+
+        numeric_block, codes_block, missing = None, None, None
+        if numeric:
+            numeric_block = np.stack(numeric, axis=1).astype(np.result_type(*numeric), copy=False)
+        if codes:
+            num_categories = max(len(c["categories"]) for c in columns if c["kind"] == "categorical")
+            codes_block = np.stack(codes, axis=1).astype(get_codes_dtype(num_categories))
+        if num_missing.any():
+            missing = is_missing.to_numpy()
+
+        tabular = cls(numeric_block, codes_block, columns, missing)
+        if downcast is None:
+            downcast = not tabular.is_numeric
+        if downcast and numeric_block is not None:
+            tabular.numeric = downcast_numeric(numeric_block)
+        return tabular
+
+    @property
+    def is_numeric(self) -> bool:
+        """If all the columns are numeric and not boolean, the values of the frame are then the ``numeric`` array."""
+        return self.codes is None and all(
+            c["kind"] == "numeric" and np.dtype(c["dtype"]) != np.dtype(bool) for c in self.columns
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the blocks in bytes."""
+        return sum(a.nbytes for a in [self.numeric, self.codes, self.missing] if a is not None)
+
+    def has_missing_values(self) -> bool:
+        """Returns if there are missing values (same as ``np.any(pd.isnull(np.asarray(X)))``)."""
+        return self.missing is not None and bool(self.missing.any())
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.get_values(np.arange(self.shape[1]))
+        return values if dtype is None else values.astype(dtype)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            if len(key) != 2:
+                raise IndexError(f"A TabularArray has 2 dimensions but {len(key)} indices were given.")
+            rows, columns = key
+            if isinstance(rows, (int, np.integer)):
+                return self.take_rows([rows])[:, columns][0]
+            if isinstance(rows, slice) and rows == slice(None):
+                tabular = self
+            else:
+                tabular = self.take_rows(rows)
+            indices = np.arange(self.shape[1])[columns]
+            if np.ndim(indices) == 0:
+                return tabular.get_values(indices.reshape(1))[:, 0]
+            return tabular.get_values(indices)
+        if isinstance(key, (int, np.integer)):
+            return self.take_rows([key])[:, :][0]
+        return self.take_rows(key)
+
+    def take_rows(self, rows) -> "TabularArray":
+        """Returns the ``TabularArray`` of the rows selected by ``rows`` (a slice, indices or a boolean mask)."""
+        if isinstance(rows, list):
+            rows = np.asarray(rows)
+        return TabularArray(
+            None if self.numeric is None else self.numeric[rows],
+            None if self.codes is None else self.codes[rows],
+            self.columns,
+            None if self.missing is None else self.missing[rows],
+        )
+
+    def get_values(self, indices: np.ndarray) -> np.ndarray:
+        """Returns the values of the columns of ``indices`` (see ``TabularArray``)."""
+        columns = [self.columns[i] for i in indices]
+        if all(c["kind"] == "numeric" for c in columns):
+            return self.numeric[:, [c["index"] for c in columns]].astype(np.float64)
+
+        # same values as the object array of the original data frame
+        frame = {}
+        for i, column in enumerate(columns):
+            if column["kind"] == "numeric":
+                frame[i] = self.numeric[:, column["index"]].astype(column["dtype"], copy=False)
+            else:
+                frame[i] = pd.Categorical.from_codes(
+                    self.codes[:, column["index"]], categories=column["categories"]
+                )
+        return pd.DataFrame(frame).values
+
+
+def summarize_columns(columns: list) -> list:
+    """Returns the metadata of the columns of a dataset given to the workflows (see ``get_columns_metadata``) from the
+    metadata of the columns of a ``TabularArray`` or of the dataset cache."""
+    return [
+        {
+            "kind": c["kind"],
+            "num_missing": c["num_missing"],
+            "cardinality": len(c["categories"]) if c["kind"] == "categorical" else None,
+        }
+        for c in columns
+    ]
+
+
+def get_columns_metadata(X) -> list:
+    """Returns the metadata of the columns of the features of a dataset, computed once when the dataset is loaded (see
+    ``load_task``) so that the workflows do not inspect the values of each anchor.
+
+    For each column, the metadata is a dictionary with its ``kind`` (``"numeric"`` or ``"categorical"``), its number of
+    missing values ``num_missing`` and its ``cardinality`` (the number of categories of a categorical column, ``None``
+    for a numeric column). The columns of an object array are categorical unless pandas infers a numeric dtype for them.
+
+    Args:
+        X (np.ndarray): the features, a ``TabularArray``, a dense array or a sparse matrix.
+
+    Returns:
+        list: the metadata of each column.
+    """
+    if isinstance(X, TabularArray):
+        return summarize_columns(X.columns)
+    if scipy.sparse.issparse(X):
+        X = X.tocsr()
+        num_missing = np.zeros(X.shape[1], dtype=np.int64)
+        if np.issubdtype(X.dtype, np.floating):
+            num_missing = np.bincount(X.indices[np.isnan(X.data)], minlength=X.shape[1])
+    elif X.dtype == object:
+        return summarize_columns(TabularArray.from_frame(pd.DataFrame(X).infer_objects()).columns)
+    elif np.issubdtype(X.dtype, np.inexact):
+        num_missing = np.isnan(X).sum(axis=0)
+    else:
+        num_missing = np.zeros(X.shape[1], dtype=np.int64)
+    return [{"kind": "numeric", "num_missing": int(n), "cardinality": None} for n in num_missing]
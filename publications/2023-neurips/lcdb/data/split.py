@@ -10,43 +10,144 @@ from sklearn.pipeline import Pipeline
 import logging
 import sklearn.impute
 
+from ._tabular import get_columns_metadata
 
-def train_valid_test_split(
-    X,
+
+def train_valid_test_split_indices(
     y,
     test_seed,
     valid_seed,
     test_prop=0.1,
     valid_prop=0.1,
     stratify=True,
-):
-    X_learn, X_test, y_learn, y_test = sklearn.model_selection.train_test_split(
-        X,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the ``int32`` indices of the train, validation and test instances of ``train_valid_test_split``.
+
+    The splits only depend on the labels, e.g., ``X[train]`` is the same as the ``X_train`` of ``train_valid_test_split``.
+
+    Args:
+        y (np.ndarray): the labels of the dataset.
+        test_seed (int): random state of the train+validation/test split.
+        valid_seed (int): random state of the train/validation split.
+        test_prop (float, optional): ratio of test/data. Defaults to ``0.1``.
+        valid_prop (float, optional): ratio of validation/data. Defaults to ``0.1``.
+        stratify (bool, optional): if the splits are stratified. Defaults to ``True``.
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray): the indices of the train, validation and test instances.
+    """
+    num_instances = len(y)
+    indices = np.arange(num_instances, dtype=np.int32)
+    learn, test, y_learn, _ = sklearn.model_selection.train_test_split(
+        indices,
         y,
         test_size=test_prop,
         random_state=test_seed,
         stratify=y if stratify else None,
         shuffle=True,
     )
-    X_train, X_valid, y_train, y_valid = sklearn.model_selection.train_test_split(
-        X_learn,
-        y_learn,
-        train_size=int(X.shape[0] * (1 - test_prop - valid_prop)),
+    train, valid = sklearn.model_selection.train_test_split(
+        learn,
+        train_size=int(num_instances * (1 - test_prop - valid_prop)),
         random_state=valid_seed,
         stratify=y_learn if stratify else None,
         shuffle=True,  # TODO: check
     )
-    return X_train, X_valid, X_test, y_train, y_valid, y_test
+    return train, valid, test
+
+
+def load_split_indices(
+    task_name: str,
+    y,
+    test_seed,
+    valid_seed,
+    test_prop=0.1,
+    valid_prop=0.1,
+    stratify=True,
+    use_cache: bool = True,
+    cache_dir: str = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the indices of ``train_valid_test_split_indices`` for a task loaded by ``load_task``.
+
+    The indices of a task of the dataset cache are stored next to its dataset the first time they are computed and are
+    then memory-mapped from the cache (see ``lcdb.data._cache.write_split``), so that all the jobs on the task use the
+    same split without computing it again.
+
+    Args:
+        task_name (str): the name of the task, e.g., `openml.3`.
+        y (np.ndarray): the labels of the task.
+        test_seed (int): random state of the train+validation/test split.
+        valid_seed (int): random state of the train/validation split.
+        test_prop (float, optional): ratio of test/data. Defaults to ``0.1``.
+        valid_prop (float, optional): ratio of validation/data. Defaults to ``0.1``.
+        stratify (bool, optional): if the splits are stratified. Defaults to ``True``.
+        use_cache (bool, optional): If the dataset cache is used. Defaults to `True`.
+        cache_dir (str, optional): Directory of the dataset cache. Defaults to `None` for the default directory (see `load_task`).
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray): the indices of the train, validation and test instances.
+    """
+    from lcdb.data._base import CACHED_SOURCES
+
+    if not use_cache or task_name.partition(".")[0] not in CACHED_SOURCES:
+        return train_valid_test_split_indices(y, test_seed, valid_seed, test_prop, valid_prop, stratify=stratify)
+
+    from lcdb.data._cache import get_dataset_path, get_split_path, is_dataset_cached, read_split, write_split
+
+    dataset_path = get_dataset_path(task_name, cache_dir)
+    path = get_split_path(dataset_path, test_seed, valid_seed, test_prop, valid_prop, stratify)
+    indices = read_split(path)
+    if indices is not None and sum(len(i) for i in indices) == len(y):
+        return indices
+
+    indices = train_valid_test_split_indices(y, test_seed, valid_seed, test_prop, valid_prop, stratify=stratify)
+    # the split is only stored next to a dataset of the cache, which removes it when the dataset is written again
+    if is_dataset_cached(dataset_path):
+        try:
+            write_split(path, *indices)
+        except OSError as exception:
+            logging.getLogger(__name__).warning(
+                f"The split of the task '{task_name}' cannot be written in the dataset cache: {exception}"
+            )
+    return indices
+
+
+def train_valid_test_split(
+    X,
+    y,
+    test_seed,
+    valid_seed,
+    test_prop=0.1,
+    valid_prop=0.1,
+    stratify=True,
+):
+    train, valid, test = train_valid_test_split_indices(
+        y, test_seed, valid_seed, test_prop, valid_prop, stratify=stratify
+    )
+    y = np.asarray(y)
+    return X[train], X[valid], X[test], y[train], y[valid], y[test]
 
 
 def get_mandatory_preprocessing(
-    X, y, binarize_sparse=False, drop_first=True, scaler="minmax"
+    X, y, binarize_sparse=False, drop_first=True, scaler="minmax", columns=None
 ):
+    """Returns the fixed pre-processing steps for imputation, scaling and binarization of a dataset.
+
+    Args:
+        X (np.ndarray): the instances of the dataset.
+        y (np.ndarray): the labels of the dataset.
+        binarize_sparse (bool, optional): if the output of the binarization is sparse. Defaults to ``False``.
+        drop_first (bool, optional): if the first category of each categorical column is dropped. Defaults to ``True``.
+        scaler (str, optional): the scaler of the numeric columns, ``"minmax"``, ``"standardize"`` or ``"none"``. Defaults to ``"minmax"``.
+        columns (list, optional): the metadata of the columns of the dataset (the ``columns`` entry of the metadata of ``load_task``). Defaults to ``None`` to inspect the dtypes of ``X`` (see ``get_columns_metadata``).
+
+    Returns:
+        list: the steps of the pipeline.
+    """
     # determine fixed pre-processing steps for imputation and binarization
-    types = [set([type(v) for v in r]) for r in X.T]
-    numeric_features = [
-        c for c, t in enumerate(types) if len(t) == 1 and list(t)[0] != str
-    ]
+    if columns is None:
+        columns = get_columns_metadata(X)
+    numeric_features = [c for c, column in enumerate(columns) if column["kind"] == "numeric"]
 
     myscaler = None
     if scaler == "minmax":
@@ -68,7 +169,7 @@ def get_mandatory_preprocessing(
         )
 
     categorical_features = [i for i in range(X.shape[1]) if i not in numeric_features]
-    missing_values_per_feature = np.sum(pd.isnull(X), axis=0)
+    missing_values_per_feature = np.array([column["num_missing"] for column in columns])
     logging.info(
         f"There are {len(categorical_features)} categorical features, which will be binarized."
     )
@@ -88,7 +189,7 @@ def get_mandatory_preprocessing(
                     sklearn.preprocessing.OneHotEncoder(
                         drop="first" if drop_first else None,
                         handle_unknown=handle_unknown,
-                        sparse=binarize_sparse,
+                        sparse_output=binarize_sparse,
                     ),
                 ),
             ]
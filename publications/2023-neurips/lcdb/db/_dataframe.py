@@ -1,4 +1,5 @@
 import json
+import re
 from typing import Tuple
 
 import numpy as np
@@ -6,6 +7,10 @@ import pandas as pd
 from deephyper.analysis.hps import filter_failed_objectives
 
 import lcdb.json
+from lcdb.builder.node_table import NodeTable
+
+JSON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+PYTHON_LITERALS = re.compile(r"\b(True|False|None)\b")
 
 
 def deserialize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
@@ -13,9 +18,12 @@ def deserialize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 
     df.sort_values("job_id", inplace=True)
 
-    # Convert the string to JSON
+    # Convert the string to JSON (the dicts are written as their Python representation)
     str_to_json = (
-        lambda x: x.replace("'", '"').replace("nan", "NaN").replace("inf", "Infinity") if type(x) == str else x
+        lambda x: PYTHON_LITERALS.sub(
+            lambda m: JSON_LITERALS[m.group(0)],
+            x.replace("'", '"').replace("nan", "NaN").replace("inf", "Infinity"),
+        ) if type(x) == str else x
     )
     load_json = lambda x: lcdb.json.loads(str_to_json(x)) if type(x) == str else x
     load_array = lambda x: np.array(load_json(x))
@@ -32,6 +40,12 @@ def deserialize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         if col in df.columns:
             df[col] = df[col].map(load_json)
 
+    # Rebuild the trees of the results stored as tables of nodes (see "--timer-format")
+    if "m:table" in df.columns:
+        load_table = lambda x: NodeTable.deserialize(x).as_dict() if type(x) == str else x
+        trees = df.pop("m:table").map(load_table)
+        df["m:json"] = trees if "m:json" not in df.columns else df["m:json"].fillna(trees)
+
     return df
 
 
@@ -50,6 +64,27 @@ def read_csv_results(path_or_buffer) -> Tuple[pd.DataFrame, pd.DataFrame]:
     return df, df_failed
 
 
+def read_anchor_costs(paths: list, workflow: str, openml_id: int = None) -> list:
+    """Read the time of each anchor built by a workflow in CSV files of results (e.g., as the prior of the "budget"
+    schedule of anchors).
+
+    Args:
+        paths (list): paths to the csv files.
+        workflow (str): the class of the workflow (e.g., "lcdb.workflow.sklearn.LibLinearWorkflow").
+        openml_id (int, optional): if results of the workflow on this dataset are found, only they are used. Defaults to None.
+
+    Returns:
+        list: the ``(anchor, duration)`` pairs (see ``get_anchor_costs``).
+    """
+    from lcdb.builder.utils import get_anchor_costs
+
+    df = pd.concat([deserialize_dataframe(pd.read_csv(path)) for path in paths])
+    df = df[(df["m:workflow"] == workflow) & df["m:json"].map(lambda x: isinstance(x, dict))]
+    if openml_id is not None and (df["m:openmlid"] == openml_id).any():
+        df = df[df["m:openmlid"] == openml_id]
+    return [cost for tree in df["m:json"] for cost in get_anchor_costs(tree)]
+
+
 def hyperparameters_from_row(row) -> dict:
     """Return a dictionary of hyperparameters from a row of the results dataframe.
 
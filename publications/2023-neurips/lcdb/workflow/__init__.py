@@ -1,3 +1,18 @@
-from ._base_workflow import BaseWorkflow
+import importlib
 
-__all__ = ["BaseWorkflow"]
+from ._registry import WORKFLOWS, get_config_space, get_workflow_class, get_workflow_module
+
+__all__ = [
+    "BaseWorkflow",
+    "WORKFLOWS",
+    "get_config_space",
+    "get_workflow_class",
+    "get_workflow_module",
+]
+
+
+def __getattr__(name):
+    # the base workflow imports sklearn, it is only imported with the workflows
+    if name == "BaseWorkflow":
+        return importlib.import_module("lcdb.workflow._base_workflow").BaseWorkflow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
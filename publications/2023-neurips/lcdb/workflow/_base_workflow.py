@@ -1,4 +1,6 @@
 import abc
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 from typing import Any
 from lcdb.builder.timer import Timer
@@ -27,6 +29,38 @@ class BaseWorkflow(abc.ABC):
         # Indicates if the workflow requires test data to be fitted (to be able to predict on test data on child fidelities)
         self.requires_test_to_fit = False
 
+        # Indicates if the workflow can continue training from its current state when new training data arrives
+        self.supports_warm_start = False
+
+        # Indicates if the last call to ``partial_fit`` continued the training (it can refit the workflow from scratch)
+        self.warm_started = False
+
+        # Number of training instances of the last anchor if the workflow is warm started on the anchors of a curve, None otherwise
+        self.warm_start_final_anchor = None
+
+        # Number of training instances on which the workflow was fitted so far
+        self.num_train_instances_fitted = 0
+
+        # Indicates if the workflow can be fitted on sparse (CSR) data, the pre-processing then keeps sparse data sparse
+        self.accepts_sparse = False
+
+        # Selects the instances on which the workflow is scored during its training (e.g., at each epoch), all instances are used if None
+        self.evaluation_sampler = None
+
+        # Records the predictions scored during the training (e.g., at each epoch) if not None
+        self.predictions_recorder = None
+
+        # Selects the metrics computed during the training (see ``MetricSelection``), all metrics are computed if None
+        self.metric_selection = None
+
+        # Number of instances predicted at once (all instances if None) and number of threads predicting chunks concurrently
+        self.predict_chunk_size = None
+        self.predict_num_threads = 1
+
+        # Indicates if the prediction of an instance does not depend on the other instances predicted in the same call
+        # (e.g., not for random predictions drawn from a generator seeded at each call), only then are they predicted in chunks
+        self.row_independent_predictions = True
+
         self.constant_prediction = None  # this is used to treat cases where only one class is provided
 
         self.label_encoder = LabelEncoder()  # internally we will always work with numeric classes
@@ -75,6 +109,8 @@ class BaseWorkflow(abc.ABC):
                     metadata=metadata
                 )
         self.workflow_fitted = True
+        self.warm_started = False
+        self.num_train_instances_fitted = len(y)
         return self
 
     @abc.abstractmethod
@@ -82,11 +118,61 @@ class BaseWorkflow(abc.ABC):
         """Fit the workflow to the data."""
         raise NotImplementedError
 
+    def partial_fit(self, X, y, X_valid, y_valid, X_test, y_test, metadata) -> "BaseWorkflow":
+        """Continue the training of an already fitted workflow on a larger training set.
+
+        ``X`` and ``y`` are all the training instances of the current anchor, the first ``num_train_instances_fitted``
+        of which are those the workflow was fitted on so far (the anchors are monotonic). The learner continues its
+        training from its current state (see ``_partial_fit`` of the workflows for what is trained on which instances)
+        on the features of the pre-processing fitted at the first anchor. If the learner cannot continue (e.g., the
+        pre-processing cannot be kept), the workflow is refitted from scratch and ``warm_started`` is ``False``.
+        Check ``can_partial_fit`` first to know if the data allows for it.
+        """
+        if not self.can_partial_fit(y):
+            raise ValueError(f"{self.__class__.__name__} cannot be warm started on the given data.")
+
+        y = self.label_encoder.transform(y)
+        y_valid = self.label_encoder.transform(y_valid)
+        y_test = self.label_encoder.transform(y_test)
+
+        self.warm_started = True
+        with self.timer.time("fit") as fit_timer:
+            self._partial_fit(
+                X=X,
+                y=y,
+                X_valid=X_valid,
+                y_valid=y_valid,
+                X_test=X_test,
+                y_test=y_test,
+                metadata=metadata
+            )
+            fit_timer["warm_started"] = self.warm_started
+        self.num_train_instances_fitted = len(y)
+        return self
+
+    def can_partial_fit(self, y) -> bool:
+        """Returns ``True`` if the workflow can continue its training on the training instances of a larger anchor with labels ``y``."""
+        return (
+            self.supports_warm_start
+            and self.workflow_fitted
+            and self.constant_prediction is None
+            and set(np.unique(y)).issubset(self.infos["classes_train_orig"])
+        )
+
+    def _partial_fit(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
+        """Continue fitting the workflow on the instances of a larger anchor (see ``partial_fit``)."""
+        raise NotImplementedError
+
+    def sample_for_evaluation(self, X, y):
+        """Returns the instances and labels of a split on which the workflow should be scored during its training."""
+        if self.evaluation_sampler is None:
+            return X, y
+        return self.evaluation_sampler.sample(X, y)
+
     def predict(self, *args, **kwargs) -> NP_ARRAY:
         """Predict from the data."""
         with self.timer.time("predict"):
             y_pred = self.get_predictions_from_probas(self.predict_proba(*args, **kwargs))
-            raise Exception(y_pred)
 
         return y_pred
 
@@ -100,16 +186,65 @@ class BaseWorkflow(abc.ABC):
         """Predict from the data."""
         raise NotImplementedError
 
-    def predict_proba(self, *args, **kwargs) -> NP_ARRAY:
+    def predict_proba(self, X, **kwargs) -> NP_ARRAY:
         """Predict from the data."""
         with self.timer.time("predict_proba"):
 
             # if there is a constant prediction, do not refer to the actual workflow
             if self.constant_prediction is not None:
-                X = kwargs["X"] if "X" in kwargs else args[0]
                 y_pred = np.ones(X.shape[0])
             else:
-                y_pred = self._predict_proba(*args, **kwargs)
+                y_pred = self.predict_in_chunks(
+                    functools.partial(self._predict_proba, **kwargs), X
+                )
+        return y_pred
+
+    def predict_in_chunks(self, predict_fn, X) -> NP_ARRAY:
+        """Apply ``predict_fn`` to consecutive chunks of at most ``predict_chunk_size`` rows of ``X``.
+
+        The outputs of the chunks are written into an array preallocated after the first chunk. If
+        ``predict_num_threads > 1`` the remaining chunks are predicted by a pool of threads, which only speeds up
+        learners that release the GIL while predicting. All rows are predicted at once if the predictions are not
+        independent of each other (see ``row_independent_predictions``).
+
+        Args:
+            predict_fn (callable): function returning an array with one row per row of its input.
+            X (np.ndarray): the data to predict.
+
+        Returns:
+            np.ndarray: the concatenated outputs of ``predict_fn``.
+        """
+        num_instances = X.shape[0]
+        chunk_size = self.predict_chunk_size
+        if (
+            not self.row_independent_predictions
+            or chunk_size is None
+            or chunk_size <= 0
+            or num_instances <= chunk_size
+        ):
+            return predict_fn(X)
+
+        # the first chunk gives the shape and type of the output
+        y_pred_chunk = np.asarray(predict_fn(X[:chunk_size]))
+        y_pred = np.empty(
+            (num_instances,) + y_pred_chunk.shape[1:], dtype=y_pred_chunk.dtype
+        )
+        y_pred[:chunk_size] = y_pred_chunk
+        del y_pred_chunk
+
+        def predict_chunk(start):
+            end = min(start + chunk_size, num_instances)
+            y_pred[start:end] = predict_fn(X[start:end])
+
+        starts = range(chunk_size, num_instances, chunk_size)
+        if self.predict_num_threads > 1:
+            with ThreadPoolExecutor(max_workers=self.predict_num_threads) as executor:
+                # consume the iterator to raise exceptions of the threads
+                list(executor.map(predict_chunk, starts))
+        else:
+            for start in starts:
+                predict_chunk(start)
+
         return y_pred
 
     @abc.abstractmethod
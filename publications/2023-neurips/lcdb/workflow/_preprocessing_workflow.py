@@ -3,6 +3,7 @@ import warnings
 import os
 import numpy as np
 import pandas as pd
+import scipy.sparse
 from sys import getsizeof
 from ConfigSpace import (
     Constant,
@@ -27,8 +28,11 @@ from sklearn.preprocessing import (
     OrdinalEncoder,
     PolynomialFeatures,
     StandardScaler, LabelEncoder,
+    FunctionTransformer,
 )
 
+from lcdb.data._tabular import TabularArray
+
 from ._base_workflow import BaseWorkflow
 
 KEY_CAT_ENCODER = "cat_encoder"
@@ -37,6 +41,96 @@ KEY_FEATUREGEN = "featuregen"
 KEY_FEATUREMAPPER = "decomposition"
 KEY_FEATURESELECTOR = "featureselector"
 
+# The output of the pre-processing is kept sparse (CSR) if its estimated density is below SPARSE_DENSITY_THRESHOLD and
+# its dense size (in float32, over all the instances of the dataset) above SPARSE_MIN_DENSE_BYTES. Smaller outputs stay
+# dense so that the results of the datasets which fit in memory do not change.
+SPARSE_DENSITY_THRESHOLD = 0.3
+SPARSE_MIN_DENSE_BYTES = 512 * 1024**2
+
+# Values of the pre-processing hyperparameters whose steps do not accept sparse data, the output is then dense
+DENSE_ONLY_STEPS = {
+    KEY_SCALER: ["minmax", "std"],
+    KEY_FEATUREMAPPER: ["lda", "fastica", "agglomerator"],
+}
+
+
+def get_missing_columns(metadata) -> np.ndarray:
+    """Returns the indices of the columns with missing values in the dataset from the metadata of its columns (see
+    ``lcdb.data._tabular.get_columns_metadata``), ``None`` if the metadata does not give them."""
+    columns = metadata.get("columns")
+    if columns is None:
+        return None
+    return np.array([i for i, c in enumerate(columns) if c["num_missing"] > 0], dtype=int)
+
+
+def has_missing_values(X, columns=None) -> bool:
+    """Returns if ``X`` (a dense or sparse matrix or a ``TabularArray``) has missing values.
+
+    Args:
+        X (np.ndarray): the instances.
+        columns (np.ndarray, optional): the indices of the only columns which can have missing values (see ``get_missing_columns``). Defaults to ``None`` to check all the columns.
+
+    Returns:
+        bool: if there are missing values.
+    """
+    if columns is not None:
+        if len(columns) == 0:
+            return False
+        if isinstance(X, TabularArray):
+            return X.missing is not None and bool(X.missing[:, columns].any())
+        if len(columns) < X.shape[1]:
+            X = X[:, columns]
+    if scipy.sparse.issparse(X):
+        return np.issubdtype(X.dtype, np.floating) and bool(np.isnan(X.data).any())
+    if isinstance(X, TabularArray):
+        return X.has_missing_values()
+    if np.issubdtype(X.dtype, np.inexact):
+        return bool(np.isnan(X).any())
+    return bool(np.any(pd.isnull(X)))
+
+
+def densify(X):
+    """Returns ``X`` as a dense array if it is a sparse matrix."""
+    return X.toarray() if scipy.sparse.issparse(X) else X
+
+
+def estimate_encoded_size(X, metadata, cat_encoder: str = "onehot") -> tuple:
+    """Estimates the number of columns and the number of non-zero values of ``X`` once its categorical columns are
+    encoded (one value per instance and categorical column, the numeric columns are counted as dense unless ``X`` is
+    sparse).
+
+    Args:
+        X (np.ndarray): the instances (possibly a sparse matrix).
+        metadata (dict): the metadata of the dataset with the categorical columns and their categories.
+        cat_encoder (str, optional): the encoder of the categorical columns, ``"onehot"`` or ``"ordinal"``. Defaults to ``"onehot"``.
+
+    Returns:
+        tuple: the number of columns and the number of non-zero values.
+    """
+    is_categorical = np.asarray(metadata["categories"]["columns"], dtype=bool)
+    idx_num_col = np.where(~is_categorical)[0]
+    idx_cat_col = np.where(is_categorical)[0]
+
+    num_rows = X.shape[0]
+    if scipy.sparse.issparse(X):
+        nnz = X.nnz if len(idx_cat_col) == 0 else X[:, idx_num_col].nnz
+    else:
+        nnz = num_rows * len(idx_num_col)
+    num_columns = len(idx_num_col)
+
+    if len(idx_cat_col) > 0:
+        nnz += num_rows * len(idx_cat_col)
+        if cat_encoder == "onehot":
+            categories = metadata["categories"].get("values")
+            if categories is None:
+                categories = [pd.unique(densify(X[:, [i]]).ravel()) for i in idx_cat_col]
+            # the first category is dropped
+            num_columns += sum(max(len(c) - 1, 1) for c in categories)
+        else:
+            num_columns += len(idx_cat_col)
+
+    return num_columns, nnz
+
 CONFIG_SPACE = ConfigurationSpace(
     name="standard_preprocessing",
     space={
@@ -121,6 +215,13 @@ class PreprocessedWorkflow(BaseWorkflow):
         # extract preprocessing hyperparameters
         self.pp_kws = kwargs
         self.pp_pipeline = None
+        # if the output of the pre-processing pipeline is sparse (see ``use_sparse_transform``)
+        self.sparse_transform = False
+        # number of features given to the learner by the pre-processing pipeline
+        self.num_features_transformed = None
+        # if the pre-processing pipeline fitted at the first anchor is kept for the next anchors of a warm-started
+        # curve (see ``can_freeze_pp_pipeline``)
+        self.pp_pipeline_frozen = False
 
         self.kernel_pca_kernel = kernel_pca_kernel
         self.kernel_pca_n_components = kernel_pca_n_components
@@ -159,22 +260,58 @@ class PreprocessedWorkflow(BaseWorkflow):
                 self.pp_pipeline = self.get_pp_pipeline(X, y, metadata, **self.pp_kws)
 
                 self.pp_pipeline.fit(X, y)
+                self.timer.active_node["sparse"] = self.sparse_transform
 
             X = self.pp_pipeline.transform(X) if self.pp_pipeline is not None else X
         return X
 
+    def use_sparse_transform(self, X, metadata, **kwargs) -> bool:
+        """Returns if the output of the pre-processing is kept sparse (see ``SPARSE_DENSITY_THRESHOLD``), which
+        requires the learner and all the steps of the pre-processing to accept sparse data."""
+        if not self.accepts_sparse:
+            return False
+        if any(kwargs.get(key) in values for key, values in DENSE_ONLY_STEPS.items()):
+            return False
+
+        num_columns, nnz = estimate_encoded_size(X, metadata, kwargs.get(KEY_CAT_ENCODER, "onehot"))
+        density = nnz / max(X.shape[0] * num_columns, 1)
+        dense_bytes = metadata.get("num_instances", X.shape[0]) * num_columns * np.dtype(np.float32).itemsize
+        return density < SPARSE_DENSITY_THRESHOLD and dense_bytes > SPARSE_MIN_DENSE_BYTES
+
+    def can_freeze_pp_pipeline(self, metadata) -> bool:
+        """Returns if the pre-processing pipeline fitted at the first anchor can be kept for the next anchors of a
+        warm-started curve, i.e., if its output columns do not depend on the instances it is fitted on. The categories
+        of the categorical columns (see ``known_categories``) and the columns with missing values must be known from
+        the metadata of the dataset."""
+        has_cat = np.any(metadata["categories"]["columns"])
+        return (
+            self.warm_start_final_anchor is not None
+            and (not has_cat or metadata["categories"].get("values") is not None)
+            and get_missing_columns(metadata) is not None
+        )
+
     def get_pp_pipeline(self, X, y, metadata, **kwargs):
         idx_cat_col = np.where(metadata["categories"]["columns"])[0]
         idx_num_col = np.where(~np.array(metadata["categories"]["columns"]))[0]
         has_cat = len(idx_cat_col) > 0
         has_num = len(idx_num_col) > 0
 
+        self.sparse_transform = self.use_sparse_transform(X, metadata, **kwargs)
+        self.pp_pipeline_frozen = self.can_freeze_pp_pipeline(metadata)
+
         cat_steps = []
         num_steps = []
         treated_kws = []
 
-        # step 1: imputation
-        if np.any(pd.isnull(X)):
+        # step 1: imputation (only the columns with missing values in the dataset are checked)
+        if self.pp_pipeline_frozen:
+            # the instances of the next anchors can have missing values where those of the first anchor have none,
+            # the columns of the imputers must not depend on them either
+            missing_columns = get_missing_columns(metadata)
+            if len(missing_columns) > 0:
+                cat_steps.append(("cat_imputer", SimpleImputer(strategy="most_frequent", keep_empty_features=True)))
+                num_steps.append(("num_imputer", SimpleImputer(strategy="most_frequent", keep_empty_features=True)))
+        elif has_missing_values(X, get_missing_columns(metadata)):
             cat_steps.append(("cat_imputer", SimpleImputer(strategy="most_frequent")))
             num_steps.append(("num_imputer", SimpleImputer(strategy="most_frequent")))
 
@@ -185,14 +322,19 @@ class PreprocessedWorkflow(BaseWorkflow):
                     f"{KEY_CAT_ENCODER} must be specified if the dataset has categorical attributes."
                 )
 
-            # Categorical features
+            # Categorical features, the encoders of a frozen pipeline are fitted on all the known categories so that
+            # their columns do not depend on the categories of the first anchor
+            categories = metadata["categories"]["values"] if self.pp_pipeline_frozen else "auto"
             if kwargs[KEY_CAT_ENCODER] == "onehot":
                 cat_encoder = OneHotEncoder(
-                    drop="first", sparse_output=False, handle_unknown="ignore"
+                    categories=categories,
+                    drop="first",
+                    sparse_output=self.sparse_transform,
+                    handle_unknown="ignore",
                 )
             elif kwargs[KEY_CAT_ENCODER] == "ordinal":
                 cat_encoder = OrdinalEncoder(
-                    handle_unknown="use_encoded_value", unknown_value=-1
+                    categories=categories, handle_unknown="use_encoded_value", unknown_value=-1
                 )
             else:
                 raise ValueError(
@@ -214,9 +356,15 @@ class PreprocessedWorkflow(BaseWorkflow):
         steps = [
             (
                 "pre_numeric_pp",
-                ColumnTransformer(transformers=transformers, remainder="passthrough"),
+                ColumnTransformer(
+                    transformers=transformers,
+                    remainder="passthrough",
+                    sparse_threshold=1.0 if self.sparse_transform else 0.0,
+                ),
             )
         ]
+        if scipy.sparse.issparse(X) and not self.sparse_transform:
+            steps.insert(0, ("densify", FunctionTransformer(densify, accept_sparse=True)))
 
         # step 6: feature selector
         if KEY_FEATURESELECTOR in kwargs:
@@ -317,14 +465,39 @@ class PreprocessedWorkflow(BaseWorkflow):
         X_valid_transformed = self.transform(X_valid, y_valid, metadata, timer_suffix="_valid").astype(np.float32)
         X_test_transformed = self.transform(X_test, y_test, metadata, timer_suffix="_test").astype(np.float32)
 
+        self.num_features_transformed = X_train_transformed.shape[1]
         self._fit_model_after_transformation(X_train_transformed, y, X_valid_transformed, y_valid, X_test_transformed, y_test, metadata)
 
+    def _partial_fit(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
+
+        # the learner continues its training only on the features of the pipeline fitted at the first anchor: a
+        # refitted pipeline (e.g., scaler, decomposition, feature selection) would give the same number of columns with
+        # another meaning. If the pipeline cannot be frozen, the workflow is refitted from scratch.
+        if not self.pp_pipeline_frozen:
+            self.warm_started = False
+            self.transform_fitted = False
+        X, y = self._transform_train_data_prior_to_standard_preprocessing(X, y)
+        X_train_transformed = self.transform(X=X, y=y, metadata=metadata, timer_suffix="_train").astype(np.float32)
+        X_valid_transformed = self.transform(X_valid, y_valid, metadata, timer_suffix="_valid").astype(np.float32)
+        X_test_transformed = self.transform(X_test, y_test, metadata, timer_suffix="_test").astype(np.float32)
+
+        if self.warm_started:
+            self._partial_fit_model_after_transformation(X_train_transformed, y, X_valid_transformed, y_valid, X_test_transformed, y_test, metadata)
+        else:
+            self.num_features_transformed = X_train_transformed.shape[1]
+            self._fit_model_after_transformation(X_train_transformed, y, X_valid_transformed, y_valid, X_test_transformed, y_test, metadata)
+
     def _transform_train_data_prior_to_standard_preprocessing(self, X, y):
         return X, y  # by default, no alterations are made, of course. Overwrite this function to do so.
 
     def _fit_model_after_transformation(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
         raise NotImplementedError
 
+    def _partial_fit_model_after_transformation(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
+        """Continues the training of the learner on the transformed instances of the anchor, whose first
+        ``num_train_instances_fitted`` were already used to train it."""
+        raise NotImplementedError
+
     def _predict(self, X):
         X = self.pp_pipeline.transform(X).astype(np.float32)
         return self._predict_after_transform(X)
@@ -0,0 +1,216 @@
+"""Registry of the workflows of ``lcdb``.
+
+Each workflow is registered by the path of its class (as given to ``--workflow-class``) with the module defining it
+and the file of its config space (in ``config_spaces/``). The config space of a registered workflow is read from its
+file, without importing the workflow and its learner (e.g., ``keras``), and the workflow is only imported when its
+class is needed. Workflows which are not registered are imported from the path of their class.
+
+After changing the config space of a workflow, its file is updated with:
+
+    python -m lcdb.workflow._registry
+
+and the files which differ from the config spaces of their workflows are listed (with a non-zero exit code) with:
+
+    python -m lcdb.workflow._registry --check
+"""
+import argparse
+import importlib
+import os
+import sys
+
+# Directory of the files of the config spaces of the registered workflows
+CONFIG_SPACES_DIR = os.path.join(os.path.dirname(__file__), "config_spaces")
+
+WORKFLOWS = {
+    "lcdb.workflow.sklearn.DTWorkflow": {
+        "module": "lcdb.workflow.sklearn._tree",
+        "config_space": "sklearn.DTWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.GaussianNBWorkflow": {
+        "module": "lcdb.workflow.sklearn._naive_bayes",
+        "config_space": "sklearn.GaussianNBWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.KNNWorkflow": {
+        "module": "lcdb.workflow.sklearn._knn",
+        "config_space": "sklearn.KNNWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.LDAWorkflow": {
+        "module": "lcdb.workflow.sklearn._discriminant_analysis",
+        "config_space": "sklearn.LDAWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.LibLinearWorkflow": {
+        "module": "lcdb.workflow.sklearn._liblinear",
+        "config_space": "sklearn.LibLinearWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.LibSVMWorkflow": {
+        "module": "lcdb.workflow.sklearn._libsvm",
+        "config_space": "sklearn.LibSVMWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.LRWorkflow": {
+        "module": "lcdb.workflow.sklearn._linear_model",
+        "config_space": "sklearn.LRWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.MajorityWorkflow": {
+        "module": "lcdb.workflow.sklearn._majority",
+        "config_space": "sklearn.MajorityWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.MajorityWorkflowWithPreprocessing": {
+        "module": "lcdb.workflow.sklearn._majority_with_pp",
+        "config_space": "sklearn.MajorityWorkflowWithPreprocessing.json",
+    },
+    "lcdb.workflow.sklearn.MeanWorkflow": {
+        "module": "lcdb.workflow.sklearn._mean",
+        "config_space": "sklearn.MeanWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.MedianWorkflow": {
+        "module": "lcdb.workflow.sklearn._median",
+        "config_space": "sklearn.MedianWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.PAWorkflow": {
+        "module": "lcdb.workflow.sklearn._linear_model",
+        "config_space": "sklearn.PAWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.PerceptronWorkflow": {
+        "module": "lcdb.workflow.sklearn._linear_model",
+        "config_space": "sklearn.PerceptronWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.QDAWorkflow": {
+        "module": "lcdb.workflow.sklearn._discriminant_analysis",
+        "config_space": "sklearn.QDAWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.RandomWorkflow": {
+        "module": "lcdb.workflow.sklearn._random",
+        "config_space": "sklearn.RandomWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.RidgeWorkflow": {
+        "module": "lcdb.workflow.sklearn._linear_model",
+        "config_space": "sklearn.RidgeWorkflow.json",
+    },
+    "lcdb.workflow.sklearn.TreesEnsembleWorkflow": {
+        "module": "lcdb.workflow.sklearn._trees_ensemble",
+        "config_space": "sklearn.TreesEnsembleWorkflow.json",
+    },
+    "lcdb.workflow.xgboost.XGBoostWorkflow": {
+        "module": "lcdb.workflow.xgboost._xgboost",
+        "config_space": "xgboost.XGBoostWorkflow.json",
+    },
+    "lcdb.workflow.keras.DenseNNWorkflow": {
+        "module": "lcdb.workflow.keras._dense",
+        "config_space": "keras.DenseNNWorkflow.json",
+    },
+}
+
+
+def get_workflow_module(name: str) -> str:
+    """Returns the module defining a workflow, given its name in the registry or the path of its class, without
+    importing it."""
+    if name in WORKFLOWS:
+        return WORKFLOWS[name]["module"]
+    return name.rsplit(".", 1)[0]
+
+
+def get_workflow_class(name: str):
+    """Imports and returns the class of a workflow, given its name in the registry or the path of its class (e.g.,
+    ``my_package.MyWorkflow``)."""
+    module = importlib.import_module(get_workflow_module(name))
+    return getattr(module, name.rsplit(".", 1)[1])
+
+
+def get_config_space_path(name: str) -> str:
+    """Returns the path of the file of the config space of a registered workflow, ``None`` if the workflow is not
+    registered."""
+    if name not in WORKFLOWS:
+        return None
+    return os.path.join(CONFIG_SPACES_DIR, WORKFLOWS[name]["config_space"])
+
+
+def get_config_space(name: str):
+    """Returns the config space of a workflow. It is read from its file if the workflow is registered (see
+    ``write_config_spaces``) and given by the class of the workflow otherwise."""
+    path = get_config_space_path(name)
+    if path is None or not os.path.exists(path):
+        return get_workflow_class(name).config_space()
+
+    import ConfigSpace.read_and_write.json
+
+    with open(path, "r") as f:
+        return ConfigSpace.read_and_write.json.read(f.read())
+
+
+def dump_config_space(config_space) -> str:
+    """Returns the content of the file of a config space."""
+    import ConfigSpace.read_and_write.json
+
+    return ConfigSpace.read_and_write.json.write(config_space, indent=2) + "\n"
+
+
+def write_config_spaces(names: list = None) -> list:
+    """Writes the files of the config spaces of registered workflows from their classes.
+
+    Args:
+        names (list, optional): the names of the workflows. Defaults to ``None`` for all the registered workflows.
+
+    Returns:
+        list: the names of the workflows which could not be imported (e.g., ``keras`` is not installed), their files are not written.
+    """
+    os.makedirs(CONFIG_SPACES_DIR, exist_ok=True)
+    not_imported = []
+    for name in WORKFLOWS if names is None else names:
+        try:
+            config_space = get_workflow_class(name).config_space()
+        except ImportError:
+            not_imported.append(name)
+            continue
+        with open(get_config_space_path(name), "w") as f:
+            f.write(dump_config_space(config_space))
+    return not_imported
+
+
+def check_config_spaces(names: list = None) -> tuple:
+    """Compares the files of the config spaces of registered workflows with the config spaces of their classes (see
+    ``write_config_spaces``).
+
+    Args:
+        names (list, optional): the names of the workflows. Defaults to ``None`` for all the registered workflows.
+
+    Returns:
+        tuple: the names of the workflows whose file is missing or differs from their config space, and the names of the workflows which could not be imported (their files are not checked).
+    """
+    outdated, not_imported = [], []
+    for name in WORKFLOWS if names is None else names:
+        try:
+            config_space = get_workflow_class(name).config_space()
+        except ImportError:
+            not_imported.append(name)
+            continue
+        path = get_config_space_path(name)
+        if not os.path.exists(path):
+            outdated.append(name)
+            continue
+        with open(path, "r") as f:
+            if f.read() != dump_config_space(config_space):
+                outdated.append(name)
+    return outdated, not_imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Writes the files of the config spaces of the registered workflows."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only list the files which differ from the config spaces of their workflows, exits with 1 if any",
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        outdated, not_imported = check_config_spaces()
+        for name in not_imported:
+            print(f"The config space of {name} was not checked as the workflow cannot be imported.")
+        for name in outdated:
+            print(f"The file of the config space of {name} is outdated, run: python -m lcdb.workflow._registry")
+        sys.exit(1 if outdated else 0)
+
+    for name in write_config_spaces():
+        print(f"The config space of {name} was not written as the workflow cannot be imported.")
@@ -1,3 +1,10 @@
-from ._dense import DenseNNWorkflow
+"""Sub-package for keras models, imported when a workflow is first accessed as importing ``keras`` is slow."""
+import importlib
 
 __all__ = ["DenseNNWorkflow"]
+
+
+def __getattr__(name):
+    if name == "DenseNNWorkflow":
+        return getattr(importlib.import_module("._dense", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
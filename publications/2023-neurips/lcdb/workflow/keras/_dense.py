@@ -1,12 +1,13 @@
+import functools
 import keras
 import pandas as pd
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras.utils import Sequence
 from ConfigSpace import Categorical, ConfigurationSpace, Float, Integer
-from ...scorer import ClassificationScorer
-from ...timer import Timer
-from ...utils import get_schedule, filter_keys_with_prefix
+from lcdb.builder.scorer import ClassificationScorer, EpochScoringBuffer
+from lcdb.builder.timer import Timer
+from lcdb.builder.utils import get_schedule, filter_keys_with_prefix
 from .._base_workflow import BaseWorkflow
 from .._preprocessing_workflow import PreprocessedWorkflow
 from ._augmentation import MixUpAugmentation, CutMixAugmentation, CutOutAugmentation
@@ -102,21 +103,34 @@ class IterationCurveCallback(keras.callbacks.Callback):
         timer: Timer,
         data: dict,
         epoch_schedule: str = "power",
+        epoch_offset: int = 0,
     ):
         super().__init__()
         self.timer = timer
         self.workflow = workflow
         self.data = data
         self.epoch = None
+
+        # number of epochs already done before this training (when warm started)
+        self.epoch_offset = epoch_offset
+
         self.scorer = ClassificationScorer(
             classes_learner=self.workflow.infos["classes_train"],
             classes_overall=self.workflow.infos["classes_overall"],
-            timer=self.timer
+            timer=self.timer,
+            predictions_recorder=self.workflow.predictions_recorder,
+            metric_selection=self.workflow.metric_selection,
         )
         self.schedule = get_schedule(
             name=epoch_schedule, n=self.workflow.num_epochs, base=2, power=0.5, delay=0
         )[::-1]
 
+        # predictions of the scheduled epochs for each split, scored by batches of epochs (see ``EpochScoringBuffer``)
+        self.buffer = EpochScoringBuffer(
+            self.scorer, {label_split: data_split["y"] for label_split, data_split in self.data.items()}
+        )
+        self.final_epoch_tested = False
+
         # Safeguard to check timers
         self.train_timer_id = None
         self.test_timer_id = None
@@ -124,6 +138,7 @@ class IterationCurveCallback(keras.callbacks.Callback):
 
     def on_epoch_begin(self, epoch, logs=None):
         super().on_epoch_begin(epoch, logs=logs)
+        self.buffer.flush_if_full()
         self.epoch = epoch
         self.epoch_timer_id = self.timer.start(
             "epoch",
@@ -144,16 +159,17 @@ class IterationCurveCallback(keras.callbacks.Callback):
 
         # Manage the schedule
         epoch_schedule = self.schedule[-1]
-        is_epoch_to_test = (self.epoch + 1) == epoch_schedule
+        is_epoch_to_test = (self.epoch + 1 - self.epoch_offset) == epoch_schedule
         is_training_continued = not (self.model.stop_training)
         if not (is_epoch_to_test) and is_training_continued:
             return
         self.schedule.pop()
+        self.final_epoch_tested = len(self.schedule) == 0 or not is_training_continued
 
-        with self.timer.time("epoch_test") as timer:
+        with self.timer.time("epoch_test"):
             with self.timer.time("metrics"):
                 for label_split, data_split in self.data.items():
-                    with self.timer.time(label_split):
+                    with self.timer.time(label_split) as split_timer:
                         with self.timer.time("predict_with_proba"):
                             (
                                 y_pred,
@@ -163,13 +179,16 @@ class IterationCurveCallback(keras.callbacks.Callback):
                                 use_snapshot_ensemble=True
                             )
 
-                        y_true = data_split["y"]
-                        scores = self.scorer.score(
-                            y_true=y_true,
-                            y_pred=y_pred,
-                            y_pred_proba=y_pred_proba,
-                        )
-                        print(scores)
+                        self.buffer.add(label_split, split_timer, y_pred, y_pred_proba)
+
+    def on_train_end(self, logs=None):
+        super().on_train_end(logs)
+        self.flush()
+
+    def flush(self):
+        """Writes the metrics of the buffered epochs in the nodes of their splits, also called when the training is
+        interrupted by an exception (``on_train_end`` is then not called)."""
+        self.buffer.flush(final_epoch=self.final_epoch_tested)
 
 
 class AugmentDataGenerator(Sequence):
@@ -319,6 +338,10 @@ class DenseNNWorkflow(PreprocessedWorkflow):
         # state variables
         self.use_snapshot_models_for_prediction = False  # this variable is modified by the Snapshot callback
         self.random_state = random_state
+        self.base_optimizer = None
+        self.num_epochs_trained = 0
+
+        self.supports_warm_start = True
 
         keras.backend.clear_session()
 
@@ -411,9 +434,6 @@ class DenseNNWorkflow(PreprocessedWorkflow):
     def _fit_model_after_transformation(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
         self.metadata = metadata
 
-        # create internal labels for keras ordered from 0 to k-1 where, k is the number of labels *known* to the NN
-        mask_valid = np.isin(y_valid, self.infos["classes_train"])
-
         # build skeleton of neural network
         self.learner = self.build_model(X.shape[1:], len(self.infos["classes_train"]))
 
@@ -428,16 +448,48 @@ class DenseNNWorkflow(PreprocessedWorkflow):
         optimizer = OPTIMIZERS[self.optimizer]()
         optimizer.learning_rate = self.learning_rate
 
+        self.base_optimizer = optimizer
+        if self.lookahead:
+            optimizer = Lookahead(
+                optimizer,
+                learning_rate=self.lookahead_learning_rate,
+                la_steps=self.lookahead_num_steps
+            )
+
+        self.learner.compile(
+            optimizer=optimizer,
+            loss="categorical_crossentropy",
+            metrics=["accuracy"],
+        )
+
+        self._train_learner(X, y, X_valid, y_valid, X_test, y_test)
+
+    def _partial_fit_model_after_transformation(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
+
+        # continue the training of the compiled network for ``num_epochs`` further epochs on the new instances
+        self._train_learner(
+            X[self.num_train_instances_fitted:], y[self.num_train_instances_fitted:], X_valid, y_valid, X_test, y_test
+        )
+
+    def _train_learner(self, X, y, X_valid, y_valid, X_test, y_test):
+
+        # create internal labels for keras ordered from 0 to k-1 where, k is the number of labels *known* to the NN
+        mask_valid = np.isin(y_valid, self.infos["classes_train"])
+
+        X_eval, y_eval = self.sample_for_evaluation(X, y)
+        X_valid_eval, y_valid_eval = self.sample_for_evaluation(X_valid, y_valid)
+        X_test_eval, y_test_eval = self.sample_for_evaluation(X_test, y_test)
         iteration_curve_callback = IterationCurveCallback(
             workflow=self,
             timer=self.timer,
             data=dict(
                 # train=dict(X=X, y=np.argmax(y, axis=1)),  # assign the class with the highest true probability (1 except for if data augmentation is used)
-                train=dict(X=X, y=y),
-                val=dict(X=X_valid, y=y_valid),
-                test=dict(X=X_test, y=y_test),
+                train=dict(X=X_eval, y=y_eval),
+                val=dict(X=X_valid_eval, y=y_valid_eval),
+                test=dict(X=X_test_eval, y=y_test_eval),
             ),
             epoch_schedule=self.epoch_schedule,
+            epoch_offset=self.num_epochs_trained,
         )
 
         # define callbacks
@@ -447,21 +499,13 @@ class DenseNNWorkflow(PreprocessedWorkflow):
             keras.callbacks.EarlyStopping(patience=self.num_epochs_patience),
         ]
 
-        base_optimizer = optimizer
-        if self.lookahead:
-            optimizer = Lookahead(
-                optimizer,
-                learning_rate=self.lookahead_learning_rate,
-                la_steps=self.lookahead_num_steps
-            )
-
         if self.stochastic_weight_averaging:
             callbacks.append(SWA(start_epoch=2, batch_size=self.batch_size))
 
         if self.snapshot_ensemble:
             self.snapshot_callback = Snapshot(
                 workflow=self,
-                optimizer=base_optimizer,
+                optimizer=self.base_optimizer,
                 reset_weights=self.snapshot_ensemble_reset_weights,
                 period_init=self.snapshot_ensemble_period_init,
                 period_increase=self.snapshot_ensemble_period_increase
@@ -471,12 +515,6 @@ class DenseNNWorkflow(PreprocessedWorkflow):
         # the callback for the iteration curve should be the last one
         callbacks.append(iteration_curve_callback)
 
-        self.learner.compile(
-            optimizer=optimizer,
-            loss="categorical_crossentropy",
-            metrics=["accuracy"],
-        )
-
         # Prepare data augmenters
         data_augmenters = []
         if self.data_augmentation == "cutout":
@@ -496,15 +534,22 @@ class DenseNNWorkflow(PreprocessedWorkflow):
                             encode_label_vector=self._encode_label_vector,
                             shuffle=self.shuffle_each_epoch
                         )
-        # now fit model
-        self.learner.fit(
-            train_generator,
-            epochs=self.num_epochs,
-            shuffle=self.shuffle_each_epoch,
-            validation_data=(X_valid[mask_valid], self._encode_label_vector(y_valid[mask_valid])),
-            callbacks=callbacks,
-            verbose=self.verbose,
-        )
+        # now fit model, epochs are counted from the ones already done if the training is continued
+        try:
+            history = self.learner.fit(
+                train_generator,
+                initial_epoch=self.num_epochs_trained,
+                epochs=self.num_epochs_trained + self.num_epochs,
+                shuffle=self.shuffle_each_epoch,
+                validation_data=(X_valid[mask_valid], self._encode_label_vector(y_valid[mask_valid])),
+                callbacks=callbacks,
+                verbose=self.verbose,
+            )
+        finally:
+            # the epochs scored before an interruption keep their metrics
+            iteration_curve_callback.flush()
+        if len(history.epoch) > 0:
+            self.num_epochs_trained = history.epoch[-1] + 1
 
     def _predict_after_transform(self, X):
         return self._predict_with_proba_after_transform(X)[0]
@@ -517,23 +562,27 @@ class DenseNNWorkflow(PreprocessedWorkflow):
         if use_snapshot_ensemble and self.snapshot_callback is not None:
             models.extend(self.snapshot_callback.checkpoint_models)
 
-        # compute probabilities per model
-        y_pred_proba = []
+        # average the probabilities of the models in place instead of stacking them
+        y_pred_proba = None
         for model in models:
             y_pred_proba_model = model.predict(
                 X, batch_size=min(len(X), self.batch_size), verbose=self.verbose
             )
-            y_pred_proba.append(y_pred_proba_model)
+            if y_pred_proba is None:
+                y_pred_proba = y_pred_proba_model
+            else:
+                y_pred_proba += y_pred_proba_model
+        y_pred_proba /= len(models)
 
-        # average probabilities
-        y_pred_proba = np.array(y_pred_proba)
         assert not np.any(np.isnan(y_pred_proba)), f"There are NAN values in the NN prediction!\n{y_pred_proba}. Input was:\n{X}"
-        return y_pred_proba.mean(axis=0)
+        return y_pred_proba
 
     def _predict_with_proba_after_transform(self, X, use_snapshot_ensemble=False):
 
         # obtain probabilistic prediction from snapshot ensemble
-        y_pred_proba = self._predict_proba_after_transform(X, use_snapshot_ensemble=use_snapshot_ensemble)
+        y_pred_proba = self.predict_in_chunks(
+            functools.partial(self._predict_proba_after_transform, use_snapshot_ensemble=use_snapshot_ensemble), X
+        )
 
         # derive predictions
         y_pred = self._decode_label_vector(y_pred_proba.argmax(axis=1))
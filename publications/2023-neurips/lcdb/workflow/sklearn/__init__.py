@@ -1,18 +1,30 @@
 """Sub-package for sklearn models.
+
+The workflows are imported when they are first accessed (e.g., ``from lcdb.workflow.sklearn import
+LibLinearWorkflow``) so that importing one workflow does not import the learners of all the others.
 """
-from ._discriminant_analysis import LDAWorkflow, QDAWorkflow
-from ._linear_model import LRWorkflow, RidgeWorkflow, PAWorkflow, PerceptronWorkflow
-from ._naive_bayes import GaussianNBWorkflow
-from ._majority import MajorityWorkflow
-from ._majority_with_pp import MajorityWorkflowWithPreprocessing
-from ._mean import MeanWorkflow
-from ._median import MedianWorkflow
-from ._knn import KNNWorkflow
-from ._libsvm import LibSVMWorkflow
-from ._liblinear import LibLinearWorkflow
-from ._trees_ensemble import TreesEnsembleWorkflow
-from ._random import RandomWorkflow
-from ._tree import DTWorkflow
+import importlib
+
+# Module of each workflow, relative to this package
+_WORKFLOW_MODULES = {
+    "LDAWorkflow": "._discriminant_analysis",
+    "QDAWorkflow": "._discriminant_analysis",
+    "LRWorkflow": "._linear_model",
+    "RidgeWorkflow": "._linear_model",
+    "PAWorkflow": "._linear_model",
+    "PerceptronWorkflow": "._linear_model",
+    "GaussianNBWorkflow": "._naive_bayes",
+    "MajorityWorkflow": "._majority",
+    "MajorityWorkflowWithPreprocessing": "._majority_with_pp",
+    "MeanWorkflow": "._mean",
+    "MedianWorkflow": "._median",
+    "KNNWorkflow": "._knn",
+    "LibSVMWorkflow": "._libsvm",
+    "LibLinearWorkflow": "._liblinear",
+    "TreesEnsembleWorkflow": "._trees_ensemble",
+    "RandomWorkflow": "._random",
+    "DTWorkflow": "._tree",
+}
 
 __all__ = [
     "LDAWorkflow",
@@ -33,3 +45,13 @@ __all__ = [
     "TreesEnsembleWorkflow",
     "RandomWorkflow"
 ]
+
+
+def __getattr__(name):
+    if name in _WORKFLOW_MODULES:
+        return getattr(importlib.import_module(_WORKFLOW_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
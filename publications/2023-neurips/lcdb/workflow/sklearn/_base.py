@@ -6,6 +6,15 @@ from lcdb.builder.utils import filter_keys_with_prefix
 from .._preprocessing_workflow import PreprocessedWorkflow
 
 
+def learner_accepts_sparse(learner) -> bool:
+    """Returns if a scikit-learn estimator can be fitted on sparse data (from its tags)."""
+    try:
+        from sklearn.utils import get_tags
+    except ImportError:  # scikit-learn < 1.6
+        return False
+    return bool(get_tags(learner).input_tags.sparse)
+
+
 CONFIG_SPACE = ConfigurationSpace(
     name="sklearn.SklearnWorkflow",
     space={}
@@ -30,6 +39,7 @@ class SklearnWorkflow(PreprocessedWorkflow):
     ):
         super().__init__(timer, **filter_keys_with_prefix(kwargs, prefix="pp@"))
         self.learner = learner
+        self.accepts_sparse = learner is not None and learner_accepts_sparse(learner)
 
     @classmethod
     def config_space(cls):
@@ -39,6 +49,10 @@ class SklearnWorkflow(PreprocessedWorkflow):
         self.metadata = metadata
         self.learner.fit(X, y)
 
+    def _partial_fit_model_after_transformation(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
+        # a single epoch over the new instances of the anchor (a fit from scratch runs up to ``max_iter`` epochs)
+        self.learner.partial_fit(X[self.num_train_instances_fitted:], y[self.num_train_instances_fitted:])
+
     def _predict_after_transform(self, X):
         return self.learner.predict(X)
 
@@ -66,6 +66,8 @@ class KNNWorkflow(SklearnWorkflow):
         self.learner_kwargs = dict(
             n_neighbors=n_neighbors, weights=weights, p=p, metric=metric
         )
+        # the learner is instantiated in the fit
+        self.accepts_sparse = True
 
     @classmethod
     def config_space(cls):
@@ -100,6 +100,7 @@ class PAWorkflow(SklearnWorkflow):
             timer=timer,
             **kwargs
         )
+        self.supports_warm_start = True
 
     @classmethod
     def config_space(cls):
@@ -135,6 +136,7 @@ class PerceptronWorkflow(SklearnWorkflow):
             timer=timer,
             **kwargs
         )
+        self.supports_warm_start = True
 
     @classmethod
     def config_space(cls):
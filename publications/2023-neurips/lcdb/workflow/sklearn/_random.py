@@ -24,6 +24,9 @@ class RandomWorkflow(BaseWorkflow):
 
         self.learner = DummyClassifier(strategy=strategy, random_state=random_state)
 
+        # the random generator is seeded at each call, chunks would be predicted with the same random draws
+        self.row_independent_predictions = False
+
     @classmethod
     def config_space(cls):
         return cls._config_space
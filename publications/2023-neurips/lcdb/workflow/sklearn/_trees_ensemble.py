@@ -8,7 +8,7 @@ from ConfigSpace import (
     EqualsCondition,
 )
 from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
-from lcdb.builder.scorer import ClassificationScorer
+from lcdb.builder.scorer import ClassificationScorer, EpochScoringBuffer
 from lcdb.builder.utils import get_schedule
 
 import numpy as np
@@ -148,8 +148,11 @@ class TreesEnsembleWorkflow(SklearnWorkflow):
             ts_train_stop - ts_train_start
         ) / self.learner.n_estimators
 
+        X_eval, y_eval = self.sample_for_evaluation(X, y)
+        X_valid, y_valid = self.sample_for_evaluation(X_valid, y_valid)
+        X_test, y_test = self.sample_for_evaluation(X_test, y_test)
         data = dict(
-            train=dict(X=X, y=y),
+            train=dict(X=X_eval, y=y_eval),
             val=dict(X=X_valid, y=y_valid),
             test=dict(X=X_test, y=y_test),
         )
@@ -172,11 +175,17 @@ class TreesEnsembleWorkflow(SklearnWorkflow):
             classes_learner=list(self.learner.classes_),
             classes_overall=self.infos["classes_overall"],
             timer=self.timer,
+            predictions_recorder=self.predictions_recorder,
+            metric_selection=self.metric_selection,
         )
         y_pred_proba_oob = np.zeros((n_samples, len(np.unique(y))))
 
+        # predictions of the epochs for each split, scored by batches of epochs (see ``EpochScoringBuffer``)
+        buffer = EpochScoringBuffer(scorer, {label_split: data_split["y"] for label_split, data_split in data.items()})
+
         # now compute metrics for partial forest sizes (and simulate the time for training)
         for i, n_estimators in enumerate(self.schedule):
+            buffer.flush_if_full()
 
             with self.timer.time("epoch", metadata={"value": n_estimators}):
                 with self.timer.time("epoch_train"):
@@ -189,7 +198,7 @@ class TreesEnsembleWorkflow(SklearnWorkflow):
                     with self.timer.time("metrics"):
                         # compute train, validation, and test scores of current forest
                         for label_split, data_split in data.items():
-                            with self.timer.time(label_split):
+                            with self.timer.time(label_split) as split_timer:
                                 with self.timer.time("predict_with_proba"):
                                     (
                                         y_pred,
@@ -199,12 +208,7 @@ class TreesEnsembleWorkflow(SklearnWorkflow):
                                     )
 
                                 # TODO: This could be optimized to only get predictions for the last tree. As for OOB
-                                y_true = data_split["y"]
-                                scorer.score(
-                                    y_true=y_true,
-                                    y_pred=y_pred,
-                                    y_pred_proba=y_pred_proba,
-                                )
+                                buffer.add(label_split, split_timer, y_pred, y_pred_proba)
 
                         if self.learner.bootstrap:
 
@@ -248,8 +252,13 @@ class TreesEnsembleWorkflow(SklearnWorkflow):
                                     y_true=y_true[mask],
                                     y_pred=y_pred_oob[mask],
                                     y_pred_proba=y_pred_proba_oob[mask],
+                                    split="oob",
+                                    final_epoch=i == len(self.schedule) - 1,
                                 )
 
+        # the metrics of the last epochs are written in the nodes of their splits
+        buffer.flush()
+
         self.infos["classes"] = list(self.learner.classes_)
 
     def _predict_after_transform(self, X):
@@ -1,3 +1,10 @@
-from ._xgboost import XGBoostWorkflow
+"""Sub-package for xgboost models, imported when a workflow is first accessed."""
+import importlib
 
-__all__ = ["XGBoostWorkflow"]
\ No newline at end of file
+__all__ = ["XGBoostWorkflow"]
+
+
+def __getattr__(name):
+    if name == "XGBoostWorkflow":
+        return getattr(importlib.import_module("._xgboost", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
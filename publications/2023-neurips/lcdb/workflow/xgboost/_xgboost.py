@@ -1,9 +1,7 @@
 import numpy as np
 from ConfigSpace import ConfigurationSpace, Float, Integer, Uniform
-from lcdb.scorer import ClassificationScorer
-#from lcdb.utils import filter_keys_with_prefix
-#from lcdb.workflow._preprocessing_workflow import PreprocessedWorkflow
-from ...utils import filter_keys_with_prefix, get_schedule
+from lcdb.builder.scorer import ClassificationScorer, EpochScoringBuffer
+from lcdb.builder.utils import filter_keys_with_prefix, get_schedule
 from .._preprocessing_workflow import PreprocessedWorkflow
 from sklearn.preprocessing import LabelEncoder
 from xgboost import DMatrix, XGBClassifier
@@ -91,11 +89,10 @@ CONFIG_SPACE = ConfigurationSpace(
 
 
 class EvalCallBack(TrainingCallback):
-    def __init__(self, workflow, timer, encoder, data, epoch_schedule: str = "power"):
+    def __init__(self, workflow, timer, encoder, data, epoch_schedule: str = "power", epoch_offset: int = 0):
         super().__init__()
         self.timer = timer
         self.workflow = workflow
-        self.scorer = None
         self.encoder = encoder
         self.data = data
         self.n_classes = len(self.workflow.infos["classes_train"])
@@ -104,19 +101,43 @@ class EvalCallBack(TrainingCallback):
             name=epoch_schedule, n=self.workflow.n_estimators, base=2, power=0.5, delay=0
         ))
 
+        # number of boosting rounds already done before this training (when warm started)
+        self.epoch_offset = epoch_offset
+
+        # predictions of the scheduled epochs for each split, scored by batches of epochs (see ``get_buffer``)
+        self.buffer = None
+
         self.epoch = None
         self.train_timer_id = None
         self.test_timer_id = None
         self.epoch_timer_id = None
 
-        self.data["train"]["y"] = self.encoder.inverse_transform(self.data["train"]["y"])
-        self.data["val"]["y"] = self.encoder.inverse_transform(self.data["val"]["y"])
-        self.data["test"]["y"] = self.encoder.inverse_transform(self.data["test"]["y"])
+        # the encoder returns lists, the scorer expects arrays
+        self.data["train"]["y"] = np.asarray(self.encoder.inverse_transform(self.data["train"]["y"]))
+        self.data["val"]["y"] = np.asarray(self.encoder.inverse_transform(self.data["val"]["y"]))
+        self.data["test"]["y"] = np.asarray(self.encoder.inverse_transform(self.data["test"]["y"]))
+
+    def get_buffer(self) -> EpochScoringBuffer:
+        """Returns the buffer of the predictions of the scheduled epochs (see ``EpochScoringBuffer``), created lazily
+        because the classes of the learner are only known once its training started."""
+        if self.buffer is None:
+            scorer = ClassificationScorer(
+                classes_learner=list(self.workflow.learner.classes_),
+                classes_overall=self.workflow.infos["classes_overall"],
+                timer=self.timer,
+                predictions_recorder=self.workflow.predictions_recorder,
+                metric_selection=self.workflow.metric_selection,
+            )
+            self.buffer = EpochScoringBuffer(
+                scorer, {label_split: data_split["y"] for label_split, data_split in self.data.items()}
+            )
+        return self.buffer
 
     def before_iteration(self, model, epoch, evals_log):
         # start tracking time for the current anchor (epoch)
+        self.get_buffer().flush_if_full()
         self.epoch = epoch
-        self.epoch_timer_id = self.timer.start("epoch", metadata={"value": self.epoch})
+        self.epoch_timer_id = self.timer.start("epoch", metadata={"value": self.epoch_offset + self.epoch})
         # start tracking time for the training
         self.train_timer_id = self.timer.start("epoch_train")
         return False
@@ -124,65 +145,29 @@ class EvalCallBack(TrainingCallback):
     def after_iteration(self, model, epoch, evals_log):
         assert self.timer.active_node.id == self.train_timer_id
         self.timer.stop()
-        if epoch in self.schedule:
+        if self.epoch_offset + epoch in self.schedule:
             self.test_timer_id = self.timer.start("epoch_test")
             with self.timer.time("metrics"):
                 for label_split, data_split in self.data.items():
-                    with self.timer.time(label_split):
+                    with self.timer.time(label_split) as split_timer:
                         with self.timer.time("predict_with_proba"):
                             y_pred_proba = model.predict(data_split["X"], strict_shape=True)
 
                         y_pred_proba = self.create_full_probs(y_pred_proba)
                         y_pred = self.create_labels_from_probs(y_pred_proba, invert=True)
 
-                        y_true = data_split["y"]
-
-                        # get the scorer lazy, because at init time, the labels are not yet registered
-                        if self.scorer is None:
-                            self.scorer = ClassificationScorer(
-                                classes_learner=list(self.workflow.learner.classes_),
-                                classes_overall=self.workflow.infos["classes_overall"],
-                                timer=self.timer
-                            )
-
-                        self.scorer.score(
-                            y_true=y_true,
-                            y_pred=y_pred,
-                            y_pred_proba=y_pred_proba,
-                        )
+                        self.get_buffer().add(label_split, split_timer, y_pred, y_pred_proba)
             assert self.timer.active_node.id == self.test_timer_id
             self.timer.stop()
             assert self.timer.active_node.id == self.epoch_timer_id
         self.timer.stop()
         return False
 
-    #def before_training(self, model):
-    #    # start tracking time for the training
-    #    self.train_timer_id = self.timer.start("epoch_train")
-    #    return model
-
-    #def after_training(self, model):
-    #    assert self.timer.active_node.id == self.train_timer_id
-    #    self.timer.stop()
-    #    self.test_timer_id = self.timer.start("epoch_test")
-    #    with self.timer.time("metrics"):
-    #        for label_split, data_split in self.data.items():
-    #            with self.timer.time(label_split):
-    #                with self.timer.time("predict_with_proba"):
-    #                    y_pred_proba = model.predict(data_split["X"], strict_shape=True)
-
-    #                y_pred_proba = self.create_full_probs(y_pred_proba)
-    #                y_pred = self.create_labels_from_probs(y_pred_proba, invert=True)
-
-    #                y_true = data_split["y"]
-
-    #                self.scorer.score(
-    #                    y_true=y_true,
-    #                    y_pred=y_pred,
-    #                    y_pred_proba=y_pred_proba,
-    #                )
-    #    self.timer.stop()
-    #    return model
+    def after_training(self, model):
+        # the metrics of the last scheduled epochs are written in the nodes of their splits
+        if self.buffer is not None:
+            self.buffer.flush()
+        return model
 
     def create_full_probs(self, probs_pred):
         if self.n_classes == 2:
@@ -251,10 +236,29 @@ class XGBoostWorkflow(PreprocessedWorkflow):
 
         self.encoder = ExtendedLabelEncoder()
 
+        self.supports_warm_start = True
+
+        # XGBoost treats the implicit zeros of a sparse matrix as missing values, its input is kept dense so that its
+        # curves do not depend on the sparsity of the pre-processed data
+        self.accepts_sparse = False
+
     @classmethod
     def config_space(cls):
         return cls._config_space
 
+    def get_num_rounds(self, num_instances: int) -> int:
+        """Returns the total number of boosting rounds of the model fitted on ``num_instances`` training instances.
+
+        When the workflow is warm started on the anchors of a curve (see ``warm_start_final_anchor``), the
+        ``n_estimators`` rounds are spread over the anchors in proportion to their size, so that the model of the last
+        anchor has as many trees as a model fitted from scratch. Otherwise, e.g., when the workflow is refitted from
+        scratch at each anchor as its pre-processing cannot be frozen, ``n_estimators`` rounds are done.
+        """
+        if self.warm_start_final_anchor is None or not self.pp_pipeline_frozen:
+            return self.n_estimators
+        num_rounds = int(np.ceil(self.n_estimators * num_instances / self.warm_start_final_anchor))
+        return min(max(num_rounds, 1), self.n_estimators)
+
     def _fit(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
         # FIXME: not sure what is the best way to additionally track the time spent in the fit method
         #   we could try to also track some of the overhead here for example the y transform but this is not real
@@ -272,16 +276,7 @@ class XGBoostWorkflow(PreprocessedWorkflow):
         X = self.transform(X, y, metadata)
         X_valid = self.transform(X_valid, y_valid, metadata)
         X_test = self.transform(X_test, y_test, metadata)
-
-        # construct callback that will handle the iteration-wise learning curve tracking and set it as a callback
-        eval_callback = EvalCallBack(
-            workflow=self,
-            timer=self.timer,
-            encoder=self.encoder,
-            data=dict(train=dict(X=DMatrix(X, label=y), y=y), val=dict(X=DMatrix(X_valid), y=y_valid), test=dict(X=DMatrix(X_test), y=y_test)),
-            epoch_schedule="power"
-        )
-        self.learner.set_params(callbacks=[eval_callback])
+        self.num_features_transformed = X.shape[1]
 
         n_classes = len(self.infos["classes"])
         multiclass = n_classes > 2
@@ -291,8 +286,66 @@ class XGBoostWorkflow(PreprocessedWorkflow):
         else:
             self.learner.set_params(objective="binary:logistic")
 
+        self._boost(X, y, X_valid, y_valid, X_test, y_test, self.get_num_rounds(X.shape[0]))
+
+    def can_partial_fit(self, y) -> bool:
+        # the sklearn interface of xgboost requires all known classes to be present when boosting is continued
+        return super().can_partial_fit(y) and set(np.unique(y)) == set(self.infos["classes_train_orig"])
+
+    def _partial_fit(self, X, y, X_valid, y_valid, X_test, y_test, metadata):
+
+        # the label encoder is kept (the classes of the anchor are those of the first anchor, see ``can_partial_fit``)
+        y = self.encoder.transform(y)
+        y_valid = self.encoder.transform(y_valid)
+        y_test = self.encoder.transform(y_test)
+
+        # the split thresholds of the trees apply to the features of the pipeline fitted at the first anchor, if it
+        # cannot be frozen (see ``PreprocessedWorkflow.can_freeze_pp_pipeline``) the boosting starts again on a
+        # refitted pipeline
+        if not self.pp_pipeline_frozen:
+            self.warm_started = False
+            self.transform_fitted = False
+        X = self.transform(X, y, metadata)
+        X_valid = self.transform(X_valid, y_valid, metadata)
+        X_test = self.transform(X_test, y_test, metadata)
+
+        if not self.warm_started:
+            self.num_features_transformed = X.shape[1]
+            self._boost(X, y, X_valid, y_valid, X_test, y_test, self.get_num_rounds(X.shape[0]))
+            return
+
+        # continue boosting from the current booster on all the instances of the anchor, up to the number of rounds
+        # of the anchor (see ``get_num_rounds``)
+        booster = self.learner.get_booster()
+        num_rounds = self.get_num_rounds(X.shape[0]) - booster.num_boosted_rounds()
+        if num_rounds > 0:
+            self._boost(X, y, X_valid, y_valid, X_test, y_test, num_rounds, booster=booster)
+
+    def _boost(self, X, y, X_valid, y_valid, X_test, y_test, num_rounds: int, booster=None):
+        """Fits ``num_rounds`` boosting rounds of the learner, from ``booster`` if given, while the callback records
+        the learning curve over the rounds."""
+        # construct callback that will handle the iteration-wise learning curve tracking and set it as a callback
+        eval_callback = EvalCallBack(
+            workflow=self,
+            timer=self.timer,
+            encoder=self.encoder,
+            data=self._get_evaluation_data(X, y, X_valid, y_valid, X_test, y_test),
+            epoch_schedule="power",
+            epoch_offset=0 if booster is None else booster.num_boosted_rounds(),
+        )
+        self.learner.set_params(callbacks=[eval_callback], n_estimators=num_rounds)
+
         # fit the learner
-        self.learner.fit(X, y)
+        self.learner.fit(X, y, xgb_model=booster)
+
+        # the callback keeps the evaluation data alive (DMatrix, which cannot be pickled, e.g., by the fit sandbox)
+        self.learner.set_params(callbacks=None)
+
+    def _get_evaluation_data(self, X, y, X_valid, y_valid, X_test, y_test):
+        X, y = self.sample_for_evaluation(X, y)
+        X_valid, y_valid = self.sample_for_evaluation(X_valid, y_valid)
+        X_test, y_test = self.sample_for_evaluation(X_test, y_test)
+        return dict(train=dict(X=DMatrix(X, label=y), y=y), val=dict(X=DMatrix(X_valid), y=y_valid), test=dict(X=DMatrix(X_test), y=y_test))
 
     def _predict(self, X):
         X_pred = self.pp_pipeline.transform(X)
@@ -0,0 +1,146 @@
+from parameterized import parameterized
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from deephyper.evaluator import RunningJob
+
+from lcdb.builder import run_learning_workflow
+from lcdb.builder.utils import (
+    PowerLawCostModel,
+    get_anchor_costs,
+    get_budget_schedule,
+    get_power_schedule,
+    prune_anchors_to_budget,
+)
+from lcdb.workflow.sklearn import LibLinearWorkflow
+
+ANCHORS = get_power_schedule(5000)
+
+
+def power_law(anchors, coefficient=1e-3, exponent=1.5):
+    return [(a, coefficient * a**exponent) for a in anchors]
+
+
+class TestPowerLawCostModel(unittest.TestCase):
+
+    def test_fit_largest_anchors(self):
+        # the cost of the small anchors is dominated by a constant overhead
+        costs = [(a, 1.0) for a in ANCHORS[:6]] + power_law(ANCHORS[6:])
+        model = PowerLawCostModel(num_anchors=4)
+        for anchor, cost in costs:
+            model.add(anchor, cost)
+
+        self.assertAlmostEqual(model.exponent, 1.5)
+        self.assertAlmostEqual(model.coefficient, 1e-3)
+        np.testing.assert_allclose(model.predict([10**4]), [1e-3 * 10**6])
+
+    def test_observed_costs_replace_prior(self):
+        model = PowerLawCostModel(prior=power_law(ANCHORS, exponent=2))
+        self.assertAlmostEqual(model.exponent, 2)
+
+        # a single observed anchor only gives the scale of the costs
+        model.add(64, 64**2)
+        self.assertAlmostEqual(model.exponent, 2)
+        self.assertAlmostEqual(model.coefficient, 1)
+
+        model.add(128, 2 * 64**2)
+        self.assertAlmostEqual(model.exponent, 1)
+        self.assertEqual(model.as_dict()["num_observed"], 2)
+
+    def test_single_anchor_without_prior(self):
+        model = PowerLawCostModel()
+        self.assertFalse(model.is_fitted)
+        with self.assertRaises(ValueError):
+            model.predict(ANCHORS)
+
+        model.add(64, 2.0)
+
+        self.assertEqual(model.exponent, 1)
+        np.testing.assert_allclose(model.predict([128]), [4.0])
+
+    @parameterized.expand([
+        (-1, 0),
+        (5, 3),
+    ])
+    def test_exponent_is_bounded(self, exponent, expected_exponent):
+        model = PowerLawCostModel(prior=power_law(ANCHORS, exponent=exponent), max_exponent=3)
+
+        self.assertAlmostEqual(model.exponent, expected_exponent)
+
+    def test_invalid_num_anchors(self):
+        with self.assertRaises(ValueError):
+            PowerLawCostModel(num_anchors=1)
+
+
+class TestBudgetSchedule(unittest.TestCase):
+
+    def test_prune_to_budget(self):
+        model = PowerLawCostModel(prior=power_law(ANCHORS, coefficient=1, exponent=1))
+
+        self.assertEqual(prune_anchors_to_budget([16, 23, 32, 45], 71, model), [16, 23, 32])
+        self.assertEqual(prune_anchors_to_budget([16, 23, 32, 45], 70, model), [16, 23])
+        self.assertEqual(prune_anchors_to_budget([16, 23, 32, 45], 0, model), [])
+        self.assertEqual(prune_anchors_to_budget([16, 23, 32, 45], 0, PowerLawCostModel()), [16, 23, 32, 45])
+
+    def test_budget_schedule(self):
+        model = PowerLawCostModel(prior=power_law(ANCHORS, coefficient=1, exponent=1))
+
+        anchors = get_budget_schedule(5000, budget=1000, cost_model=model)
+
+        self.assertEqual(anchors, ANCHORS[: len(anchors)])
+        self.assertLessEqual(sum(anchors), 1000)
+        self.assertGreater(sum(ANCHORS[: len(anchors) + 1]), 1000)
+        # the smallest anchor is kept whatever the budget, all the anchors without predicted costs
+        self.assertEqual(get_budget_schedule(5000, budget=1, cost_model=model), ANCHORS[:1])
+        self.assertEqual(get_budget_schedule(5000, budget=1, cost_model=PowerLawCostModel()), ANCHORS)
+
+
+class TestBudgetBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        patcher = mock.patch.dict(os.environ, {"LCDB_DATASET_CACHE": self.directory})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.job = RunningJob(1, parameters=dict(LibLinearWorkflow.config_space().get_default_configuration()))
+        self.kwargs = dict(
+            task_id="synthetic.rows=2000,features=5",
+            workflow_class="lcdb.workflow.sklearn.LibLinearWorkflow",
+            anchor_schedule="budget",
+            logger=logging.getLogger("test_budget"),
+            raise_errors=True,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_anchors_planned_with_prior(self):
+        prior = power_law(ANCHORS, coefficient=1, exponent=1)
+
+        output = run_learning_workflow(self.job, anchor_budget=1000, anchor_cost_prior=prior, **self.kwargs)
+
+        report = output["metadata"]["anchor_schedule"]
+        anchors = [16, 23, 32, 45, 64, 91, 128, 181, 256]
+        self.assertEqual(report["planned_anchors"], anchors)
+        self.assertEqual(report["anchors"], anchors)
+        self.assertEqual(get_anchor_costs(output["metadata"]["json"])[-1][0], anchors[-1])
+        # the costs observed in the job replace those of the prior
+        self.assertEqual(report["cost_model"]["num_observed"], len(anchors))
+
+    def test_anchors_pruned_with_observed_costs(self):
+        output = run_learning_workflow(self.job, anchor_budget=1e-6, **self.kwargs)
+
+        report = output["metadata"]["anchor_schedule"]
+        self.assertEqual(report["planned_anchors"], get_power_schedule(report["planned_anchors"][-1]))
+        self.assertEqual(report["anchors"], [16])
+        self.assertEqual([a for a, _ in get_anchor_costs(output["metadata"]["json"])], [16])
+
+
+if __name__ == "__main__":
+    unittest.main()
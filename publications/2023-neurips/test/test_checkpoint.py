@@ -0,0 +1,99 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from deephyper.evaluator import RunningJob
+
+from lcdb.builder import run_learning_workflow
+from lcdb.builder._base import get_checkpoint_path
+from lcdb.builder.checkpoint import AnchorCheckpoint
+from lcdb.workflow.sklearn import LibLinearWorkflow
+
+
+def find_node(node: dict, *tags: str) -> dict:
+    """Returns the first descendant of a node of the tree of a timer at the path ``tags`` (depth-first)."""
+    if not tags:
+        return node
+    for child in node.get("children", []):
+        if child["tag"] == tags[0]:
+            found = find_node(child, *tags[1:])
+        else:
+            found = find_node(child, *tags)
+        if found is not None:
+            return found
+    return None
+
+
+def get_anchor_scores(tree: dict) -> dict:
+    """Returns the validation log loss of each anchor of the tree of a timer and whether the anchor was resumed."""
+    scores = {}
+    for node in find_node(tree, "build_curves")["children"]:
+        if node["tag"] == "anchor":
+            log_loss = find_node(node, "metrics", "val", "log_loss")
+            scores[node["metadata"]["value"]] = (log_loss["metadata"]["value"], node["metadata"].get("resumed", False))
+    return scores
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        patcher = mock.patch.dict(os.environ, {"LCDB_DATASET_CACHE": os.path.join(self.directory, "datasets")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.job = RunningJob(1, parameters=dict(LibLinearWorkflow.config_space().get_default_configuration()))
+        self.kwargs = dict(
+            task_id="synthetic.rows=1000,features=5",
+            workflow_class="lcdb.workflow.sklearn.LibLinearWorkflow",
+            checkpoint_dir=os.path.join(self.directory, "checkpoints"),
+            logger=logging.getLogger("test_checkpoint"),
+            raise_errors=True,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def run_job(self) -> dict:
+        output = run_learning_workflow(self.job, **self.kwargs)
+        self.assertNotEqual(output["objective"], "F", output["metadata"]["traceback"])
+        return output
+
+    def test_resume_equals_full_run(self):
+        output = self.run_job()
+        path = get_checkpoint_path(self.job, **self.kwargs)
+        with open(path) as f:
+            lines = f.readlines()
+        scores = get_anchor_scores(output["metadata"]["json"])
+        anchors = sorted(scores)
+        self.assertEqual(sorted(AnchorCheckpoint(path).load()), anchors)
+        self.assertFalse(any(resumed for _, resumed in scores.values()))
+
+        # the job is killed while writing the checkpoint of the 4th anchor
+        with open(path, "w") as f:
+            f.writelines(lines[:3])
+            f.write(lines[3][: len(lines[3]) // 2])
+        self.assertEqual(sorted(AnchorCheckpoint(path).load()), anchors[:3])
+
+        resumed_output = self.run_job()
+        resumed_scores = get_anchor_scores(resumed_output["metadata"]["json"])
+
+        self.assertEqual(resumed_output["objective"], output["objective"])
+        self.assertEqual(sorted(resumed_scores), anchors)
+        for i, anchor in enumerate(anchors):
+            self.assertEqual(resumed_scores[anchor], (scores[anchor][0], i < 3))
+        self.assertEqual(sorted(AnchorCheckpoint(path).load()), anchors)
+
+    def test_checkpoint_depends_on_parameters(self):
+        path = get_checkpoint_path(self.job, **self.kwargs)
+
+        self.assertEqual(path, get_checkpoint_path(self.job, **{**self.kwargs, "predict_chunk_size": 100}))
+        self.assertNotEqual(path, get_checkpoint_path(self.job, **{**self.kwargs, "valid_seed": 1}))
+        self.assertIsNone(get_checkpoint_path(self.job, **{**self.kwargs, "checkpoint_dir": None}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+from parameterized import parameterized
+import unittest
+
+from lcdb.workflow._registry import WORKFLOWS, check_config_spaces, get_workflow_class
+
+
+class TestConfigSpaces(unittest.TestCase):
+
+    @parameterized.expand([(name,) for name in WORKFLOWS])
+    def test_config_space_file_is_up_to_date(self, name):
+        try:
+            get_workflow_class(name)
+        except ImportError as e:
+            self.skipTest(f"{name} cannot be imported: {e}")
+
+        outdated, not_imported = check_config_spaces([name])
+        self.assertEqual(not_imported, [])
+        self.assertEqual(
+            outdated, [], f"Run 'python -m lcdb.workflow._registry' to update the config space of {name}."
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+from parameterized import parameterized
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import scipy.sparse
+
+from lcdb.data import TabularArray, load_task
+from lcdb.data._cache import get_dataset_path, get_split_path, is_dataset_cached, read_dataset, write_dataset
+from lcdb.data._file import get_file_data, load_from_file
+from lcdb.data._synthetic import get_synthetic_data, parse_synthetic_spec
+from lcdb.data._tabular import get_columns_metadata
+from lcdb.data.split import load_split_indices, train_valid_test_split_indices
+
+
+def get_frame(num_rows: int = 200, seed: int = 0) -> pd.DataFrame:
+    """Returns a data frame with numeric, integer, boolean, categorical and string columns, with missing values."""
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=num_rows)
+    x[::7] = np.nan
+    c = rng.choice(["u", "v", "w"], size=num_rows).astype(object)
+    c[::11] = None
+    return pd.DataFrame({
+        "x": x,
+        "i": rng.integers(-5, 5, size=num_rows),
+        "b": rng.random(num_rows) > 0.5,
+        "c": pd.Categorical(c),
+        "s": rng.choice(["p", "q"], size=num_rows),
+    })
+
+
+def assert_same_values(test: unittest.TestCase, values, expected_values):
+    """Asserts that two arrays have the same values (and missing values), e.g., object arrays of data frames."""
+    test.assertTrue(pd.DataFrame(np.asarray(values)).equals(pd.DataFrame(expected_values)))
+
+
+class TestTabularArray(unittest.TestCase):
+
+    @parameterized.expand([(True,), (False,)])
+    def test_values_equal_frame_values(self, with_categorical):
+        X = get_frame()
+        if not with_categorical:
+            X = X[["x", "i"]]
+
+        tabular = TabularArray.from_frame(X)
+
+        assert_same_values(self, tabular, X.values)
+        rows = np.array([3, 0, 7, 7, 150])
+        assert_same_values(self, tabular[rows], X.values[rows])
+        assert_same_values(self, tabular[rows, 3:], X.values[rows, 3:])
+        np.testing.assert_array_equal(tabular[:, [0, 1]], X.values[:, [0, 1]].astype(np.float64))
+        self.assertEqual(tabular.has_missing_values(), True)
+        self.assertEqual(tabular.shape, X.shape)
+
+    def test_columns_metadata(self):
+        X = get_frame()
+
+        columns = get_columns_metadata(TabularArray.from_frame(X))
+
+        self.assertEqual([c["kind"] for c in columns], ["numeric"] * 3 + ["categorical"] * 2)
+        self.assertEqual([c["num_missing"] for c in columns], X.isna().sum().tolist())
+        self.assertEqual([c["cardinality"] for c in columns], [None] * 3 + [3, 2])
+        self.assertEqual(get_columns_metadata(X.values), columns)
+
+
+class TestDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_dense_round_trip(self):
+        X = get_frame()
+        y = pd.Series(pd.Categorical(np.where(X["b"], "yes", "no")), name="class")
+        path = get_dataset_path("test.dense", self.cache_dir)
+
+        write_dataset(path, X, y, {"type": "classification", "num_classes": 2})
+        (X_read, y_read), metadata = read_dataset(path)
+
+        self.assertTrue(is_dataset_cached(path))
+        self.assertIsInstance(X_read, TabularArray)
+        assert_same_values(self, X_read, X.values)
+        np.testing.assert_array_equal(y_read, y.to_numpy())
+        self.assertEqual(metadata["num_classes"], 2)
+        self.assertEqual(metadata["columns"], get_columns_metadata(X.values))
+
+    def test_numeric_and_sparse_round_trip(self):
+        rng = np.random.default_rng(1)
+        values = np.where(rng.random((100, 6)) > 0.8, rng.normal(size=(100, 6)), 0)
+        y = pd.Series(rng.normal(size=100), name="target")
+        for name, X in [
+            ("numeric", pd.DataFrame(values)),
+            ("sparse", pd.DataFrame.sparse.from_spmatrix(scipy.sparse.csr_matrix(values))),
+        ]:
+            path = get_dataset_path(f"test.{name}", self.cache_dir)
+
+            write_dataset(path, X, y, {"type": "regression"})
+            (X_read, y_read), _ = read_dataset(path)
+
+            if name == "sparse":
+                self.assertTrue(scipy.sparse.issparse(X_read))
+                X_read = X_read.toarray()
+            self.assertIsInstance(X_read, np.ndarray)
+            np.testing.assert_array_equal(X_read, values)
+            np.testing.assert_array_equal(y_read, y.to_numpy())
+
+    def test_load_task_from_cache(self):
+        task_name = "synthetic.rows=300,features=6,classes=3,categorical=0.5"
+
+        (X, y), metadata = load_task(task_name, cache_dir=self.cache_dir)
+        (X_cached, y_cached), metadata_cached = load_task(task_name, cache_dir=self.cache_dir)
+        (X_uncached, y_uncached), metadata_uncached = load_task(task_name, use_cache=False)
+
+        self.assertTrue(is_dataset_cached(get_dataset_path(task_name, self.cache_dir)))
+        for X_other, y_other, metadata_other in [
+            (X_cached, y_cached, metadata_cached), (X_uncached, y_uncached, metadata_uncached)
+        ]:
+            assert_same_values(self, X_other, np.asarray(X))
+            np.testing.assert_array_equal(y_other, y)
+            self.assertEqual(metadata_other["columns"], metadata["columns"])
+            self.assertEqual(metadata_other["categories"], metadata["categories"])
+
+    def test_split_cache(self):
+        task_name = "synthetic.rows=500,features=4"
+        (_, y), _ = load_task(task_name, cache_dir=self.cache_dir)
+        expected = train_valid_test_split_indices(y, test_seed=1, valid_seed=2)
+        path = get_split_path(get_dataset_path(task_name, self.cache_dir), 1, 2, 0.1, 0.1, True)
+
+        indices = load_split_indices(task_name, y, 1, 2, cache_dir=self.cache_dir)
+        self.assertTrue(os.path.isdir(path))
+        cached_indices = load_split_indices(task_name, y, 1, 2, cache_dir=self.cache_dir)
+
+        for split, cached_split, expected_split in zip(indices, cached_indices, expected):
+            np.testing.assert_array_equal(split, expected_split)
+            np.testing.assert_array_equal(cached_split, expected_split)
+            self.assertIsInstance(cached_split, np.ndarray)
+        self.assertEqual(sorted(np.concatenate(cached_indices).tolist()), list(range(len(y))))
+
+
+class TestSources(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_synthetic_source(self):
+        X, y, metadata = get_synthetic_data("rows=400,features=10,classes=4,categorical=0.3,cardinality=6,seed=3")
+        X_again, y_again, _ = get_synthetic_data("seed=3,rows=400,features=10,classes=4,categorical=0.3,cardinality=6")
+
+        self.assertEqual(X.shape, (400, 10))
+        self.assertTrue(X.equals(X_again) and y.equals(y_again))
+        self.assertEqual(sorted(y.unique()), ["0", "1", "2", "3"])
+        self.assertEqual(metadata["num_classes"], 4)
+        self.assertEqual(metadata["categories"], [False] * 7 + [True] * 3)
+        self.assertTrue(all(isinstance(X[c].dtype, pd.CategoricalDtype) for c in ["f7", "f8", "f9"]))
+        self.assertEqual(X["f9"].nunique(), 6)
+
+    @parameterized.expand([
+        ("rows=0",),
+        ("classes=1",),
+        ("categorical=2",),
+        ("cardinality=1",),
+        ("depth=3",),
+        ("rows=many",),
+        ("features=1,classes=8",),
+    ])
+    def test_synthetic_invalid_spec(self, spec):
+        with self.assertRaises(ValueError):
+            get_synthetic_data(spec)
+
+    def test_synthetic_defaults(self):
+        self.assertEqual(
+            parse_synthetic_spec(""),
+            {"rows": 1000, "features": 20, "classes": 2, "categorical": 0.0, "cardinality": 5, "seed": 42},
+        )
+
+    @parameterized.expand([("csv",), ("parquet",), ("npz",)])
+    def test_file_source(self, file_format):
+        frame = pd.DataFrame({
+            "a": [0.5, 1.5, 2.5, 3.5],
+            "b": ["x", "y", "x", "z"],
+            "label": ["p", "q", "p", "p"],
+        })
+        path = os.path.join(self.directory, f"data.{file_format}")
+        if file_format == "csv":
+            frame.to_csv(path, index=False)
+        elif file_format == "parquet":
+            frame.to_parquet(path)
+        else:
+            # npz files are loaded without pickle, so the labels must not be strings
+            frame["label"] = (frame["label"] == "q").astype(int)
+            np.savez(path, X=frame[["a"]].to_numpy(), y=frame["label"].to_numpy())
+        with open(os.path.join(self.directory, "data.json"), "w") as f:
+            json.dump({"target": "label", "description": "test"}, f)
+
+        X, y, metadata = get_file_data(path)
+        (X_array, y_array), _ = load_from_file(path)
+
+        self.assertEqual(metadata["num_classes"], 2)
+        self.assertEqual(metadata["description"], "test")
+        np.testing.assert_array_equal(y_array, frame["label"].to_numpy())
+        if file_format == "npz":
+            self.assertEqual(metadata["categories"], [False])
+            np.testing.assert_array_equal(X_array, frame[["a"]].to_numpy())
+        else:
+            self.assertEqual(list(X.columns), ["a", "b"])
+            self.assertEqual(metadata["categories"], [False, True])
+            assert_same_values(self, X_array, frame[["a", "b"]].astype({"b": "category"}).values)
+
+    def test_file_source_errors(self):
+        path = os.path.join(self.directory, "data.csv")
+        with self.assertRaises(ValueError):
+            get_file_data(path)
+
+        pd.DataFrame({"a": [1, 2], "label": [0, 1]}).to_csv(path, index=False)
+        with open(os.path.join(self.directory, "data.json"), "w") as f:
+            json.dump({"target": "class"}, f)
+        with self.assertRaises(ValueError):
+            get_file_data(path)
+
+        with self.assertRaises(ValueError):
+            get_file_data(os.path.join(self.directory, "data.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from lcdb.builder.node_table import NodeTable
+from lcdb.builder.timer import Timer
+
+
+def get_timer() -> Timer:
+    """Returns a stopped timer with metadata of all kinds and a canceled branch."""
+    timer = Timer()
+    timer.start("run", {"workflow": "lcdb.workflow.sklearn.LibLinearWorkflow", "seed": 42})
+    for anchor in [16, 32]:
+        with timer.time("anchor", {"value": anchor, "warm_started": anchor > 16}):
+            with timer.time("fit"):
+                pass
+            with timer.time("metrics"):
+                with timer.time("val"):
+                    with timer.time("confusion_matrix") as metric_timer:
+                        metric_timer["value"] = [[anchor, 1], [2, 3]]
+                    with timer.time("auc") as metric_timer:
+                        metric_timer["value"] = {"auc_ovr_macro": 0.75, "auc_ovr_None": [0.5, 1.0]}
+                    with timer.time("log_loss") as metric_timer:
+                        metric_timer["value"] = 0.125 * anchor
+    with timer.time("anchor", {"value": 64}, cancel_on_error=True):
+        with timer.time("fit"):
+            raise RuntimeError
+    timer.stop()
+    return timer
+
+
+class TestNodeTable(unittest.TestCase):
+
+    def test_serialize_round_trip(self):
+        table = get_timer().as_table()
+
+        deserialized = NodeTable.deserialize(table.serialize())
+
+        self.assertEqual(deserialized.as_dict(), table.as_dict())
+        self.assertEqual(deserialized.tags, table.tags)
+        self.assertEqual(deserialized.precision, table.precision)
+        self.assertEqual(deserialized.canceled.tolist(), table.canceled.tolist())
+
+    def test_as_dict_equals_tree(self):
+        timer = get_timer()
+
+        tree = NodeTable.deserialize(timer.as_table().serialize()).as_dict()
+
+        self.assertEqual(tree, timer.as_dict())
+        anchors = tree["children"]
+        self.assertEqual([a["metadata"]["value"] for a in anchors], [16, 32, 64])
+        self.assertEqual([a["metadata"]["warm_started"] for a in anchors[:2]], [False, True])
+        self.assertIn("cancellation_source_id", anchors[2])
+        metrics = anchors[1]["children"][1]["children"][0]["children"]
+        self.assertEqual(metrics[0]["metadata"]["value"], [[32, 1], [2, 3]])
+        self.assertEqual(metrics[1]["metadata"]["value"], {"auc_ovr_macro": 0.75, "auc_ovr_None": [0.5, 1.0]})
+        self.assertEqual(metrics[2]["metadata"]["value"], 4.0)
+
+    def test_select_and_get_metadata(self):
+        table = get_timer().as_table()
+
+        anchors = table.select("anchor")
+        nodes, values = table.get_metadata("value", kind="int")
+
+        self.assertEqual(len(anchors), 3)
+        self.assertEqual(nodes.tolist(), anchors.tolist())
+        self.assertEqual(list(values), [16, 32, 64])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import pickle
+import unittest
+
+import numpy as np
+
+from lcdb.builder.pool import MemoryLimitedPool
+
+
+def allocate(num_bytes):
+    """Job writing ``num_bytes`` in memory, the allocations failing under the limit of the virtual memory are
+    reported as in ``run_learning_workflow``."""
+    try:
+        buffer = np.ones(num_bytes, dtype=np.uint8)
+    except MemoryError:
+        return "F_memory_error"
+    return {"objective": float(buffer[-1]), "metadata": {"pid": os.getpid()}}
+
+
+def exit_worker(code):
+    os._exit(code)
+
+
+def recover(output, *args, **kwargs):
+    return {"objective": "F_recovered", "metadata": {"terminated_output": output}}
+
+
+class TestMemoryLimitedPool(unittest.TestCase):
+
+    def get_pool(self, **kwargs) -> MemoryLimitedPool:
+        pool = MemoryLimitedPool(**kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_workers_are_reused_and_recycled(self):
+        pool = self.get_pool(memory_limit=-1, max_jobs_per_worker=2)
+
+        outputs = [pool.run(allocate, 1024) for _ in range(3)]
+
+        self.assertEqual([output["objective"] for output in outputs], [1.0] * 3)
+        pids = [output["metadata"]["pid"] for output in outputs]
+        self.assertNotEqual(pids[0], os.getpid())
+        self.assertEqual(pids[1], pids[0])
+        self.assertNotEqual(pids[2], pids[0])
+        for output in outputs:
+            self.assertGreater(output["metadata"]["memory"], 0)
+            self.assertLessEqual(output["metadata"]["timestamp_start"], output["metadata"]["timestamp_end"])
+
+    def test_memory_limit_exceeded(self):
+        pool = self.get_pool(memory_limit=512 * 1024**2, memory_tracing_interval=0.01)
+        pid = pool.run(allocate, 1024)["metadata"]["pid"]
+
+        output = pool.run(allocate, 1024**3)
+
+        self.assertEqual(output["objective"], "F_memory_limit_exceeded")
+        self.assertGreater(output["metadata"]["memory"], 512 * 1024**2)
+        # the peak memory of the killed worker is not carried over to the next job
+        output = pool.run(allocate, 1024)
+        self.assertNotEqual(output["metadata"]["pid"], pid)
+        self.assertLess(output["metadata"]["memory"], 512 * 1024**2)
+
+    def test_address_space_limit(self):
+        pool = self.get_pool(memory_limit=-1, address_space_limit=8 * 1024**3)
+
+        self.assertEqual(pool.run(allocate, 16 * 1024**3)["objective"], "F_memory_error")
+        self.assertEqual(pool.run(allocate, 1024)["objective"], 1.0)
+
+    def test_terminated_job_is_recovered(self):
+        pool = self.get_pool(memory_limit=512 * 1024**2, memory_tracing_interval=0.01)
+
+        output = pool.run(exit_worker, 1, recover_func=recover)
+        self.assertEqual(output["objective"], "F_recovered")
+        self.assertIsNone(output["metadata"]["terminated_output"])
+
+        output = pool.run(allocate, 1024**3, recover_func=recover)
+        self.assertEqual(output["metadata"]["terminated_output"], "F_memory_limit_exceeded")
+
+    def test_pickled_as_pool_of_process(self):
+        pool = self.get_pool(memory_limit=1024**3, max_jobs_per_worker=10, preload=["lcdb.workflow.sklearn"])
+
+        unpickled_pool = pickle.loads(pickle.dumps(pool))
+        self.addCleanup(unpickled_pool.close)
+
+        self.assertEqual(unpickled_pool.config, pool.config)
+        self.assertIs(pickle.loads(pickle.dumps(pool)), unpickled_pool)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            MemoryLimitedPool(memory_limit=-1, memory_tracing_interval=0)
+        with self.assertRaises(ValueError):
+            MemoryLimitedPool(memory_limit=-1, max_jobs_per_worker=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import time
+import tracemalloc
+import unittest
+
+from lcdb.builder.resources import ResourceProbe
+from lcdb.builder.timer import Timer
+
+RESOURCE_KEYS = ["cpu_user", "cpu_system", "rss_start", "rss_stop", "max_rss_delta", "major_faults"]
+
+
+def burn_cpu(seconds: float):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+class TestResourceProbe(unittest.TestCase):
+
+    def test_cpu_time(self):
+        probe = ResourceProbe()
+        burn_cpu(0.2)
+
+        metadata = probe.stop()
+
+        self.assertEqual(list(metadata), RESOURCE_KEYS)
+        self.assertGreaterEqual(metadata["cpu_user"] + metadata["cpu_system"], 0.15)
+        self.assertGreater(metadata["rss_start"], 0)
+        self.assertGreaterEqual(metadata["max_rss_delta"], 0)
+
+    def test_timer_records_tagged_nodes(self):
+        timer = Timer(resource_tags=["fit"], tracemalloc_tags=["predict"])
+        timer.start("run")
+
+        with timer.time("fit") as fit_timer:
+            burn_cpu(0.1)
+        with timer.time("metrics") as metrics_timer:
+            pass
+        with timer.time("predict") as outer_timer:
+            outer_buffer = bytearray(8 * 1024**2)
+            with timer.time("predict") as inner_timer:
+                inner_buffer = bytearray(32 * 1024**2)
+                del inner_buffer
+            del outer_buffer
+        timer.stop()
+
+        self.assertTrue(set(RESOURCE_KEYS).issubset(fit_timer.metadata))
+        self.assertNotIn("alloc_peak", fit_timer.metadata)
+        self.assertGreaterEqual(fit_timer["cpu_user"] + fit_timer["cpu_system"], 0.05)
+        self.assertFalse(set(RESOURCE_KEYS).intersection(metrics_timer.metadata))
+        # the peak of the inner node is also a peak of the outer one, which allocated more before it
+        self.assertGreaterEqual(inner_timer["alloc_peak"], 32 * 1024**2)
+        self.assertGreaterEqual(outer_timer["alloc_peak"], 40 * 1024**2)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_canceled_nodes_are_probed(self):
+        timer = Timer(resource_tags=["anchor", "fit"])
+        timer.start("run")
+
+        with timer.time("anchor", cancel_on_error=True) as anchor_timer:
+            with timer.time("fit") as fit_timer:
+                raise RuntimeError
+        timer.stop()
+
+        for node in [anchor_timer, fit_timer]:
+            self.assertIsNone(node.probe)
+            self.assertTrue(set(RESOURCE_KEYS).issubset(node.metadata))
+
+
+if __name__ == "__main__":
+    unittest.main()
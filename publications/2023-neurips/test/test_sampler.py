@@ -0,0 +1,111 @@
+from parameterized import parameterized
+import unittest
+
+import numpy as np
+import pandas as pd
+import scipy.sparse
+
+from lcdb.builder.sampler import AnchorSampler, EvaluationSampler
+from lcdb.data import TabularArray
+
+
+def get_anchor_samples(X_train, y_train, anchors, anchor, monotonic, valid_seed):
+    """Samples of an anchor as computed by ``LearningCurveBuilder.set_anchor`` before ``AnchorSampler``."""
+    train_idx = np.arange(X_train.shape[0])
+    i = anchors.index(anchor)
+    if not monotonic:
+        random_seed_train_shuffle = np.random.RandomState(valid_seed).randint(
+            0, 2**32 - 1, size=len(anchors)
+        )[i]
+        rs = np.random.RandomState(random_seed_train_shuffle)
+        rs.shuffle(train_idx)
+
+        X_train = X_train[train_idx]
+        y_train = y_train[train_idx]
+
+    return X_train[:anchor], y_train[:anchor]
+
+
+class TestAnchorSampler(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(500, 4))
+        self.y = rng.choice(["a", "b", "c"], size=500, p=[0.6, 0.3, 0.1])
+        self.train_indices = np.sort(rng.choice(500, size=400, replace=False))
+        self.anchors = [16, 23, 32, 45, 64, 91, 128, 181, 256, 362, 400]
+
+    @parameterized.expand([(True, False), (False, False), (True, True), (False, True)])
+    def test_samples_equal_previous_implementation(self, monotonic, with_train_indices):
+        X_train, y_train = self.X[self.train_indices], self.y[self.train_indices]
+        if with_train_indices:
+            sampler = AnchorSampler(
+                self.X, self.y, self.anchors, monotonic=monotonic, random_state=42, train_indices=self.train_indices
+            )
+        else:
+            sampler = AnchorSampler(X_train, y_train, self.anchors, monotonic=monotonic, random_state=42)
+
+        # the anchors are sampled in order as the buffer is reused from one anchor to the next
+        for anchor in self.anchors:
+            X_anchor, y_anchor = sampler.sample(anchor)
+            X_expected, y_expected = get_anchor_samples(X_train, y_train, self.anchors, anchor, monotonic, 42)
+            np.testing.assert_array_equal(X_anchor, X_expected)
+            np.testing.assert_array_equal(y_anchor, y_expected)
+
+    def test_stratified_anchors_are_nested(self):
+        sampler = AnchorSampler(
+            self.X, self.y, self.anchors, monotonic=True, stratify=True, train_indices=self.train_indices
+        )
+        y_train = self.y[self.train_indices]
+        proportions = np.unique(y_train, return_counts=True)[1] / len(y_train)
+
+        for smaller, larger in zip(self.anchors, self.anchors[1:]):
+            np.testing.assert_array_equal(sampler.indices[larger][:smaller], sampler.indices[smaller])
+        for anchor in self.anchors[2:]:
+            counts = np.unique(sampler.sample(anchor)[1], return_counts=True)[1]
+            np.testing.assert_allclose(counts / anchor, proportions, atol=1.5 / anchor)
+
+    def test_sparse_and_tabular_samples(self):
+        X_frame = pd.DataFrame({"a": self.X[:, 0], "b": pd.Categorical(np.where(self.X[:, 1] > 0, "x", "y"))})
+        X_sparse = scipy.sparse.csr_matrix(np.where(self.X > 1, self.X, 0))
+
+        for X, to_array in [
+            (TabularArray.from_frame(X_frame), lambda X: np.asarray(X)),
+            (X_sparse, lambda X: X.toarray()),
+        ]:
+            sampler = AnchorSampler(X, self.y, self.anchors, monotonic=False, random_state=1)
+            dense_sampler = AnchorSampler(to_array(X), self.y, self.anchors, monotonic=False, random_state=1)
+            for anchor in self.anchors:
+                X_anchor, y_anchor = sampler.sample(anchor)
+                X_expected, y_expected = dense_sampler.sample(anchor)
+                np.testing.assert_array_equal(to_array(X_anchor), X_expected)
+                np.testing.assert_array_equal(y_anchor, y_expected)
+
+
+class TestEvaluationSampler(unittest.TestCase):
+
+    def test_selection_is_deterministic(self):
+        y = np.repeat(["a", "b"], [900, 100])
+        sampler = EvaluationSampler(max_instances=100, random_state=0)
+
+        indices = sampler.indices(y)
+
+        np.testing.assert_array_equal(indices, sampler.indices(y))
+        self.assertEqual(len(indices), 100)
+        self.assertEqual(np.sum(y[indices] == "b"), 10)
+        self.assertIsNone(EvaluationSampler(max_instances=-1).indices(y))
+
+    def test_sample_keeps_rows_and_labels_aligned(self):
+        X = np.arange(1000)[:, None] * np.ones((1, 3))
+        y = np.repeat(["a", "b", "c"], [700, 200, 100])
+        sampler = EvaluationSampler(max_instances=50, random_state=1)
+
+        X_eval, y_eval = sampler.sample(X, y)
+
+        np.testing.assert_array_equal(y[X_eval[:, 0].astype(int)], y_eval)
+        self.assertEqual(dict(zip(*np.unique(y_eval, return_counts=True))), {"a": 35, "b": 10, "c": 5})
+        self.assertIs(EvaluationSampler(max_instances=1000).sample(X, y)[0], X)
+
+
+if __name__ == "__main__":
+    unittest.main()
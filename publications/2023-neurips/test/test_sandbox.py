@@ -0,0 +1,128 @@
+import logging
+import os
+import shutil
+import signal
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import psutil
+from deephyper.evaluator import RunningJob
+
+from lcdb.builder import run_learning_workflow
+from lcdb.builder.sandbox import FitSandbox, RemoteTraceback, WorkerTerminatedError, get_stored
+from lcdb.builder.utils import FunctionCallTimeoutError, terminate_on_timeout
+from lcdb.workflow.sklearn import LibLinearWorkflow
+
+
+def add_stored(key, value):
+    return get_stored(key) + value
+
+
+def fail():
+    raise ValueError("failed in the worker")
+
+
+def exit_worker(code):
+    os._exit(code)
+
+
+class TestFitSandbox(unittest.TestCase):
+
+    def setUp(self):
+        self.sandbox = FitSandbox()
+        self.addCleanup(self.sandbox.close)
+
+    def test_call_reuses_worker(self):
+        pid = self.sandbox.call(-1, os.getpid)
+
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(self.sandbox.call(10, os.getpid), pid)
+        self.assertEqual(self.sandbox.pid, pid)
+
+    def test_exception_carries_remote_traceback(self):
+        with self.assertRaises(ValueError) as context:
+            self.sandbox.call(10, fail)
+
+        self.assertIsInstance(context.exception.__cause__, RemoteTraceback)
+        self.assertIn("failed in the worker", str(context.exception.__cause__))
+        # the worker survives the exceptions of the calls
+        self.assertEqual(self.sandbox.call(10, divmod, 7, 2), (3, 1))
+
+    def test_timeout_kills_worker(self):
+        self.sandbox.store("offset", 10)
+        pid = self.sandbox.call(10, os.getpid)
+
+        with self.assertRaises(FunctionCallTimeoutError):
+            self.sandbox.call(0.5, time.sleep, 30)
+
+        self.assertIsNone(self.sandbox.pid)
+        self.assertFalse(psutil.pid_exists(pid))
+        # the next call starts another worker to which the stored values are sent again
+        self.assertEqual(self.sandbox.call(10, add_stored, "offset", 1), 11)
+        self.assertNotEqual(self.sandbox.pid, pid)
+
+    def test_killed_worker(self):
+        pid = self.sandbox.call(10, os.getpid)
+
+        with self.assertRaises(MemoryError):
+            self.sandbox.call(10, os.kill, pid, signal.SIGKILL)
+        with self.assertRaises(WorkerTerminatedError) as context:
+            self.sandbox.call(10, exit_worker, 3)
+
+        self.assertEqual(context.exception.exitcode, 3)
+        self.assertEqual(self.sandbox.call(10, divmod, 7, 2), (3, 1))
+
+
+class TestTerminateOnTimeout(unittest.TestCase):
+
+    def test_timeout(self):
+        self.assertEqual(terminate_on_timeout(10, divmod, 7, 2), (3, 1))
+        with self.assertRaises(FunctionCallTimeoutError):
+            terminate_on_timeout(0.1, time.sleep, 2)
+
+
+class TestTimeoutIsolation(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        patcher = mock.patch.dict(os.environ, {"LCDB_DATASET_CACHE": self.directory})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.job = RunningJob(1, parameters=dict(LibLinearWorkflow.config_space().get_default_configuration()))
+        self.kwargs = dict(
+            task_id="synthetic.rows=1000,features=5",
+            workflow_class="lcdb.workflow.sklearn.LibLinearWorkflow",
+            logger=logging.getLogger("test_sandbox"),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_process_equals_thread(self):
+        outputs = [
+            run_learning_workflow(
+                self.job, timeout_on_fit=60, timeout_isolation=isolation, raise_errors=True, **self.kwargs
+            )
+            for isolation in ["thread", "process"]
+        ]
+
+        self.assertEqual(outputs[1]["objective"], outputs[0]["objective"])
+        build_curves = [output["metadata"]["json"]["children"][-1] for output in outputs]
+        anchors = [[n["metadata"]["value"] for n in b["children"] if n["tag"] == "anchor"] for b in build_curves]
+        self.assertEqual(anchors[1], anchors[0])
+        # the nodes recorded in the worker are attached to the anchors of the builder
+        for anchor in build_curves[1]["children"]:
+            if anchor["tag"] == "anchor":
+                self.assertIn("fit", [n["tag"] for n in anchor["children"]])
+
+    def test_process_timeout(self):
+        output = run_learning_workflow(self.job, timeout_on_fit=0.001, timeout_isolation="process", **self.kwargs)
+
+        self.assertEqual(output["objective"], "F_function_call_timeout_error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+from parameterized import parameterized
+import unittest
+from unittest import mock
+
+import numpy as np
+from sklearn.metrics import brier_score_loss, confusion_matrix, log_loss, roc_auc_score
+
+from lcdb.builder.scorer import ClassificationScorer, EpochScoringBuffer
+from lcdb.builder.timer import Timer
+
+
+def get_predictions(num_instances, num_classes, num_missing, seed, num_epochs=1):
+    """Returns random predictions with ties of ``num_epochs`` epochs of a learner which does not know the last
+    ``num_missing`` classes."""
+    rng = np.random.default_rng(seed)
+    classes_overall = list(range(num_classes))
+    classes_learner = classes_overall[: num_classes - num_missing]
+
+    y_true = rng.integers(num_classes, size=num_instances)
+    y_pred_proba = rng.dirichlet(np.ones(len(classes_learner)), size=(num_epochs, num_instances))
+    y_pred_proba = np.round(y_pred_proba, 1)
+    y_pred_proba /= y_pred_proba.sum(axis=2, keepdims=True)
+    y_pred = np.asarray(classes_learner)[np.argmax(y_pred_proba, axis=2)]
+    return classes_learner, classes_overall, y_true, y_pred, y_pred_proba
+
+
+def get_sklearn_scores(classes_learner, classes_overall, y_true, y_pred, y_pred_proba):
+    """Scores computed with ``sklearn.metrics`` for each metric, as done before ``ClassificationScorer``."""
+    padded_classes = sorted(set(classes_overall) - set(classes_learner))
+    if padded_classes:
+        y_pred_proba = np.concatenate([y_pred_proba, np.zeros((len(y_true), len(padded_classes)))], axis=1)
+        order = classes_learner + padded_classes
+        y_pred_proba = y_pred_proba[:, [order.index(label) for label in classes_overall]]
+
+    labels_in_ground_truth = sorted(np.unique(y_true))
+    is_binary = len(labels_in_ground_truth) == 2
+
+    scores = {"confusion_matrix": confusion_matrix(y_true, y_pred, labels=classes_overall).tolist()}
+
+    if is_binary:
+        scores["auc"] = np.round(roc_auc_score(y_true, y_pred_proba[:, 1], labels=classes_overall), 5)
+    else:
+        if set(y_true).issubset(set(classes_learner)):
+            accepted_labels = labels_in_ground_truth
+        else:
+            accepted_labels = [
+                label for i, label in enumerate(classes_overall)
+                if label in y_true or y_pred_proba[:, i].sum() > 0
+            ]
+        y_pred_proba_auc = y_pred_proba[:, np.isin(classes_overall, accepted_labels)]
+        if len(labels_in_ground_truth) != len(classes_learner):
+            y_pred_proba_auc = y_pred_proba_auc / y_pred_proba_auc.sum(axis=1, keepdims=True)
+        scores["auc"] = {}
+        for multi_class, average in [
+            ("ovr", "micro"), ("ovr", "macro"), ("ovr", "weighted"), ("ovr", None), ("ovo", "macro"), ("ovo", "weighted")
+        ]:
+            scores["auc"][f"auc_{multi_class}_{average}"] = np.round(
+                roc_auc_score(
+                    y_true, y_pred_proba_auc, labels=accepted_labels, multi_class=multi_class, average=average
+                ),
+                5,
+            )
+
+    scores["log_loss"] = np.round(
+        log_loss(y_true, y_pred_proba[:, 1] if is_binary else y_pred_proba, labels=classes_overall), 5
+    )
+
+    if is_binary:
+        scores["brier_score"] = np.round(
+            brier_score_loss(y_true, y_pred_proba[:, 1], pos_label=classes_overall[1]), 5
+        )
+    else:
+        y_true_binarized = (np.asarray(y_true)[:, None] == np.asarray(classes_overall)).astype(float)
+        scores["brier_score"] = np.round(((y_true_binarized - y_pred_proba) ** 2).sum(axis=1).mean(), 5)
+    return scores
+
+
+def get_scorer(classes_learner, classes_overall):
+    timer = Timer()
+    timer.start("metrics")
+    return ClassificationScorer(classes_learner, classes_overall, timer=timer)
+
+
+class TestClassificationScorer(unittest.TestCase):
+
+    def assert_same_scores(self, scores, expected_scores):
+        if isinstance(expected_scores, dict):
+            self.assertEqual(scores.keys(), expected_scores.keys())
+            for key in expected_scores:
+                self.assert_same_scores(scores[key], expected_scores[key])
+        else:
+            np.testing.assert_allclose(scores, expected_scores, rtol=0, atol=1e-5)
+
+    @parameterized.expand([
+        (500, 2, 0),
+        (500, 5, 0),
+        (500, 5, 1),
+        (2000, 10, 0),
+    ])
+    def test_score_equals_sklearn(self, num_instances, num_classes, num_missing):
+        classes_learner, classes_overall, y_true, y_pred, y_pred_proba = get_predictions(
+            num_instances, num_classes, num_missing, seed=num_classes
+        )
+        scorer = get_scorer(classes_learner, classes_overall)
+
+        scores = scorer.score(y_true, y_pred[0], y_pred_proba[0])
+
+        expected_scores = get_sklearn_scores(classes_learner, classes_overall, y_true, y_pred[0], y_pred_proba[0])
+        self.assert_same_scores(scores, expected_scores)
+
+    @parameterized.expand([(2, 0), (5, 0), (5, 1)])
+    def test_score_many_equals_score(self, num_classes, num_missing):
+        classes_learner, classes_overall, y_true, y_pred, y_pred_proba = get_predictions(
+            300, num_classes, num_missing, seed=0, num_epochs=4
+        )
+        scorer = get_scorer(classes_learner, classes_overall)
+        parents = []
+        for _ in range(len(y_pred)):
+            with scorer.timer.time("epoch"):
+                with scorer.timer.time("val") as split_timer:
+                    parents.append(split_timer)
+
+        scores_many = scorer.score_many(y_true, y_pred, y_pred_proba, parents)
+
+        for epoch, parent in enumerate(parents):
+            scores = get_scorer(classes_learner, classes_overall).score(y_true, y_pred[epoch], y_pred_proba[epoch])
+            self.assert_same_scores(scores_many[epoch], scores)
+            self.assertEqual([c.tag for c in parent.children], list(scores))
+            self.assert_same_scores({c.tag: c["value"] for c in parent.children}, scores)
+
+    @parameterized.expand([
+        (0, [1, 1, 1, 1]),
+        (2 * 300 * 8 * 4, [3, 1]),
+        (10**9, [4]),
+    ])
+    def test_buffer_scores_epochs_by_batches(self, max_bytes, batch_sizes):
+        classes_learner, classes_overall, y_true, y_pred, y_pred_proba = get_predictions(
+            300, 3, 0, seed=0, num_epochs=4
+        )
+        scorer = get_scorer(classes_learner, classes_overall)
+        buffer = EpochScoringBuffer(scorer, {"val": y_true}, max_bytes=max_bytes)
+        parents = []
+
+        with mock.patch.object(scorer, "score_many", wraps=scorer.score_many) as score_many:
+            for epoch in range(len(y_pred)):
+                buffer.flush_if_full()
+                with scorer.timer.time("epoch"):
+                    with scorer.timer.time("val") as split_timer:
+                        parents.append(split_timer)
+                        buffer.add("val", split_timer, y_pred[epoch], y_pred_proba[epoch])
+            buffer.flush()
+
+        self.assertEqual([len(c.kwargs["parents"]) for c in score_many.call_args_list], batch_sizes)
+        # only the last batch holds the last scheduled epoch
+        self.assertEqual(
+            [c.kwargs["final_epoch"] for c in score_many.call_args_list], [False] * (len(batch_sizes) - 1) + [True]
+        )
+        self.assertEqual(buffer.num_bytes, 0)
+        for epoch, parent in enumerate(parents):
+            scores = get_scorer(classes_learner, classes_overall).score(y_true, y_pred[epoch], y_pred_proba[epoch])
+            self.assert_same_scores({c.tag: c["value"] for c in parent.children}, scores)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import copy
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from deephyper.evaluator import RunningJob
+
+from lcdb.builder import run_learning_workflow
+from lcdb.builder.cache import DatasetSplits
+from lcdb.builder.timer import Timer
+from lcdb.builder.utils import PowerLawCostModel
+from lcdb.data import load_task
+from lcdb.workflow.sklearn import PerceptronWorkflow
+from lcdb.workflow.xgboost import XGBoostWorkflow
+
+TASK_ID = "synthetic.rows=2000,features=10,classes=3,categorical=0.3,cardinality=20"
+
+
+def get_workflow_and_data(WorkflowClass, known_categories=True, warm_start=True, **parameters):
+    """Returns a workflow with its default configuration updated with ``parameters``, the training instances and the
+    arguments of ``fit`` besides them, as given by ``LearningCurveBuilder``."""
+    (X, y), metadata = load_task(TASK_ID, use_cache=False)
+    splits = DatasetSplits(X, y, metadata["categories"], 42, 42, known_categories=known_categories)
+    metadata = dict(metadata, categories=splits.categories, num_instances=splits.num_instances)
+
+    timer = Timer()
+    timer.start("run")
+    workflow = WorkflowClass(
+        timer=timer, **dict(WorkflowClass.config_space().get_default_configuration(), **parameters)
+    )
+    if warm_start:
+        workflow.warm_start_final_anchor = len(splits.train_indices)
+    kwargs = dict(
+        X_valid=splits.X_valid,
+        y_valid=splits.y_valid,
+        X_test=splits.X_test,
+        y_test=splits.y_test,
+        metadata=metadata,
+    )
+    return workflow, X[splits.train_indices], splits.y_train, kwargs
+
+
+class TestWarmStart(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        patcher = mock.patch.dict(os.environ, {"LCDB_DATASET_CACHE": self.directory})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_perceptron_continues_on_frozen_features(self):
+        workflow, X, y, kwargs = get_workflow_and_data(PerceptronWorkflow, **{"pp@scaler": "std"})
+        workflow.fit(X[:64], y[:64], **kwargs)
+        reference = copy.deepcopy(workflow)
+
+        workflow.partial_fit(X[:256], y[:256], **kwargs)
+
+        self.assertTrue(workflow.warm_started)
+        # the weights of the first anchor are applied to the features they were trained on
+        np.testing.assert_array_equal(
+            workflow.pp_pipeline.transform(X[:256]), reference.pp_pipeline.transform(X[:256])
+        )
+        reference.learner.partial_fit(
+            reference.pp_pipeline.transform(X[64:256]).astype(np.float32),
+            reference.label_encoder.transform(y[64:256]),
+        )
+        np.testing.assert_array_equal(workflow.learner.coef_, reference.learner.coef_)
+        np.testing.assert_array_equal(workflow.learner.intercept_, reference.learner.intercept_)
+
+    def test_onehot_columns_cover_known_categories(self):
+        workflow, X, y, kwargs = get_workflow_and_data(PerceptronWorkflow)
+        workflow.fit(X[:16], y[:16], **kwargs)
+
+        num_categories = [len(c) for c in kwargs["metadata"]["categories"]["values"]]
+        num_numeric = len(kwargs["metadata"]["categories"]["columns"]) - len(num_categories)
+        self.assertTrue(workflow.pp_pipeline_frozen)
+        self.assertEqual(workflow.num_features_transformed, num_numeric + sum(n - 1 for n in num_categories))
+
+    def test_unknown_categories_fall_back_to_cold_fit(self):
+        workflow, X, y, kwargs = get_workflow_and_data(PerceptronWorkflow, known_categories=False)
+        workflow.fit(X[:64], y[:64], **kwargs)
+
+        workflow.partial_fit(X[:256], y[:256], **kwargs)
+
+        cold_workflow, _, _, _ = get_workflow_and_data(PerceptronWorkflow, known_categories=False, warm_start=False)
+        cold_workflow.fit(X[:256], y[:256], **kwargs)
+        self.assertFalse(workflow.pp_pipeline_frozen)
+        self.assertFalse(workflow.warm_started)
+        np.testing.assert_array_equal(workflow.predict_proba(X), cold_workflow.predict_proba(X))
+
+    def test_xgboost_continues_on_frozen_features(self):
+        workflow, X, y, kwargs = get_workflow_and_data(XGBoostWorkflow, n_estimators=20, **{"pp@scaler": "minmax"})
+        workflow.warm_start_final_anchor = 512
+        workflow.fit(X[:128], y[:128], **kwargs)
+        reference = copy.deepcopy(workflow)
+
+        workflow.partial_fit(X[:512], y[:512], **kwargs)
+
+        self.assertTrue(workflow.warm_started)
+        self.assertEqual(reference.learner.get_booster().num_boosted_rounds(), 5)
+        self.assertEqual(workflow.learner.get_booster().num_boosted_rounds(), 20)
+        np.testing.assert_array_equal(
+            workflow.pp_pipeline.transform(X[:512]), reference.pp_pipeline.transform(X[:512])
+        )
+
+    def test_xgboost_rounds_follow_pruned_anchors(self):
+        job = RunningJob(
+            1, parameters=dict(XGBoostWorkflow.config_space().get_default_configuration(), n_estimators=20)
+        )
+
+        # the anchors after 91 do not fit in the budget once the cost model is fitted (on the first 4 anchors)
+        def predict(self, anchors):
+            return np.where(np.asarray(anchors) <= 91, 0.0, 1e9)
+
+        with mock.patch.object(PowerLawCostModel, "predict", predict):
+            output = run_learning_workflow(
+                job,
+                task_id=TASK_ID,
+                workflow_class="lcdb.workflow.xgboost.XGBoostWorkflow",
+                warm_start=True,
+                anchor_schedule="budget",
+                anchor_budget=3600,
+                logger=logging.getLogger("test_warm_start"),
+                raise_errors=True,
+            )
+
+        anchors = [n for n in output["metadata"]["json"]["children"][-1]["children"] if n["tag"] == "anchor"]
+        self.assertEqual([a["metadata"]["value"] for a in anchors], [16, 23, 32, 45, 64, 91])
+        self.assertEqual([a["metadata"]["warm_started"] for a in anchors], [False] + [True] * 5)
+
+        def get_rounds(node):
+            rounds = [node["metadata"]["value"] + 1] if node["tag"] == "epoch" else []
+            return rounds + [r for c in node.get("children", []) for r in get_rounds(c)]
+
+        # the model of the last anchor actually built has all the rounds of a model fitted from scratch
+        self.assertEqual(max(get_rounds(anchors[-1])), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
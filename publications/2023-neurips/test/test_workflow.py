@@ -0,0 +1,82 @@
+from parameterized import parameterized
+import unittest
+
+import numpy as np
+
+from lcdb.builder.cache import DatasetSplits
+from lcdb.builder.timer import Timer
+from lcdb.data import load_task
+from lcdb.workflow.sklearn import LibLinearWorkflow, RandomWorkflow
+
+
+def get_fitted_workflow(**kwargs):
+    """Returns a LibLinear workflow fitted on the training split of a synthetic task, and the whole data to predict."""
+    (X, y), metadata = load_task("synthetic.rows=1000,features=8,classes=3,categorical=0.25", use_cache=False)
+    splits = DatasetSplits(X, y, metadata["categories"], test_seed=42, valid_seed=42)
+    metadata = dict(metadata, categories=splits.categories, num_instances=splits.num_instances)
+
+    timer = Timer()
+    timer.start("run")
+    parameters = dict(LibLinearWorkflow.config_space().get_default_configuration())
+    workflow = LibLinearWorkflow(timer=timer, **parameters, **kwargs)
+    workflow.fit(
+        X[splits.train_indices],
+        splits.y_train,
+        X_valid=splits.X_valid,
+        y_valid=splits.y_valid,
+        X_test=splits.X_test,
+        y_test=splits.y_test,
+        metadata=metadata,
+    )
+    return workflow, X
+
+
+class TestPredictInChunks(unittest.TestCase):
+
+    @parameterized.expand([
+        (7, 1),
+        (100, 1),
+        (300, 4),
+        (1000, 1),
+        (-1, 1),
+    ])
+    def test_chunks_equal_single_call(self, chunk_size, num_threads):
+        workflow, X = get_fitted_workflow()
+        workflow.predict_chunk_size = None
+        y_pred_proba, y_pred = workflow.predict_proba(X), workflow.predict(X)
+
+        workflow.predict_chunk_size = chunk_size
+        workflow.predict_num_threads = num_threads
+
+        np.testing.assert_array_equal(workflow.predict_proba(X), y_pred_proba)
+        np.testing.assert_array_equal(workflow.predict(X), y_pred)
+
+    def test_chunks_of_outputs_with_one_dimension(self):
+        workflow, X = get_fitted_workflow()
+        workflow.predict_chunk_size = 64
+        workflow.predict_num_threads = 2
+        calls = []
+
+        def predict_fn(X_chunk):
+            calls.append(X_chunk.shape[0])
+            return np.asarray(X_chunk[:, 0], dtype=np.float64)
+
+        y_pred = workflow.predict_in_chunks(predict_fn, X)
+
+        np.testing.assert_array_equal(y_pred, np.asarray(X[:, 0], dtype=np.float64))
+        self.assertEqual(sorted(calls), sorted([64] * 15 + [40]))
+
+    def test_random_workflow_is_not_chunked(self):
+        (X, y), _ = load_task("synthetic.rows=1000,features=8,classes=3", use_cache=False)
+        workflow = RandomWorkflow(random_state=1)
+        workflow.learner.fit(X, y)
+        y_pred_proba = workflow.learner.predict_proba(X)
+
+        workflow.predict_chunk_size = 7
+
+        # the random draws of a chunk would be the ones of the first rows
+        np.testing.assert_array_equal(workflow.predict_in_chunks(workflow.learner.predict_proba, X), y_pred_proba)
+
+
+if __name__ == "__main__":
+    unittest.main()